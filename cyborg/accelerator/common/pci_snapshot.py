@@ -0,0 +1,158 @@
+# Copyright 2026 The Cyborg Authors.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""A PCI topology snapshot shared by the drivers of one discovery.
+
+Every driver used to run ``lspci`` through privsep and to walk
+``/sys/bus/pci/devices`` on its own. The resource tracker now makes one
+PciSnapshot per update and makes it current while the drivers discover;
+the drivers ask it for the ``lspci`` output and the PCI devices, and fall
+back to reading them themselves when no snapshot is current.
+
+A snapshot reads nothing until asked, so hosts without PCI drivers pay
+nothing. Nothing is kept across snapshots: sysfs does not update the
+mtime of a device directory when its attributes change, so there is no
+cheap way to tell a cached device is stale.
+"""
+
+import collections
+import contextlib
+import os
+import threading
+
+from oslo_concurrency import processutils
+from oslo_log import log as logging
+
+import cyborg.privsep
+
+
+LOG = logging.getLogger(__name__)
+
+PCI_DEVICES_PATH = "/sys/bus/pci/devices"
+# The lspci flags of most drivers.
+LSPCI_FLAGS = ('-nnn', '-D')
+
+PciDevice = collections.namedtuple(
+    'PciDevice', ['address', 'vendor', 'device']
+)
+
+
+@cyborg.privsep.sys_admin_pctxt.entrypoint
+def lspci_privileged(flags):
+    cmd = ['lspci', *flags]
+    return processutils.execute(*cmd)
+
+
+def _read_line(path):
+    try:
+        with open(path) as f:
+            return f.readline().strip()
+    except OSError:
+        return None
+
+
+def read_device(path):
+    """Read the IDs of the PCI device at a sysfs path."""
+    return PciDevice(
+        address=os.path.basename(path),
+        vendor=_read_line(os.path.join(path, 'vendor')),
+        device=_read_line(os.path.join(path, 'device')),
+    )
+
+
+def read_devices(path=PCI_DEVICES_PATH):
+    """Return the PCI devices of sysfs by address."""
+    try:
+        addresses = os.listdir(path)
+    except OSError as e:
+        LOG.warning('Unable to list PCI devices: %s', e)
+        return {}
+    return {
+        address: read_device(os.path.join(path, address))
+        for address in addresses
+    }
+
+
+class PciSnapshot:
+    """The lspci output and the sysfs PCI devices of a host, read once."""
+
+    def __init__(self, path=PCI_DEVICES_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        # The outputs of lspci by flags.
+        self._lspci = {}
+        self._devices = None
+
+    def lspci(self, flags=LSPCI_FLAGS):
+        """Return the ``(stdout, stderr)`` of lspci run with some flags."""
+        flags = tuple(flags)
+        with self._lock:
+            if flags not in self._lspci:
+                self._lspci[flags] = lspci_privileged(flags)
+            return self._lspci[flags]
+
+    @property
+    def devices(self):
+        """The PCI devices, by address."""
+        with self._lock:
+            if self._devices is None:
+                self._devices = read_devices(self.path)
+            return self._devices
+
+    def paths(self, known):
+        """Return the sysfs paths of the devices with a known ID.
+
+        :param known: (vendor, device) tuples as read from sysfs,
+            e.g. ("0x8086", "0x09c4").
+        """
+        known = set(known)
+        return [
+            os.path.join(self.path, address)
+            for address, dev in sorted(self.devices.items())
+            if (dev.vendor, dev.device) in known
+        ]
+
+
+_current = None
+
+
+def current():
+    """Return the snapshot of the ongoing discovery, or None."""
+    return _current
+
+
+@contextlib.contextmanager
+def use(snapshot):
+    """Make a snapshot current for the drivers discovering in the block."""
+    global _current
+    previous, _current = _current, snapshot
+    try:
+        yield snapshot
+    finally:
+        _current = previous
+
+
+def lspci(fallback, *args, flags=LSPCI_FLAGS):
+    """Return the lspci output of the current snapshot, if any.
+
+    Without a current snapshot, ``fallback(*args)`` is called to run lspci
+    as the driver did on its own.
+
+    :param flags: the flags the driver runs lspci with.
+    """
+    snapshot = _current
+    if snapshot is not None:
+        return snapshot.lspci(flags)
+    return fallback(*args)
@@ -17,6 +17,7 @@ from oslo_serialization import jsonutils
 
 import cyborg.privsep
 
+from cyborg.accelerator.common import pci_snapshot
 from cyborg.accelerator.common import utils
 from cyborg.accelerator.drivers.driver import GenericDriver
 from cyborg.common import constants
@@ -79,7 +80,7 @@ class AscendDriver(GenericDriver):
     def _get_pci_lines(self, keywords=()):
         pci_lines = []
         if keywords:
-            lspci_out = lspci_privileged()[0].split('\n')
+            lspci_out = pci_snapshot.lspci(lspci_privileged)[0].split('\n')
             for i in range(len(lspci_out)):
                 # filter out pci devices info that contains all keywords
                 if all([k in (lspci_out[i]) for k in keywords]):
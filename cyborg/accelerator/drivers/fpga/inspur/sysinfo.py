@@ -24,6 +24,7 @@ from oslo_serialization import jsonutils
 
 import cyborg.privsep
 
+from cyborg.accelerator.common import pci_snapshot
 from cyborg.accelerator.common import utils
 from cyborg.common import constants
 from cyborg.conf import CONF
@@ -59,7 +60,7 @@ def lspci_privileged():
 def get_pci_devices(pci_flags, vendor_id=None):
     device_for_vendor_out = []
     all_device_out = []
-    lspci_out = lspci_privileged()[0].split('\n')
+    lspci_out = pci_snapshot.lspci(lspci_privileged)[0].split('\n')
     for i in range(len(lspci_out)):
         if any(x in lspci_out[i] for x in pci_flags):
             all_device_out.append(lspci_out[i])
@@ -24,6 +24,7 @@ import socket
 
 from oslo_serialization import jsonutils
 
+from cyborg.accelerator.common import pci_snapshot
 from cyborg.accelerator.common import utils
 from cyborg.common import constants
 from cyborg.objects.driver_objects import driver_attach_handle
@@ -76,6 +77,9 @@ def link_real_path(p):
 # TODO(s_shogo) This function name should be reconsidered in py3
 # env( filter() in py3 returns iterator, not list)
 def find_fpgas_by_know_list():
+    snapshot = pci_snapshot.current()
+    if snapshot is not None:
+        return snapshot.paths(KNOWN_FPGAS)
     return filter(
         lambda p: (
             read_line(os.path.join(p, "vendor")),
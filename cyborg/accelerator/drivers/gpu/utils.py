@@ -24,6 +24,8 @@ import cyborg.common.exception as exception
 import cyborg.conf
 import cyborg.privsep
 
+from cyborg.accelerator.common import pci_snapshot
+
 
 LOG = logging.getLogger(__name__)
 
@@ -71,7 +73,7 @@ def remove_mdev_privileged(physical_device, mdev_type, medv_uuid):
 def get_pci_devices(pci_flags, vendor_id=None):
     device_for_vendor_out = []
     all_device_out = []
-    lspci_out = lspci_privileged()[0].split('\n')
+    lspci_out = pci_snapshot.lspci(lspci_privileged)[0].split('\n')
     for pci in lspci_out:
         if any(x in pci for x in pci_flags):
             all_device_out.append(pci)
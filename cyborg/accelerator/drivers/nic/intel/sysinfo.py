@@ -27,6 +27,7 @@ from oslo_serialization import jsonutils
 
 import cyborg.conf
 
+from cyborg.accelerator.common import pci_snapshot
 from cyborg.accelerator.common import utils
 from cyborg.objects.driver_objects import driver_attach_handle
 from cyborg.objects.driver_objects import driver_attribute
@@ -100,6 +101,9 @@ def read_line(filename):
 
 
 def find_nics_by_know_list():
+    snapshot = pci_snapshot.current()
+    if snapshot is not None:
+        return set(snapshot.paths(KNOWN_NICS))
     return set(
         filter(
             lambda p: (
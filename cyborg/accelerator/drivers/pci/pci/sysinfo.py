@@ -24,6 +24,7 @@ from oslo_serialization import jsonutils
 
 import cyborg.conf
 
+from cyborg.accelerator.common import pci_snapshot
 from cyborg.accelerator.common import utils
 from cyborg.accelerator.drivers.pci import utils as pci_utils
 from cyborg.accelerator.drivers.pci import whitelist
@@ -140,7 +141,7 @@ def _discover_pcis():
     cyborg.conf.devices.register_dynamic_opts(CONF)
     # discover pci devices by "lspci"
     pci_list = []
-    stdout, _stderr = pci_utils.get_pci_devices()
+    stdout, _stderr = pci_snapshot.lspci(pci_utils.get_pci_devices)
     LOG.info('lspci output: %s', stdout)
     # report trait,rc and generate driver object
     dev_filter = whitelist.Whitelist(CONF.pci.passthrough_whitelist)
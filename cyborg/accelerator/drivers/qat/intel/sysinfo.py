@@ -23,6 +23,7 @@ import socket
 
 from oslo_serialization import jsonutils
 
+from cyborg.accelerator.common import pci_snapshot
 from cyborg.accelerator.common import utils
 from cyborg.common import constants
 from cyborg.objects.driver_objects import driver_attach_handle
@@ -66,6 +67,9 @@ def get_link_targets(links):
 
 
 def all_qats():
+    snapshot = pci_snapshot.current()
+    if snapshot is not None:
+        return set(snapshot.paths(KNOW_QATS))
     return set(
         filter(
             lambda p: (
@@ -25,6 +25,7 @@ from oslo_serialization import jsonutils
 
 import cyborg.privsep
 
+from cyborg.accelerator.common import pci_snapshot
 from cyborg.accelerator.common import utils
 from cyborg.common import constants
 from cyborg.conf import CONF
@@ -38,6 +39,7 @@ from cyborg.objects.driver_objects import driver_device
 LOG = logging.getLogger(__name__)
 
 SSD_FLAGS = ["Non-Volatile memory controller"]
+LSPCI_FLAGS = ('-nn', '-D')
 SSD_INFO_PATTERN = re.compile(
     r"(?P<devices>[0-9a-fA-F]{4}:[0-9a-fA-F]{2}:"
     r"[0-9a-fA-F]{2}\.[0-9a-fA-F]) "
@@ -51,14 +53,15 @@ VENDOR_MAPS = utils.get_vendor_maps()
 
 @cyborg.privsep.sys_admin_pctxt.entrypoint
 def lspci_privileged():
-    cmd = ['lspci', '-nn', '-D']
+    cmd = ['lspci', *LSPCI_FLAGS]
     return processutils.execute(*cmd)
 
 
 def get_pci_devices(pci_flags, vendor_id=None):
     device_for_vendor_out = []
     all_device_out = []
-    lspci_out = lspci_privileged()[0].split('\n')
+    lspci_out = pci_snapshot.lspci(lspci_privileged, flags=LSPCI_FLAGS)
+    lspci_out = lspci_out[0].split('\n')
     for i in range(len(lspci_out)):
         if any(x in lspci_out[i] for x in pci_flags):
             all_device_out.append(lspci_out[i])
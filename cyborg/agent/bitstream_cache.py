@@ -0,0 +1,214 @@
+# Copyright 2026 The Cyborg Authors.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""A cache of the FPGA bitstreams downloaded from Glance.
+
+Programming an FPGA with the same bitstream again used to download it
+again. The bitstreams are kept on disk, named after their image and the
+hash of their content given by Glance, and the ones used least recently
+are evicted when the cache grows beyond its size. A bitstream is hashed
+as it is downloaded, one not matching its hash is neither cached nor
+programmed. Concurrent requests of a bitstream share a single download.
+"""
+
+import collections
+import contextlib
+import os
+import tempfile
+import threading
+
+from concurrent import futures
+
+from oslo_log import log as logging
+
+from cyborg.image import glance
+
+
+LOG = logging.getLogger(__name__)
+
+SUFFIX = '.gbs'
+# The suffix of the bitstreams being downloaded.
+PART_SUFFIX = '.part'
+
+
+class BitstreamCache:
+    """The bitstreams of the images last programmed.
+
+    :param image_api: the cyborg.image.api.API to download images with.
+    :param path: the directory of the cache, created on first use.
+    :param max_size: the size of the cache in bytes. When 0, the
+        bitstreams are downloaded for every use and removed after.
+    """
+
+    def __init__(self, image_api, path, max_size):
+        self._image_api = image_api
+        self._path = path
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        # The sizes of the cached bitstreams keyed by file name, the least
+        # recently used first. None until the directory is read.
+        self._entries = None
+        self._size = 0
+        # The number of users of each bitstream, which is not evicted
+        # while in use.
+        self._users = collections.Counter()
+        # The downloads in progress, keyed by file name.
+        self._downloads = {}
+
+    @contextlib.contextmanager
+    def fetch(self, context, image_id):
+        """Yield the path of the bitstream of an image.
+
+        The bitstream is downloaded unless cached already, and stays in
+        the cache until the caller is done with it.
+        """
+        if not self._max_size:
+            with self._download_uncached(context, image_id) as path:
+                yield path
+            return
+        image = self._image_api.get(context, image_id)
+        _, digest = glance.image_hasher(image)
+        if digest is None:
+            LOG.warning(
+                'Image %s has no checksum, its bitstream is not cached.',
+                image_id,
+            )
+            with self._download_uncached(context, image_id) as path:
+                yield path
+            return
+        name = '%s-%s%s' % (image_id, digest, SUFFIX)
+        self._acquire(context, image_id, name, image)
+        try:
+            yield os.path.join(self._path, name)
+        finally:
+            self._release(name)
+
+    @contextlib.contextmanager
+    def _download_uncached(self, context, image_id):
+        fd, path = tempfile.mkstemp(suffix=SUFFIX, prefix=image_id)
+        os.close(fd)
+        try:
+            self._image_api.download(context, image_id, dest_path=path)
+            yield path
+        finally:
+            LOG.debug('Remove tmp bitstream file: %s', path)
+            os.remove(path)
+
+    def _acquire(self, context, image_id, name, image):
+        """Add a user to a bitstream, downloading it if not cached."""
+        while True:
+            with self._lock:
+                self._load()
+                if name in self._entries:
+                    self._entries.move_to_end(name)
+                    self._users[name] += 1
+                    break
+                future = self._downloads.get(name)
+                downloading = future is None
+                if downloading:
+                    future = self._downloads[name] = futures.Future()
+            if not downloading:
+                # Another request downloads the bitstream, wait for it and
+                # look again.
+                future.result()
+                continue
+            try:
+                size = self._download(context, image_id, name, image)
+            except Exception as e:
+                with self._lock:
+                    del self._downloads[name]
+                future.set_exception(e)
+                raise
+            with self._lock:
+                del self._downloads[name]
+                self._entries[name] = size
+                self._size += size
+                self._users[name] += 1
+                self._evict()
+            future.set_result(None)
+            return
+        LOG.debug('Using the cached bitstream of image %s.', image_id)
+        try:
+            # The modification time orders the bitstreams on restart.
+            os.utime(os.path.join(self._path, name))
+        except OSError as e:
+            LOG.warning('Unable to touch the bitstream %s: %s', name, e)
+
+    def _release(self, name):
+        with self._lock:
+            self._users[name] -= 1
+            if not self._users[name]:
+                del self._users[name]
+            self._evict()
+
+    def _download(self, context, image_id, name, image):
+        """Download and verify a bitstream into the cache.
+
+        :returns: the size of the bitstream.
+        :raises: ImageUnacceptable if it does not match its hash.
+        """
+        LOG.info('Downloading the bitstream of image %s.', image_id)
+        fd, part = tempfile.mkstemp(suffix=PART_SUFFIX, dir=self._path)
+        os.close(fd)
+        try:
+            self._image_api.download(
+                context,
+                image_id,
+                dest_path=part,
+                image_meta=image,
+                verify=True,
+            )
+            size = os.path.getsize(part)
+            os.replace(part, os.path.join(self._path, name))
+        except Exception:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(part)
+            raise
+        return size
+
+    def _load(self):
+        """Read the bitstreams cached by a previous run, if not done yet."""
+        if self._entries is not None:
+            return
+        os.makedirs(self._path, exist_ok=True)
+        found = []
+        for entry in os.scandir(self._path):
+            if entry.name.endswith(PART_SUFFIX):
+                # Left by an interrupted download.
+                os.remove(entry.path)
+            elif entry.name.endswith(SUFFIX) and entry.is_file():
+                st = entry.stat()
+                found.append((st.st_mtime, entry.name, st.st_size))
+        self._entries = collections.OrderedDict(
+            (name, size) for _, name, size in sorted(found)
+        )
+        self._size = sum(self._entries.values())
+        self._evict()
+
+    def _evict(self):
+        """Evict the bitstreams least recently used and not in use until
+        the cache fits in its size.
+        """
+        for name in list(self._entries):
+            if self._size <= self._max_size:
+                return
+            if self._users[name]:
+                continue
+            LOG.debug('Evicting the bitstream %s.', name)
+            try:
+                os.remove(os.path.join(self._path, name))
+            except FileNotFoundError:
+                pass
+            self._size -= self._entries.pop(name)
@@ -0,0 +1,192 @@
+# Copyright 2026 The Cyborg Authors.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Watch the kernel uevents of PCI devices and mediated devices.
+
+The agent otherwise only learns of a hot plugged device, a created VF or
+a created mdev on its next periodic update. The DeviceWatcher reads the
+uevents the kernel broadcasts on the NETLINK_KOBJECT_UEVENT socket, the
+same ones udev reads, and calls back with the PCI addresses of the
+devices that changed. Events are coalesced for a debounce period, so that
+creating 64 VFs results in a single call.
+
+The event source is pluggable: FakeEventSource is fed by hand, which lets
+the watcher be exercised without root or real devices.
+"""
+
+import collections
+import queue
+import re
+import select
+import socket
+import threading
+import time
+
+from oslo_log import log as logging
+
+
+LOG = logging.getLogger(__name__)
+
+NETLINK_KOBJECT_UEVENT = 15
+# The multicast group of the uevents sent by the kernel, as opposed to the
+# ones udev sends once it processed them.
+KERNEL_UEVENT_GROUP = 1
+
+SUBSYSTEMS = ('pci', 'mdev')
+_BDF_REGEX = re.compile(
+    r"^[a-fA-F\d]{4}:[a-fA-F\d]{2}:[a-fA-F\d]{2}\.[a-fA-F\d]$"
+)
+
+DeviceEvent = collections.namedtuple(
+    'DeviceEvent', ['action', 'subsystem', 'devpath', 'address']
+)
+
+
+def parse_uevent(data):
+    """Return the DeviceEvent of a kernel uevent, or None.
+
+    A kernel uevent is a header followed by NUL separated properties, e.g.
+    ``add@/devices/...\\0ACTION=add\\0DEVPATH=/devices/...\\0SUBSYSTEM=pci``.
+    Only the events of PCI devices and mdevs are returned; the address of
+    an mdev event is the one of its parent PCI device.
+    """
+    fields = data.decode('utf-8', 'replace').split('\0')
+    props = dict(field.split('=', 1) for field in fields[1:] if '=' in field)
+    subsystem = props.get('SUBSYSTEM')
+    if subsystem not in SUBSYSTEMS:
+        return None
+    devpath = props.get('DEVPATH', '')
+    address = props.get('PCI_SLOT_NAME')
+    if address is None:
+        parents = [p for p in devpath.split('/') if _BDF_REGEX.match(p)]
+        if not parents:
+            return None
+        address = parents[-1]
+    return DeviceEvent(props.get('ACTION'), subsystem, devpath, address)
+
+
+class NetlinkEventSource:
+    """The uevents of the kernel, read from a netlink socket."""
+
+    def __init__(self):
+        self._sock = socket.socket(
+            socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_KOBJECT_UEVENT
+        )
+        self._sock.bind((0, KERNEL_UEVENT_GROUP))
+        self._sock.setblocking(False)
+
+    def read(self, timeout):
+        """Return the events received within a timeout, in seconds."""
+        readable, _, _ = select.select([self._sock], [], [], timeout)
+        events = []
+        while readable:
+            try:
+                data = self._sock.recv(65536)
+            except BlockingIOError:
+                break
+            event = parse_uevent(data)
+            if event is not None:
+                events.append(event)
+        return events
+
+    def close(self):
+        self._sock.close()
+
+
+class FakeEventSource:
+    """An event source fed by hand, for tests."""
+
+    def __init__(self):
+        self._queue = queue.Queue()
+
+    def push(self, *events):
+        for event in events:
+            self._queue.put(event)
+
+    def read(self, timeout):
+        try:
+            events = [self._queue.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        while True:
+            try:
+                events.append(self._queue.get_nowait())
+            except queue.Empty:
+                return events
+
+    def close(self):
+        pass
+
+
+class DeviceWatcher:
+    """Call back with the addresses of the devices that changed.
+
+    :param source: the event source, e.g. a NetlinkEventSource.
+    :param callback: called with the set of the PCI addresses whose events
+        were received during a debounce period.
+    :param debounce: seconds the events following a first one are waited
+        for before calling back.
+    """
+
+    # Seconds between checks that the watcher is stopped.
+    POLL_INTERVAL = 1.0
+
+    def __init__(self, source, callback, debounce=1.0):
+        self._source = source
+        self._callback = callback
+        self._debounce = debounce
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._run, name='device-watcher', daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._source.close()
+
+    def _run(self):
+        pending = set()
+        deadline = None
+        while not self._stopped.is_set():
+            timeout = self.POLL_INTERVAL
+            if deadline is not None:
+                timeout = max(0, min(timeout, deadline - time.monotonic()))
+            try:
+                events = self._source.read(timeout)
+            except Exception:
+                LOG.exception('Unable to read device events.')
+                self._stopped.wait(self.POLL_INTERVAL)
+                continue
+            for event in events:
+                LOG.debug('Device event: %s', event)
+                pending.add(event.address)
+                if deadline is None:
+                    deadline = time.monotonic() + self._debounce
+            if deadline is not None and time.monotonic() >= deadline:
+                addresses, pending, deadline = pending, set(), None
+                try:
+                    self._callback(addresses)
+                except Exception:
+                    LOG.exception(
+                        'Unable to update the devices at %s.',
+                        sorted(addresses),
+                    )
@@ -11,8 +11,6 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
-import os
-import tempfile
 import time
 import urllib.parse
 
@@ -21,10 +19,14 @@ import oslo_messaging as messaging
 from keystoneauth1 import exceptions as ks_exc
 from oslo_log import log as logging
 from oslo_service import periodic_task
+from oslo_utils import units
 from oslo_utils import uuidutils
 
+from cyborg import context as cyborg_context
 from cyborg.accelerator.drivers.fpga.base import FPGADriver
 from cyborg.accelerator.drivers.gpu import utils as gpu_utils
+from cyborg.agent import bitstream_cache
+from cyborg.agent import device_watcher
 from cyborg.agent.resource_tracker import ResourceTracker
 from cyborg.agent.rpcapi import AgentAPI
 from cyborg.common import exception
@@ -95,11 +97,41 @@ class AgentManager(periodic_task.PeriodicTasks):
         self.cond_api = cond_api.ConductorAPI()
         self.agent_api = AgentAPI()
         self.image_api = ImageAPI()
+        self.bitstream_cache = bitstream_cache.BitstreamCache(
+            self.image_api,
+            CONF.agent.bitstream_cache_dir,
+            CONF.agent.bitstream_cache_size * units.Mi,
+        )
         self._rt = ResourceTracker(self.resource_provider_name, self.cond_api)
+        self._device_watcher = None
+        self._last_full_update = None
 
     def init_host(self):
         """Hook called by RPCService.start() after the RPC server is up."""
-        pass
+        if CONF.agent.watch_device_events:
+            self._start_device_watcher()
+
+    def _start_device_watcher(self, source=None):
+        try:
+            source = source or device_watcher.NetlinkEventSource()
+        except OSError as e:
+            LOG.warning(
+                'Unable to watch device events, resources are only '
+                'updated periodically: %s',
+                e,
+            )
+            return
+        self._device_watcher = device_watcher.DeviceWatcher(
+            source,
+            self._update_changed_devices,
+            debounce=CONF.agent.device_event_debounce,
+        )
+        self._device_watcher.start()
+        LOG.info('Watching device events.')
+
+    def _update_changed_devices(self, addresses):
+        LOG.info('Updating the resources of devices %s.', sorted(addresses))
+        self._rt.update_usage(cyborg_context.get_admin_context(), addresses)
 
     def _get_resource_provider_name(self):
         """Determine the correct resource provider name by querying Placement.
@@ -173,25 +205,26 @@ class AgentManager(periodic_task.PeriodicTasks):
         bitstream_uuid = str(bitstream_uuid)
         if not uuidutils.is_uuid_like(bitstream_uuid):
             raise exception.InvalidUUID(uuid=bitstream_uuid)
-        download_path = tempfile.NamedTemporaryFile(
-            suffix=".gbs", prefix=bitstream_uuid
-        )
-        self.image_api.download(
-            context, bitstream_uuid, dest_path=download_path.name
-        )
-        try:
+        with self.bitstream_cache.fetch(context, bitstream_uuid) as path:
             driver = self.fpga_driver.create(driver_name)
-            ret = driver.program(controlpath_id, download_path.name)
+            ret = driver.program(controlpath_id, path)
             LOG.info('Driver program() API returned %s', ret)
-        finally:
-            LOG.debug('Remove tmp bitstream file: %s', download_path.name)
-            os.remove(download_path.name)
         return ret
 
     @periodic_task.periodic_task(run_immediately=True)
     def update_available_resource(self, context, startup=True):
         """Update all kinds of accelerator resources from their drivers."""
+        # Device events keep the resources up to date, so only reconcile
+        # them every now and then.
+        if (
+            self._device_watcher is not None
+            and self._last_full_update is not None
+            and time.monotonic() - self._last_full_update
+            < CONF.agent.device_reconcile_interval
+        ):
+            return
         self._rt.update_usage(context)
+        self._last_full_update = time.monotonic()
 
     def create_vgpu_mdev(self, context, pci_addr, asked_type, ah_uuid):
         LOG.debug('Instantiate a mediated device')
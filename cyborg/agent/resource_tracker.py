@@ -19,10 +19,17 @@ conductor with useful information about availability through the accelerator
 model.
 """
 
+import functools
+import time
+
+from concurrent import futures
+
 from oslo_log import log as logging
+from oslo_serialization import jsonutils
 from stevedore import driver
 from stevedore.extension import ExtensionManager
 
+from cyborg.accelerator.common import pci_snapshot
 from cyborg.common import exception
 from cyborg.common import utils
 from cyborg.conf import CONF
@@ -33,6 +40,15 @@ LOG = logging.getLogger(__name__)
 AGENT_RESOURCE_SEMAPHORE = "agent_resources"
 
 
+def _pci_address(info):
+    """Return the PCI address in a cpid_info or attach_info, or None."""
+    try:
+        bdf = jsonutils.loads(info)
+        return '%(domain)s:%(bus)s:%(device)s.%(function)s' % bdf
+    except (TypeError, ValueError, KeyError):
+        return None
+
+
 class ResourceTracker:
     """Agent helper class for keeping track of resource usage as instances
     are built and destroyed.
@@ -42,6 +58,21 @@ class ResourceTracker:
         self.host = host
         self.conductor_api = cond_api
         self.acc_drivers = []
+        # The enabled driver names, keyed by driver.
+        self._driver_names = {}
+        # Discoveries still running, and the devices last discovered, keyed
+        # by driver.
+        self._discoveries = {}
+        self._discovered = {}
+        # Latency and state of the last discovery of each driver, keyed by
+        # driver name.
+        self.discovery_metrics = {}
+        self._discovery_executor = futures.ThreadPoolExecutor(
+            max_workers=CONF.agent.discovery_workers
+        )
+        # Fingerprints of the devices last accepted by the conductor, keyed
+        # by cpid_info. None means the next report must be a full one.
+        self._reported_fingerprints = None
         self._initialize_drivers()
 
     def _initialize_drivers(self, enabled_drivers=None):
@@ -50,6 +81,7 @@ class ResourceTracker:
         :return: [nvidia_gpu_driver_obj, intel_fpga_driver_obj]
         """
         acc_drivers = []
+        driver_names = {}
         if not enabled_drivers:
             enabled_drivers = CONF.agent.enabled_drivers
         valid_drivers = ExtensionManager(
@@ -64,17 +96,170 @@ class ResourceTracker:
                 invoke_on_load=True,
             ).driver
             acc_drivers.append(acc_driver)
+            driver_names[acc_driver] = d
         self.acc_drivers = acc_drivers
+        self._driver_names = driver_names
 
     @utils.synchronized(AGENT_RESOURCE_SEMAPHORE)
-    def update_usage(self, context):
-        """Update the resource usage periodically."""
-        acc_list = []
-        for acc_driver in self.acc_drivers:
-            acc_list.extend(acc_driver.discover())
-        # Call conductor_api here to diff and report acc data. Now, we actually
-        # do not have the method report_data.
+    def update_usage(self, context, addresses=None):
+        """Update the resource usage periodically.
+
+        :param addresses: the PCI addresses of the devices known to have
+            changed. Only the drivers of these devices discover again, the
+            devices of the other drivers are reported as last discovered.
+            All drivers discover when not given.
+        """
+        acc_drivers = None
+        if addresses is not None:
+            acc_drivers = self._drivers_of(addresses)
+        # The drivers share one lspci run and one read of sysfs.
+        with pci_snapshot.use(pci_snapshot.PciSnapshot()):
+            acc_list = self._discover(acc_drivers)
+        if acc_list is None:
+            return
+        fingerprints = {
+            acc.controlpath_id.cpid_info: acc.fingerprint() for acc in acc_list
+        }
+        # Call conductor_api here to diff and report acc data.
         try:
-            self.conductor_api.report_data(context, self.host, acc_list)
+            self._report(context, acc_list, fingerprints)
         except exception.PlacementResourceProviderNotFound as e:
+            self._reported_fingerprints = None
             LOG.error('Unable to report usage: %s', e)
+        except Exception:
+            self._reported_fingerprints = None
+            raise
+
+    def _driver_name(self, acc_driver):
+        return self._driver_names.get(acc_driver, type(acc_driver).__name__)
+
+    def _drivers_of(self, addresses):
+        """Return the drivers of the devices at some PCI addresses.
+
+        The addresses of a driver are those of the control paths and attach
+        handles it last discovered. An unknown address may be a new device
+        of any driver, so all drivers are returned for it.
+        """
+        owners = {}
+        for acc_driver, acc_list in self._discovered.items():
+            for acc in acc_list:
+                infos = [acc.controlpath_id.cpid_info]
+                for dep in acc.deployable_list or []:
+                    infos.extend(
+                        ah.attach_info for ah in dep.attach_handle_list or []
+                    )
+                for info in infos:
+                    address = _pci_address(info)
+                    if address:
+                        owners[address] = acc_driver
+        acc_drivers = set()
+        for address in addresses:
+            if address not in owners:
+                return list(self.acc_drivers)
+            acc_drivers.add(owners[address])
+        return [d for d in self.acc_drivers if d in acc_drivers]
+
+    def _discover(self, acc_drivers=None):
+        """Discover the devices of the drivers concurrently.
+
+        A driver whose discovery does not finish within
+        CONF.agent.discovery_timeout has its last discovered devices
+        reported again, while its discovery goes on in the background.
+
+        :param acc_drivers: the drivers to discover, all by default. The
+            other drivers report their last discovered devices, unless
+            they never discovered any.
+        :return: the list of driver device objs, or None if a driver timed
+            out before it ever discovered its devices.
+        """
+        if acc_drivers is None:
+            acc_drivers = self.acc_drivers
+        acc_drivers = [
+            d
+            for d in self.acc_drivers
+            if d in acc_drivers or d not in self._discovered
+        ]
+        for acc_driver in acc_drivers:
+            future = self._discoveries.get(acc_driver)
+            if future is None or future.done():
+                self._discoveries[acc_driver] = self._spawn_discovery(
+                    acc_driver
+                )
+        futures.wait(
+            [self._discoveries[d] for d in acc_drivers],
+            timeout=CONF.agent.discovery_timeout or None,
+        )
+        acc_list = []
+        for acc_driver in self.acc_drivers:
+            if acc_driver not in acc_drivers:
+                acc_list.extend(self._discovered[acc_driver])
+                continue
+            name = self._driver_name(acc_driver)
+            metrics = self.discovery_metrics.setdefault(name, {})
+            future = self._discoveries[acc_driver]
+            if future.done():
+                del self._discoveries[acc_driver]
+                acc_list.extend(future.result())
+                metrics['stale'] = False
+                continue
+            metrics['stale'] = True
+            metrics['timeouts'] = metrics.get('timeouts', 0) + 1
+            if acc_driver not in self._discovered:
+                LOG.warning(
+                    'Discovery of %s did not finish in %s seconds, '
+                    'skipping this resource update.',
+                    name,
+                    CONF.agent.discovery_timeout,
+                )
+                return None
+            LOG.warning(
+                'Discovery of %s did not finish in %s seconds, reporting '
+                'its devices as last discovered.',
+                name,
+                CONF.agent.discovery_timeout,
+            )
+            acc_list.extend(self._discovered[acc_driver])
+        return acc_list
+
+    def _spawn_discovery(self, acc_driver):
+        future = self._discovery_executor.submit(acc_driver.discover)
+        future.add_done_callback(
+            functools.partial(
+                self._discovery_done, acc_driver, time.monotonic()
+            )
+        )
+        return future
+
+    def _discovery_done(self, acc_driver, start, future):
+        name = self._driver_name(acc_driver)
+        latency = time.monotonic() - start
+        metrics = self.discovery_metrics.setdefault(name, {})
+        metrics['latency'] = latency
+        if future.exception() is None:
+            self._discovered[acc_driver] = future.result()
+            metrics['devices'] = len(self._discovered[acc_driver])
+        else:
+            metrics['errors'] = metrics.get('errors', 0) + 1
+        LOG.debug('Discovery of %s took %.3f seconds.', name, latency)
+
+    def _report(self, context, acc_list, fingerprints):
+        """Report only the devices changed since the last accepted report,
+        or all of them if the conductor lacks a baseline for this host.
+        """
+        reported = self._reported_fingerprints
+        if reported is not None:
+            changed = [
+                acc
+                for acc in acc_list
+                if reported.get(acc.controlpath_id.cpid_info)
+                != fingerprints[acc.controlpath_id.cpid_info]
+            ]
+            if self.conductor_api.report_data_delta(
+                context, self.host, fingerprints, changed
+            ):
+                self._reported_fingerprints = fingerprints
+                return
+            LOG.info('Conductor requested a full report of host devices.')
+        self._reported_fingerprints = None
+        self.conductor_api.report_data(context, self.host, acc_list)
+        self._reported_fingerprints = fingerprints
@@ -97,6 +97,9 @@ class ARQCollection(base.APIBase):
     arqs = [ARQ]
     """A list containing arq objects"""
 
+    next = wtypes.text
+    """A link to retrieve the next page of arqs, if any"""
+
     @classmethod
     def convert_with_links(cls, obj_arqs):
         collection = cls()
@@ -206,10 +209,14 @@ class ARQsController(base.CyborgController):
                 obj_arq = objects.ARQ(context, **arq_fields)
                 extarq_fields = {'arq': obj_arq}
                 obj_extarq = objects.ExtARQ(context, **extarq_fields)
-                new_extarq = pecan.request.conductor_api.arq_create(
-                    context, obj_extarq, devprof.id
-                )
-                extarq_list.append(new_extarq)
+                extarq_list.append(obj_extarq)
+
+        # Create the ARQs of all groups with one RPC call and in one DB
+        # transaction, instead of one round trip per accelerator.
+        if extarq_list:
+            extarq_list = pecan.request.conductor_api.arq_create_bulk(
+                context, extarq_list, devprof.id
+            )
 
         ret = ARQCollection.convert_with_links(
             [extarq.arq for extarq in extarq_list]
@@ -226,9 +233,21 @@ class ARQsController(base.CyborgController):
         return ARQ.convert_with_links(extarq.arq)
 
     @authorize_wsgi.authorize_wsgi("cyborg:arq", "get_all")
-    @expose.expose(ARQCollection, wtypes.text, types.uuid)
-    def get_all(self, bind_state=None, instance=None):
-        """Retrieve a list of arqs."""
+    @expose.expose(
+        ARQCollection,
+        wtypes.text,
+        types.uuid,
+        wtypes.IntegerType(),
+        types.uuid,
+    )
+    def get_all(self, bind_state=None, instance=None, limit=None, marker=None):
+        """Retrieve a list of arqs.
+
+        :param bind_state: only 'resolved' is supported.
+        :param instance: UUID of the instance whose arqs are listed.
+        :param limit: maximum number of arqs to return. (API v2.4+)
+        :param marker: UUID of the last arq of the previous page. (API v2.4+)
+        """
         # TODO(Sundar) Need to implement 'arq=uuid1,...' query parameter
         LOG.info(
             '[arqs] get_all. bind_state:(%s), instance:(%s)',
@@ -236,37 +255,57 @@ class ARQsController(base.CyborgController):
             instance or '',
         )
         context = pecan.request.context
-        extarqs = objects.ExtARQ.list(context)
+        limit = utils.get_limit(limit, marker)
+        page = {} if limit is None else {'limit': limit, 'marker': marker}
         state_map = constants.ARQ_BIND_STATES_STATUS_MAP
         valid_bind_states = list(state_map.keys())
-        arqs = [extarq.arq for extarq in extarqs]
-        # TODO(Sundar): Optimize by doing the filtering in the db layer
-        # Apply instance filter before state filter.
         if bind_state and bind_state != 'resolved':
             raise exception.ARQBadState(
                 state=bind_state, uuid=None, expected=['resolved']
             )
-        if instance:
-            new_arqs = [
-                arq for arq in arqs if arq['instance_uuid'] == instance
-            ]
-            arqs = new_arqs
-            if bind_state:
-                for arq in new_arqs:
-                    if arq['state'] not in valid_bind_states:
-                        # NOTE(Sundar) This should return HTTP code 423
-                        # if any ARQ for this instance is not resolved.
-                        LOG.warning(
-                            'Some of ARQs for instance %s is not resolved',
-                            instance,
-                        )
-                        return wsme.api.Response(
-                            None, status_code=HTTPStatus.LOCKED
-                        )
+        # Apply instance filter before state filter.
+        if instance and bind_state:
+            # The whole instance is checked, not just the page asked.
+            extarqs = objects.ExtARQ.list(context, instance_uuid=instance)
+            arqs = [extarq.arq for extarq in extarqs]
+            for arq in arqs:
+                if arq['state'] not in valid_bind_states:
+                    # NOTE(Sundar) This should return HTTP code 423
+                    # if any ARQ for this instance is not resolved.
+                    LOG.warning(
+                        'Some of ARQs for instance %s is not resolved',
+                        instance,
+                    )
+                    return wsme.api.Response(
+                        None, status_code=HTTPStatus.LOCKED
+                    )
+            if page:
+                extarqs = objects.ExtARQ.list(
+                    context, instance_uuid=instance, **page
+                )
+                arqs = [extarq.arq for extarq in extarqs]
+        elif instance:
+            extarqs = objects.ExtARQ.list(
+                context, instance_uuid=instance, **page
+            )
+            arqs = [extarq.arq for extarq in extarqs]
         elif bind_state:
-            arqs = [arq for arq in arqs if arq['state'] in valid_bind_states]
+            extarqs = objects.ExtARQ.list(
+                context, state=valid_bind_states, **page
+            )
+            arqs = [extarq.arq for extarq in extarqs]
+        else:
+            extarqs = objects.ExtARQ.list(context, **page)
+            arqs = [extarq.arq for extarq in extarqs]
 
         ret = ARQCollection.convert_with_links(arqs)
+        ret.next = utils.get_next_link(
+            'accelerator_requests',
+            arqs,
+            limit,
+            bind_state=bind_state,
+            instance=instance,
+        )
         LOG.info('[arqs:get_all] Returned: %s', ret)
         return ret
 
@@ -378,12 +417,9 @@ class ARQsController(base.CyborgController):
     def _check_if_already_bound(context, valid_fields):
         patch_fields = list(valid_fields.values())[0]
         instance_uuid = patch_fields['instance_uuid']
-        extarqs = objects.ExtARQ.list(context)
-        extarqs_for_instance = [
-            extarq
-            for extarq in extarqs
-            if extarq.arq['instance_uuid'] == instance_uuid
-        ]
+        extarqs_for_instance = objects.ExtARQ.list(
+            context, instance_uuid=instance_uuid, limit=1
+        )
         if extarqs_for_instance:  # duplicate binding request
             msg = _(
                 'Instance {} already has accelerator requests. '
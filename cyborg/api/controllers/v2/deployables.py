@@ -25,6 +25,7 @@ from cyborg.api import expose
 from cyborg.api.controllers import base
 from cyborg.api.controllers import link
 from cyborg.api.controllers import types
+from cyborg.api.controllers.v2 import utils
 from cyborg.common import authorize_wsgi
 from cyborg.common import exception as exc
 
@@ -103,6 +104,9 @@ class DeployableCollection(Deployable):
     deployables = [Deployable]
     """A list containing deployable objects"""
 
+    next = wtypes.text
+    """A link to retrieve the next page of deployables, if any"""
+
     def convert_with_links(self, obj_deps):
         collection = DeployableCollection()
         collection.deployables = [
@@ -182,16 +186,33 @@ class DeployablesController(base.CyborgController, DeployableCollection):
         return self.convert_with_link(obj_dep)
 
     @authorize_wsgi.authorize_wsgi("cyborg:deployable", "get_all")
-    @expose.expose(DeployableCollection, wtypes.ArrayType(types.FilterType))
-    def get_all(self, filters=None):
+    @expose.expose(
+        DeployableCollection,
+        wtypes.ArrayType(types.FilterType),
+        wtypes.IntegerType(),
+        types.uuid,
+    )
+    def get_all(self, filters=None, limit=None, marker=None):
         """Retrieve a list of deployables.
         :param filters: a filter of FilterType to get deployables list by
         filter.
+        :param limit: maximum number of deployables to return. (API v2.4+)
+        :param marker: UUID of the last deployable of the previous page.
+        (API v2.4+)
         """
+        context = pecan.request.context
+        limit = utils.get_limit(limit, marker)
         filters_dict = {}
         if filters:
             for filter in filters:
                 filters_dict.update(filter.as_dict())
-        context = pecan.request.context
+        if limit is not None:
+            filters_dict['limit'] = limit
+        if marker is not None:
+            filters_dict['marker_obj'] = objects.Deployable.get(
+                context, marker
+            )
         obj_deps = objects.Deployable.list(context, filters=filters_dict)
-        return self.convert_with_links(obj_deps)
+        ret = self.convert_with_links(obj_deps)
+        ret.next = utils.get_next_link('deployables', obj_deps, limit)
+        return ret
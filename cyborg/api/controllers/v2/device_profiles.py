@@ -48,6 +48,7 @@ from cyborg.api import expose
 from cyborg.api.controllers import base
 from cyborg.api.controllers import link
 from cyborg.api.controllers import types
+from cyborg.api.controllers.v2 import utils
 from cyborg.api.controllers.v2 import versions
 from cyborg.common import authorize_wsgi
 from cyborg.common import constants
@@ -122,6 +123,9 @@ class DeviceProfileCollection(DeviceProfile):
     """A list containing device profile objects"""
     device_profiles = [DeviceProfile]
 
+    next = wtypes.text
+    """A link to retrieve the next page of device profiles, if any"""
+
     @classmethod
     def convert_with_links(cls, obj_devprofs):
         collection = cls()
@@ -265,17 +269,41 @@ class DeviceProfilesController(base.CyborgController, DeviceProfileCollection):
         return obj_devprofs
 
     @authorize_wsgi.authorize_wsgi("cyborg:device_profile", "get_all")
-    @expose.expose(DeviceProfileCollection, wtypes.text)
-    def get_all(self, name=None):
-        """Retrieve a list of device profiles."""
+    @expose.expose(
+        DeviceProfileCollection, wtypes.text, wtypes.IntegerType(), types.uuid
+    )
+    def get_all(self, name=None, limit=None, marker=None):
+        """Retrieve a list of device profiles.
+
+        :param name: comma separated names of the device profiles to list.
+        :param limit: maximum number of device profiles to return.
+            (API v2.4+)
+        :param marker: UUID of the last device profile of the previous page.
+            (API v2.4+)
+        """
         if name is not None:
             names = name.split(',')
         else:
             names = []
         LOG.info('[device_profiles] get_all. names=%s', names)
-        api_obj_devprofs = self._get_device_profile_list(names)
+        limit = utils.get_limit(limit, marker)
+        if limit is None:
+            api_obj_devprofs = self._get_device_profile_list(names)
+        else:
+            context = pecan.request.context
+            filters = {'limit': limit}
+            if names:
+                filters['name'] = names
+            if marker is not None:
+                filters['marker_obj'] = objects.DeviceProfile.get_by_uuid(
+                    context, marker
+                )
+            api_obj_devprofs = objects.DeviceProfile.list(context, filters)
 
         ret = DeviceProfileCollection.convert_with_links(api_obj_devprofs)
+        ret.next = utils.get_next_link(
+            'device_profiles', api_obj_devprofs, limit, name=name
+        )
         LOG.info('[device_profiles] get_all returned: %s', ret)
         return ret
 
@@ -28,6 +28,7 @@ from cyborg.api import expose
 from cyborg.api.controllers import base
 from cyborg.api.controllers import link
 from cyborg.api.controllers import types
+from cyborg.api.controllers.v2 import utils
 from cyborg.api.controllers.v2 import versions
 from cyborg.common import authorize_wsgi
 from cyborg.common import placement_client
@@ -97,6 +98,9 @@ class DeviceCollection(base.APIBase):
     devices = [Device]
     """A list containing Device objects"""
 
+    next = wtypes.text
+    """A link to retrieve the next page of devices, if any"""
+
     @classmethod
     def convert_with_links(cls, devices):
         collection = cls()
@@ -128,15 +132,30 @@ class DevicesController(base.CyborgController):
         wtypes.text,
         wtypes.text,
         wtypes.ArrayType(types.FilterType),
+        wtypes.IntegerType(),
+        types.uuid,
     )
-    def get_all(self, type=None, vendor=None, hostname=None, filters=None):
+    def get_all(
+        self,
+        type=None,
+        vendor=None,
+        hostname=None,
+        filters=None,
+        limit=None,
+        marker=None,
+    ):
         """Retrieve a list of devices.
         :param type: type of a device.
         :param vendor: vendor ID of a device.
         :param hostname: the hostname of a compute node where the device
         locates.
         :param filters: a filter of FilterType to get device list by filter.
+        :param limit: maximum number of devices to return. (API v2.4+)
+        :param marker: UUID of the last device of the previous page.
+        (API v2.4+)
         """
+        context = pecan.request.context
+        limit = utils.get_limit(limit, marker)
         filters_dict = {}
         if type:
             filters_dict["type"] = type
@@ -147,10 +166,22 @@ class DevicesController(base.CyborgController):
         if filters:
             for filter in filters:
                 filters_dict.update(filter.as_dict())
-        context = pecan.request.context
+        if limit is not None:
+            filters_dict['limit'] = limit
+        if marker is not None:
+            filters_dict['marker_obj'] = objects.Device.get(context, marker)
         obj_devices = objects.Device.list(context, filters=filters_dict)
         LOG.info('[devices:get_all] Returned: %s', obj_devices)
-        return DeviceCollection.convert_with_links(obj_devices)
+        ret = DeviceCollection.convert_with_links(obj_devices)
+        ret.next = utils.get_next_link(
+            'devices',
+            obj_devices,
+            limit,
+            type=type,
+            vendor=vendor,
+            hostname=hostname,
+        )
+        return ret
 
     @authorize_wsgi.authorize_wsgi("cyborg:device", "disable")
     @expose.expose(None, wtypes.text, types.uuid, status_code=HTTPStatus.OK)
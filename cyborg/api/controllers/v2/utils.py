@@ -13,10 +13,69 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from urllib import parse
+
+from wsme import types as wtypes
+
 from cyborg import api
+from cyborg.api.controllers import link
 from cyborg.api.controllers.v2 import versions
+from cyborg.common import exception
+from cyborg.common.i18n import _
+from cyborg.conf import CONF
 
 
 def allow_project_id():
     # v2.1 added project_id for arq patch
     return api.request.version.minor >= versions.MINOR_1_PROJECT_ID
+
+
+def allow_pagination():
+    # v2.4 added limit and marker for the list APIs
+    return api.request.version.minor >= versions.MINOR_4_PAGINATION
+
+
+def get_limit(limit, marker):
+    """Validate the pagination parameters of a list request.
+
+    :param limit: the requested page size, if any.
+    :param marker: the UUID of the last item of the previous page, if any.
+    :returns: the page size to use, or None if the requested microversion
+        does not support pagination.
+    """
+    if not allow_pagination():
+        if limit is not None or marker is not None:
+            raise exception.NotAcceptable(
+                _(
+                    "Request not acceptable. The minimal required API "
+                    "version should be %(base)s.%(opr)s"
+                )
+                % {
+                    'base': versions.BASE_VERSION,
+                    'opr': versions.MINOR_4_PAGINATION,
+                }
+            )
+        return None
+    if limit is None:
+        return CONF.api.max_limit
+    if limit <= 0:
+        raise exception.InvalidParameterValue(
+            err=_("Limit must be positive, got %s") % limit
+        )
+    return min(limit, CONF.api.max_limit)
+
+
+def get_next_link(resource, items, limit, **params):
+    """Return the link to the page after items, or Unset if it is the last.
+
+    :param resource: the name of the collection resource.
+    :param items: the items of the current page, they must have a uuid.
+    :param limit: the page size used to get items.
+    :param params: other query parameters to keep in the link.
+    """
+    if limit is None or len(items) < limit:
+        return wtypes.Unset
+    query = {k: v for k, v in params.items() if v is not None}
+    query['limit'] = limit
+    query['marker'] = items[-1].uuid
+    return link.build_url(resource, '?' + parse.urlencode(query))
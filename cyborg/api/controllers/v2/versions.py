@@ -29,10 +29,12 @@ BASE_VERSION = 2
 # v2.1: Add project_id for arq patch
 # v2.2: Support getting device profile by name (newly introduced) and uuid.
 # v2.3: Add status info for device API.
+# v2.4: Add limit and marker pagination to the list APIs.
 MINOR_0_INITIAL_VERSION = 0
 MINOR_1_PROJECT_ID = 1
 MINOR_2_DP_BY_NAME = 2
 MINOR_3_DEVICE_STATUS = 3
+MINOR_4_PAGINATION = 4
 
 # When adding another version, update:
 # - MINOR_MAX_VERSION
@@ -40,7 +42,7 @@ MINOR_3_DEVICE_STATUS = 3
 #   explanation of what changed in the new version
 
 
-MINOR_MAX_VERSION = MINOR_3_DEVICE_STATUS
+MINOR_MAX_VERSION = MINOR_4_PAGINATION
 
 # String representations of the minor and maximum versions
 _MIN_VERSION_STRING = '{}.{}'.format(BASE_VERSION, MINOR_0_INITIAL_VERSION)
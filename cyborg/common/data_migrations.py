@@ -38,7 +38,7 @@ def _get_nova_adapter():
     # NOTE(sean-k-mooney): Pass ``microversion=`` on each Nova request rather
     # than setting ``default_microversion`` on the adapter so every call's
     # contract is explicit. Extend this pattern to other Nova callers.
-    return utils.get_sdk_adapter('compute')
+    return utils.get_shared_sdk_adapter('compute')
 
 
 def heal_arq_project_ids():
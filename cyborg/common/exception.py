@@ -327,6 +327,10 @@ class PlacementServerError(CyborgException):
     _msg_fmt = _("Placement Server has some error at this time.")
 
 
+class NovaServerError(CyborgException):
+    _msg_fmt = _("Nova Server has some error at this time.")
+
+
 class PlacementAPIConflict(CyborgException):
     """Any 409 error from placement APIs should use (a subclass of) this
     exception.
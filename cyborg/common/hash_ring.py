@@ -0,0 +1,93 @@
+# Copyright 2026 The Cyborg Authors.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Partition the compute hosts between the conductors alive.
+
+Each conductor is placed at many points of a ring of hashes, and a host
+belongs to the conductor found first on the ring after the hash of its
+name. When a conductor joins or leaves, only the hosts next to its points
+move, about 1/N of them, so that the other conductors keep their hosts
+and what they cached about them.
+"""
+
+import bisect
+import hashlib
+import threading
+
+from oslo_log import log as logging
+
+from cyborg import context
+from cyborg.conf import CONF
+from cyborg.db import api as dbapi
+
+
+LOG = logging.getLogger(__name__)
+
+# The points of each conductor on the ring. The more points, the more even
+# the share of the hosts of each conductor.
+REPLICAS = 64
+
+
+def _hash(key):
+    digest = hashlib.md5(key.encode('utf-8'), usedforsecurity=False).digest()
+    return int.from_bytes(digest[:8], 'big')
+
+
+class HashRing:
+    """A consistent hash ring of nodes."""
+
+    def __init__(self, nodes, replicas=REPLICAS):
+        self.nodes = frozenset(nodes)
+        ring = sorted(
+            (_hash('%s-%d' % (node, i)), node)
+            for node in self.nodes
+            for i in range(replicas)
+        )
+        self._hashes = [h for h, _ in ring]
+        self._nodes = [node for _, node in ring]
+
+    def get_node(self, key):
+        """Return the node of a key, or None if the ring is empty."""
+        if not self._hashes:
+            return None
+        index = bisect.bisect(self._hashes, _hash(key))
+        return self._nodes[index % len(self._nodes)]
+
+
+class HashRingManager:
+    """The ring of the conductors whose heartbeat is recent.
+
+    The ring is read from the database when first needed after a reset.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ring = None
+
+    @property
+    def ring(self):
+        with self._lock:
+            if self._ring is None:
+                conductors = dbapi.get_instance().conductor_list_alive(
+                    context.get_admin_context(),
+                    CONF.conductor_heartbeat_timeout,
+                )
+                LOG.debug('Conductors alive: %s', conductors)
+                self._ring = HashRing(conductors)
+            return self._ring
+
+    def reset(self):
+        with self._lock:
+            self._ring = None
@@ -12,20 +12,37 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import queue
+import random
+import threading
+import time
+
+from keystoneauth1 import exceptions as ks_exc
 from oslo_log import log as logging
 
 from cyborg.common import exception
 from cyborg.common import utils
 from cyborg.common.i18n import _
+from cyborg.conf import CONF
 
 
 LOG = logging.getLogger(__name__)
 
 
+def _backoff(attempt):
+    """Sleep before a retry, randomly up to a doubling interval."""
+    interval = CONF.nova.event_retry_interval * 2**attempt
+    # Not for cryptography, only to spread the retries.
+    time.sleep(random.uniform(0, interval))  # noqa: S311
+
+
 class NovaAPI:
+    # The compute adapter is shared, so the microversion is passed on each
+    # request rather than set as its default.
+    MICROVERSION = '2.82'
+
     def __init__(self):
-        self.nova_client = utils.get_sdk_adapter('compute')
-        self.nova_client.default_microversion = '2.82'
+        self.nova_client = utils.get_shared_sdk_adapter('compute')
 
     def _get_acc_changed_events(self, instance_uuid, arq_bind_statuses):
         return [
@@ -46,7 +63,9 @@ class NovaAPI:
         """
         url = "/os-server-external-events"
         body = {"events": events}
-        response = self.nova_client.post(url, json=body)
+        response = self.nova_client.post(
+            url, json=body, microversion=self.MICROVERSION
+        )
         # NOTE(Sundar): Response status should always be 200/207. See
         # https://review.opendev.org/#/c/698037/
         if response.status_code == 200:
@@ -100,12 +119,147 @@ class NovaAPI:
                 service='Nova', api=url[1:], msg=msg
             )
 
+    def _send_event_batch(self, events):
+        """Send the events of several instances to Nova in one request.
+
+        The events Nova fails to process are logged rather than raised, as
+        the other events of the request are processed.
+
+        :param events: List of events to send to Nova.
+        :raises: exception.NovaServerError, on a server error
+        :raises: exception.InvalidAPIResponse, on another unexpected error
+        """
+        url = "/os-server-external-events"
+        response = self.nova_client.post(
+            url, json={"events": events}, microversion=self.MICROVERSION
+        )
+        if response.status_code >= 500:
+            raise exception.NovaServerError()
+        if response.status_code == 200:
+            LOG.info("Successfully sent %d events to Nova.", len(events))
+            return
+        if response.status_code != 207:
+            msg = _('Failed to send events %(ev)s: HTTP %(code)s: %(txt)s')
+            msg = msg % {
+                'ev': events,
+                'code': response.status_code,
+                'txt': response.text,
+            }
+            raise exception.InvalidAPIResponse(
+                service='Nova', api=url[1:], msg=msg
+            )
+        for event in response.json()['events']:
+            if event.get('code') == 200:
+                continue
+            if event.get('code') == 422:
+                # NOTE(Sundar): see _send_events.
+                LOG.info(
+                    'Ignoring Nova notification error that the instance %s '
+                    'is not yet associated with a host.',
+                    event['server_uuid'],
+                )
+            else:
+                LOG.error(
+                    'Unexpected event code %(code)s for event %(event)s.',
+                    {'code': event.get('code'), 'event': event},
+                )
+
     def notify_binding(self, instance_uuid, arq_bind_statuses):
         """Notify Nova that ARQ bindings are resolved for a given instance.
 
+        The events are queued to be sent along with those of other
+        instances, unless CONF.nova.event_batch_window is 0.
+
         :param instance_uuid: UUID of the instance whose ARQs are resolved
         :param arq_bind_statuses: List of (arq_uuid, arq_bind_status) tuples
         :returns: None
         """
         events = self._get_acc_changed_events(instance_uuid, arq_bind_statuses)
-        self._send_events(events)
+        if not CONF.nova.event_batch_window:
+            self._send_events(events)
+            return
+        EVENT_NOTIFIER.put(events)
+
+
+class EventNotifier:
+    """Send the events of many instances to Nova in few requests.
+
+    The events are sent by a background thread, started on first use.
+    Those queued within CONF.nova.event_batch_window seconds of a first
+    one are sent together, up to CONF.nova.event_batch_size events in a
+    request, and the events of an instance always in the same request.
+    Sending the events is retried on server errors.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._queue = None
+        # The number of instances whose events are queued or being sent.
+        self._unsent = 0
+
+    def put(self, events):
+        """Queue the events of an instance, waiting while the queue is
+        full.
+        """
+        with self._cond:
+            if self._queue is None:
+                self._queue = queue.Queue(maxsize=CONF.nova.event_queue_size)
+                threading.Thread(
+                    target=self._run, name='nova-event-notifier', daemon=True
+                ).start()
+            self._unsent += 1
+        self._queue.put(events)
+
+    def flush(self, timeout=None):
+        """Wait until the events queued are sent.
+
+        :returns: False if the timeout expired first.
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._unsent, timeout)
+
+    def _run(self):
+        pending = None
+        while True:
+            batch = [pending or self._queue.get()]
+            pending = None
+            size = len(batch[0])
+            deadline = time.monotonic() + CONF.nova.event_batch_window
+            while size < CONF.nova.event_batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    events = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if size + len(events) > CONF.nova.event_batch_size:
+                    pending = events
+                    break
+                batch.append(events)
+                size += len(events)
+            self._send([event for events in batch for event in events])
+            with self._cond:
+                self._unsent -= len(batch)
+                self._cond.notify_all()
+
+    def _send(self, events):
+        for attempt in range(CONF.nova.event_retries + 1):
+            if attempt:
+                _backoff(attempt - 1)
+            try:
+                NovaAPI()._send_event_batch(events)
+                return
+            except (exception.NovaServerError, ks_exc.ConnectionError) as e:
+                LOG.warning(
+                    'Failed to send %(num)d events to Nova: %(err)s',
+                    {'num': len(events), 'err': e},
+                )
+            except Exception:
+                LOG.exception('Failed to send events %s to Nova.', events)
+                return
+        LOG.error('Giving up sending events %s to Nova.', events)
+
+
+# The events of the instances of this process wait here to be sent.
+EVENT_NOTIFIER = EventNotifier()
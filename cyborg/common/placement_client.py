@@ -13,6 +13,9 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import random
+import time
+
 import os_resource_classes as orc
 
 from keystoneauth1 import exceptions as ks_exc
@@ -20,7 +23,9 @@ from oslo_log import log as logging
 from oslo_middleware import request_id
 
 from cyborg.common import exception
+from cyborg.common import provider_tree
 from cyborg.common import utils
+from cyborg.conf import CONF
 
 
 LOG = logging.getLogger(__name__)
@@ -28,35 +33,88 @@ NESTED_PROVIDER_API_VERSION = '1.14'
 POST_RPS_RETURNS_PAYLOAD_API_VERSION = '1.20'
 PLACEMENT_CLIENT_SEMAPHORE = 'placement_client'
 
+# Shared by all the placement clients of the process.
+PROVIDER_TREE = provider_tree.ProviderTree()
+# The requests retried on server errors.
+_IDEMPOTENT_METHODS = ('get', 'put', 'delete')
+
+
+def _backoff(attempt):
+    """Sleep before a retry, randomly up to a doubling interval.
+
+    The jitter keeps the concurrent reports failing at once from retrying
+    at once.
+    """
+    interval = CONF.placement.retry_interval * 2**attempt
+    # Not for cryptography, only to spread the retries.
+    time.sleep(random.uniform(0, interval))  # noqa: S311
+
+
+def _is_generation_conflict(resp):
+    if resp.status_code != 409:
+        return False
+    try:
+        errors = resp.json().get('errors', [])
+    except ValueError:
+        return False
+    return any(
+        err.get('code') == 'placement.concurrent_update' for err in errors
+    )
+
 
 class PlacementClient:
     """Client class for reporting to placement."""
 
     def __init__(self):
-        self._client = utils.get_sdk_adapter('placement')
+        # The conductor reports that many providers at once.
+        self._client = utils.get_shared_sdk_adapter(
+            'placement', pool_maxsize=CONF.placement.report_workers
+        )
+        self._provider_tree = PROVIDER_TREE
+
+    def _request(self, method, url, **kwargs):
+        """Send a request, retrying it on server errors.
+
+        A POST is not retried: placement may have made the change before
+        failing, and a retried resource provider creation would conflict.
+
+        :raise: PlacementServerError once the retries are exhausted.
+        """
+        retries = CONF.placement.request_retries
+        if method not in _IDEMPOTENT_METHODS:
+            retries = 0
+        for attempt in range(retries + 1):
+            if attempt:
+                _backoff(attempt - 1)
+            res = getattr(self._client, method)(url, **kwargs)
+            if res is None or res.status_code < 500:
+                return res
+            LOG.warning(
+                "Placement returned HTTP %(status)s on %(method)s %(url)s.",
+                {'status': res.status_code, 'method': method, 'url': url},
+            )
+        raise exception.PlacementServerError(
+            "Placement Server has some error at this time."
+        )
 
     def get(self, url, version=None, global_request_id=None):
-        res = self._client.get(
-            url, microversion=version, global_request_id=global_request_id
+        res = self._request(
+            'get',
+            url,
+            microversion=version,
+            global_request_id=global_request_id,
         )
-        if res and res.status_code >= 500:
-            raise exception.PlacementServerError(
-                "Placement Server has some error at this time."
-            )
         LOG.debug('Successfully got resources from placement: %s', url)
         return res
 
     def post(self, url, data, version=None, global_request_id=None):
-        res = self._client.post(
+        res = self._request(
+            'post',
             url,
             json=data,
             microversion=version,
             global_request_id=global_request_id,
         )
-        if res.status_code >= 500:
-            raise exception.PlacementServerError(
-                "Placement Server has some error at this time."
-            )
         LOG.debug('Successfully created resources from placement: %s', url)
         return res
 
@@ -64,62 +122,81 @@ class PlacementClient:
         kwargs = {}
         if data is not None:
             kwargs['json'] = data
-        res = self._client.put(
+        res = self._request(
+            'put',
             url,
             microversion=version,
             global_request_id=global_request_id,
             **kwargs,
         )
-        if res.status_code >= 500:
-            raise exception.PlacementServerError(
-                "Placement Server has some error at this time."
-            )
         LOG.debug('Successfully updated resources from placement: %s', url)
         return res
 
     def delete(self, url, version=None, global_request_id=None):
-        res = self._client.delete(
-            url, microversion=version, global_request_id=global_request_id
+        res = self._request(
+            'delete',
+            url,
+            microversion=version,
+            global_request_id=global_request_id,
         )
-        if res.status_code >= 500:
-            raise exception.PlacementServerError(
-                "Placement Server has some error at this time."
-            )
         LOG.debug('Successfully deleted resources from placement: %s', url)
         return res
 
+    def _get_generation(self, rp_uuid):
+        generation = self._provider_tree.generation(rp_uuid)
+        if generation is None:
+            generation = self.get_resource_provider(
+                resource_provider_uuid=rp_uuid
+            )['generation']
+        return generation
+
     def _get_rp_traits(self, rp_uuid):
+        traits = self._provider_tree.traits(rp_uuid)
+        if traits is not None:
+            return {
+                'traits': sorted(traits),
+                'resource_provider_generation': (
+                    self._provider_tree.generation(rp_uuid)
+                ),
+            }
         resp = self.get(f"/resource_providers/{rp_uuid}/traits", version='1.6')
         if resp.status_code != 200:
+            self._provider_tree.remove(rp_uuid)
             raise Exception(
                 f"Failed to get traits for rp {rp_uuid}:"
                 f" HTTP {resp.status_code}: {resp.text}"
             )
-        return resp.json()
+        traits_json = resp.json()
+        self._provider_tree.update(
+            rp_uuid,
+            traits_json['resource_provider_generation'],
+            traits=traits_json['traits'],
+        )
+        return traits_json
 
     def _ensure_traits(self, trait_names):
         # TODO(Xinran): maintain a reference count of how many RPs use
         # this trait and do the deletion only when the last RP is deleted.
-        for trait_name in trait_names:
-            trait = self.get(f"/traits/{trait_name}", version='1.6')
-            if trait:
-                LOG.info(
-                    "Trait %(trait)s already existed", {"trait": trait_name}
-                )
-                continue
+        for trait_name in self._provider_tree.missing_traits(trait_names):
+            # The PUT is idempotent, no need to check for the trait first.
             resp = self.put(f"/traits/{trait_name}", None, version='1.6')
             if resp.status_code == 201:
                 LOG.info("Created trait %(trait)s", {"trait": trait_name})
+            elif resp.status_code == 204:
+                LOG.info(
+                    "Trait %(trait)s already existed", {"trait": trait_name}
+                )
             else:
                 raise Exception(
                     f"Failed to create trait {trait_name}:"
                     f" HTTP {resp.status_code}: {resp.text}"
                 )
+            self._provider_tree.add_traits([trait_name])
 
     def _put_rp_traits(self, rp_uuid, traits_json):
-        generation = self.get_resource_provider(
-            resource_provider_uuid=rp_uuid
-        )['generation']
+        generation = traits_json.get('resource_provider_generation')
+        if generation is None:
+            generation = self._get_generation(rp_uuid)
         payload = {
             'resource_provider_generation': generation,
             'traits': traits_json["traits"],
@@ -127,38 +204,93 @@ class PlacementClient:
         resp = self.put(
             f"/resource_providers/{rp_uuid}/traits", payload, version='1.6'
         )
-        if resp.status_code != 200:
-            raise Exception(
-                f"Failed to set traits to {traits_json} for rp {rp_uuid}:"
-                f" HTTP {resp.status_code}: {resp.text}"
+        if resp.status_code == 200:
+            result = resp.json()
+            self._provider_tree.update(
+                rp_uuid,
+                result['resource_provider_generation'],
+                traits=result['traits'],
+                written=generation,
+            )
+            return
+        # Whatever failed, the cached provider may be stale.
+        self._provider_tree.remove(rp_uuid)
+        if _is_generation_conflict(resp):
+            raise exception.ResourceProviderUpdateConflict(
+                uuid=rp_uuid, generation=generation, error=resp.text
             )
+        if resp.status_code == 400:
+            # A trait cached as existing may have been deleted.
+            for trait in traits_json['traits']:
+                self._provider_tree.remove_trait(trait)
+        raise Exception(
+            f"Failed to set traits to {traits_json} for rp {rp_uuid}:"
+            f" HTTP {resp.status_code}: {resp.text}"
+        )
+
+    def _update_rp_traits(self, rp_uuid, update):
+        """Set the traits of a provider to update(current traits).
+
+        Nothing is written when the traits do not change. On a generation
+        conflict the traits are read again and the update retried once.
+
+        :param update: a callable returning the new list of traits from the
+            current one.
+        """
+        for attempt in range(2):
+            traits_json = self._get_rp_traits(rp_uuid)
+            traits = update(traits_json['traits'])
+            if set(traits) == set(traits_json['traits']):
+                return
+            try:
+                self._put_rp_traits(
+                    rp_uuid,
+                    {
+                        'traits': traits,
+                        'resource_provider_generation': traits_json.get(
+                            'resource_provider_generation'
+                        ),
+                    },
+                )
+                return
+            except exception.ResourceProviderUpdateConflict:
+                if attempt:
+                    raise
+                LOG.info(
+                    "Generation conflict setting traits of resource "
+                    "provider %s, retrying.",
+                    rp_uuid,
+                )
+                _backoff(attempt)
 
     def add_traits_to_rp(self, rp_uuid, trait_names):
         self._ensure_traits(trait_names)
-        traits_json = self._get_rp_traits(rp_uuid)
-        traits = list(set(traits_json['traits'] + trait_names))
-        traits_json['traits'] = traits
-        self._put_rp_traits(rp_uuid, traits_json)
+        self._update_rp_traits(
+            rp_uuid, lambda traits: list(set(traits + trait_names))
+        )
 
     def delete_trait_by_name(self, context, rp_uuid, trait_name):
-        traits_json = self._get_rp_traits(rp_uuid)
-        traits = [
-            trait for trait in traits_json['traits'] if trait != trait_name
-        ]
-        traits_json['traits'] = traits
-        self._put_rp_traits(rp_uuid, traits_json)
+        self._update_rp_traits(
+            rp_uuid,
+            lambda traits: [trait for trait in traits if trait != trait_name],
+        )
         self._delete_trait(context, trait_name)
 
     def delete_traits_with_prefixes(self, context, rp_uuid, trait_prefixes):
-        traits_json = self._get_rp_traits(rp_uuid)
-        traits = [
-            trait
-            for trait in traits_json['traits']
-            if not any(trait.startswith(prefix) for prefix in trait_prefixes)
-        ]
-        delete_traits = set(traits_json['traits']) - set(traits)
-        traits_json['traits'] = traits
-        self._put_rp_traits(rp_uuid, traits_json)
+        delete_traits = set()
+
+        def _remove_prefixed(traits):
+            kept = [
+                trait
+                for trait in traits
+                if not any(
+                    trait.startswith(prefix) for prefix in trait_prefixes
+                )
+            ]
+            delete_traits.update(set(traits) - set(kept))
+            return kept
+
+        self._update_rp_traits(rp_uuid, _remove_prefixed)
         for trait in delete_traits:
             self._delete_trait(context, trait)
 
@@ -173,21 +305,63 @@ class PlacementClient:
         resource_provider_generation=None,
         version=None,
     ):
-        if resource_provider_generation is None:
-            resource_provider_generation = self.get_resource_provider(
-                resource_provider_uuid=resource_provider_uuid
-            )['generation']
-        url = f'/resource_providers/{resource_provider_uuid}/inventories'
-        body = {
-            'resource_provider_generation': resource_provider_generation,
-            'inventories': inventories,
-        }
-        try:
-            return self.put(url, body, version=version).json()
-        except ks_exc.NotFound:
-            raise exception.PlacementResourceProviderNotFound(
-                resource_provider=resource_provider_uuid
-            )
+        """Set the inventories of a resource provider.
+
+        Without an explicit generation, the cached one is used, nothing is
+        written if the inventories are those last set by this process, and
+        a generation conflict is retried once with a fresh generation.
+        """
+        rp_uuid = resource_provider_uuid
+        retry = resource_provider_generation is None
+        if retry and self._provider_tree.inventories(rp_uuid) == inventories:
+            LOG.debug("Inventories of resource provider %s unchanged", rp_uuid)
+            return {
+                'resource_provider_generation': (
+                    self._provider_tree.generation(rp_uuid)
+                ),
+                'inventories': inventories,
+            }
+        url = f'/resource_providers/{rp_uuid}/inventories'
+        while True:
+            generation = resource_provider_generation
+            if generation is None:
+                generation = self._get_generation(rp_uuid)
+            body = {
+                'resource_provider_generation': generation,
+                'inventories': inventories,
+            }
+            try:
+                resp = self.put(url, body, version=version)
+            except ks_exc.NotFound:
+                self._provider_tree.remove(rp_uuid)
+                raise exception.PlacementResourceProviderNotFound(
+                    resource_provider=rp_uuid
+                )
+            if resp.status_code == 200:
+                result = resp.json()
+                self._provider_tree.update(
+                    rp_uuid,
+                    result['resource_provider_generation'],
+                    inventories=inventories,
+                    written=generation,
+                )
+                return result
+            # Whatever failed, the cached provider may be stale.
+            self._provider_tree.remove(rp_uuid)
+            if resp.status_code == 400:
+                # A resource class cached as existing may have been deleted.
+                for name in inventories:
+                    self._provider_tree.remove_resource_class(name)
+            if retry and _is_generation_conflict(resp):
+                LOG.info(
+                    "Generation conflict setting inventories of resource "
+                    "provider %s, retrying.",
+                    rp_uuid,
+                )
+                retry = False
+                _backoff(0)
+                continue
+            return resp.json()
 
     def get_resource_provider(self, resource_provider_uuid):
         """Get resource provider by UUID.
@@ -198,11 +372,17 @@ class PlacementClient:
         """
         url = f'/resource_providers/{resource_provider_uuid}'
         try:
-            return self.get(url).json()
+            provider = self.get(url).json()
         except ks_exc.NotFound:
+            self._provider_tree.remove(resource_provider_uuid)
             raise exception.PlacementResourceProviderNotFound(
                 resource_provider=resource_provider_uuid
             )
+        if 'generation' in provider:
+            self._provider_tree.update(
+                resource_provider_uuid, provider['generation']
+            )
+        return provider
 
     def _create_resource_provider(
         self, context, uuid, name, parent_provider_uuid=None
@@ -254,35 +434,77 @@ class PlacementClient:
     def ensure_resource_provider(
         self, context, uuid, name=None, parent_provider_uuid=None
     ):
+        if self._provider_tree.exists(uuid):
+            return uuid
         resp = self.get(f"/resource_providers/{uuid}", version='1.6')
         if resp.status_code == 200:
             LOG.info(
                 "Resource Provider %(uuid)s already exists", {"uuid": uuid}
             )
+            provider = resp.json()
         else:
             LOG.info(
                 "Creating resource provider %(provider)s",
                 {"provider": name or uuid},
             )
             try:
-                resp = self._create_resource_provider(
+                provider = self._create_resource_provider(
                     context, uuid, name, parent_provider_uuid
                 )
             except Exception:
                 raise exception.ResourceProviderCreationFailed(
                     name=name or uuid
                 )
+            if provider:
+                # A new provider has neither traits nor inventories.
+                self._provider_tree.update(
+                    uuid, provider['generation'], traits=[], inventories={}
+                )
+                return uuid
+        if provider:
+            self._provider_tree.update(uuid, provider['generation'])
         return uuid
 
+    def sync_provider(
+        self,
+        context,
+        rp_uuid,
+        inventories,
+        traits,
+        name=None,
+        parent_provider_uuid=None,
+    ):
+        """Make a provider exist with some inventories and traits.
+
+        The provider is created if needed, its inventories are set and the
+        traits are added to the ones it has. Only the calls the cache does
+        not make pointless are done, each write using the generation
+        returned by the previous one: a new provider costs a lookup, a
+        creation, one inventory PUT and one traits PUT.
+        """
+        self.ensure_resource_classes(context, list(inventories))
+        self._ensure_traits(traits)
+        self.ensure_resource_provider(
+            context,
+            rp_uuid,
+            name=name,
+            parent_provider_uuid=parent_provider_uuid,
+        )
+        self.update_inventory(rp_uuid, inventories)
+        self._update_rp_traits(
+            rp_uuid, lambda current: list(set(current) | set(traits))
+        )
+        return rp_uuid
+
     def ensure_resource_classes(self, context, names):
         """Make sure resource classes exist."""
         version = '1.7'
         to_ensure = set(names)
-        for name in to_ensure:
+        for name in self._provider_tree.missing_resource_classes(to_ensure):
             # no payload on the put request
             # if rc exists in placement's db, skip it.
             if name in orc.STANDARDS:
-                return
+                continue
             resp = self.put(
                 f"/resource_classes/{name}",
                 None,
@@ -312,6 +534,7 @@ class PlacementClient:
                     "Successfully created resource class %(rc_name)s.",
                     {"rc_name": name},
                 )
+            self._provider_tree.add_resource_classes([name])
 
     def get_providers_in_tree(self, context, uuid):
         """Queries the placement API for a list of the resource providers in
@@ -330,7 +553,12 @@ class PlacementClient:
         )
 
         if resp.status_code == 200:
-            return resp.json()['resource_providers']
+            providers = resp.json()['resource_providers']
+            for provider in providers:
+                self._provider_tree.update(
+                    provider['uuid'], provider['generation']
+                )
+            return providers
 
         # Some unexpected error
         placement_req_id = self.get_placement_request_id(resp)
@@ -353,6 +581,7 @@ class PlacementClient:
             f'/resource_providers/{rp_uuid}',
             global_request_id=global_request_id,
         )
+        self._provider_tree.remove(rp_uuid)
         # Check for 404 since we don't need to warn/raise if we tried to delete
         # something which doesn"t actually exist.
         if resp.ok:
@@ -383,6 +612,7 @@ class PlacementClient:
         resp = self.delete(
             f"/resource_classes/{name}", global_request_id=context.global_id
         )
+        self._provider_tree.remove_resource_class(name)
         if not resp:
             msg = (
                 "Failed to delete resource class record with placement "
@@ -409,6 +639,7 @@ class PlacementClient:
             version=version,
             global_request_id=context.global_id,
         )
+        self._provider_tree.remove_trait(name)
         if not resp:
             msg = (
                 "Failed to delete trait record with placement "
@@ -0,0 +1,180 @@
+# Copyright 2026 The Cyborg Authors.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""A local cache of the resource providers Cyborg reports to placement.
+
+Like nova's ProviderTree, it holds what this process last read from or
+wrote to placement for each provider: its generation, and its traits and
+inventories when known. The placement client uses it to skip the reads
+that only fetch a generation and the writes that would change nothing.
+Writes are still guarded by the generation, so a stale entry only costs
+a 409 conflict, after which the entry is refreshed.
+
+Another conductor, an operator or nova may change a provider, a trait or
+a resource class without its generation being seen here, so each entry
+is only trusted for ``[placement] provider_cache_ttl`` seconds, after
+which it is read from placement again.
+"""
+
+import copy
+import threading
+import time
+
+from cyborg.conf import CONF
+
+
+class _Provider:
+    def __init__(self, uuid, generation):
+        self.uuid = uuid
+        self.generation = generation
+        # None when not known.
+        self.traits = None
+        self.inventories = None
+        self.cached_at = time.monotonic()
+
+
+class ProviderTree:
+    """A thread safe cache of resource providers, traits and inventories.
+
+    :param ttl: the number of seconds an entry is trusted, 0 to never use
+        the cache. Defaults to ``[placement] provider_cache_ttl``.
+    """
+
+    def __init__(self, ttl=None):
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._providers = {}
+        # The times the traits and resource classes were known to exist.
+        self._traits = {}
+        self._resource_classes = {}
+
+    @property
+    def ttl(self):
+        if self._ttl is None:
+            return CONF.placement.provider_cache_ttl
+        return self._ttl
+
+    def _expired(self, cached_at):
+        return time.monotonic() - cached_at >= self.ttl
+
+    def _get(self, uuid):
+        """Return the cached provider, forgetting it once expired."""
+        provider = self._providers.get(uuid)
+        if provider is not None and self._expired(provider.cached_at):
+            del self._providers[uuid]
+            return None
+        return provider
+
+    def exists(self, uuid):
+        with self._lock:
+            return self._get(uuid) is not None
+
+    def generation(self, uuid):
+        """Return the cached generation of a provider, or None."""
+        with self._lock:
+            provider = self._get(uuid)
+            return provider.generation if provider else None
+
+    def traits(self, uuid):
+        """Return the cached traits of a provider, or None if not known."""
+        with self._lock:
+            provider = self._get(uuid)
+            if provider is None or provider.traits is None:
+                return None
+            return set(provider.traits)
+
+    def inventories(self, uuid):
+        """Return the cached inventories of a provider, or None."""
+        with self._lock:
+            provider = self._get(uuid)
+            if provider is None or provider.inventories is None:
+                return None
+            return copy.deepcopy(provider.inventories)
+
+    def update(
+        self, uuid, generation, traits=None, inventories=None, written=None
+    ):
+        """Record what placement returned for a provider.
+
+        A generation other than the cached one means the provider changed
+        behind our back, so its traits and inventories are forgotten
+        unless they are given.
+
+        :param written: the generation a successful write of ours was made
+            with. When it is the cached one, only our write changed the
+            provider and what else is cached remains valid, until the entry
+            expires.
+        """
+        with self._lock:
+            provider = self._get(uuid)
+            if (
+                provider is not None
+                and written is not None
+                and provider.generation == written
+            ):
+                provider.generation = generation
+            elif provider is None or provider.generation != generation:
+                provider = _Provider(uuid, generation)
+                self._providers[uuid] = provider
+            if traits is not None:
+                provider.traits = set(traits)
+            if inventories is not None:
+                provider.inventories = copy.deepcopy(inventories)
+
+    def remove(self, uuid):
+        """Forget a provider, e.g. once deleted or on a conflict."""
+        with self._lock:
+            self._providers.pop(uuid, None)
+
+    def _missing(self, known, names):
+        return [
+            name
+            for name in names
+            if name not in known or self._expired(known[name])
+        ]
+
+    def missing_traits(self, names):
+        """Return the trait names not known to exist in placement."""
+        with self._lock:
+            return self._missing(self._traits, names)
+
+    def add_traits(self, names):
+        now = time.monotonic()
+        with self._lock:
+            self._traits.update((name, now) for name in names)
+
+    def remove_trait(self, name):
+        with self._lock:
+            self._traits.pop(name, None)
+
+    def missing_resource_classes(self, names):
+        """Return the resource classes not known to exist in placement."""
+        with self._lock:
+            return self._missing(self._resource_classes, names)
+
+    def add_resource_classes(self, names):
+        now = time.monotonic()
+        with self._lock:
+            self._resource_classes.update((name, now) for name in names)
+
+    def remove_resource_class(self, name):
+        with self._lock:
+            self._resource_classes.pop(name, None)
+
+    def clear(self):
+        with self._lock:
+            self._providers.clear()
+            self._traits.clear()
+            self._resource_classes.clear()
@@ -80,6 +80,10 @@ class RPCService(service.Service):
                 e,
             )
 
+        del_host = getattr(self.manager, 'del_host', None)
+        if del_host is not None:
+            del_host()
+
         super().stop(graceful=graceful)
         LOG.info(
             'Stopped RPC server for service %(service)s on host %(host)s.',
@@ -15,6 +15,8 @@
 
 """Utilities and helper functions."""
 
+import collections
+import threading
 import time
 import traceback
 
@@ -23,8 +25,11 @@ from functools import wraps
 
 from keystoneauth1 import exceptions as ks_exc
 from keystoneauth1 import loading as ks_loading
+from keystoneauth1 import session as ks_session
 from openstack import connection
 from openstack import exceptions as sdk_exc
+from openstack.config import cloud_region
+from openstack.config import defaults as sdk_config_defaults
 from os_service_types import service_types
 from oslo_concurrency import lockutils
 from oslo_log import log
@@ -147,7 +152,9 @@ def _get_auth_and_session(confgrp):
     )
 
 
-def get_sdk_adapter(service_type, check_service=False):
+def get_sdk_adapter(
+    service_type, check_service=False, pool_maxsize=None, concurrency=None
+):
     """Construct an openstacksdk-brokered Adapter for a given service type.
     We expect to find a conf group whose name corresponds to the service_type's
     project according to the service-types-authority.  That conf group must
@@ -156,6 +163,11 @@ def get_sdk_adapter(service_type, check_service=False):
                          is to be constructed.
     :param check_service: If True, we will query the endpoint to make sure the
             service is alive, raising ServiceUnavailable if it is not.
+    :param pool_maxsize: The number of connections to the service kept open
+            for reuse, for adapters shared by that many threads. The
+            requests default of 10 is used when not given.
+    :param concurrency: The number of requests to the service the adapter
+            sends at once at most, without limit when not given.
     :return: An openstack.proxy.Proxy object for the specified service_type.
     :raise: ConfGroupForServiceTypeNotFound If no conf group name could be
             found for the specified service_type.
@@ -163,11 +175,24 @@ def get_sdk_adapter(service_type, check_service=False):
     """
     confgrp = _get_conf_group(service_type)
     sess = _get_auth_and_session(confgrp)
+    pool_maxsize = max(pool_maxsize or 0, concurrency or 0)
+    if pool_maxsize:
+        for scheme in ('https://', 'http://'):
+            sess.session.mount(
+                scheme,
+                ks_session.TCPKeepAliveAdapter(pool_maxsize=pool_maxsize),
+            )
+    config = sdk_config_defaults.get_defaults()
+    if concurrency:
+        config['concurrency'] = {service_type: concurrency}
     try:
         conn = connection.Connection(
-            session=sess,
-            oslo_conf=CONF,
-            service_types={service_type},
+            config=cloud_region.from_conf(
+                CONF,
+                session=sess,
+                service_types={service_type},
+                config=config,
+            ),
             strict_proxies=check_service,
         )
     except sdk_exc.ServiceDiscoveryException as e:
@@ -178,6 +203,53 @@ def get_sdk_adapter(service_type, check_service=False):
     return getattr(conn, service_type)
 
 
+_SHARED_CLIENTS = {}
+_SHARED_CLIENTS_LOCK = threading.Lock()
+
+
+def get_shared_sdk_adapter(service_type, pool_maxsize=None):
+    """Return the openstacksdk adapter for a service type shared by the
+    process.
+
+    Building an adapter loads an auth plugin and a session, and discovers
+    the version of the service. A shared adapter keeps its token and its
+    keep-alive connections for the requests of all the callers. The
+    requests it sends at once are limited by CONF.client_concurrency.
+
+    :param service_type: String name of the service type, see
+                         get_sdk_adapter.
+    :param pool_maxsize: The number of connections to the service kept open
+            for reuse, used when the adapter is first built.
+    :return: An openstack.proxy.Proxy object for the specified service_type.
+    """
+    key = ('service', service_type)
+    with _SHARED_CLIENTS_LOCK:
+        if key not in _SHARED_CLIENTS:
+            _SHARED_CLIENTS[key] = get_sdk_adapter(
+                service_type,
+                pool_maxsize=pool_maxsize,
+                concurrency=CONF.client_concurrency.get(service_type),
+            )
+        return _SHARED_CLIENTS[key]
+
+
+def get_shared_connection(cloud):
+    """Return the openstacksdk Connection to a cloud of clouds.yaml shared
+    by the process.
+    """
+    key = ('cloud', cloud)
+    with _SHARED_CLIENTS_LOCK:
+        if key not in _SHARED_CLIENTS:
+            _SHARED_CLIENTS[key] = connection.Connection(cloud=cloud)
+        return _SHARED_CLIENTS[key]
+
+
+def clear_shared_clients():
+    """Forget the shared adapters and connections, for tests."""
+    with _SHARED_CLIENTS_LOCK:
+        _SHARED_CLIENTS.clear()
+
+
 def get_endpoint(ksa_adapter):
     """Get the endpoint URL represented by a keystoneauth1 Adapter.
 
@@ -374,6 +446,50 @@ class ThreadWorks(Singleton):
         return future_iterator()
 
 
+class KeyedThreadWorks:
+    """A bounded thread pool running the jobs of a same key in order.
+
+    Jobs of different keys run concurrently, while a job only starts once
+    the jobs submitted before it with the same key are done, whether they
+    succeeded or not.
+    """
+
+    def __init__(self, pool_size):
+        self.executor = futures.ThreadPoolExecutor(max_workers=pool_size)
+        self._lock = threading.Lock()
+        # The future of the last job submitted for each key.
+        self._tails = {}
+
+    def spawn(self, key, func, *args, **kwargs):
+        """Put a job in the thread pool, after the previous ones of key."""
+        future = futures.Future()
+
+        def run():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                result = func(*args, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+        def forget(done):
+            with self._lock:
+                if self._tails.get(key) is done:
+                    del self._tails[key]
+
+        with self._lock:
+            previous = self._tails.get(key)
+            self._tails[key] = future
+        future.add_done_callback(forget)
+        if previous is None:
+            self.executor.submit(run)
+        else:
+            previous.add_done_callback(lambda _: self.executor.submit(run))
+        return future
+
+
 # info https://www.oreilly.com/library/view/python-cookbook/
 # 0596001673/ch14s05.html
 def format_tb(tb, limit=None):
@@ -453,3 +569,52 @@ class FactoryMixin:
                 cls.__name__,
                 typ,
             )
+
+
+class LRUCache:
+    """A thread safe least recently used cache, with an optional TTL.
+
+    :param maxsize: the number of entries kept, 0 disables the cache.
+    :param ttl: the number of seconds an entry is kept, 0 to keep it
+        until evicted.
+    """
+
+    _MISSING = object()
+
+    def __init__(self, maxsize, ttl=0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._data = collections.OrderedDict()
+
+    def get(self, key, default=None):
+        with self._lock:
+            value, expires = self._data.get(key, (self._MISSING, None))
+            if value is self._MISSING:
+                return default
+            if expires is not None and expires <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        expires = time.monotonic() + self.ttl if self.ttl > 0 else None
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
@@ -13,33 +13,45 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import functools
 import uuid
 
+from concurrent import futures
+
 import oslo_messaging as messaging
 
 from oslo_log import log as logging
 
+from cyborg import context as cyborg_context
 from cyborg.common import data_migrations
 from cyborg.common import exception
+from cyborg.common import hash_ring
+from cyborg.common import nova_client
 from cyborg.common import placement_client
+from cyborg.common import utils
+from cyborg.conductor import report_queue
+from cyborg.conductor import rpcapi as conductor_rpcapi
 from cyborg.conf import CONF
+from cyborg.db import api as dbapi
 from cyborg.objects.attach_handle import AttachHandle
 from cyborg.objects.attribute import Attribute
 from cyborg.objects.control_path import ControlpathID
 from cyborg.objects.deployable import Deployable
 from cyborg.objects.device import Device
-from cyborg.objects.driver_objects.driver_device import DriverDeployable
 from cyborg.objects.driver_objects.driver_device import DriverDevice
 from cyborg.objects.ext_arq import ExtARQ
 
 
 LOG = logging.getLogger(__name__)
 
+# Seconds a stopping conductor waits for its events to be sent to Nova.
+NOVA_EVENTS_FLUSH_TIMEOUT = 30
+
 
 class ConductorManager:
     """Cyborg Conductor manager main class."""
 
-    RPC_API_VERSION = '1.0'
+    RPC_API_VERSION = '1.4'
     target = messaging.Target(version=RPC_API_VERSION)
 
     def __init__(self, topic, host=None):
@@ -47,9 +59,28 @@ class ConductorManager:
         self.topic = topic
         self.host = host or CONF.host
         self.placement_client = placement_client.PlacementClient()
+        # Reports the providers of a host concurrently, and the changes of
+        # one provider in order.
+        self._placement_works = utils.KeyedThreadWorks(
+            CONF.placement.report_workers
+        )
+        self._report_queue = report_queue.ReportQueue(CONF.host_report_workers)
+        # The conductors alive share the hosts, each one only applies the
+        # reports of its own hosts and caches their devices.
+        self._hash_ring = hash_ring.HashRingManager()
+        self._conductor_api = None
+        # Per-host fingerprints of the last device report that was fully
+        # applied to the DB, keyed by hostname and then by cpid_info.
+        self._host_fingerprints = {}
+        # The id of the full report each fingerprints are relative to. The
+        # id of the last full report of a host is kept in the DB, so that a
+        # conductor whose fingerprints are older than a full report applied
+        # by another one does not apply a delta relative to the latter.
+        self._host_report_ids = {}
 
     def init_host(self):
         """Hook called on service startup. Heals NULL project_id ARQs."""
+        self._heartbeat(cyborg_context.get_admin_context())
         try:
             count = data_migrations.heal_arq_project_ids()
             if count:
@@ -62,8 +93,69 @@ class ConductorManager:
                 'Run cyborg-dbsync online_data_migrations manually.'
             )
 
+    def del_host(self):
+        """Hook called on service stop, handing the hosts over and sending
+        the events still queued to Nova.
+        """
+        try:
+            dbapi.get_instance().conductor_unregister(
+                cyborg_context.get_admin_context(), self.host
+            )
+        except Exception:
+            LOG.exception('Unable to unregister conductor %s.', self.host)
+        if not nova_client.EVENT_NOTIFIER.flush(NOVA_EVENTS_FLUSH_TIMEOUT):
+            LOG.warning('Stopping before all the events are sent to Nova.')
+
     def periodic_tasks(self, context, raise_on_error=False):
-        pass
+        self._heartbeat(context)
+        self._rebalance()
+
+    def _heartbeat(self, context):
+        try:
+            dbapi.get_instance().conductor_register(context, self.host)
+        except Exception:
+            LOG.exception(
+                'Unable to record the heartbeat of conductor %s.', self.host
+            )
+
+    def _rebalance(self):
+        """Take the conductors joined or gone into account, forgetting the
+        devices of the hosts now owned by another conductor.
+        """
+        self._hash_ring.reset()
+        for hostname in list(self._host_fingerprints):
+            owner = self._owner(hostname)
+            if owner:
+                LOG.info(
+                    'Host %(host)s moved to conductor %(owner)s.',
+                    {'host': hostname, 'owner': owner},
+                )
+                self._host_fingerprints.pop(hostname, None)
+                self._host_report_ids.pop(hostname, None)
+
+    def _owner(self, hostname):
+        """Return the conductor owning a host, or None if it is this one.
+
+        A host is owned by this conductor while the conductors alive are
+        unknown, or while [upgrade_levels] conductor caps the RPC API below
+        the forwarding of the reports.
+        """
+        if not self.conductor_api.client.can_send_version('1.4'):
+            return None
+        try:
+            owner = self._hash_ring.ring.get_node(hostname)
+        except Exception:
+            LOG.exception('Unable to list the conductors alive.')
+            return None
+        if owner == self.host:
+            return None
+        return owner
+
+    @property
+    def conductor_api(self):
+        if self._conductor_api is None:
+            self._conductor_api = conductor_rpcapi.ConductorAPI()
+        return self._conductor_api
 
     def device_profile_create(self, context, obj_devprof):
         """Signal to conductor service to create a device_profile.
@@ -94,6 +186,18 @@ class ConductorManager:
         obj_extarq.create(context, devprof_id)
         return obj_extarq
 
+    def arq_create_bulk(self, context, obj_extarqs, devprof_id):
+        """Create accelerator requests of one device profile in a single
+        DB transaction.
+
+        :param context: request context.
+        :param obj_extarqs: a list of created (but not saved)
+        accelerator_requests objects.
+        :param devprof_id: a device profile id
+        :returns: a list of saved accelerator_requests objects.
+        """
+        return ExtARQ.create_many(context, obj_extarqs, devprof_id)
+
     # TODO(sean-k-mooney): Remove arq_delete_by_uuid and
     # arq_delete_by_instance_uuid in RPC API v2 (after 2027.1). ARQ
     # deletion is now performed directly in the API layer to enforce
@@ -127,6 +231,32 @@ class ConductorManager:
         """
         ExtARQ.apply_patch(context, patch_list, valid_fields)
 
+    def queue_report_data(
+        self, context, hostname, driver_device_list, forwarded=False
+    ):
+        """Queue a report_data of a host, to be applied in the background.
+
+        A queued report of the host not applied yet is dropped, this one
+        describing all the devices of the host as they are now. The report
+        of a host owned by another conductor is forwarded to it.
+
+        :param forwarded: True if forwarded by another conductor, to be
+            applied by this one whoever it thinks owns the host.
+        """
+        owner = None if forwarded else self._owner(hostname)
+        if owner:
+            self.conductor_api.forward_report_data(
+                context, owner, hostname, driver_device_list
+            )
+            return
+        self._report_queue.put(
+            hostname,
+            self._apply_report_data,
+            context,
+            hostname,
+            driver_device_list,
+        )
+
     def report_data(self, context, hostname, driver_device_list):
         """Update the Cyborg DB in one hostname according to the
         discovered device list.
@@ -135,51 +265,237 @@ class ConductorManager:
         :param driver_device_list: a list of driver_device object
         discovered by agent in the host.
         """
-        # TODO(): Every time get from the DB?
-        # First retrieve the old_device_list from the DB.
-        old_driver_device_list = DriverDevice.list(context, hostname)
-        # TODO(wangzhh): Remove invalid driver_devices without controlpath_id.
-        # Then diff two driver device list.
-        self.drv_device_make_diff(
-            context, hostname, old_driver_device_list, driver_device_list
+        owner = self._owner(hostname)
+        if owner:
+            self.conductor_api.forward_report_data(
+                context, owner, hostname, driver_device_list
+            )
+            return
+        self._apply_report_data(context, hostname, driver_device_list)
+
+    def _apply_report_data(self, context, hostname, driver_device_list):
+        """Apply a full report of a host, whoever owns it.
+
+        The owner is decided once, when the report is received, so that a
+        report is never forwarded again between conductors whose rings
+        disagree.
+        """
+        with self._report_queue.lock(hostname):
+            # Forget the old fingerprints first, so that a failed diff
+            # always makes the agent fall back to a full report.
+            self._host_fingerprints.pop(hostname, None)
+            # Make the fingerprints other conductors have of the host stale.
+            report_id = uuid.uuid4().hex
+            try:
+                dbapi.get_instance().host_report_set(
+                    context, hostname, report_id
+                )
+            except Exception:
+                LOG.exception(
+                    'Unable to record the report of host %s, its next '
+                    'report must be a full one.',
+                    hostname,
+                )
+                report_id = None
+            # First retrieve the old_device_list from the DB.
+            old_driver_device_list = DriverDevice.list(context, hostname)
+            # TODO(wangzhh): Remove invalid driver_devices without
+            # controlpath_id.
+            # Then diff two driver device list.
+            failed = self.drv_device_make_diff(
+                context, hostname, old_driver_device_list, driver_device_list
+            )
+            fingerprints = _fingerprint_devices(driver_device_list)
+            for cpid_info in failed:
+                fingerprints.pop(cpid_info, None)
+            if report_id is not None:
+                self._host_fingerprints[hostname] = fingerprints
+                self._host_report_ids[hostname] = report_id
+
+    def report_data_delta(
+        self,
+        context,
+        hostname,
+        fingerprints,
+        driver_device_list,
+        forwarded=False,
+    ):
+        """Update the Cyborg DB in one hostname from an incremental report.
+
+        :param context: request context.
+        :param hostname: agent's hostname.
+        :param fingerprints: a dict of cpid_info to the fingerprint of every
+        driver_device object currently discovered by agent in the host.
+        :param driver_device_list: the driver_device objects whose
+        fingerprint changed since the last report accepted by conductor.
+        :param forwarded: True if forwarded by another conductor, to be
+        applied by this one whoever it thinks owns the host.
+        :returns: True if the report is applied, False if conductor has no
+        matching baseline for the host and agent must send a full report.
+        """
+        owner = None if forwarded else self._owner(hostname)
+        if owner:
+            try:
+                return self.conductor_api.forward_report_data_delta(
+                    context, owner, hostname, fingerprints, driver_device_list
+                )
+            except messaging.MessagingTimeout:
+                LOG.warning(
+                    'Conductor %(owner)s of host %(host)s did not answer, '
+                    'a full report is needed.',
+                    {'owner': owner, 'host': hostname},
+                )
+                self._hash_ring.reset()
+                return False
+        # The delta is relative to the last full report the agent cast.
+        self._report_queue.wait(hostname)
+        with self._report_queue.lock(hostname):
+            return self._report_data_delta(
+                context, hostname, fingerprints, driver_device_list
+            )
+
+    def _report_data_delta(
+        self, context, hostname, fingerprints, driver_device_list
+    ):
+        cached = self._host_fingerprints.get(hostname)
+        if cached is None:
+            LOG.info(
+                "No device fingerprints cached for host %s, a full report "
+                "is needed.",
+                hostname,
+            )
+            return False
+        report_id = dbapi.get_instance().host_report_get(context, hostname)
+        if report_id != self._host_report_ids.get(hostname):
+            LOG.info(
+                "Host %s was fully reported to another conductor since its "
+                "fingerprints were cached, a full report is needed.",
+                hostname,
+            )
+            self._host_fingerprints.pop(hostname, None)
+            return False
+        changed = {
+            cpid_info
+            for cpid_info, fp in fingerprints.items()
+            if cpid_info not in cached or cached[cpid_info]['device'] != fp
+        }
+        removed = set(cached) - set(fingerprints)
+        if not changed and not removed:
+            LOG.debug("Devices in host %s are unchanged.", hostname)
+            return True
+
+        new_fingerprints = _fingerprint_devices(driver_device_list)
+        for cpid_info in changed:
+            new_fp = new_fingerprints.get(cpid_info, {}).get('device')
+            if new_fp != fingerprints[cpid_info]:
+                LOG.info(
+                    "Device %(cpid)s in host %(host)s is missing from the "
+                    "incremental report, a full report is needed.",
+                    {'cpid': cpid_info, 'host': hostname},
+                )
+                return False
+
+        LOG.info(
+            "Differing host %(host)s incrementally, changed: %(changed)d, "
+            "removed: %(removed)d.",
+            {
+                'host': hostname,
+                'changed': len(changed),
+                'removed': len(removed),
+            },
+        )
+        self._host_fingerprints.pop(hostname, None)
+        touched = changed | removed
+        old_driver_device_list = [
+            driver_dev_obj
+            for driver_dev_obj in DriverDevice.list(context, hostname)
+            if driver_dev_obj.controlpath_id.cpid_info in touched
+        ]
+        new_driver_device_list = [
+            driver_dev_obj
+            for driver_dev_obj in driver_device_list
+            if driver_dev_obj.controlpath_id.cpid_info in changed
+        ]
+        # Deployables whose fingerprint is unchanged need no diff even if
+        # something else in their device changed.
+        unchanged_deployables = {}
+        for cpid_info in changed & set(cached):
+            old_deps = cached[cpid_info]['deployables']
+            new_deps = new_fingerprints[cpid_info]['deployables']
+            unchanged_deployables[cpid_info] = {
+                name
+                for name, fp in new_deps.items()
+                if old_deps.get(name) == fp
+            }
+        failed = self.drv_device_make_diff(
+            context,
+            hostname,
+            old_driver_device_list,
+            new_driver_device_list,
+            unchanged_deployables=unchanged_deployables,
         )
+        for cpid_info in removed:
+            cached.pop(cpid_info)
+        for cpid_info in changed:
+            cached[cpid_info] = new_fingerprints[cpid_info]
+        for cpid_info in failed:
+            cached.pop(cpid_info, None)
+        self._host_fingerprints[hostname] = cached
+        return True
 
     def drv_device_make_diff(
-        self, context, host, old_driver_device_list, new_driver_device_list
+        self,
+        context,
+        host,
+        old_driver_device_list,
+        new_driver_device_list,
+        unchanged_deployables=None,
     ):
         """Compare new driver-side device object list with the old one in
         one host.
+
+        :param unchanged_deployables: an optional dict of cpid_info to the
+        names of deployables known to be unchanged, which are not differed.
+        :returns: a set of cpid_info of the devices failed to be reported.
         """
         LOG.info("Start differing devices.")
+        unchanged_deployables = unchanged_deployables or {}
+        failed = set()
         # TODO(): The placement report will be implemented here.
         # Use cpid.cpid_info to identify whether the device is the same.
-        stub_cpid_list = [
+        stub_cpids = {
             driver_dev_obj.controlpath_id.cpid_info
             for driver_dev_obj in new_driver_device_list
             if driver_dev_obj.stub
-        ]
-        new_cpid_list = [
-            driver_dev_obj.controlpath_id.cpid_info
-            for driver_dev_obj in new_driver_device_list
-        ]
-        old_cpid_list = [
-            driver_dev_obj.controlpath_id.cpid_info
-            for driver_dev_obj in old_driver_device_list
-        ]
-        same = set(new_cpid_list) & set(old_cpid_list) - set(stub_cpid_list)
-        added = set(new_cpid_list) - same - set(stub_cpid_list)
-        deleted = set(old_cpid_list) - same - set(stub_cpid_list)
+        }
+        new_driver_devs = _index_by(
+            new_driver_device_list, lambda obj: obj.controlpath_id.cpid_info
+        )
+        old_driver_devs = _index_by(
+            old_driver_device_list, lambda obj: obj.controlpath_id.cpid_info
+        )
+        same = new_driver_devs.keys() & old_driver_devs.keys() - stub_cpids
+        added = new_driver_devs.keys() - same - stub_cpids
+        deleted = old_driver_devs.keys() - same - stub_cpids
         host_rp = self._get_root_provider(context, host)
+        if added:
+            self._load_provider_tree(context, host_rp)
         # device is deleted.
-        for d in deleted:
-            old_driver_dev_obj = old_driver_device_list[old_cpid_list.index(d)]
-            for driver_dep_obj in old_driver_dev_obj.deployable_list:
-                rp_uuid = self.get_rp_uuid_from_obj(driver_dep_obj)
-                self._delete_provider_and_sub_providers(context, rp_uuid)
-            old_driver_dev_obj.destroy(context, host)
+        deletions = {
+            d: self._delete_providers(
+                context, old_driver_devs[d].deployable_list
+            )
+            for d in deleted
+        }
+        for d, jobs in deletions.items():
+            # A device whose providers are left is deleted again next time.
+            if not any(job.exception() for job in jobs):
+                old_driver_devs[d].destroy(context, host)
+        _raise_first_error(j for jobs in deletions.values() for j in jobs)
         # device is added
+        reports = {}
         for a in added:
-            new_driver_dev_obj = new_driver_device_list[new_cpid_list.index(a)]
+            new_driver_dev_obj = new_driver_devs[a]
             try:
                 new_driver_dev_obj.create(context, host)
             except Exception as exc:
@@ -188,45 +504,47 @@ class ConductorManager:
                     {'device': new_driver_dev_obj, 'reason': exc},
                 )
                 new_driver_dev_obj.destroy(context, host)
+                failed.add(a)
+                continue
+            reports[a] = self._report_deployables(
+                context, new_driver_dev_obj.deployable_list, host_rp
+            )
+        futures.wait([job for jobs in reports.values() for job in jobs])
+        for a, jobs in reports.items():
+            errors = [job.exception() for job in jobs if job.exception()]
+            if not errors:
+                continue
             # TODO(All): If report device data to Placement raise exception,
             # we should revert driver device created in Cyborg and resources
             # created in Placement to reduce the risk of data inconsistency
             # here between Cyborg and Placement.
-            cleanup_inconsistency_resources = False
-            for driver_dep_obj in new_driver_dev_obj.deployable_list:
-                try:
-                    self.get_placement_needed_info_and_report(
-                        context, driver_dep_obj, host_rp
-                    )
-                except Exception as exc:
-                    LOG.info(
-                        "Failed to add device %(device)s. Reason: %(reason)s",
-                        {'device': new_driver_dev_obj, 'reason': exc},
-                    )
-                    cleanup_inconsistency_resources = True
-                    break
-            if cleanup_inconsistency_resources:
-                new_driver_dev_obj.destroy(context, host)
-                for driver_dep_obj in new_driver_dev_obj.deployable_list:
-                    rp_uuid = self.get_rp_uuid_from_obj(driver_dep_obj)
-                    self._delete_provider_and_sub_providers(context, rp_uuid)
+            new_driver_dev_obj = new_driver_devs[a]
+            LOG.info(
+                "Failed to add device %(device)s. Reason: %(reason)s",
+                {'device': new_driver_dev_obj, 'reason': errors[0]},
+            )
+            failed.add(a)
+            new_driver_dev_obj.destroy(context, host)
+            _raise_first_error(
+                self._delete_providers(
+                    context, new_driver_dev_obj.deployable_list
+                )
+            )
+        # Use controlpath_id.cpid_info to identify the Devices of the host.
+        host_devices = self._get_host_devices(context, host) if same else {}
         for s in same:
             # get the driver_dev_obj, diff the driver_device layer
-            new_driver_dev_obj = new_driver_device_list[new_cpid_list.index(s)]
-            old_driver_dev_obj = old_driver_device_list[old_cpid_list.index(s)]
-            # First, get dev_obj_list from hostname
-            device_obj_list = Device.get_list_by_hostname(context, host)
-            # Then, use controlpath_id.cpid_info to identify one Device.
-            cpid_info = new_driver_dev_obj.controlpath_id.cpid_info
-            for dev_obj in device_obj_list:
-                # get cpid_obj, could be empty or only one value.
-                cpid_obj = ControlpathID.get_by_device_id_cpidinfo(
-                    context, dev_obj.id, cpid_info
+            new_driver_dev_obj = new_driver_devs[s]
+            old_driver_dev_obj = old_driver_devs[s]
+            if s not in host_devices:
+                LOG.warning(
+                    "Device with controlpath_id %(cpid)s is not found in "
+                    "host %(host)s.",
+                    {'cpid': s, 'host': host},
                 )
-                # find the one cpid_obj with cpid_info
-                if cpid_obj is not None:
-                    break
-
+                failed.add(s)
+                continue
+            dev_obj, cpid_obj = host_devices[s]
             changed_key = [
                 'std_board_info',
                 'vendor',
@@ -239,16 +557,21 @@ class ConductorManager:
                     old_driver_dev_obj, c_k
                 ):
                     setattr(dev_obj, c_k, getattr(new_driver_dev_obj, c_k))
-            dev_obj.save(context)
+            if dev_obj.obj_what_changed():
+                dev_obj.save(context)
             # diff the internal layer: driver_deployable
-            self.drv_deployable_make_diff(
+            failed_deps = self.drv_deployable_make_diff(
                 context,
                 dev_obj.id,
                 cpid_obj.id,
                 old_driver_dev_obj.deployable_list,
                 new_driver_dev_obj.deployable_list,
                 host_rp,
+                unchanged=unchanged_deployables.get(s),
             )
+            if failed_deps:
+                failed.add(s)
+        return failed
 
     def drv_deployable_make_diff(
         self,
@@ -258,75 +581,113 @@ class ConductorManager:
         old_driver_dep_list,
         new_driver_dep_list,
         host_rp,
+        unchanged=None,
     ):
         """Compare new driver-side deployable object list with the old one in
         one host.
+
+        :param unchanged: an optional set of names of the deployables known
+        to be unchanged, which are not differed.
+        :returns: a set of names of the deployables failed to be reported.
         """
         # use name to identify whether the deployable is the same.
         LOG.info("Start differing deploybles.")
-        new_name_list = [
-            driver_dep_obj.name for driver_dep_obj in new_driver_dep_list
-        ]
-        old_name_list = [
-            driver_dep_obj.name for driver_dep_obj in old_driver_dep_list
-        ]
-        same = set(new_name_list) & set(old_name_list)
-        added = set(new_name_list) - same
-        deleted = set(old_name_list) - same
+        failed = set()
+        new_driver_deps = _index_by(new_driver_dep_list, lambda obj: obj.name)
+        old_driver_deps = _index_by(old_driver_dep_list, lambda obj: obj.name)
+        same = new_driver_deps.keys() & old_driver_deps.keys()
+        added = new_driver_deps.keys() - same
+        deleted = old_driver_deps.keys() - same
         # name is deleted.
         for d in deleted:
-            old_driver_dep_obj = old_driver_dep_list[old_name_list.index(d)]
-            rp_uuid = self.get_rp_uuid_from_obj(old_driver_dep_obj)
-            old_driver_dep_obj.destroy(context, device_id)
-            self._delete_provider_and_sub_providers(context, rp_uuid)
+            old_driver_deps[d].destroy(context, device_id)
+        _raise_first_error(
+            self._delete_providers(
+                context, [old_driver_deps[d] for d in deleted]
+            )
+        )
         # name is added.
         for a in added:
-            new_driver_dep_obj = new_driver_dep_list[new_name_list.index(a)]
-            new_driver_dep_obj.create(context, device_id, cpid_id)
-            try:
-                self.get_placement_needed_info_and_report(
-                    context, new_driver_dep_obj, host_rp
-                )
-            except Exception as exc:
-                LOG.info(
-                    "Failed to add deployable %(deployable)s. "
-                    "Reason: %(reason)s",
-                    {'deployable': new_driver_dep_obj, 'reason': exc},
-                )
-                new_driver_dep_obj.destroy(context, device_id)
-                rp_uuid = self.get_rp_uuid_from_obj(new_driver_dep_obj)
-                # TODO(All): If report deployable data to Placement raise
-                # exception, we should revert driver deployable created in
-                # Cyborg and resources created in Placement to reduce the risk
-                # of data inconsistency here between Cyborg and Placement.
-                self._delete_provider_and_sub_providers(context, rp_uuid)
+            new_driver_deps[a].create(context, device_id, cpid_id)
+        reports = dict(
+            zip(
+                added,
+                self._report_deployables(
+                    context, [new_driver_deps[a] for a in added], host_rp
+                ),
+            )
+        )
+        futures.wait(reports.values())
+        for a, job in reports.items():
+            if job.exception() is None:
+                continue
+            new_driver_dep_obj = new_driver_deps[a]
+            LOG.info(
+                "Failed to add deployable %(deployable)s. Reason: %(reason)s",
+                {'deployable': new_driver_dep_obj, 'reason': job.exception()},
+            )
+            failed.add(a)
+            new_driver_dep_obj.destroy(context, device_id)
+            # TODO(All): If report deployable data to Placement raise
+            # exception, we should revert driver deployable created in
+            # Cyborg and resources created in Placement to reduce the risk
+            # of data inconsistency here between Cyborg and Placement.
+            _raise_first_error(
+                self._delete_providers(context, [new_driver_dep_obj])
+            )
+        same -= unchanged or set()
+        dep_objs = {}
+        if same:
+            dep_objs = _index_by(
+                Deployable.get_list_by_device_id(context, device_id),
+                lambda obj: obj.name,
+            )
+        placement_jobs = []
         for s in same:
             # get the driver_dep_obj, diff the driver_dep layer
-            new_driver_dep_obj = new_driver_dep_list[new_name_list.index(s)]
-            old_driver_dep_obj = old_driver_dep_list[old_name_list.index(s)]
+            new_driver_dep_obj = new_driver_deps[s]
+            old_driver_dep_obj = old_driver_deps[s]
             # get dep_obj, it won't be None because it stored before.
-            dep_obj = Deployable.get_by_name_deviceid(context, s, device_id)
+            dep_obj = dep_objs[s]
+            rp_uuid = self.get_rp_uuid_from_obj(new_driver_dep_obj)
             # update the driver_dep num_accelerators field
             if dep_obj.num_accelerators != new_driver_dep_obj.num_accelerators:
                 dep_obj.num_accelerators = new_driver_dep_obj.num_accelerators
                 dep_obj.save(context)
-                rp_uuid = self.get_rp_uuid_from_obj(new_driver_dep_obj)
                 attrs = new_driver_dep_obj.attribute_list
                 resource_class = [i.value for i in attrs if i.key == 'rc'][0]
                 inv_data = _gen_resource_inventory(
                     resource_class, dep_obj.num_accelerators
                 )
-                self.placement_client.update_inventory(rp_uuid, inv_data)
+                placement_jobs.append(
+                    self._placement_works.spawn(
+                        rp_uuid,
+                        self.placement_client.update_inventory,
+                        rp_uuid,
+                        inv_data,
+                    )
+                )
             # diff the internal layer: driver_attribute_list
             new_attribute_list = []
             if hasattr(new_driver_dep_obj, 'attribute_list'):
                 new_attribute_list = new_driver_dep_obj.attribute_list
+            placement_writes = []
             self.drv_attr_make_diff(
                 context,
                 dep_obj.id,
                 old_driver_dep_obj.attribute_list,
                 new_attribute_list,
+                dep_obj=dep_obj,
+                placement_writes=placement_writes,
             )
+            # The attribute writes of the provider run after its inventory
+            # update, never alongside it.
+            if placement_writes:
+                placement_jobs.append(
+                    self._placement_works.spawn(
+                        rp_uuid, _run_all, placement_writes
+                    )
+                )
             # diff the internal layer: driver_attach_hanle_list
             self.drv_ah_make_diff(
                 context,
@@ -335,66 +696,102 @@ class ConductorManager:
                 old_driver_dep_obj.attach_handle_list,
                 new_driver_dep_obj.attach_handle_list,
             )
+        _raise_first_error(placement_jobs)
+        return failed
 
     def drv_attr_make_diff(
-        self, context, dep_id, old_driver_attr_list, new_driver_attr_list
+        self,
+        context,
+        dep_id,
+        old_driver_attr_list,
+        new_driver_attr_list,
+        dep_obj=None,
+        placement_writes=None,
     ):
-        """Diff new driver-side Attribute Object lists with the old one."""
+        """Diff new driver-side Attribute Object lists with the old one.
+
+        :param dep_obj: the Deployable object of dep_id, if already loaded.
+        :param placement_writes: an optional list the placement writes are
+            appended to as callables, rather than made at once, for the
+            caller to run them in order with the other writes of the
+            provider.
+        """
         LOG.info("Start differing attributes.")
-        dep_obj = Deployable.get_by_id(context, dep_id)
-        driver_dep = DriverDeployable.get_by_name(context, dep_obj.name)
-        rp_uuid = self.get_rp_uuid_from_obj(driver_dep)
-        new_key_list = [
-            driver_attr_obj.key for driver_attr_obj in new_driver_attr_list
-        ]
-        old_key_list = [
-            driver_attr_obj.key for driver_attr_obj in old_driver_attr_list
-        ]
-        same = set(new_key_list) & set(old_key_list)
+        if dep_obj is None:
+            dep_obj = Deployable.get_by_id(context, dep_id)
+        rp_uuid = self.get_rp_uuid_from_obj(dep_obj)
+
+        def write(func, *args):
+            if placement_writes is None:
+                func(*args)
+            else:
+                placement_writes.append(functools.partial(func, *args))
+
+        new_driver_attrs = _index_by(new_driver_attr_list, lambda obj: obj.key)
+        old_driver_attrs = _index_by(old_driver_attr_list, lambda obj: obj.key)
+        same = new_driver_attrs.keys() & old_driver_attrs.keys()
         # key is deleted.
-        deleted = set(old_key_list) - same
+        deleted = old_driver_attrs.keys() - same
         for d in deleted:
-            old_driver_attr_obj = old_driver_attr_list[old_key_list.index(d)]
-            self.placement_client.delete_trait_by_name(
-                context, rp_uuid, old_driver_attr_obj.value
+            old_driver_attr_obj = old_driver_attrs[d]
+            write(
+                self.placement_client.delete_trait_by_name,
+                context,
+                rp_uuid,
+                old_driver_attr_obj.value,
             )
             old_driver_attr_obj.delete_by_key(context, dep_id, d)
         # key is added.
-        added = set(new_key_list) - same
+        added = new_driver_attrs.keys() - same
         for a in added:
-            new_driver_attr_obj = new_driver_attr_list[new_key_list.index(a)]
+            new_driver_attr_obj = new_driver_attrs[a]
             new_driver_attr_obj.create(context, dep_id)
-            self.placement_client.add_traits_to_rp(
-                rp_uuid, [new_driver_attr_obj.value]
+            write(
+                self.placement_client.add_traits_to_rp,
+                rp_uuid,
+                [new_driver_attr_obj.value],
             )
         # key is same, diff the value.
         for s in same:
             # value is not same, update
-            new_driver_attr_obj = new_driver_attr_list[new_key_list.index(s)]
-            old_driver_attr_obj = old_driver_attr_list[old_key_list.index(s)]
+            new_driver_attr_obj = new_driver_attrs[s]
+            old_driver_attr_obj = old_driver_attrs[s]
             if new_driver_attr_obj.value != old_driver_attr_obj.value:
                 attr_obj = Attribute.get_by_dep_key(context, dep_id, s)
                 attr_obj.value = new_driver_attr_obj.value
                 attr_obj.save(context)
                 # Update traits here.
                 if new_driver_attr_obj.key.startswith("trait"):
-                    self.placement_client.delete_trait_by_name(
-                        context, rp_uuid, old_driver_attr_obj.value
+                    write(
+                        self.placement_client.delete_trait_by_name,
+                        context,
+                        rp_uuid,
+                        old_driver_attr_obj.value,
                     )
-                    self.placement_client.add_traits_to_rp(
-                        rp_uuid, [new_driver_attr_obj.value]
+                    write(
+                        self.placement_client.add_traits_to_rp,
+                        rp_uuid,
+                        [new_driver_attr_obj.value],
                     )
                 # Update resource classes here.
                 if new_driver_attr_obj.key.startswith("rc"):
-                    self.placement_client.ensure_resource_classes(
-                        context, [new_driver_attr_obj.value]
+                    write(
+                        self.placement_client.ensure_resource_classes,
+                        context,
+                        [new_driver_attr_obj.value],
                     )
                     inv_data = _gen_resource_inventory(
                         new_driver_attr_obj.value, dep_obj.num_accelerators
                     )
-                    self.placement_client.update_inventory(rp_uuid, inv_data)
-                    self.placement_client.delete_rc_by_name(
-                        context, old_driver_attr_obj.value
+                    write(
+                        self.placement_client.update_inventory,
+                        rp_uuid,
+                        inv_data,
+                    )
+                    write(
+                        self.placement_client.delete_rc_by_name,
+                        context,
+                        old_driver_attr_obj.value,
                     )
 
     @classmethod
@@ -403,41 +800,68 @@ class ConductorManager:
     ):
         """Diff new driver-side AttachHandle Object lists with the old one."""
         LOG.info("Start differing attach_handles.")
-        new_info_list = [
-            driver_ah_obj.attach_info for driver_ah_obj in new_driver_ah_list
-        ]
-        old_info_list = [
-            driver_ah_obj.attach_info for driver_ah_obj in old_driver_ah_list
-        ]
-        same = set(new_info_list) & set(old_info_list)
-        LOG.info('new info list %s', new_info_list)
-        LOG.info('old info list %s', old_info_list)
+        new_driver_ahs = _index_by(
+            new_driver_ah_list, lambda obj: obj.attach_info
+        )
+        old_driver_ahs = _index_by(
+            old_driver_ah_list, lambda obj: obj.attach_info
+        )
+        same = new_driver_ahs.keys() & old_driver_ahs.keys()
+        LOG.debug('new info list %s', list(new_driver_ahs))
+        LOG.debug('old info list %s', list(old_driver_ahs))
         # attach_info is deleted.
-        deleted = set(old_info_list) - same
+        deleted = old_driver_ahs.keys() - same
         for d in deleted:
-            old_driver_ah_obj = old_driver_ah_list[old_info_list.index(d)]
+            old_driver_ah_obj = old_driver_ahs[d]
             old_driver_ah_obj.destroy(context, dep_id)
         # attach_info is added.
-        added = set(new_info_list) - same
+        added = new_driver_ahs.keys() - same
         for a in added:
-            new_driver_ah_obj = new_driver_ah_list[new_info_list.index(a)]
+            new_driver_ah_obj = new_driver_ahs[a]
             new_driver_ah_obj.create(context, dep_id, cpid_id)
-        # attach-info is same
-        for s in same:
-            # get attach_handle obj
-            new_driver_ah_obj = new_driver_ah_list[new_info_list.index(s)]
-            old_driver_ah_obj = old_driver_ah_list[old_info_list.index(s)]
-            changed_key = ['attach_type']
-            ah_obj = AttachHandle.get_ah_by_depid_attachinfo(
-                context, dep_id, s
+        # attach-info is same, only the changed ones need an update.
+        changed_key = ['attach_type']
+        changed = [
+            s
+            for s in same
+            if any(
+                getattr(new_driver_ahs[s], c_k)
+                != getattr(old_driver_ahs[s], c_k)
+                for c_k in changed_key
             )
+        ]
+        if not changed:
+            return
+        ah_objs = _index_by(
+            AttachHandle.get_ah_list_by_deployable_id(context, dep_id),
+            lambda obj: obj.attach_info,
+        )
+        for s in changed:
+            # get attach_handle obj
+            new_driver_ah_obj = new_driver_ahs[s]
+            ah_obj = ah_objs[s]
             for c_k in changed_key:
-                if getattr(new_driver_ah_obj, c_k) != getattr(
-                    old_driver_ah_obj, c_k
-                ):
-                    setattr(ah_obj, c_k, getattr(new_driver_ah_obj, c_k))
+                setattr(ah_obj, c_k, getattr(new_driver_ah_obj, c_k))
             ah_obj.save(context)
 
+    def _get_host_devices(self, context, hostname):
+        """Map the cpid_info of every Device in one host to its Device and
+        ControlpathID objects, using one query for each table.
+        """
+        dev_objs = {
+            dev_obj.id: dev_obj
+            for dev_obj in Device.get_list_by_hostname(context, hostname)
+        }
+        if not dev_objs:
+            return {}
+        cpid_objs = ControlpathID.list(context, {'device_id': list(dev_objs)})
+        host_devices = {}
+        for cpid_obj in cpid_objs:
+            host_devices.setdefault(
+                cpid_obj.cpid_info, (dev_objs[cpid_obj.device_id], cpid_obj)
+            )
+        return host_devices
+
     def _get_root_provider(self, context, hostname):
         try:
             provider = self.placement_client.get(
@@ -450,32 +874,24 @@ class ConductorManager:
                 resource_provider=hostname
             )
 
-    def _get_sub_provider(self, context, parent, name):
-        old_sub_pr_uuid = str(uuid.uuid3(uuid.NAMESPACE_DNS, str(name)))
-        new_sub_pr_uuid = self.placement_client.ensure_resource_provider(
-            context, old_sub_pr_uuid, name=name, parent_provider_uuid=parent
-        )
-        if old_sub_pr_uuid == new_sub_pr_uuid:
-            return new_sub_pr_uuid
-        else:
-            raise exception.Conflict()
-
     def provider_report(
         self, context, name, resource_class, traits, total, parent
     ):
-        self.placement_client.ensure_resource_classes(
-            context, [resource_class]
-        )
-        sub_pr_uuid = self._get_sub_provider(context, parent, name)
+        sub_pr_uuid = str(uuid.uuid3(uuid.NAMESPACE_DNS, str(name)))
         result = _gen_resource_inventory(resource_class, total)
-        self.placement_client.update_inventory(sub_pr_uuid, result)
         # traits = ["CUSTOM_FPGA_INTEL", "CUSTOM_FPGA_INTEL_ARRIA10",
         #           "CUSTOM_FPGA_INTEL_REGION_UUID",
         #           "CUSTOM_FPGA_FUNCTION_ID_INTEL_UUID",
         #           "CUSTOM_PROGRAMMABLE",
         #           "CUSTOM_FPGA_NETWORK"]
-        self.placement_client.add_traits_to_rp(sub_pr_uuid, traits)
-        return sub_pr_uuid
+        return self.placement_client.sync_provider(
+            context,
+            sub_pr_uuid,
+            result,
+            traits,
+            name=name,
+            parent_provider_uuid=parent,
+        )
 
     def get_placement_needed_info_and_report(
         self, context, obj, parent_uuid=None
@@ -492,6 +908,55 @@ class ConductorManager:
         dep_obj["rp_uuid"] = rp_uuid
         dep_obj.save(context)
 
+    def _report_deployables(self, context, driver_dep_objs, host_rp):
+        """Report the providers of deployables concurrently.
+
+        :returns: the futures of the reports, in the order of the
+            deployables.
+        """
+        return [
+            self._placement_works.spawn(
+                self.get_rp_uuid_from_obj(driver_dep_obj),
+                self.get_placement_needed_info_and_report,
+                context,
+                driver_dep_obj,
+                host_rp,
+            )
+            for driver_dep_obj in driver_dep_objs
+        ]
+
+    def _delete_providers(self, context, driver_dep_objs):
+        """Delete the providers of deployables concurrently.
+
+        :returns: the futures of the deletions, all done.
+        """
+        jobs = []
+        for driver_dep_obj in driver_dep_objs:
+            rp_uuid = self.get_rp_uuid_from_obj(driver_dep_obj)
+            jobs.append(
+                self._placement_works.spawn(
+                    rp_uuid,
+                    self._delete_provider_and_sub_providers,
+                    context,
+                    rp_uuid,
+                )
+            )
+        futures.wait(jobs)
+        return jobs
+
+    def _load_provider_tree(self, context, host_rp):
+        """Cache the generations of all the providers of a host at once,
+        rather than looking each sub provider up when reporting it.
+        """
+        try:
+            self.placement_client.get_providers_in_tree(context, host_rp)
+        except (
+            exception.ResourceProviderRetrievalFailed,
+            exception.PlacementServerError,
+        ):
+            # Each provider is then looked up on its own.
+            pass
+
     def get_rp_uuid_from_obj(self, obj):
         return str(uuid.uuid3(uuid.NAMESPACE_DNS, str(obj.name)))
 
@@ -510,6 +975,46 @@ class ConductorManager:
                     break
 
 
+def _run_all(funcs):
+    """Call functions one after the other."""
+    for func in funcs:
+        func()
+
+
+def _raise_first_error(jobs):
+    """Wait for jobs, then raise the exception of the first one failed."""
+    jobs = list(jobs)
+    futures.wait(jobs)
+    for job in jobs:
+        job.result()
+
+
+def _index_by(objs, key):
+    """Index objects by key, keeping the first object of a duplicated key."""
+    index = {}
+    for obj in objs:
+        index.setdefault(key(obj), obj)
+    return index
+
+
+def _fingerprint_devices(driver_device_list):
+    """Fingerprint driver_device objects and their deployables by cpid_info.
+
+    :returns: a dict of cpid_info to a dict holding the device fingerprint
+    and the fingerprints of its deployables by name.
+    """
+    return {
+        driver_dev_obj.controlpath_id.cpid_info: {
+            'device': driver_dev_obj.fingerprint(),
+            'deployables': {
+                driver_dep_obj.name: driver_dep_obj.fingerprint()
+                for driver_dep_obj in driver_dev_obj.deployable_list
+            },
+        }
+        for driver_dev_obj in driver_device_list
+    }
+
+
 def _gen_resource_inventory(resource_class, total):
     return {
         resource_class: {
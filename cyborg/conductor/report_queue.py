@@ -0,0 +1,94 @@
+# Copyright 2026 The Cyborg Authors.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""A queue of the device reports of the agents, per host.
+
+Agents cast their full reports, which the conductor applies in the
+background. Only the latest report of a host waiting to be applied is
+kept: a report is a snapshot of all the devices of the host, so applying
+one it superseded would be wasted work. The reports of one host are
+applied one after the other, those of different hosts concurrently.
+"""
+
+import threading
+
+from concurrent import futures
+
+from oslo_log import log as logging
+
+
+LOG = logging.getLogger(__name__)
+
+
+class ReportQueue:
+    """Apply the latest report of each host, one host at a time each.
+
+    :param max_workers: the number of hosts whose reports are applied
+        concurrently.
+    """
+
+    def __init__(self, max_workers):
+        self._executor = futures.ThreadPoolExecutor(max_workers=max_workers)
+        self._cond = threading.Condition()
+        # The job waiting to run for each host.
+        self._pending = {}
+        # The hosts with a job running, or about to.
+        self._busy = set()
+        # The lock held while a report of each host is applied, whether
+        # queued or not.
+        self._locks = {}
+
+    def put(self, hostname, func, *args, **kwargs):
+        """Queue a job for a host, superseding the one waiting, if any."""
+        with self._cond:
+            if hostname in self._pending:
+                LOG.info(
+                    "Dropping a report of host %s superseded by a newer one.",
+                    hostname,
+                )
+            self._pending[hostname] = (func, args, kwargs)
+            if hostname in self._busy:
+                return
+            self._busy.add(hostname)
+        self._executor.submit(self._run, hostname)
+
+    def _run(self, hostname):
+        while True:
+            with self._cond:
+                job = self._pending.pop(hostname, None)
+                if job is None:
+                    self._busy.discard(hostname)
+                    self._cond.notify_all()
+                    return
+            func, args, kwargs = job
+            try:
+                func(*args, **kwargs)
+            except Exception:
+                LOG.exception("Failed to apply a report of host %s.", hostname)
+
+    def lock(self, hostname):
+        """Return the lock serializing the reports of a host."""
+        with self._cond:
+            return self._locks.setdefault(hostname, threading.RLock())
+
+    def wait(self, hostname, timeout=None):
+        """Wait until no report of a host is queued or being applied.
+
+        :returns: False if the timeout expired first.
+        """
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: hostname not in self._busy, timeout
+            )
@@ -33,24 +33,42 @@ class ConductorAPI:
     API version history:
 
     |    1.0 - Initial version.
+    |    1.1 - Add report_data_delta.
+    |    1.2 - Add arq_create_bulk.
+    |    1.3 - Add queue_report_data.
+    |    1.4 - Add forwarded to queue_report_data and report_data_delta.
 
     """
 
-    RPC_API_VERSION = '1.0'
+    RPC_API_VERSION = '1.4'
 
     def __init__(self, topic=None):
         super().__init__()
         self.topic = topic or constants.CONDUCTOR_TOPIC
         target = messaging.Target(topic=self.topic, version='1.0')
         serializer = objects_base.CyborgObjectSerializer()
+        version_cap = CONF.upgrade_levels.conductor or self.RPC_API_VERSION
         self.client = rpc.get_client(
-            target, version_cap=self.RPC_API_VERSION, serializer=serializer
+            target, version_cap=version_cap, serializer=serializer
         )
 
     def report_data(self, context, hostname, driver_device_list):
         """Signal to conductor service to update the cyborg DB
+
+        The report is cast, the conductor applying it in the background,
+        unless ``[upgrade_levels] conductor`` caps the RPC API below 1.3.
+
         :param context: request context.
         """
+        if self.client.can_send_version('1.3'):
+            cctxt = self.client.prepare(topic=self.topic, version='1.3')
+            cctxt.cast(
+                context,
+                'queue_report_data',
+                hostname=hostname,
+                driver_device_list=driver_device_list,
+            )
+            return
         cctxt = self.client.prepare(topic=self.topic)
         cctxt.call(
             context,
@@ -59,6 +77,67 @@ class ConductorAPI:
             driver_device_list=driver_device_list,
         )
 
+    def report_data_delta(
+        self, context, hostname, fingerprints, driver_device_list
+    ):
+        """Signal to conductor service to update the cyborg DB with the
+        devices changed since the last accepted report.
+
+        :param context: request context.
+        :param hostname: agent's hostname.
+        :param fingerprints: a dict of cpid_info to fingerprint of every
+            device discovered in the host.
+        :param driver_device_list: the changed driver_device objects.
+        :returns: False if conductor needs a full report instead.
+        """
+        cctxt = self.client.prepare(topic=self.topic, version='1.1')
+        return cctxt.call(
+            context,
+            'report_data_delta',
+            hostname=hostname,
+            fingerprints=fingerprints,
+            driver_device_list=driver_device_list,
+        )
+
+    def forward_report_data(
+        self, context, server, hostname, driver_device_list
+    ):
+        """Forward a full report of a host to the conductor owning it.
+
+        :param server: the hostname of the conductor owning the host.
+        """
+        cctxt = self.client.prepare(
+            topic=self.topic, server=server, version='1.4'
+        )
+        cctxt.cast(
+            context,
+            'queue_report_data',
+            hostname=hostname,
+            driver_device_list=driver_device_list,
+            forwarded=True,
+        )
+
+    def forward_report_data_delta(
+        self, context, server, hostname, fingerprints, driver_device_list
+    ):
+        """Forward an incremental report of a host to the conductor owning
+        it.
+
+        :param server: the hostname of the conductor owning the host.
+        :returns: False if the owner needs a full report instead.
+        """
+        cctxt = self.client.prepare(
+            topic=self.topic, server=server, version='1.4'
+        )
+        return cctxt.call(
+            context,
+            'report_data_delta',
+            hostname=hostname,
+            fingerprints=fingerprints,
+            driver_device_list=driver_device_list,
+            forwarded=True,
+        )
+
     def device_profile_create(self, context, obj_devprof):
         """Signal to conductor service to create a device_profile.
 
@@ -93,6 +172,32 @@ class ConductorAPI:
             context, 'arq_create', obj_extarq=obj_extarq, devprof_id=devprof_id
         )
 
+    def arq_create_bulk(self, context, obj_extarqs, devprof_id):
+        """Signal to conductor service to create accelerator requests
+        of one device profile in a single call.
+
+        Falls back to one arq_create call per accelerator request when
+        the conductor is too old to support it.
+
+        :param context: request context.
+        :param obj_extarqs: a list of created (but not saved)
+        accelerator_requests objects.
+        :param devprof_id: a device profile id
+        :returns: a list of saved accelerator_requests objects.
+        """
+        if not self.client.can_send_version('1.2'):
+            return [
+                self.arq_create(context, obj_extarq, devprof_id)
+                for obj_extarq in obj_extarqs
+            ]
+        cctxt = self.client.prepare(topic=self.topic, version='1.2')
+        return cctxt.call(
+            context,
+            'arq_create_bulk',
+            obj_extarqs=obj_extarqs,
+            devprof_id=devprof_id,
+        )
+
     # TODO(sean-k-mooney): Remove arq_delete_by_uuid and
     # arq_delete_by_instance_uuid in RPC API v2 (after 2027.1). ARQ
     # deletion is now performed directly in the API layer to enforce
@@ -24,6 +24,7 @@ from cyborg.conf import glance
 from cyborg.conf import nova
 from cyborg.conf import placement
 from cyborg.conf import service_token
+from cyborg.conf import upgrade_levels
 
 
 CONF = cfg.CONF
@@ -37,3 +38,4 @@ service_token.register_opts(CONF)
 glance.register_opts(CONF)
 nova.register_opts(CONF)
 placement.register_opts(CONF)
+upgrade_levels.register_opts(CONF)
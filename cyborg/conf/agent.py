@@ -55,6 +55,74 @@ opts = [
             'back to using CONF.host.'
         ),
     ),
+    cfg.IntOpt(
+        'discovery_workers',
+        default=4,
+        min=1,
+        help=_(
+            'Number of accelerator drivers whose devices are discovered '
+            'concurrently on each resource update.'
+        ),
+    ),
+    cfg.IntOpt(
+        'discovery_timeout',
+        default=30,
+        min=0,
+        help=_(
+            'Seconds a resource update waits for the discovery of an '
+            'accelerator driver. The devices last discovered by a driver '
+            'that does not finish in time are reported again, and its '
+            'discovery is left to finish in the background. Set to 0 '
+            'to wait without limit.'
+        ),
+    ),
+    cfg.BoolOpt(
+        'watch_device_events',
+        default=False,
+        help=_(
+            'Watch the kernel uevents of PCI devices and mediated devices, '
+            'and update the resources of the changed devices as soon as '
+            'they change, rather than on the next periodic update. The '
+            'periodic update then only runs every '
+            'device_reconcile_interval seconds.'
+        ),
+    ),
+    cfg.FloatOpt(
+        'device_event_debounce',
+        default=1.0,
+        min=0,
+        help=_(
+            'Seconds the device events following a first one are waited '
+            'for, to update the resources of all of them at once.'
+        ),
+    ),
+    cfg.IntOpt(
+        'device_reconcile_interval',
+        default=600,
+        min=0,
+        help=_(
+            'Seconds between the periodic updates of all resources while '
+            'device events are watched.'
+        ),
+    ),
+    cfg.StrOpt(
+        'bitstream_cache_dir',
+        default='$state_path/bitstreams',
+        help=_(
+            'Directory where the FPGA bitstreams downloaded from Glance are '
+            'cached, keyed by image and checksum.'
+        ),
+    ),
+    cfg.IntOpt(
+        'bitstream_cache_size',
+        default=1024,
+        min=0,
+        help=_(
+            'Size in MiB of the FPGA bitstream cache. The bitstreams used '
+            'least recently are evicted beyond it. Set to 0 to download '
+            'the bitstream on every program request.'
+        ),
+    ),
 ]
 
 opt_group = cfg.OptGroup(
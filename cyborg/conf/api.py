@@ -66,6 +66,17 @@ opts = [
         default="api-paste.ini",
         help="Configuration file for WSGI definition of API.",
     ),
+    cfg.IntOpt(
+        'max_limit',
+        default=1000,
+        min=1,
+        help=_(
+            "The maximum number of items returned in a single response "
+            "from a collection resource. Requests for a larger page, or "
+            "without a limit, are capped to this value. Only applies to "
+            "API microversion 2.4 and later."
+        ),
+    ),
 ]
 
 opt_group = cfg.OptGroup(
@@ -19,6 +19,7 @@ import os
 import socket
 
 from oslo_config import cfg
+from oslo_config import types
 
 from cyborg.common.i18n import _
 
@@ -62,6 +63,41 @@ service_opts = [
             'of concurrent connections using this option.'
         ),
     ),
+    cfg.IntOpt(
+        'host_report_workers',
+        default=4,
+        min=1,
+        help=_(
+            'The number of hosts whose device reports the conductor '
+            'applies concurrently. The reports of one host are applied one '
+            'after the other, and a report waiting to be applied is dropped '
+            'when a newer one of the same host arrives.'
+        ),
+    ),
+    cfg.IntOpt(
+        'conductor_heartbeat_timeout',
+        default=180,
+        min=1,
+        help=_(
+            'The number of seconds after its last heartbeat a conductor is '
+            'considered gone. The compute hosts are partitioned between '
+            'the conductors alive, each applying the device reports of its '
+            'own hosts. Conductors heartbeat every periodic_interval '
+            'seconds.'
+        ),
+    ),
+    cfg.Opt(
+        'client_concurrency',
+        type=types.Dict(value_type=types.Integer(min=1)),
+        default={},
+        help=_(
+            'The number of requests each cyborg process sends at once at '
+            'most to a service, keyed by service type, e.g. '
+            '"compute:8,placement:16". The clients of a service share its '
+            'connections and token in each process, and send requests '
+            'without limit to the services not listed.'
+        ),
+    ),
     cfg.IntOpt(
         'bind_timeout',
         default=60,
@@ -69,6 +105,63 @@ service_opts = [
     ),
 ]
 
+cache_opts = [
+    cfg.IntOpt(
+        'device_profile_cache_size',
+        default=128,
+        min=0,
+        help=_(
+            'The number of device profiles each cyborg process keeps in '
+            'memory, so that the ARQs of a device profile are loaded '
+            'without reading and parsing it again. Set to 0 to disable '
+            'the cache.'
+        ),
+    ),
+    cfg.IntOpt(
+        'device_profile_cache_ttl',
+        default=300,
+        min=0,
+        help=_(
+            'The number of seconds a device profile is kept in the cache '
+            'of a process. Changes made to a device profile by another '
+            'process may be missed for this long. Set to 0 to keep them '
+            'until evicted.'
+        ),
+    ),
+    cfg.IntOpt(
+        'bitstream_md_cache_size',
+        default=256,
+        min=0,
+        help=_(
+            'The number of lookups of FPGA bitstream images in Glance, by '
+            'function id or bitstream id, each cyborg process keeps in '
+            'memory, so that binding an ARQ of a known function does not '
+            'query Glance again. Set to 0 to disable the cache.'
+        ),
+    ),
+    cfg.IntOpt(
+        'bitstream_md_cache_ttl',
+        default=300,
+        min=0,
+        help=_(
+            'The number of seconds the image found by a lookup of an FPGA '
+            'bitstream is kept in the cache. Set to 0 to keep them until '
+            'evicted.'
+        ),
+    ),
+    cfg.IntOpt(
+        'bitstream_md_cache_miss_ttl',
+        default=30,
+        min=0,
+        help=_(
+            'The number of seconds a lookup of an FPGA bitstream that '
+            'found no image, or more than one, is kept in the cache, so '
+            'that a bitstream uploaded to Glance is used within this '
+            'long. Set to 0 to keep them until evicted.'
+        ),
+    ),
+]
+
 path_opts = [
     cfg.StrOpt(
         'pybasedir',
@@ -94,10 +187,11 @@ path_opts = [
 def register_opts(conf):
     conf.register_opts(exc_log_opts)
     conf.register_opts(service_opts)
+    conf.register_opts(cache_opts)
     conf.register_opts(path_opts)
 
 
-DEFAULT_OPTS = exc_log_opts + service_opts + path_opts
+DEFAULT_OPTS = exc_log_opts + service_opts + cache_opts + path_opts
 
 
 def list_opts():
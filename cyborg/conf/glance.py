@@ -14,6 +14,7 @@
 
 from keystoneauth1 import loading as ks_loading
 from oslo_config import cfg
+from oslo_utils import units
 
 from cyborg.conf import utils as confutils
 
@@ -36,6 +37,55 @@ Enable glance operation retries.
 
 Specifies the number of retries when uploading / downloading
 an image to / from glance. 0 means no retries.
+""",
+    ),
+    cfg.BoolOpt(
+        'verify_download',
+        default=True,
+        help="""
+Verify the data of the images downloaded from glance.
+
+The data is hashed as it is downloaded and compared to the hash glance has
+of the image, the os_hash_value or the checksum of older images. A
+download that does not match fails.
+""",
+    ),
+    cfg.IntOpt(
+        'download_chunk_size',
+        default=4 * units.Mi,
+        min=units.Ki,
+        help="""
+The minimum number of bytes written to disk at once when downloading an
+image. The chunks received from glance are grouped up to this size.
+""",
+    ),
+    cfg.IntOpt(
+        'download_prefetch_chunks',
+        default=4,
+        min=0,
+        help="""
+The number of chunks of an image read from glance ahead of the one written
+to disk, so that the network reads overlap the disk writes. 0 reads and
+writes in turn.
+""",
+    ),
+    cfg.IntOpt(
+        'download_sync_size',
+        default=64,
+        min=0,
+        help="""
+The number of MiB of an image downloaded to a file between two syncs of
+the file to disk. Syncing as the download goes spreads the writeback over
+the download rather than stalling at its end. 0 syncs once the download
+is done.
+""",
+    ),
+    cfg.BoolOpt(
+        'download_drop_cache',
+        default=False,
+        help="""
+Drop the images downloaded to a file from the page cache once synced to
+disk, so that large images do not evict the pages of other processes.
 """,
     ),
 ]
@@ -13,6 +13,7 @@
 from keystoneauth1 import loading as ks_loading
 from oslo_config import cfg
 
+from cyborg.common.i18n import _
 from cyborg.conf import utils as confutils
 
 
@@ -26,15 +27,67 @@ nova_group = cfg.OptGroup(
 )
 
 
+nova_opts = [
+    cfg.FloatOpt(
+        'event_batch_window',
+        default=0.1,
+        min=0,
+        help=_(
+            'The number of seconds the accelerator-request-bound events '
+            'following a first one are waited for, to be sent to nova in '
+            'a single request. Set to 0 to send the events of each '
+            'instance in its own request as soon as its binds complete.'
+        ),
+    ),
+    cfg.IntOpt(
+        'event_batch_size',
+        default=100,
+        min=1,
+        help=_('The number of events sent to nova in a request at most.'),
+    ),
+    cfg.IntOpt(
+        'event_queue_size',
+        default=1000,
+        min=1,
+        help=_(
+            'The number of instances whose events wait to be sent to nova '
+            'at most. The binds completing once the queue is full wait '
+            'for room in it.'
+        ),
+    ),
+    cfg.IntOpt(
+        'event_retries',
+        default=3,
+        min=0,
+        help=_(
+            'The number of times the sending of events to nova failing '
+            'with a server error is retried.'
+        ),
+    ),
+    cfg.FloatOpt(
+        'event_retry_interval',
+        default=0.5,
+        min=0,
+        help=_(
+            'The base number of seconds waited before retrying to send '
+            'events to nova. The wait doubles on each retry and is '
+            'randomized.'
+        ),
+    ),
+]
+
+
 def register_opts(conf):
     conf.register_group(nova_group)
+    conf.register_opts(nova_opts, group=nova_group)
     confutils.register_ksa_opts(conf, nova_group, DEFAULT_SERVICE_TYPE)
 
 
 def list_opts():
     return {
         nova_group.name: (
-            ks_loading.get_session_conf_options()
+            nova_opts
+            + ks_loading.get_session_conf_options()
             + ks_loading.get_auth_common_conf_options()
             + ks_loading.get_auth_plugin_conf_options('password')
             + ks_loading.get_auth_plugin_conf_options('v2password')
@@ -13,6 +13,7 @@
 from keystoneauth1 import loading as ks_loading
 from oslo_config import cfg
 
+from cyborg.common.i18n import _
 from cyborg.conf import utils as confutils
 
 
@@ -25,16 +26,64 @@ placement_group = cfg.OptGroup(
     help="Configuration options for connecting to the placement API service",
 )
 
+placement_opts = [
+    cfg.IntOpt(
+        'report_workers',
+        default=8,
+        min=1,
+        help=_(
+            'The number of resource providers the conductor reports to '
+            'placement concurrently. The reports of one resource provider '
+            'are always made one after the other.'
+        ),
+    ),
+    cfg.IntOpt(
+        'request_retries',
+        default=3,
+        min=0,
+        help=_(
+            'The number of times a placement GET, PUT or DELETE request '
+            'failing with a server error is retried. POST requests are not '
+            'retried.'
+        ),
+    ),
+    cfg.FloatOpt(
+        'retry_interval',
+        default=0.5,
+        min=0,
+        help=_(
+            'The base number of seconds waited before retrying a placement '
+            'request. The wait doubles on each retry and is randomized, so '
+            'that concurrent reports do not retry in lockstep.'
+        ),
+    ),
+    cfg.IntOpt(
+        'provider_cache_ttl',
+        default=300,
+        min=0,
+        help=_(
+            'The number of seconds each cyborg process trusts what it '
+            'cached of a resource provider, a trait or a resource class, '
+            'before reading it from placement again. The changes made by '
+            'another service or an operator, which the cache does not '
+            'see, are corrected within this long. Set to 0 to disable the '
+            'cache.'
+        ),
+    ),
+]
+
 
 def register_opts(conf):
     conf.register_group(placement_group)
+    conf.register_opts(placement_opts, group=placement_group)
     confutils.register_ksa_opts(conf, placement_group, DEFAULT_SERVICE_TYPE)
 
 
 def list_opts():
     return {
         PLACEMENT_CONF_SECTION: (
-            ks_loading.get_session_conf_options()
+            placement_opts
+            + ks_loading.get_session_conf_options()
             + ks_loading.get_auth_common_conf_options()
             + ks_loading.get_auth_plugin_conf_options('password')
             + ks_loading.get_auth_plugin_conf_options('v2password')
@@ -0,0 +1,49 @@
+# Copyright 2026 The Cyborg Authors.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from oslo_config import cfg
+
+
+upgrade_group = cfg.OptGroup(
+    'upgrade_levels',
+    title='Upgrade levels options',
+    help="""
+Configuration options for the RPC API versions sent between the services
+during a rolling upgrade.
+""",
+)
+
+upgrade_levels_opts = [
+    cfg.StrOpt(
+        'conductor',
+        help="""
+The highest version of the conductor RPC API the other services send.
+
+Set it to the version of the oldest conductor running, e.g. ``1.2``, while
+the conductors are upgraded, so that the others only send the messages the
+old conductors understand. Unset once all the conductors are upgraded, to
+send the latest version.
+""",
+    ),
+]
+
+
+def register_opts(conf):
+    conf.register_group(upgrade_group)
+    conf.register_opts(upgrade_levels_opts, group=upgrade_group)
+
+
+def list_opts():
+    return {upgrade_group: upgrade_levels_opts}
@@ -89,6 +89,12 @@ class Connection(metaclass=abc.ABCMeta):
     ):
         """Get requested devices by filters."""
 
+    @abc.abstractmethod
+    def device_tree_get_by_hostname(self, context, hostname):
+        """Get the devices of a host with their controlpath_ids,
+        deployables, attributes and attach_handles.
+        """
+
     @abc.abstractmethod
     def device_update(self, context, uuid, values):
         """Update a device."""
@@ -226,6 +232,14 @@ class Connection(metaclass=abc.ABCMeta):
     def extarq_create(self, context, values):
         """Create a new extarq."""
 
+    @abc.abstractmethod
+    def extarq_create_many(self, context, values_list):
+        """Create several extarqs in a single transaction.
+
+        :param values_list: a list of dicts of the values of each extarq.
+        :returns: the created extarqs, in the order of values_list.
+        """
+
     @abc.abstractmethod
     def extarq_delete(self, context, uuid, project_id=None):
         """Delete an extarq."""
@@ -236,6 +250,29 @@ class Connection(metaclass=abc.ABCMeta):
     ):
         """Update an extarq."""
 
+    @abc.abstractmethod
+    def extarq_update_many(self, context, values_by_uuid, state_scope=None):
+        """Update several extarqs with a single conditional UPDATE.
+
+        :param values_by_uuid: a dict of extarq uuid to the values to set.
+        :param state_scope: if given, the states the extarqs must all be
+            in. Nothing is updated otherwise.
+        :raises: ARQBadState if an extarq is not in state_scope.
+        :raises: ResourceNotFound if an extarq does not exist.
+        """
+
+    @abc.abstractmethod
+    def extarq_update_state(self, context, uuid, values, state_scope=None):
+        """Compare and swap the state of an extarq.
+
+        :param values: the values to set, including the new state.
+        :param state_scope: if given, the states the extarq must be in to
+            be updated.
+        :returns: a tuple of the number of rows updated and the state of
+            the extarq: the new state if it was updated, else its current
+            state, or None if it does not exist.
+        """
+
     @abc.abstractmethod
     def extarq_list(
         self,
@@ -245,6 +282,7 @@ class Connection(metaclass=abc.ABCMeta):
         instance_uuid=None,
         limit=None,
         marker=None,
+        state=None,
     ):
         """Get requested list of extarqs.
 
@@ -257,6 +295,8 @@ class Connection(metaclass=abc.ABCMeta):
         :param limit: Maximum number of rows to return.
         :param marker: The last-seen ``id`` value; rows after this
             marker are returned (keyset pagination).
+        :param state: Filter by state. Pass a list to match any of
+            several states.
         """
 
     @abc.abstractmethod
@@ -301,6 +341,14 @@ class Connection(metaclass=abc.ABCMeta):
     def attach_handle_update(self, context, uuid, values):
         """Update an attach_handle"""
 
+    @abc.abstractmethod
+    def attach_handle_allocate(self, context, deployable_id):
+        """Allocate an unused attach_handle of a deployable"""
+
+    @abc.abstractmethod
+    def attach_handle_allocate_many(self, context, deployable_id, count):
+        """Allocate count unused attach_handles of a deployable at once"""
+
     # control_path_id
     @abc.abstractmethod
     def control_path_create(self, context, values):
@@ -334,3 +382,27 @@ class Connection(metaclass=abc.ABCMeta):
     @abc.abstractmethod
     def control_path_update(self, context, uuid, values):
         """Update a control path id"""
+
+    # conductor
+    @abc.abstractmethod
+    def conductor_register(self, context, hostname):
+        """Mark a conductor online, recording its heartbeat."""
+
+    @abc.abstractmethod
+    def conductor_unregister(self, context, hostname):
+        """Mark a conductor offline."""
+
+    @abc.abstractmethod
+    def conductor_list_alive(self, context, timeout):
+        """Get the hostnames of the online conductors whose last heartbeat
+        is at most timeout seconds old.
+        """
+
+    # host report
+    @abc.abstractmethod
+    def host_report_set(self, context, hostname, report_id):
+        """Record the id of the last full device report of a host."""
+
+    @abc.abstractmethod
+    def host_report_get(self, context, hostname):
+        """Get the id of the last full device report of a host, or None."""
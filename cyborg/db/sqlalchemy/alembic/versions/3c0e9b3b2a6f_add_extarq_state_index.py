@@ -0,0 +1,23 @@
+"""add-extarq-state-index
+
+Revision ID: 3c0e9b3b2a6f
+Revises: 6c77bd6afea5
+Create Date: 2026-10-18 10:12:40.271522
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '3c0e9b3b2a6f'
+down_revision = '6c77bd6afea5'
+
+
+def upgrade():
+    op.create_index(
+        'extArqs_state_idx',
+        'extended_accelerator_requests',
+        ['state'],
+        unique=False,
+    )
@@ -0,0 +1,47 @@
+"""add-lookup-indexes
+
+Revision ID: 8f3b2c6d1e4a
+Revises: 3c0e9b3b2a6f
+Create Date: 2026-10-18 14:03:51.846210
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '8f3b2c6d1e4a'
+down_revision = '3c0e9b3b2a6f'
+
+
+def upgrade():
+    op.create_index(
+        'devices_hostname_idx', 'devices', ['hostname'], unique=False
+    )
+    op.create_index(
+        'deployables_name_device_id_idx',
+        'deployables',
+        ['name', 'device_id'],
+        unique=False,
+    )
+    op.create_index(
+        'deployables_rp_uuid_idx', 'deployables', ['rp_uuid'], unique=False
+    )
+    op.create_index(
+        'controlpath_ids_device_id_cpid_info_idx',
+        'controlpath_ids',
+        ['device_id', 'cpid_info'],
+        unique=False,
+    )
+    op.create_index(
+        'attach_handles_deployable_id_in_use_idx',
+        'attach_handles',
+        ['deployable_id', 'in_use'],
+        unique=False,
+    )
+    op.create_index(
+        'attach_handles_deployable_id_attach_info_idx',
+        'attach_handles',
+        ['deployable_id', 'attach_info'],
+        unique=False,
+    )
@@ -0,0 +1,31 @@
+"""add-conductors-table
+
+Revision ID: b5e1d4a7c2f9
+Revises: 8f3b2c6d1e4a
+Create Date: 2026-10-18 16:22:09.513847
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5e1d4a7c2f9'
+down_revision = '8f3b2c6d1e4a'
+
+
+def upgrade():
+    op.create_table(
+        'conductors',
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('hostname', sa.String(length=255), nullable=False),
+        sa.Column('online', sa.Boolean(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('hostname', name='uniq_conductors0hostname'),
+        mysql_ENGINE='InnoDB',
+        mysql_DEFAULT_CHARSET='UTF8',
+    )
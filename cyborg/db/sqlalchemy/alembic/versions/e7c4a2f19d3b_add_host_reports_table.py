@@ -0,0 +1,31 @@
+"""add-host-reports-table
+
+Revision ID: e7c4a2f19d3b
+Revises: b5e1d4a7c2f9
+Create Date: 2026-10-18 21:04:37.218645
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7c4a2f19d3b'
+down_revision = 'b5e1d4a7c2f9'
+
+
+def upgrade():
+    op.create_table(
+        'host_reports',
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('hostname', sa.String(length=255), nullable=False),
+        sa.Column('report_id', sa.String(length=36), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('hostname', name='uniq_host_reports0hostname'),
+        mysql_ENGINE='InnoDB',
+        mysql_DEFAULT_CHARSET='UTF8',
+    )
@@ -16,6 +16,7 @@
 """SQLAlchemy storage backend."""
 
 import copy
+import datetime
 import uuid
 
 from oslo_db import api as oslo_db_api
@@ -26,6 +27,7 @@ from oslo_log import log
 from oslo_utils import strutils
 from oslo_utils import timeutils
 from oslo_utils import uuidutils
+from sqlalchemy import case
 from sqlalchemy.orm import load_only
 from sqlalchemy.orm.exc import NoResultFound
 
@@ -45,6 +47,20 @@ def get_backend():
     return Connection()
 
 
+def _supports_skip_locked(session):
+    """Whether the database supports SELECT ... FOR UPDATE SKIP LOCKED."""
+    dialect = session.get_bind().dialect
+    version = dialect.server_version_info or ()
+    if dialect.name == 'postgresql':
+        return version >= (9, 5)
+    if dialect.name == 'mysql':
+        if dialect.is_mariadb:
+            return version >= (10, 6)
+        return version >= (8, 0, 1)
+    # SQLite has no row locks, its writers are serialized anyway.
+    return False
+
+
 def model_query(context, model, *args, **kwargs):
     """Query helper for simpler session usage.
 
@@ -186,7 +202,14 @@ class Connection(api.Connection):
         query_prefix = model_query(context, models.AttachHandle)
         filters = copy.deepcopy(filters)
 
-        exact_match_filter_names = ['uuid', 'id', 'deployable_id', 'cpid_id']
+        exact_match_filter_names = [
+            'uuid',
+            'id',
+            'deployable_id',
+            'cpid_id',
+            'in_use',
+            'attach_info',
+        ]
 
         # Filter the query
         query_prefix = self._exact_filter(
@@ -277,21 +300,35 @@ class Connection(api.Connection):
 
     @oslo_db_api.retry_on_deadlock
     @main_context_manager.writer
-    def _do_allocate_attach_handle(self, context, deployable_id):
-        """Atomically get a set of attach handles that match the query
-        and mark one of those as in_use.
+    def _do_allocate_attach_handles(self, context, deployable_id, count=1):
+        """Atomically get count unused attach handles of a deployable
+        and mark them as in_use.
+
+        Where the database supports it, concurrent allocations skip the
+        handles locked by each other instead of all waiting for the same
+        first unused one.
         """
-        query = model_query(context, models.AttachHandle).filter_by(
-            deployable_id=deployable_id, in_use=False
+        query = (
+            model_query(context, models.AttachHandle)
+            .filter_by(deployable_id=deployable_id, in_use=False)
+            .order_by(models.AttachHandle.id)
+            .limit(count)
         )
-        values = {"in_use": True}
-        ref = query.with_for_update().first()
-        if not ref:
+        skip_locked = _supports_skip_locked(context.session)
+        refs = query.with_for_update(skip_locked=skip_locked).all()
+        if len(refs) < count:
             msg = 'Matching deployable_id {}'.format(deployable_id)
             raise exception.ResourceNotFound(resource='AttachHandle', msg=msg)
-        ref.update(values)
-        context.session.flush()
-        return ref
+        model_query(context, models.AttachHandle).filter(
+            models.AttachHandle.id.in_([ref.id for ref in refs])
+        ).update({"in_use": True}, synchronize_session='evaluate')
+        return refs
+
+    def _do_allocate_attach_handle(self, context, deployable_id):
+        """Atomically get an unused attach handle of a deployable
+        and mark it as in_use.
+        """
+        return self._do_allocate_attach_handles(context, deployable_id)[0]
 
     def attach_handle_allocate(self, context, deployable_id):
         """Allocate an attach handle with given deployable.
@@ -305,6 +342,13 @@ class Connection(api.Connection):
             raise exception.ResourceNotFound(resource='AttachHandle', msg=msg)
         return ah
 
+    def attach_handle_allocate_many(self, context, deployable_id, count):
+        """Allocate count attach handles with given deployable.
+
+        Either all of them are allocated or none is.
+        """
+        return self._do_allocate_attach_handles(context, deployable_id, count)
+
     # NOTE: For deallocate, we use attach_handle_update()
 
     @oslo_db_api.retry_on_deadlock
@@ -514,6 +558,73 @@ class Connection(api.Connection):
             context, models.Device, query, limit, marker, sort_key, sort_dir
         )
 
+    @main_context_manager.reader
+    def device_tree_get_by_hostname(self, context, hostname):
+        """Return the devices of one host and the rows hanging off them.
+
+        Each table is loaded with one query joined back to the devices of
+        the host, so the cost does not grow with the number of devices,
+        deployables or attach handles.
+        """
+        device_query = model_query(context, models.Device).filter_by(
+            hostname=hostname
+        )
+        devices = device_query.order_by(
+            models.Device.created_at.desc(), models.Device.id.desc()
+        ).all()
+        if not devices:
+            return {
+                'devices': [],
+                'controlpath_ids': [],
+                'deployables': [],
+                'attributes': [],
+                'attach_handles': [],
+            }
+
+        def _by_host(model, *joins):
+            query = model_query(context, model)
+            for target, onclause in joins:
+                query = query.join(target, onclause)
+            return query.filter(models.Device.hostname == hostname).order_by(
+                model.created_at.desc(), model.id.desc()
+            )
+
+        device_join = (
+            models.Device,
+            models.Device.id == models.Deployable.device_id,
+        )
+        cpids = _by_host(
+            models.ControlpathID,
+            (
+                models.Device,
+                models.Device.id == models.ControlpathID.device_id,
+            ),
+        ).all()
+        deployables = _by_host(models.Deployable, device_join).all()
+        attributes = _by_host(
+            models.Attribute,
+            (
+                models.Deployable,
+                models.Deployable.id == models.Attribute.deployable_id,
+            ),
+            device_join,
+        ).all()
+        attach_handles = _by_host(
+            models.AttachHandle,
+            (
+                models.Deployable,
+                models.Deployable.id == models.AttachHandle.deployable_id,
+            ),
+            device_join,
+        ).all()
+        return {
+            'devices': devices,
+            'controlpath_ids': cpids,
+            'deployables': deployables,
+            'attributes': attributes,
+            'attach_handles': attach_handles,
+        }
+
     def device_update(self, context, uuid, values):
         if 'uuid' in values:
             msg = _("Cannot overwrite UUID for an existing Device.")
@@ -935,8 +1046,12 @@ class Connection(api.Connection):
                 resource='Attribute', msg='with uuid=%s' % uuid
             )
 
-    @main_context_manager.writer
-    def extarq_create(self, context, values):
+    def _extarq_build(self, context, values, devprof_ids):
+        """Return a new ExtArq model for values, without adding it.
+
+        :param devprof_ids: a dict of device profile name to id, used to
+            look up each device profile only once.
+        """
         if not values.get('uuid'):
             values['uuid'] = uuidutils.generate_uuid()
         if values.get('id'):
@@ -945,15 +1060,21 @@ class Connection(api.Connection):
         if values.get('device_profile_id'):
             pass  # Already have the devprof id, so nothing to do
         elif values.get('device_profile_name'):
-            devprof = self.device_profile_get(
-                context, values['device_profile_name']
-            )
-            values['device_profile_id'] = devprof['id']
+            name = values['device_profile_name']
+            if name not in devprof_ids:
+                devprof = self.device_profile_get(context, name)
+                devprof_ids[name] = devprof['id']
+            values['device_profile_id'] = devprof_ids[name]
         else:
             raise exception.DeviceProfileNameNeeded()
 
         extarq = models.ExtArq()
         extarq.update(values)
+        return extarq
+
+    @main_context_manager.writer
+    def extarq_create(self, context, values):
+        extarq = self._extarq_build(context, values, {})
 
         try:
             context.session.add(extarq)
@@ -962,6 +1083,22 @@ class Connection(api.Connection):
             raise exception.ExtArqAlreadyExists(uuid=values['uuid'])
         return extarq
 
+    @main_context_manager.writer
+    def extarq_create_many(self, context, values_list):
+        devprof_ids = {}
+        extarqs = [
+            self._extarq_build(context, values, devprof_ids)
+            for values in values_list
+        ]
+
+        try:
+            context.session.add_all(extarqs)
+            context.session.flush()
+        except db_exc.DBDuplicateEntry:
+            uuid = ', '.join(values['uuid'] for values in values_list)
+            raise exception.ExtArqAlreadyExists(uuid=uuid)
+        return extarqs
+
     @oslo_db_api.retry_on_deadlock
     @main_context_manager.writer
     def extarq_delete(self, context, uuid, project_id=None):
@@ -1008,6 +1145,66 @@ class Connection(api.Connection):
         ref = query.first()
         return ref
 
+    @oslo_db_api.retry_on_deadlock
+    @main_context_manager.writer
+    def extarq_update_many(self, context, values_by_uuid, state_scope=None):
+        uuids = list(values_by_uuid)
+        columns = set().union(*values_by_uuid.values())
+        updates = {}
+        for column in columns:
+            by_uuid = {
+                arq_uuid: values[column]
+                for arq_uuid, values in values_by_uuid.items()
+                if column in values
+            }
+            if len(by_uuid) == len(uuids) and len(set(by_uuid.values())) == 1:
+                updates[column] = by_uuid[uuids[0]]
+            else:
+                # Set each extarq to its own value, in the same statement.
+                updates[column] = case(
+                    by_uuid,
+                    value=models.ExtArq.uuid,
+                    else_=getattr(models.ExtArq, column),
+                )
+
+        query = model_query(context, models.ExtArq).filter(
+            models.ExtArq.uuid.in_(uuids)
+        )
+        query_update = query
+        if state_scope is not None:
+            query_update = query.filter(models.ExtArq.state.in_(state_scope))
+        count = query_update.update(updates, synchronize_session=False)
+        if count == len(uuids):
+            return count
+
+        # Raising rolls back the whole update, so either all the extarqs
+        # are updated or none is.
+        found = {ref.uuid: ref.state for ref in query}
+        for arq_uuid in uuids:
+            if arq_uuid not in found:
+                raise exception.ResourceNotFound(
+                    resource='ExtArq', msg='with uuid=%s' % arq_uuid
+                )
+            if state_scope is not None and found[arq_uuid] not in state_scope:
+                raise exception.ARQBadState(
+                    state=found[arq_uuid], uuid=arq_uuid, expected=state_scope
+                )
+        return count
+
+    @oslo_db_api.retry_on_deadlock
+    @main_context_manager.writer
+    def extarq_update_state(self, context, uuid, values, state_scope=None):
+        query = model_query(context, models.ExtArq).filter_by(uuid=uuid)
+        query_update = query
+        if state_scope is not None:
+            query_update = query.filter(models.ExtArq.state.in_(state_scope))
+        count = query_update.update(values, synchronize_session=False)
+        if count:
+            return count, values['state']
+        # Only a failed swap needs a read, to tell why it failed.
+        ref = query.with_entities(models.ExtArq.state).first()
+        return count, ref.state if ref else None
+
     @main_context_manager.reader
     def extarq_list(
         self,
@@ -1017,6 +1214,7 @@ class Connection(api.Connection):
         instance_uuid=None,
         limit=None,
         marker=None,
+        state=None,
     ):
         query = model_query(context, models.ExtArq)
         if project_id is api.NULL_FILTER:
@@ -1033,6 +1231,10 @@ class Connection(api.Connection):
             query = query.filter_by(instance_uuid=instance_uuid)
         if type(uuid_range) is list:
             query = query.filter(models.ExtArq.uuid.in_(uuid_range))
+        if isinstance(state, list | tuple | set | frozenset):
+            query = query.filter(models.ExtArq.state.in_(state))
+        elif state:
+            query = query.filter_by(state=state)
         if marker is not None:
             marker = (
                 model_query(context, models.ExtArq).filter_by(id=marker).one()
@@ -1056,6 +1258,58 @@ class Connection(api.Connection):
                 resource='ExtArq', msg='with uuid=%s' % uuid
             )
 
+    @oslo_db_api.retry_on_deadlock
+    @main_context_manager.writer
+    def conductor_register(self, context, hostname):
+        query = model_query(context, models.Conductor).filter_by(
+            hostname=hostname
+        )
+        ref = query.one_or_none()
+        if ref is None:
+            ref = models.Conductor(hostname=hostname)
+            context.session.add(ref)
+        ref.update({'online': True, 'updated_at': timeutils.utcnow()})
+        context.session.flush()
+        return ref
+
+    @oslo_db_api.retry_on_deadlock
+    @main_context_manager.writer
+    def conductor_unregister(self, context, hostname):
+        model_query(context, models.Conductor).filter_by(
+            hostname=hostname
+        ).update({'online': False}, synchronize_session=False)
+
+    @main_context_manager.reader
+    def conductor_list_alive(self, context, timeout):
+        since = timeutils.utcnow() - datetime.timedelta(seconds=timeout)
+        query = model_query(context, models.Conductor).filter(
+            models.Conductor.online.is_(True),
+            models.Conductor.updated_at >= since,
+        )
+        return sorted(ref.hostname for ref in query)
+
+    @oslo_db_api.retry_on_deadlock
+    @main_context_manager.writer
+    def host_report_set(self, context, hostname, report_id):
+        query = model_query(context, models.HostReport).filter_by(
+            hostname=hostname
+        )
+        ref = query.one_or_none()
+        if ref is None:
+            ref = models.HostReport(hostname=hostname)
+            context.session.add(ref)
+        ref.update({'report_id': report_id})
+        context.session.flush()
+
+    @main_context_manager.reader
+    def host_report_get(self, context, hostname):
+        ref = (
+            model_query(context, models.HostReport)
+            .filter_by(hostname=hostname)
+            .one_or_none()
+        )
+        return ref.report_id if ref is not None else None
+
     @main_context_manager.writer
     def _get_quota_usages(self, context, project_id, resources=None):
         # Broken out for testability
@@ -79,6 +79,10 @@ class Device(Base):
     """Represents the devices."""
 
     __tablename__ = 'devices'
+    __table_args__ = (
+        Index('devices_hostname_idx', 'hostname'),
+        table_args(),
+    )
 
     id = Column(Integer, primary_key=True)
     uuid = Column(String(36), nullable=False, unique=True)
@@ -106,6 +110,8 @@ class Deployable(Base):
         Index('deployables_parent_id_idx', 'parent_id'),
         Index('deployables_root_id_idx', 'root_id'),
         Index('deployables_device_id_idx', 'device_id'),
+        Index('deployables_name_device_id_idx', 'name', 'device_id'),
+        Index('deployables_rp_uuid_idx', 'rp_uuid'),
         table_args(),
     )
 
@@ -152,6 +158,12 @@ class ControlpathID(Base):
     """
 
     __tablename__ = 'controlpath_ids'
+    __table_args__ = (
+        Index(
+            'controlpath_ids_device_id_cpid_info_idx', 'device_id', 'cpid_info'
+        ),
+        table_args(),
+    )
 
     id = Column(Integer, primary_key=True)
     uuid = Column(String(36), nullable=False, unique=True)
@@ -172,6 +184,16 @@ class AttachHandle(Base):
     __table_args__ = (
         Index('attach_handles_cpid_id_idx', 'cpid_id'),
         Index('attach_handles_deployable_id_idx', 'deployable_id'),
+        Index(
+            'attach_handles_deployable_id_in_use_idx',
+            'deployable_id',
+            'in_use',
+        ),
+        Index(
+            'attach_handles_deployable_id_attach_info_idx',
+            'deployable_id',
+            'attach_info',
+        ),
         table_args(),
     )
 
@@ -231,6 +253,7 @@ class ExtArq(Base):
         Index('extArqs_instance_uuid_idx', 'instance_uuid'),
         Index('extArqs_attach_handle_id_idx', 'attach_handle_id'),
         Index('extArqs_deployable_id_idx', 'deployable_id'),
+        Index('extArqs_state_idx', 'state'),
         table_args(),
     )
 
@@ -273,6 +296,34 @@ class ExtArq(Base):
     )
 
 
+class Conductor(Base):
+    """Represents a conductor service, alive while its row is updated."""
+
+    __tablename__ = 'conductors'
+    __table_args__ = (
+        schema.UniqueConstraint('hostname', name='uniq_conductors0hostname'),
+        table_args(),
+    )
+
+    id = Column(Integer, primary_key=True)
+    hostname = Column(String(255), nullable=False)
+    online = Column(Boolean, nullable=False, default=True)
+
+
+class HostReport(Base):
+    """Represents the last full device report applied for a host."""
+
+    __tablename__ = 'host_reports'
+    __table_args__ = (
+        schema.UniqueConstraint('hostname', name='uniq_host_reports0hostname'),
+        table_args(),
+    )
+
+    id = Column(Integer, primary_key=True)
+    hostname = Column(String(255), nullable=False)
+    report_id = Column(String(36), nullable=False)
+
+
 class QuotaUsage(Base):
     """Represents the current usage for a given resource."""
 
@@ -42,7 +42,27 @@ class API:
         """
         return glance.get_remote_image_service(context, id_or_uri)
 
-    def download(self, context, id_or_uri, data=None, dest_path=None):
+    def get(self, context, id_or_uri):
+        """Returns a dict with the metadata of an image, e.g. its size,
+        checksum, os_hash_algo and os_hash_value.
+
+        :param context: The `cyborg.context.RequestContext` object for the
+                        request
+        :param id_or_uri: A UUID identifier or an image URI to look up image
+                          information for.
+        """
+        session, image_id = self._get_session_and_image_id(context, id_or_uri)
+        return session.show(context, image_id)
+
+    def download(
+        self,
+        context,
+        id_or_uri,
+        data=None,
+        dest_path=None,
+        image_meta=None,
+        verify=None,
+    ):
         """Transfer image bits from Glance or a known source location to the
         supplied destination filepath.
 
@@ -52,6 +72,10 @@ class API:
                           information for.
         :param data: A file object to use in downloading image data.
         :param dest_path: Filepath to transfer image bits to.
+        :param image_meta: The metadata of the image, if already read.
+        :param verify: Whether to verify the image bits written against the
+                       hash of the image, CONF.glance.verify_download by
+                       default.
 
         Note that because of the poor design of the
         `glance.ImageService.download` method, the function returns different
@@ -73,5 +97,10 @@ class API:
 
         session, image_id = self._get_session_and_image_id(context, id_or_uri)
         return session.download(
-            context, image_id, data=data, dst_path=dest_path
+            context,
+            image_id,
+            data=data,
+            dst_path=dest_path,
+            image_meta=image_meta,
+            verify=verify,
         )
@@ -15,10 +15,13 @@
 
 """Implementation of an image service that uses Glance as the backend."""
 
+import hashlib
 import inspect
 import os
+import queue
 import re
 import stat
+import threading
 import time
 
 import glanceclient
@@ -27,6 +30,7 @@ import glanceclient.exc
 from keystoneauth1 import loading as ks_loading
 from oslo_log import log as logging
 from oslo_utils import excutils
+from oslo_utils import units
 
 import cyborg.conf
 
@@ -174,6 +178,92 @@ class GlanceClientWrapper:
                 time.sleep(1)
 
 
+def image_hasher(image_meta):
+    """Return a hash object and the digest expected of the data of an image.
+
+    The multihash of the image is preferred to its MD5 checksum.
+
+    :returns: (None, None) if glance has no hash of the image.
+    """
+    algo = image_meta.get('os_hash_algo')
+    value = image_meta.get('os_hash_value')
+    if algo and value:
+        try:
+            return hashlib.new(algo), value
+        except ValueError:
+            LOG.warning('Unsupported image hash algorithm %s.', algo)
+    if image_meta.get('checksum'):
+        return hashlib.md5(usedforsecurity=False), image_meta['checksum']
+    return None, None
+
+
+def _rechunk(chunks, size):
+    """Group chunks of bytes into chunks of at least a size."""
+    buf = bytearray()
+    for chunk in chunks:
+        if not buf and len(chunk) >= size:
+            yield chunk
+            continue
+        buf += chunk
+        if len(buf) >= size:
+            yield bytes(buf)
+            buf.clear()
+    if buf:
+        yield bytes(buf)
+
+
+_DONE = object()
+
+
+class _ReadError:
+    def __init__(self, exc):
+        self.exc = exc
+
+
+def _prefetch(chunks, depth):
+    """Yield the items of an iterator read ahead by a thread.
+
+    :param depth: the number of items read ahead at most. 0 reads the
+        items when they are asked for.
+    """
+    if not depth:
+        yield from chunks
+        return
+    ready = queue.Queue(maxsize=depth)
+    stopped = threading.Event()
+
+    def put(item):
+        while not stopped.is_set():
+            try:
+                ready.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def read():
+        try:
+            for chunk in chunks:
+                if not put(chunk):
+                    return
+        except Exception as e:
+            put(_ReadError(e))
+        else:
+            put(_DONE)
+
+    threading.Thread(target=read, name='image-prefetch', daemon=True).start()
+    try:
+        while True:
+            item = ready.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _ReadError):
+                raise item.exc
+            yield item
+    finally:
+        stopped.set()
+
+
 class GlanceImageServiceV2:
     """Provides storage and retrieval of disk image objects within Glance."""
 
@@ -196,10 +286,12 @@ class GlanceImageServiceV2:
         if not any(check(mode) for check in (stat.S_ISFIFO, stat.S_ISSOCK)):
             os.fsync(fileno)
 
-    def download(self, context, image_id, data=None, dst_path=None):
-        """Calls out to Glance for data and writes data."""
+    def _call(self, context, method, image_id):
+        """Call a glance client method on an image, translating the
+        errors into Cyborg exceptions.
+        """
         try:
-            image_chunks = self._client.call(context, 2, 'data', image_id)
+            return self._client.call(context, 2, method, image_id)
         except (
             glanceclient.exc.HTTPForbidden,
             glanceclient.exc.HTTPUnauthorized,
@@ -212,6 +304,55 @@ class GlanceImageServiceV2:
         except glanceclient.exc.HTTPBadRequest as e:
             raise exception.ImageBadRequest(image_id=image_id, response=str(e))
 
+    def show(self, context, image_id):
+        """Returns a dict with the metadata of an image."""
+        return dict(self._call(context, 'get', image_id))
+
+    @staticmethod
+    def _sync(fh, start, end):
+        """Sync the bytes of a file written since the last sync to disk,
+        dropping them from the page cache if configured to.
+        """
+        fh.flush()
+        os.fdatasync(fh.fileno())
+        if CONF.glance.download_drop_cache:
+            os.posix_fadvise(
+                fh.fileno(), start, end - start, os.POSIX_FADV_DONTNEED
+            )
+
+    def download(
+        self,
+        context,
+        image_id,
+        data=None,
+        dst_path=None,
+        image_meta=None,
+        verify=None,
+    ):
+        """Calls out to Glance for data and writes data.
+
+        :param image_meta: the metadata of the image, read from glance if
+            needed and not given.
+        :param verify: whether to verify the data written against the hash
+            of the image, CONF.glance.verify_download by default.
+        :raises: ImageUnacceptable if the data does not match the hash.
+            The data written is left for the caller to remove.
+        """
+        if verify is None:
+            verify = CONF.glance.verify_download
+        hasher = digest = None
+        if verify and (data is not None or dst_path):
+            if image_meta is None:
+                image_meta = self.show(context, image_id)
+            hasher, digest = image_hasher(image_meta)
+            if hasher is None:
+                LOG.warning(
+                    'Image %s has no checksum, its data is not verified.',
+                    image_id,
+                )
+
+        image_chunks = self._call(context, 'data', image_id)
+
         if image_chunks.wrapped is None:
             raise exception.ImageUnacceptable(
                 image_id=image_id,
@@ -225,25 +366,56 @@ class GlanceImageServiceV2:
 
         if data is None:
             return image_chunks
-        else:
-            try:
-                for chunk in image_chunks:
-                    data.write(chunk)
-            except Exception as ex:
-                with excutils.save_and_reraise_exception():
-                    LOG.error(
-                        "Error writing to %(path)s: %(exception)s",
-                        {'path': dst_path, 'exception': ex},
+
+        # Only a regular file opened here is synced as the download goes,
+        # and dropped from the page cache.
+        is_regular = close_file and stat.S_ISREG(
+            os.fstat(data.fileno()).st_mode
+        )
+        sync_size = 0
+        if is_regular:
+            sync_size = CONF.glance.download_sync_size * units.Mi
+        written = synced = 0
+        chunks = _prefetch(
+            _rechunk(image_chunks, CONF.glance.download_chunk_size),
+            CONF.glance.download_prefetch_chunks,
+        )
+        try:
+            for chunk in chunks:
+                if hasher is not None:
+                    hasher.update(chunk)
+                data.write(chunk)
+                written += len(chunk)
+                if sync_size and written - synced >= sync_size:
+                    self._sync(data, synced, written)
+                    synced = written
+        except Exception as ex:
+            with excutils.save_and_reraise_exception():
+                LOG.error(
+                    "Error writing to %(path)s: %(exception)s",
+                    {'path': dst_path, 'exception': ex},
+                )
+        finally:
+            chunks.close()
+            if close_file:
+                # Ensure that the data is pushed all the way down to
+                # persistent storage. This ensures that in the event of a
+                # subsequent host crash we don't have running instances
+                # using a corrupt backing file.
+                data.flush()
+                self._safe_fsync(data)
+                if is_regular and CONF.glance.download_drop_cache:
+                    os.posix_fadvise(
+                        data.fileno(), synced, 0, os.POSIX_FADV_DONTNEED
                     )
-            finally:
-                if close_file:
-                    # Ensure that the data is pushed all the way down to
-                    # persistent storage. This ensures that in the event of a
-                    # subsequent host crash we don't have running instances
-                    # using a corrupt backing file.
-                    data.flush()
-                    self._safe_fsync(data)
-                    data.close()
+                data.close()
+
+        if hasher is not None and hasher.hexdigest() != digest:
+            raise exception.ImageUnacceptable(
+                image_id=image_id,
+                reason='the %s of its data does not match %s'
+                % (hasher.name, digest),
+            )
 
 
 def get_remote_image_service(context, image_href):
@@ -121,6 +121,14 @@ class AttachHandle(base.CyborgObject, object_base.VersionedObjectDictCompat):
         obj_ah = cls._from_db_object(cls(context), db_ah)
         return obj_ah
 
+    @classmethod
+    def allocate_many(cls, context, deployable_id, count):
+        """Allocate count attach handles of a deployable at once."""
+        db_ahs = cls.dbapi.attach_handle_allocate_many(
+            context, deployable_id, count
+        )
+        return cls._from_db_object_list(db_ahs, context)
+
     def deallocate(self, context):
         values = {"in_use": False}
         self.dbapi.attach_handle_update(context, self.uuid, values)
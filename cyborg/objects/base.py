@@ -15,9 +15,12 @@
 
 """Cyborg common internal object model"""
 
+import hashlib
+
 import netaddr
 
 from oslo_log import log as logging
+from oslo_serialization import jsonutils
 from oslo_utils import versionutils
 from oslo_versionedobjects import base as object_base
 
@@ -223,6 +226,34 @@ class DriverObjectBase(CyborgObject):
         obj.obj_reset_changes()
         return obj
 
+    def fingerprint(self):
+        """Return a stable content hash of this driver-side object.
+
+        The hash covers every field that is set, recursing into nested
+        driver objects. Nested lists are hashed independently of their
+        order, so two discoveries of the same hardware state always share
+        a fingerprint.
+        """
+        data = jsonutils.dumps(self._fingerprint_primitive(), sort_keys=True)
+        return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+    def _fingerprint_primitive(self):
+        def _primitive(value):
+            if isinstance(value, DriverObjectBase):
+                return value._fingerprint_primitive()
+            if isinstance(value, list):
+                return sorted(
+                    (_primitive(v) for v in value),
+                    key=lambda v: jsonutils.dumps(v, sort_keys=True),
+                )
+            return value
+
+        return {
+            k: _primitive(getattr(self, k))
+            for k in self.fields
+            if self.obj_attr_is_set(k)
+        }
+
 
 def _log_backport(ovo, target_version):
     """Log backported versioned objects."""
@@ -18,6 +18,8 @@ from oslo_utils import versionutils
 from oslo_versionedobjects import base as object_base
 
 from cyborg.common import exception
+from cyborg.common import utils
+from cyborg.conf import CONF
 from cyborg.db import api as dbapi
 from cyborg.objects import base
 from cyborg.objects import fields as object_fields
@@ -25,6 +27,31 @@ from cyborg.objects import fields as object_fields
 
 LOG = logging.getLogger(__name__)
 
+# The keys a device profile can be looked up by.
+_CACHE_KEYS = ('id', 'uuid', 'name')
+_cache = None
+
+
+def _get_cache():
+    """Return the cache of the device profiles of this process.
+
+    Each profile is cached under its id, uuid and name, along with its
+    groups already parsed from its profile_json.
+    """
+    global _cache
+    if _cache is None:
+        _cache = utils.LRUCache(
+            len(_CACHE_KEYS) * CONF.device_profile_cache_size,
+            CONF.device_profile_cache_ttl,
+        )
+    return _cache
+
+
+def clear_cache():
+    """Drop the cached device profiles, and pick up new cache options."""
+    global _cache
+    _cache = None
+
 
 @base.CyborgObjectRegistry.register
 class DeviceProfile(base.CyborgObject, object_base.VersionedObjectDictCompat):
@@ -71,32 +98,78 @@ class DeviceProfile(base.CyborgObject, object_base.VersionedObjectDictCompat):
         db_devprof = self.dbapi.device_profile_create(context, values)
         self._from_db_object(self, db_devprof)
 
+    @classmethod
+    def _get_cached(cls, context, key, value, db_get):
+        entry = _get_cache().get((key, value))
+        if entry is None:
+            db_devprof = db_get(context, value)
+            return cls._from_db_object(cls(context), db_devprof)
+        return base.CyborgObject._from_db_object(cls(context), entry)
+
     @classmethod
     def get_by_id(cls, context, id):
         """Find a DB Device_profile and return an Obj Device_profile."""
-        db_devprof = cls.dbapi.device_profile_get_by_id(context, id)
-        obj_devprof = cls._from_db_object(cls(context), db_devprof)
-        return obj_devprof
+        return cls._get_cached(
+            context, 'id', id, cls.dbapi.device_profile_get_by_id
+        )
+
+    @classmethod
+    def get_by_ids(cls, context, ids):
+        """Return a dict of id to Device Profile of the given ids.
+
+        Only the profiles missing from the cache are read, with one query.
+        """
+        cache = _get_cache()
+        devprofs = {}
+        missing = []
+        for id in ids:
+            entry = cache.get(('id', id))
+            if entry is None:
+                missing.append(id)
+            else:
+                devprofs[id] = base.CyborgObject._from_db_object(
+                    cls(context), entry
+                )
+        if missing:
+            db_devprofs = cls.dbapi.device_profile_list_by_filters(
+                context, {'id': missing}
+            )
+            for devprof in cls._from_db_object_list(db_devprofs, context):
+                devprofs[devprof.id] = devprof
+        return devprofs
 
     @classmethod
     def get_by_uuid(cls, context, uuid):
         """Find a DB Device_profile and return an Obj Device_profile."""
-        db_devprof = cls.dbapi.device_profile_get_by_uuid(context, uuid)
-        obj_devprof = cls._from_db_object(cls(context), db_devprof)
-        return obj_devprof
+        return cls._get_cached(
+            context, 'uuid', uuid, cls.dbapi.device_profile_get_by_uuid
+        )
 
     @classmethod
     def get_by_name(cls, context, name):
         """Find a DB Device Profile and return an Obj Device Profile."""
-        db_devprof = cls.dbapi.device_profile_get(context, name)
-        obj_devprof = cls._from_db_object(cls(context), db_devprof)
-        return obj_devprof
+        return cls._get_cached(
+            context, 'name', name, cls.dbapi.device_profile_get
+        )
 
     @classmethod
-    def list(cls, context):
-        # TODO() add filters, limits, pagination, etc.
+    def list(cls, context, filters=None):
         """Return a list of Device Profile objects."""
-        db_devprofs = cls.dbapi.device_profile_list(context)
+        if filters:
+            sort_dir = filters.pop('sort_dir', 'desc')
+            sort_key = filters.pop('sort_key', 'created_at')
+            limit = filters.pop('limit', None)
+            marker = filters.pop('marker_obj', None)
+            db_devprofs = cls.dbapi.device_profile_list_by_filters(
+                context,
+                filters,
+                sort_dir=sort_dir,
+                sort_key=sort_key,
+                limit=limit,
+                marker=marker,
+            )
+        else:
+            db_devprofs = cls.dbapi.device_profile_list(context)
         obj_dp_list = cls._from_db_object_list(db_devprofs, context)
         return obj_dp_list
 
@@ -105,16 +178,24 @@ class DeviceProfile(base.CyborgObject, object_base.VersionedObjectDictCompat):
         updates = self.obj_get_changes()
         self._to_profile_json(updates)
 
+        self._uncache()
         db_devprof = self.dbapi.device_profile_update(
-            context, self.name, updates
+            context, self.uuid, updates
         )
         self._from_db_object(self, db_devprof)
 
     def destroy(self, context):
         """Delete a Device Profile from the DB."""
         self.dbapi.device_profile_delete(context, self.uuid)
+        self._uncache()
         self.obj_reset_changes()
 
+    def _uncache(self):
+        cache = _get_cache()
+        for key in _CACHE_KEYS:
+            if self.obj_attr_is_set(key):
+                cache.pop((key, getattr(self, key)))
+
     @classmethod
     def _from_db_object(cls, obj, db_obj):
         """Converts a device_profile to a formal object.
@@ -123,8 +204,23 @@ class DeviceProfile(base.CyborgObject, object_base.VersionedObjectDictCompat):
         :param db_obj: A DB model of the object
         :return: The object of the class with the database entity added
         """
-        # Convert from profile_json to 'groups' ListOfDictOfStrings
-        d = jsonutils.loads(db_obj['profile_json'])
-        db_obj['groups'] = d['groups']
+        # Convert from profile_json to 'groups' ListOfDictOfStrings, unless
+        # the same profile_json was parsed already.
+        cache = _get_cache()
+        entry = cache.get(('id', db_obj['id']))
+        if entry is None or entry['profile_json'] != db_obj['profile_json']:
+            d = jsonutils.loads(db_obj['profile_json'])
+            entry = {
+                'profile_json': db_obj['profile_json'],
+                'groups': d['groups'],
+            }
+        db_obj['groups'] = entry['groups']
         obj = base.CyborgObject._from_db_object(obj, db_obj)
+
+        entry = dict(entry)
+        for field in obj.fields:
+            if field != 'groups':
+                entry[field] = db_obj[field]
+        for key in _CACHE_KEYS:
+            cache.put((key, entry[key]), entry)
         return obj
@@ -13,12 +13,22 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+
 from oslo_versionedobjects import base as object_base
 
+from cyborg.db import api as dbapi
 from cyborg.objects import base
 from cyborg.objects import fields as object_fields
+from cyborg.objects.attach_handle import AttachHandle
+from cyborg.objects.attribute import Attribute
 from cyborg.objects.control_path import ControlpathID
+from cyborg.objects.deployable import Deployable
 from cyborg.objects.device import Device
+from cyborg.objects.driver_objects.driver_attach_handle import (
+    DriverAttachHandle,
+)
+from cyborg.objects.driver_objects.driver_attribute import DriverAttribute
 from cyborg.objects.driver_objects.driver_controlpath_id import (
     DriverControlPathID,
 )
@@ -32,6 +42,8 @@ class DriverDevice(
     # Version 1.0: Initial version
     VERSION = '1.0'
 
+    dbapi = dbapi.get_instance()
+
     fields = {
         'vendor': object_fields.StringField(nullable=False),
         'model': object_fields.StringField(nullable=False),
@@ -124,13 +136,58 @@ class DriverDevice(
         the case some of controlpath_id can't store successfully but its
         devices stores successfully.)
         """
-        # get dev_obj_list from hostname
-        dev_obj_list = Device.get_list_by_hostname(context, host)
+        # load the whole device tree of the host at once.
+        rows = cls.dbapi.device_tree_get_by_hostname(context, host)
+        dev_obj_list = Device._from_db_object_list(rows['devices'], context)
+        cpid_objs = {}
+        for cpid_obj in ControlpathID._from_db_object_list(
+            rows['controlpath_ids'], context
+        ):
+            # control_path is unique for one device.
+            cpid_objs.setdefault(cpid_obj.device_id, cpid_obj)
+        attr_objs = collections.defaultdict(list)
+        for attr_obj in Attribute._from_db_object_list(
+            rows['attributes'], context
+        ):
+            attr_objs[attr_obj.deployable_id].append(attr_obj)
+        ah_objs = collections.defaultdict(list)
+        for ah_obj in AttachHandle._from_db_object_list(
+            rows['attach_handles'], context
+        ):
+            ah_objs[ah_obj.deployable_id].append(ah_obj)
+        driver_dep_objs = collections.defaultdict(list)
+        for dep_obj in Deployable._from_db_object_list(
+            rows['deployables'], context
+        ):
+            driver_dep_objs[dep_obj.device_id].append(
+                DriverDeployable(
+                    context=context,
+                    name=dep_obj.name,
+                    num_accelerators=dep_obj.num_accelerators,
+                    attribute_list=[
+                        DriverAttribute(
+                            context=context,
+                            key=attr_obj.key,
+                            value=attr_obj.value,
+                        )
+                        for attr_obj in attr_objs[dep_obj.id]
+                    ],
+                    attach_handle_list=[
+                        DriverAttachHandle(
+                            context=context,
+                            attach_type=ah_obj.attach_type,
+                            attach_info=ah_obj.attach_info,
+                            in_use=ah_obj.in_use,
+                        )
+                        for ah_obj in ah_objs[dep_obj.id]
+                    ],
+                )
+            )
         driver_dev_obj_list = []
         for dev_obj in dev_obj_list:
-            cpid = DriverControlPathID.get(context, dev_obj.id)
+            cpid_obj = cpid_objs.get(dev_obj.id)
             # NOTE: will not return device without controlpath_id.
-            if cpid is not None:
+            if cpid_obj is not None:
                 driver_dev_obj = cls(
                     context=context,
                     vendor=dev_obj.vendor,
@@ -138,8 +195,12 @@ class DriverDevice(
                     type=dev_obj.type,
                     std_board_info=dev_obj.std_board_info,
                     vendor_board_info=dev_obj.vendor_board_info,
-                    controlpath_id=cpid,
-                    deployable_list=DriverDeployable.list(context, dev_obj.id),
+                    controlpath_id=DriverControlPathID(
+                        context=context,
+                        cpid_type=cpid_obj.cpid_type,
+                        cpid_info=cpid_obj.cpid_info,
+                    ),
+                    deployable_list=driver_dep_objs[dev_obj.id],
                 )
                 driver_dev_obj_list.append(driver_dev_obj)
         return driver_dev_obj_list
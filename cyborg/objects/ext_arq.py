@@ -15,7 +15,6 @@
 
 import json
 
-from openstack import connection
 from oslo_log import log as logging
 from oslo_utils import versionutils
 from oslo_versionedobjects import base as object_base
@@ -89,8 +88,8 @@ class ExtARQ(
         super().__init__(*args, **kwargs)
         self.agent = AgentAPI()
 
-    def create(self, context, device_profile_id=None):
-        """Create an ExtARQ record in the DB."""
+    def _get_create_values(self, device_profile_id=None):
+        """Return the values of a new ExtARQ record for this object."""
         if 'device_profile_name' not in self.arq and not device_profile_id:
             raise exception.ObjectActionError(
                 action='create',
@@ -106,11 +105,33 @@ class ExtARQ(
         # Pass devprof id to db layer, to avoid repeated queries
         if device_profile_id is not None:
             values['device_profile_id'] = device_profile_id
+        return values
 
+    def create(self, context, device_profile_id=None):
+        """Create an ExtARQ record in the DB."""
+        values = self._get_create_values(device_profile_id)
         db_extarq = self.dbapi.extarq_create(context, values)
         self._from_db_object(self, db_extarq, context)
         return self
 
+    @classmethod
+    def create_many(cls, context, extarqs, device_profile_id=None):
+        """Create the ExtARQ records of extarqs in a single transaction.
+
+        :param extarqs: the created (but not saved) ExtARQ objects.
+        :param device_profile_id: the id of the device profile of all
+            the ARQs, if known.
+        :returns: extarqs, updated from their DB records.
+        """
+        values_list = [
+            extarq._get_create_values(device_profile_id) for extarq in extarqs
+        ]
+        db_extarqs = cls.dbapi.extarq_create_many(context, values_list)
+        related = cls._get_related_objects(context, db_extarqs)
+        for extarq, db_extarq in zip(extarqs, db_extarqs):
+            cls._from_db_object(extarq, db_extarq, context, related)
+        return extarqs
+
     @classmethod
     def get(cls, context, uuid, lock=False):
         """Find a DB ExtARQ and return an Obj ExtARQ."""
@@ -123,10 +144,35 @@ class ExtARQ(
         return obj_extarq
 
     @classmethod
-    def list(cls, context, uuid_range=None):
-        """Return a list of ExtARQ objects."""
+    def list(
+        cls,
+        context,
+        uuid_range=None,
+        instance_uuid=None,
+        state=None,
+        limit=None,
+        marker=None,
+    ):
+        """Return a list of ExtARQ objects.
+
+        :param instance_uuid: only return the ARQs of this instance.
+        :param state: only return the ARQs in this state, or in any of
+            the states if a list is given.
+        :param limit: maximum number of ARQs to return.
+        :param marker: the UUID of the ARQ after which the list starts.
+        """
         target = {} if context.is_admin else {'project_id': context.project_id}
-        db_extarqs = cls.dbapi.extarq_list(context, uuid_range, **target)
+        filters = dict(target)
+        if instance_uuid is not None:
+            filters['instance_uuid'] = instance_uuid
+        if state is not None:
+            filters['state'] = state
+        if limit is not None:
+            filters['limit'] = limit
+        if marker is not None:
+            db_marker = cls.dbapi.extarq_get(context, marker, **target)
+            filters['marker'] = db_marker['id']
+        db_extarqs = cls.dbapi.extarq_list(context, uuid_range, **filters)
         obj_extarq_list = cls._from_db_object_list(db_extarqs, context)
         return obj_extarq_list
 
@@ -155,25 +201,51 @@ class ExtARQ(
             return False
         old = self.arq.state
         scope = scope or ARQ_STATES_TRANSFORM_MATRIX[state]
-        self.update_state(context, state, scope)
-        ea = ExtARQ.get(context, self.arq.uuid, lock=True)
-        if not ea:
+        updates = self.obj_get_changes()
+        updates['state'] = state
+        count, current = self.dbapi.extarq_update_state(
+            context, self.arq.uuid, updates, scope
+        )
+        if current is None:
             raise exception.ResourceNotFound(
-                resources='ExtARQ',
+                resource='ExtARQ',
                 msg="Can not find ExtARQ(%s)" % self.arq.uuid,
             )
-        current = ea.arq.state
-        if state != current:
+        if not count:
             msg = (
                 "Failed to change ARQ state from %s to %s, the current "
                 "state is %s" % (old, state, current)
             )
             LOG.error(msg)
             raise exception.ARQBadState(
-                state=current, uuid=self.arq.uuid, expected=list(state)
+                state=current, uuid=self.arq.uuid, expected=scope
             )
+        self.arq.state = state
+        # obj_get_changes() flattens the ARQ fields, reset them directly.
+        self.obj_reset_changes()
+        self.arq.obj_reset_changes()
         return True
 
+    @classmethod
+    def update_check_states(cls, context, extarqs, state):
+        """Move extarqs to state with a single conditional UPDATE.
+
+        Either all the extarqs are updated, with their pending changes,
+        or none is and ARQBadState is raised.
+        """
+        scope = ARQ_STATES_TRANSFORM_MATRIX[state]
+        values_by_uuid = {}
+        for extarq in extarqs:
+            updates = extarq.obj_get_changes()
+            updates['state'] = state
+            values_by_uuid[extarq.arq.uuid] = updates
+        cls.dbapi.extarq_update_many(context, values_by_uuid, scope)
+        for extarq in extarqs:
+            extarq.arq.state = state
+            # obj_get_changes() flattens the ARQ fields, reset them directly.
+            extarq.obj_reset_changes()
+            extarq.arq.obj_reset_changes()
+
     def destroy(self, context):
         """Delete an ExtARQ from the DB."""
         target = {} if context.is_admin else {'project_id': context.project_id}
@@ -215,11 +287,7 @@ class ExtARQ(
         not raise an error on the second and later attempts even if the
         first one has deleted the ARQs.
         """
-        obj_extarqs = [
-            extarq
-            for extarq in objects.ExtARQ.list(context)
-            if extarq.arq['instance_uuid'] == instance_uuid
-        ]
+        obj_extarqs = objects.ExtARQ.list(context, instance_uuid=instance_uuid)
         for obj_extarq in obj_extarqs:
             LOG.info(
                 'Deleting obj_extarq uuid %s for instance %s',
@@ -235,11 +303,11 @@ class ExtARQ(
             auth_user = CONF.image.username or default_user
         except Exception:
             auth_user = default_user
-        return connection.Connection(cloud=auth_user)
+        return utils.get_shared_connection(auth_user)
 
-    def _allocate_attach_handle(self, context, deployable):
+    def _allocate_attach_handle(self, context, deployable, attach_handle=None):
         try:
-            ah = AttachHandle.allocate(context, deployable.id)
+            ah = attach_handle or AttachHandle.allocate(context, deployable.id)
             self.attach_handle_id = ah.id
             # if attach_handle is a vgpu, create the mdev in the sys path
             if ah.attach_type == 'MDEV':
@@ -273,8 +341,13 @@ class ExtARQ(
             self.arq.uuid,
         )
 
-    def bind(self, context, deployable):
-        self._allocate_attach_handle(context, deployable)
+    def bind(self, context, deployable, attach_handle=None):
+        """Bind the ARQ to an attach handle of deployable.
+
+        :param attach_handle: an attach handle of deployable already
+            allocated for this ARQ, if any.
+        """
+        self._allocate_attach_handle(context, deployable, attach_handle)
         self.deployable_id = deployable.id
         self.save(context)
         # ARQ state changes get committed here
@@ -335,23 +408,77 @@ class ExtARQ(
         self.save(context)
 
     @classmethod
-    def _fill_obj_extarq_fields(cls, context, db_extarq):
+    def _get_related_objects(cls, context, db_extarqs):
+        """Load the device profiles, attach handles and deployables
+        referenced by db_extarqs, with one query for each table.
+
+        :returns: a dict of the loaded rows by id for each table.
+        """
+        devprof_ids = set()
+        ah_ids = set()
+        dep_ids = set()
+        for db_extarq in db_extarqs:
+            devprof_ids.add(db_extarq.get('device_profile_id'))
+            if db_extarq.get('state') == 'Bound':
+                ah_ids.add(db_extarq.get('attach_handle_id'))
+            dep_ids.add(db_extarq.get('deployable_id'))
+        devprof_ids.discard(None)
+        ah_ids.discard(None)
+        dep_ids.discard(None)
+
+        related = {
+            'device_profiles': {},
+            'attach_handles': {},
+            'deployables': {},
+        }
+        if devprof_ids:
+            related['device_profiles'] = DeviceProfile.get_by_ids(
+                context, devprof_ids
+            )
+        if ah_ids:
+            related['attach_handles'] = {
+                db_ah['id']: db_ah
+                for db_ah in cls.dbapi.attach_handle_get_by_filters(
+                    context, {'id': list(ah_ids)}
+                )
+            }
+        if dep_ids:
+            related['deployables'] = {
+                dep.id: dep
+                for dep in objects.Deployable.list(
+                    context, {'id': list(dep_ids)}
+                )
+            }
+        return related
+
+    @classmethod
+    def _fill_obj_extarq_fields(cls, context, db_extarq, related=None):
         """ExtARQ object has some fields that are not present
         in db_extarq. We fill them out here.
+
+        :param related: the rows loaded by _get_related_objects. Any row
+            missing from it is queried on its own.
         """
+        related = related or {}
         # From the 2 fields in the ExtARQ, we obtain other fields.
         devprof_id = db_extarq['device_profile_id']
         devprof_group_id = db_extarq['device_profile_group_id']
 
-        devprof = DeviceProfile.get_by_id(context, devprof_id)
+        devprof = related.get('device_profiles', {}).get(devprof_id)
+        if devprof is None:
+            devprof = DeviceProfile.get_by_id(context, devprof_id)
         db_extarq['device_profile_name'] = devprof['name']
 
         db_extarq['attach_handle_type'] = ''
         db_extarq['attach_handle_info'] = ''
         if db_extarq['state'] == 'Bound':  # TODO() Do proper bind
-            db_ah = cls.dbapi.attach_handle_get_by_id(
-                context, db_extarq['attach_handle_id']
+            db_ah = related.get('attach_handles', {}).get(
+                db_extarq['attach_handle_id']
             )
+            if db_ah is None:
+                db_ah = cls.dbapi.attach_handle_get_by_id(
+                    context, db_extarq['attach_handle_id']
+                )
             if db_ah is not None:
                 db_extarq['attach_handle_type'] = db_ah['attach_type']
                 db_extarq['attach_handle_info'] = db_ah['attach_info']
@@ -363,9 +490,13 @@ class ExtARQ(
                 )
 
         if db_extarq['deployable_id']:
-            dep = objects.Deployable.get_by_id(
-                context, db_extarq['deployable_id']
+            dep = related.get('deployables', {}).get(
+                db_extarq['deployable_id']
             )
+            if dep is None:
+                dep = objects.Deployable.get_by_id(
+                    context, db_extarq['deployable_id']
+                )
             db_extarq['deployable_uuid'] = dep.uuid
         else:
             LOG.debug(
@@ -382,13 +513,14 @@ class ExtARQ(
         return db_extarq
 
     @classmethod
-    def _from_db_object(cls, extarq, db_extarq, context):
+    def _from_db_object(cls, extarq, db_extarq, context, related=None):
         """Converts an ExtARQ to a formal object.
         :param extarq: An object of the class ExtARQ
         :param db_extarq: A DB model of the object
+        :param related: the rows loaded by _get_related_objects, if any
         :return: The object of the class with the database entity added
         """
-        cls._fill_obj_extarq_fields(context, db_extarq)
+        cls._fill_obj_extarq_fields(context, db_extarq, related)
 
         for field in extarq.fields:
             if field != 'arq':
@@ -402,9 +534,12 @@ class ExtARQ(
     def _from_db_object_list(cls, db_objs, context):
         """Converts a list of ExtARQs to a list of formal objects."""
         objs = []
+        if not db_objs:
+            return objs
+        related = cls._get_related_objects(context, db_objs)
         for db_obj in db_objs:
             extarq = cls(context)
-            obj = cls._from_db_object(extarq, db_obj, context)
+            obj = cls._from_db_object(extarq, db_obj, context, related)
             objs.append(obj)
         return objs
 
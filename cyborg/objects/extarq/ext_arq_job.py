@@ -13,6 +13,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+
+from concurrent import futures
+
 from oslo_log import log as logging
 
 from cyborg import objects
@@ -30,13 +34,17 @@ LOG = logging.getLogger(__name__)
 class ExtARQJobMixin:
     """Mixin Class for ExtARQ async job management."""
 
-    def _bind_job(self, context, deployable):
-        """The bind process of an accelerator."""
+    def _need_bind_job(self, context, deployable):
+        """Whether the bind of this ARQ runs as an async job."""
         check_extra_job = getattr(self, "_need_extra_bind_job", None)
         need_job = False
         if check_extra_job:
             need_job = check_extra_job(context, deployable)
-        if getattr(self.bind, "is_job", False) and need_job:
+        return getattr(self.bind, "is_job", False) and need_job
+
+    def _bind_job(self, context, deployable):
+        """The bind process of an accelerator."""
+        if self._need_bind_job(context, deployable):
             LOG.info("Start job for ARQ(%s) bind.", self.arq.uuid)
             works = utils.ThreadWorks()
             job = works.spawn(self.bind, context, deployable)
@@ -55,8 +63,39 @@ class ExtARQJobMixin:
             return factory.get(context, uuid)
         return extarq
 
-    def start_bind_job(self, context, valid_fields):
-        """Check and start bind jobs for ARQ."""
+    @classmethod
+    def get_suitable_ext_arqs(cls, context, uuids):
+        """Find the suitable ExtARQ of each uuid with a single DB query.
+
+        :returns: the ExtARQs in the order of uuids.
+        :raises: ResourceNotFound if any of the ARQs does not exist.
+        """
+        extarqs = {
+            extarq.arq.uuid: extarq for extarq in cls.list(context, uuids)
+        }
+        suitable = []
+        for uuid in uuids:
+            extarq = extarqs.get(uuid)
+            if extarq is None:
+                raise exception.ResourceNotFound(
+                    resource='ExtArq', msg='with uuid=%s' % uuid
+                )
+            typ = extarq.get_resources_from_device_profile_group()
+            factory = cls.factory(typ)
+            if factory != cls:
+                # Rebuild the ARQ as the concrete class without another
+                # round trip to the DB.
+                concrete = factory(context)
+                for field in extarq.fields:
+                    if extarq.obj_attr_is_set(field):
+                        setattr(concrete, field, getattr(extarq, field))
+                concrete.obj_reset_changes()
+                extarq = concrete
+            suitable.append(extarq)
+        return suitable
+
+    def _prepare_bind(self, context, valid_fields):
+        """Check the ARQ can be bound and set its binding fields."""
         expected = ARQ_STATES_TRANSFORM_MATRIX[constants.ARQ_BIND_STARTED]
         # Check whether ARQ can be bound.
         if self.arq.state not in expected:
@@ -88,12 +127,117 @@ class ExtARQJobMixin:
         self.arq.instance_uuid = instance_uuid
         self.arq.project_id = project_id
 
+    def start_bind_job(self, context, valid_fields):
+        """Check and start bind jobs for ARQ."""
+        self._prepare_bind(context, valid_fields)
+
         # If prog fails, we'll change this ARQ state changes get committed here
         self.update_check_state(context, constants.ARQ_BIND_STARTED)
 
-        dep = objects.Deployable.get_by_device_rp_uuid(context, devrp_uuid)
+        dep = objects.Deployable.get_by_device_rp_uuid(
+            context, self.arq.device_rp_uuid
+        )
         return self._bind_job(context, dep)
 
+    @classmethod
+    def start_bind_jobs(cls, context, extarqs, valid_fields):
+        """Check and start bind jobs for the ARQs of one instance.
+
+        The ARQs move to the bind started state with a single conditional
+        UPDATE, so none of them starts binding if any is in a bad state.
+        The instant binds run concurrently and are finished when this
+        returns, the other binds run as async jobs.
+
+        :returns: a dict of ExtARQ to its async bind job, or None when
+            its bind is instant.
+        """
+        for extarq in extarqs:
+            extarq._prepare_bind(context, valid_fields)
+
+        rp_uuids = {extarq.arq.device_rp_uuid for extarq in extarqs}
+        deps = {
+            dep.rp_uuid: dep
+            for dep in objects.Deployable.list(
+                context, {'rp_uuid': list(rp_uuids)}
+            )
+        }
+        for rp_uuid in rp_uuids - set(deps):
+            raise exception.ResourceNotFound(
+                resource='Deployable',
+                msg='with resource provider uuid=%s' % rp_uuid,
+            )
+
+        # If prog fails, we'll change this ARQ state changes get committed here
+        cls.update_check_states(context, extarqs, constants.ARQ_BIND_STARTED)
+
+        arq_binds = {}
+        instant = collections.defaultdict(list)
+        for extarq in extarqs:
+            dep = deps[extarq.arq.device_rp_uuid]
+            if extarq._need_bind_job(context, dep):
+                LOG.info("Start job for ARQ(%s) bind.", extarq.arq.uuid)
+                works = utils.ThreadWorks()
+                arq_binds[extarq] = works.spawn(extarq.bind, context, dep)
+            else:
+                LOG.info("ARQ(%s) bind process is instant.", extarq.arq.uuid)
+                instant[dep.id].append((extarq, dep))
+                arq_binds[extarq] = None
+        cls._run_instant_binds(context, list(instant.values()))
+        return arq_binds
+
+    @staticmethod
+    def _bind_all(context, binds):
+        """Bind ARQs to one deployable, allocating their handles at once."""
+        handles = []
+        if len(binds) > 1:
+            dep = binds[0][1]
+            try:
+                handles = objects.AttachHandle.allocate_many(
+                    context, dep.id, len(binds)
+                )
+            except exception.ResourceNotFound:
+                # Not enough handles for all, each ARQ gets one or fails
+                # on its own as it would alone.
+                LOG.warning(
+                    "Deployable(%s) has fewer than %d free attach handles.",
+                    dep.uuid,
+                    len(binds),
+                )
+        for i, (extarq, dep) in enumerate(binds):
+            try:
+                if handles:
+                    extarq.bind(context, dep, handles[i])
+                else:
+                    extarq.bind(context, dep)
+            except Exception:
+                for ah in handles[i + 1 :]:
+                    ah.deallocate(context)
+                raise
+
+    @classmethod
+    def _run_instant_binds(cls, context, binds_by_dep):
+        """Run the instant binds of each deployable concurrently.
+
+        The binds of one deployable run one after the other, as they
+        allocate attach handles from the same pool. Every bind finishes
+        before the first failure, if any, is raised.
+
+        :param binds_by_dep: a list of the (extarq, deployable) binds of
+            each deployable.
+        """
+        if len(binds_by_dep) <= 1:
+            for binds in binds_by_dep:
+                cls._bind_all(context, binds)
+            return
+        works = utils.ThreadWorks()
+        jobs = [
+            works.spawn(cls._bind_all, context, binds)
+            for binds in binds_by_dep
+        ]
+        futures.wait(jobs)
+        for job in jobs:
+            job.result()
+
     @classmethod
     def master(cls, context, arq_binds):
         """Start a master thread to monitor job workers."""
@@ -258,14 +402,21 @@ class ExtARQJobMixin:
     @classmethod
     def apply_patch(cls, context, patch_list, valid_fields):
         """Apply JSON patch. See api/controllers/v2/arqs.py."""
-        arq_binds = {}
+        bind_uuids = []
         for arq_uuid, patch in patch_list.items():
-            extarq = cls.get_suitable_ext_arq(context, arq_uuid)
             if patch[0]['op'] == 'add':  # All ops are 'add'
-                # arq_notify_list.append(arq_uuid)
-                job = extarq.start_bind_job(context, valid_fields)
-                arq_binds[extarq] = job
+                bind_uuids.append(arq_uuid)
             else:
+                extarq = cls.get_suitable_ext_arq(context, arq_uuid)
                 extarq.unbind(context)
-        if arq_binds:
+        if not bind_uuids:
+            return
+
+        # Bind the ARQs of each instance as one batch.
+        extarqs_by_instance = collections.defaultdict(list)
+        for extarq in cls.get_suitable_ext_arqs(context, bind_uuids):
+            instance_uuid = valid_fields[extarq.arq.uuid]['instance_uuid']
+            extarqs_by_instance[instance_uuid].append(extarq)
+        for extarqs in extarqs_by_instance.values():
+            arq_binds = cls.start_bind_jobs(context, extarqs, valid_fields)
             cls.master(context, arq_binds)
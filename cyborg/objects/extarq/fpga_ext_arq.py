@@ -17,7 +17,6 @@
 Different accelerator handlers for conductor/agent/api/object to call.
 """
 
-from openstack import connection
 from oslo_log import log as logging
 from oslo_serialization import jsonutils
 
@@ -26,12 +25,76 @@ from cyborg.common import constants
 from cyborg.common import exception
 from cyborg.common import placement_client
 from cyborg.common import utils
+from cyborg.conf import CONF
 from cyborg.objects import base
 from cyborg.objects.ext_arq import ExtARQ
 
 
 LOG = logging.getLogger(__name__)
 
+# The images found in Glance for a function or bitstream id, and the
+# lookups that found none or more than one, kept for a shorter time.
+_cache = None
+_miss_cache = None
+
+
+def _get_caches():
+    """Return the caches of the bitstream metadata of this process.
+
+    The images of a lookup are cached under ('function', function_id) or
+    ('bitstream', bitstream_id); an image found by its function is also
+    cached under its bitstream id.
+    """
+    global _cache, _miss_cache
+    if _cache is None:
+        _cache = utils.LRUCache(
+            CONF.bitstream_md_cache_size, CONF.bitstream_md_cache_ttl
+        )
+        _miss_cache = utils.LRUCache(
+            CONF.bitstream_md_cache_size, CONF.bitstream_md_cache_miss_ttl
+        )
+    return _cache, _miss_cache
+
+
+def clear_cache():
+    """Drop the cached bitstream metadata, and pick up new cache options."""
+    global _cache, _miss_cache
+    _cache = _miss_cache = None
+
+
+def invalidate_bitstream_md(bitstream_id, function_id=None):
+    """Drop the cached metadata of a bitstream and of its function."""
+    keys = [('bitstream', bitstream_id)]
+    if function_id:
+        keys.append(('function', function_id))
+    for cache in _get_caches():
+        for key in keys:
+            cache.pop(key)
+
+
+def _cached_images(key, lookup):
+    """Return the images of a Glance lookup, cached.
+
+    :param key: the key of the lookup in the caches.
+    :param lookup: called on a cache miss, returns the list of the images
+        found, or None if Glance failed, which is not cached.
+    """
+    cache, miss_cache = _get_caches()
+    for c in (cache, miss_cache):
+        images = c.get(key)
+        if images is not None:
+            LOG.debug('Using the cached images of %s: %s', key, images)
+            return images
+    images = lookup()
+    if images is None:
+        return None
+    if len(images) == 1:
+        cache.put(key, images)
+        cache.put(('bitstream', images[0]['id']), images)
+    else:
+        miss_cache.put(key, images)
+    return images
+
 
 @utils.factory_register(ExtARQ, constants.FPGA)
 @base.CyborgObjectRegistry.register
@@ -52,27 +115,31 @@ class FPGAExtARQ(ExtARQ):
 
     def _get_bitstream_md_from_bitstream_id(self, bitstream_id):
         """Get bitstream metadata given a bitstream id."""
-        conn = connection.Connection(cloud='devstack-admin')
-        resp = conn.image.get('/images/' + bitstream_id)
-        if resp:
-            return resp.json()
+        images = _cached_images(
+            ('bitstream', bitstream_id),
+            lambda: self._get_images_by_bitstream_id(bitstream_id),
+        )
+        if images:
+            return images[0]
         else:
             LOG.warning('Failed to get image for bitstream (%s)', bitstream_id)
             return None
 
+    def _get_images_by_bitstream_id(self, bitstream_id):
+        conn = utils.get_shared_connection('devstack-admin')
+        resp = conn.image.get('/images/' + bitstream_id)
+        if resp.status_code == 404:
+            return []
+        return [resp.json()] if resp else None
+
     # TODO(Shaohe) should move to spec handler.
     def _get_bitstream_md_from_function_id(self, function_id):
         """Get bitstream metadata given a function id."""
-        # TODO(Shaohe) parametrize this role in config file.
-        conn = connection.Connection(cloud='devstack-admin')
-        properties = {constants.ACCEL_FUNCTION_ID: function_id}
-        resp = conn.image.get('/images', params=properties)
-        if resp:
-            image_list = resp.json()['images']
-            if not isinstance(image_list, list):
-                raise exception.InvalidType(
-                    obj='image', type=type(image_list), expected='list'
-                )
+        image_list = _cached_images(
+            ('function', function_id),
+            lambda: self._get_images_by_function_id(function_id),
+        )
+        if image_list is not None:
             if len(image_list) != 1:
                 raise exception.ExpectedOneObject(
                     obj='image', count=len(image_list)
@@ -87,6 +154,20 @@ class FPGAExtARQ(ExtARQ):
             LOG.warning('Failed to get image for function (%s)', function_id)
             return None
 
+    def _get_images_by_function_id(self, function_id):
+        # TODO(Shaohe) parametrize this role in config file.
+        conn = utils.get_shared_connection('devstack-admin')
+        properties = {constants.ACCEL_FUNCTION_ID: function_id}
+        resp = conn.image.get('/images', params=properties)
+        if not resp:
+            return None
+        image_list = resp.json()['images']
+        if not isinstance(image_list, list):
+            raise exception.InvalidType(
+                obj='image', type=type(image_list), expected='list'
+            )
+        return image_list
+
     def _needs_programming(self, context, deployable):
         bs_id = self._get_bitstream_id()
         fun_id = self._get_function_id()
@@ -157,7 +238,7 @@ class FPGAExtARQ(ExtARQ):
         return self._needs_programming(context, deployable)
 
     @utils.wrap_job_tb("Error during ARQ bind job. Reason: %s")
-    def bind(self, context, deployable):
+    def bind(self, context, deployable, attach_handle=None):
         LOG.info(
             'Start bind jobs for ARQ(%s) with deployable(%s)',
             self.arq.uuid,
@@ -174,7 +255,7 @@ class FPGAExtARQ(ExtARQ):
             self._update_placement(context, fun_id, deployable.driver_name)
             deployable.update(context, {'bitstream_id': bs_md['id']})
 
-        super().bind(context, deployable)
+        super().bind(context, deployable, attach_handle)
 
         return True
 
@@ -272,12 +353,14 @@ class FPGAExtARQ(ExtARQ):
                 context, hostname, controlpath_id, bitstream_id, driver_name
             )
         except Exception as e:
+            # The image may be gone from Glance, look it up again next time.
+            invalidate_bitstream_md(bitstream_id, self._get_function_id())
             self.update_check_state(context, constants.ARQ_BIND_FAILED)
             LOG.error(
                 'Failed programming for host: (%s) deployable (%s). Error: %s',
                 hostname,
                 deployable.uuid,
-                e.message,
+                e,
             )
             raise
         LOG.info(
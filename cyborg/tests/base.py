@@ -28,6 +28,9 @@ from oslotest import base
 
 from cyborg import context as cyborg_context
 from cyborg.common import config as cyborg_config
+from cyborg.common import utils
+from cyborg.objects import device_profile
+from cyborg.objects.extarq import fpga_ext_arq
 from cyborg.tests import post_mortem_debug
 from cyborg.tests.local_fixtures import policy_fixture
 
@@ -48,6 +51,14 @@ class TestCase(base.BaseTestCase):
         self.context = cyborg_context.get_admin_context()
         self._set_config()
         self.policy = self.useFixture(policy_fixture.PolicyFixture())
+        # Each test has its own database.
+        device_profile.clear_cache()
+        self.addCleanup(device_profile.clear_cache)
+        fpga_ext_arq.clear_cache()
+        self.addCleanup(fpga_ext_arq.clear_cache)
+        # Each test mocks the clients of the services its own way.
+        utils.clear_shared_clients()
+        self.addCleanup(utils.clear_shared_clients)
 
     def _set_config(self):
         self.cfg_fixture = self.useFixture(config_fixture.Config(cfg.CONF))
@@ -0,0 +1,120 @@
+# Copyright 2026 The Cyborg Authors.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+
+from unittest import mock
+
+import fixtures
+
+from cyborg.accelerator.common import pci_snapshot
+from cyborg.accelerator.drivers.fpga.intel import sysinfo
+from cyborg.tests import base
+
+
+class TestPciSnapshot(base.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.root = self.useFixture(fixtures.TempDir()).path
+        self.devices = os.path.join(self.root, 'devices')
+        os.mkdir(self.devices)
+
+    def _write(self, path, name, value):
+        with open(os.path.join(path, name), 'w') as f:
+            f.write(value + '\n')
+
+    def _add_device(self, address, vendor, device):
+        path = os.path.join(self.devices, address)
+        os.mkdir(path)
+        self._write(path, 'vendor', vendor)
+        self._write(path, 'device', device)
+        return path
+
+    def test_devices(self):
+        self._add_device('0000:5e:00.0', '0x8086', '0x09c4')
+        snapshot = pci_snapshot.PciSnapshot(self.devices)
+        self.assertEqual(
+            {
+                '0000:5e:00.0': pci_snapshot.PciDevice(
+                    address='0000:5e:00.0', vendor='0x8086', device='0x09c4'
+                )
+            },
+            snapshot.devices,
+        )
+
+    def test_devices_once_per_snapshot(self):
+        path = self._add_device('0000:5e:00.0', '0x8086', '0x09c4')
+        snapshot = pci_snapshot.PciSnapshot(self.devices)
+        snapshot.devices
+        self._write(path, 'device', '0x0b30')
+        with mock.patch.object(
+            pci_snapshot, 'read_device', wraps=pci_snapshot.read_device
+        ) as m_read:
+            self.assertEqual('0x09c4', snapshot.devices['0000:5e:00.0'].device)
+            m_read.assert_not_called()
+            snapshot = pci_snapshot.PciSnapshot(self.devices)
+            self.assertEqual('0x0b30', snapshot.devices['0000:5e:00.0'].device)
+            m_read.assert_called_once_with(path)
+
+    def test_devices_missing(self):
+        snapshot = pci_snapshot.PciSnapshot(os.path.join(self.root, 'nope'))
+        self.assertEqual({}, snapshot.devices)
+
+    @mock.patch.object(pci_snapshot, 'lspci_privileged')
+    def test_lspci_once(self, m_lspci):
+        m_lspci.return_value = ('0000:5e:00.0 ...', '')
+        snapshot = pci_snapshot.PciSnapshot(self.devices)
+        fallback = mock.Mock()
+        with pci_snapshot.use(snapshot):
+            self.assertEqual(
+                m_lspci.return_value, pci_snapshot.lspci(fallback)
+            )
+            self.assertEqual(
+                m_lspci.return_value, pci_snapshot.lspci(fallback)
+            )
+        m_lspci.assert_called_once_with(pci_snapshot.LSPCI_FLAGS)
+        fallback.assert_not_called()
+        self.assertIsNone(pci_snapshot.current())
+
+    @mock.patch.object(pci_snapshot, 'lspci_privileged')
+    def test_lspci_flags(self, m_lspci):
+        m_lspci.side_effect = lambda flags: (' '.join(flags), '')
+        snapshot = pci_snapshot.PciSnapshot(self.devices)
+        fallback = mock.Mock()
+        with pci_snapshot.use(snapshot):
+            self.assertEqual(('-nnn -D', ''), pci_snapshot.lspci(fallback))
+            self.assertEqual(
+                ('-nn -D', ''),
+                pci_snapshot.lspci(fallback, flags=('-nn', '-D')),
+            )
+        self.assertEqual(2, m_lspci.call_count)
+        fallback.assert_not_called()
+
+    def test_lspci_without_snapshot(self):
+        fallback = mock.Mock(return_value=('out', ''))
+        self.assertEqual(('out', ''), pci_snapshot.lspci(fallback, 'arg'))
+        fallback.assert_called_once_with('arg')
+
+    def test_driver_uses_snapshot(self):
+        self._add_device('0000:5e:00.0', '0x8086', '0x09c4')
+        self._add_device('0000:5f:00.0', '0x8086', '0x1572')
+        snapshot = pci_snapshot.PciSnapshot(self.devices)
+        with (
+            pci_snapshot.use(snapshot),
+            mock.patch.object(sysinfo, 'read_line') as m_read_line,
+        ):
+            fpgas = list(sysinfo.find_fpgas_by_know_list())
+        m_read_line.assert_not_called()
+        self.assertEqual([os.path.join(self.devices, '0000:5e:00.0')], fpgas)
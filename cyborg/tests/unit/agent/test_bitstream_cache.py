@@ -0,0 +1,179 @@
+# Copyright 2026 The Cyborg Authors.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import hashlib
+import os
+import threading
+
+from concurrent import futures
+
+import fixtures
+
+from cyborg.agent import bitstream_cache
+from cyborg.common import exception
+from cyborg.image import glance
+from cyborg.tests import base
+
+
+class FakeImageAPI:
+    """Images with their sha512 in Glance."""
+
+    def __init__(self):
+        self.images = {}
+        self.downloads = []
+        self.gate = None
+
+    def add(self, image_id, data, os_hash_value=None):
+        self.images[image_id] = {
+            'id': image_id,
+            'os_hash_algo': 'sha512',
+            'os_hash_value': os_hash_value or hashlib.sha512(data).hexdigest(),
+            'data': data,
+        }
+
+    def get(self, context, image_id):
+        return self.images[image_id]
+
+    def download(
+        self, context, image_id, dest_path, image_meta=None, verify=None
+    ):
+        self.downloads.append(image_id)
+        if self.gate is not None:
+            self.gate.wait(5)
+        content = self.images[image_id]['data']
+        with open(dest_path, 'wb') as f:
+            f.write(content)
+        if verify:
+            hasher, digest = glance.image_hasher(image_meta)
+            hasher.update(content)
+            if hasher.hexdigest() != digest:
+                raise exception.ImageUnacceptable(
+                    image_id=image_id, reason='bad data'
+                )
+
+
+class TestBitstreamCache(base.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.path = os.path.join(
+            self.useFixture(fixtures.TempDir()).path, 'bitstreams'
+        )
+        self.image_api = FakeImageAPI()
+        self.image_api.add('image-1', b'bitstream 1')
+        self.image_api.add('image-2', b'bitstream 2')
+        self.image_api.add('image-3', b'bitstream 3')
+        self.cache = bitstream_cache.BitstreamCache(
+            self.image_api, self.path, 25
+        )
+
+    def _fetch(self, image_id, cache=None):
+        with (cache or self.cache).fetch(self.context, image_id) as path:
+            with open(path, 'rb') as f:
+                return f.read()
+
+    def test_fetch_cached(self):
+        self.assertEqual(b'bitstream 1', self._fetch('image-1'))
+        self.assertEqual(b'bitstream 1', self._fetch('image-1'))
+        self.assertEqual(['image-1'], self.image_api.downloads)
+
+    def test_fetch_new_checksum(self):
+        self._fetch('image-1')
+        self.image_api.add('image-1', b'bitstream 1 fixed')
+        self.assertEqual(b'bitstream 1 fixed', self._fetch('image-1'))
+        self.assertEqual(['image-1', 'image-1'], self.image_api.downloads)
+
+    def test_fetch_checksum_mismatch(self):
+        self.image_api.add('image-1', b'bitstream 1', os_hash_value='bad')
+        self.assertRaises(exception.ImageUnacceptable, self._fetch, 'image-1')
+        self.assertEqual([], os.listdir(self.path))
+
+    def test_fetch_md5_checksum(self):
+        self.image_api.images['image-1'] = {
+            'checksum': hashlib.md5(b'bitstream 1').hexdigest(),
+            'data': b'bitstream 1',
+        }
+        self._fetch('image-1')
+        self._fetch('image-1')
+        self.assertEqual(['image-1'], self.image_api.downloads)
+
+    def test_fetch_without_checksum(self):
+        self.image_api.images['image-1'] = {'data': b'bitstream 1'}
+        self.assertEqual(b'bitstream 1', self._fetch('image-1'))
+        self.assertEqual(b'bitstream 1', self._fetch('image-1'))
+        self.assertEqual(['image-1', 'image-1'], self.image_api.downloads)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_disabled(self):
+        cache = bitstream_cache.BitstreamCache(self.image_api, self.path, 0)
+        with cache.fetch(self.context, 'image-1') as path:
+            self.assertTrue(os.path.exists(path))
+        self.assertFalse(os.path.exists(path))
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_evict_least_recently_used(self):
+        self._fetch('image-1')
+        self._fetch('image-2')
+        self._fetch('image-1')
+        # Beyond 25 bytes, image-2 is evicted.
+        self._fetch('image-3')
+        self.assertEqual(2, len(os.listdir(self.path)))
+        self._fetch('image-1')
+        self._fetch('image-3')
+        self._fetch('image-2')
+        self.assertEqual(
+            ['image-1', 'image-2', 'image-3', 'image-2'],
+            self.image_api.downloads,
+        )
+
+    def test_evict_not_in_use(self):
+        with self.cache.fetch(self.context, 'image-1') as path:
+            self._fetch('image-2')
+            self._fetch('image-3')
+            self.assertTrue(os.path.exists(path))
+        self._fetch('image-1')
+        self.assertEqual(
+            ['image-1', 'image-2', 'image-3'], self.image_api.downloads
+        )
+
+    def test_restart(self):
+        self._fetch('image-1')
+        with open(os.path.join(self.path, 'x' + '.part'), 'wb'):
+            pass
+        cache = bitstream_cache.BitstreamCache(self.image_api, self.path, 25)
+        self.assertEqual(b'bitstream 1', self._fetch('image-1', cache))
+        self.assertEqual(['image-1'], self.image_api.downloads)
+        self.assertEqual(1, len(os.listdir(self.path)))
+
+    def test_concurrent_fetch_single_download(self):
+        self.image_api.gate = threading.Event()
+        with futures.ThreadPoolExecutor(4) as executor:
+            results = [
+                executor.submit(self._fetch, 'image-1') for _ in range(4)
+            ]
+            threading.Timer(0.1, self.image_api.gate.set).start()
+            for result in results:
+                self.assertEqual(b'bitstream 1', result.result())
+        self.assertEqual(['image-1'], self.image_api.downloads)
+
+    def test_concurrent_fetch_failed(self):
+        self.image_api.add('image-1', b'bitstream 1', os_hash_value='bad')
+        self.image_api.gate = threading.Event()
+        with futures.ThreadPoolExecutor(2) as executor:
+            results = [
+                executor.submit(self._fetch, 'image-1') for _ in range(2)
+            ]
+            threading.Timer(0.1, self.image_api.gate.set).start()
+            for result in results:
+                self.assertRaises(exception.ImageUnacceptable, result.result)
@@ -0,0 +1,102 @@
+# Copyright 2026 The Cyborg Authors.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import queue
+
+from unittest import mock
+
+from cyborg.agent import device_watcher
+from cyborg.tests import base
+
+
+def _event(address, subsystem='pci'):
+    return device_watcher.DeviceEvent('add', subsystem, '/devices', address)
+
+
+class TestParseUevent(base.TestCase):
+    def test_pci(self):
+        data = (
+            b'add@/devices/pci0000:5d/0000:5d:00.0/0000:5e:00.1\0'
+            b'ACTION=add\0'
+            b'DEVPATH=/devices/pci0000:5d/0000:5d:00.0/0000:5e:00.1\0'
+            b'SUBSYSTEM=pci\0'
+            b'PCI_SLOT_NAME=0000:5e:00.1\0'
+        )
+        self.assertEqual(
+            device_watcher.DeviceEvent(
+                'add',
+                'pci',
+                '/devices/pci0000:5d/0000:5d:00.0/0000:5e:00.1',
+                '0000:5e:00.1',
+            ),
+            device_watcher.parse_uevent(data),
+        )
+
+    def test_mdev(self):
+        devpath = (
+            '/devices/pci0000:3a/0000:3a:00.0/0000:3b:00.0/'
+            '3b1d5e2c-9f6a-4a8b-8e3d-2f1c7b6a5d40'
+        )
+        data = (
+            'add@%s\0ACTION=add\0DEVPATH=%s\0SUBSYSTEM=mdev\0'
+            % (devpath, devpath)
+        ).encode()
+        self.assertEqual(
+            '0000:3b:00.0', device_watcher.parse_uevent(data).address
+        )
+
+    def test_other_subsystem(self):
+        data = b'add@/devices/virtual/net/tap0\0ACTION=add\0SUBSYSTEM=net\0'
+        self.assertIsNone(device_watcher.parse_uevent(data))
+
+
+class TestDeviceWatcher(base.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.source = device_watcher.FakeEventSource()
+        self.calls = queue.Queue()
+        self.watcher = device_watcher.DeviceWatcher(
+            self.source, self.calls.put, debounce=0.2
+        )
+        self.watcher.start()
+        self.addCleanup(self.watcher.stop)
+
+    def test_coalesce(self):
+        self.source.push(
+            _event('0000:5e:00.1'),
+            _event('0000:5e:00.2'),
+            _event('0000:5e:00.1'),
+        )
+        self.assertEqual(
+            {'0000:5e:00.1', '0000:5e:00.2'}, self.calls.get(timeout=5)
+        )
+        self.source.push(_event('0000:3b:00.0', 'mdev'))
+        self.assertEqual({'0000:3b:00.0'}, self.calls.get(timeout=5))
+        self.assertTrue(self.calls.empty())
+
+    @mock.patch.object(device_watcher, 'LOG')
+    def test_callback_error(self, mock_log):
+        def _callback(addresses):
+            self.calls.put(addresses)
+            if '0000:5e:00.1' in addresses:
+                raise Exception('boom')
+
+        self.watcher._callback = _callback
+        self.source.push(_event('0000:5e:00.1'))
+        self.assertEqual({'0000:5e:00.1'}, self.calls.get(timeout=5))
+        # The watcher goes on after a failed callback.
+        self.source.push(_event('0000:5e:00.2'))
+        self.assertEqual({'0000:5e:00.2'}, self.calls.get(timeout=5))
+        self.assertTrue(mock_log.exception.called)
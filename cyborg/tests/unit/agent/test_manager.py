@@ -12,12 +12,16 @@
 
 """Cyborg agent manager test cases."""
 
+import hashlib
+
 from unittest import mock
 
 import fixtures
 
 from keystoneauth1 import exceptions as ks_exc
+from oslo_utils.fixture import uuidsentinel as uuids
 
+from cyborg.agent import device_watcher
 from cyborg.agent import manager
 from cyborg.common import exception
 from cyborg.tests import base
@@ -231,3 +235,74 @@ class TestAgentManager(base.TestCase):
             exception.PlacementResourceProviderNotFound,
             self._create_manager_with_mocks,
         )
+
+    def _create_watching_manager(self):
+        self.placement_mock.get.return_value.json.return_value = {
+            'resource_providers': [{'uuid': 'test-uuid'}]
+        }
+        am = self._create_manager_with_mocks()
+        source = device_watcher.FakeEventSource()
+        with mock.patch.object(device_watcher.DeviceWatcher, 'start'):
+            am._start_device_watcher(source)
+        return am
+
+    def test_update_available_resource_reconciles(self):
+        self.flags(device_reconcile_interval=600, group='agent')
+        am = self._create_watching_manager()
+        am.update_available_resource(None)
+        am.update_available_resource(None)
+        am._rt.update_usage.assert_called_once_with(None)
+
+        self.flags(device_reconcile_interval=0, group='agent')
+        am.update_available_resource(None)
+        self.assertEqual(2, am._rt.update_usage.call_count)
+
+    def test_update_changed_devices(self):
+        am = self._create_watching_manager()
+        am._device_watcher._callback({'0000:5e:00.1'})
+        am._rt.update_usage.assert_called_once_with(mock.ANY, {'0000:5e:00.1'})
+
+    @mock.patch.object(device_watcher, 'NetlinkEventSource')
+    def test_init_host_watch_unavailable(self, mock_source):
+        self.flags(watch_device_events=True, group='agent')
+        mock_source.side_effect = OSError('denied')
+        self.placement_mock.get.return_value.json.return_value = {
+            'resource_providers': [{'uuid': 'test-uuid'}]
+        }
+        am = self._create_manager_with_mocks()
+        am.init_host()
+        self.assertIsNone(am._device_watcher)
+
+    def test_fpga_program_cached_bitstream(self):
+        self.flags(
+            bitstream_cache_dir=self.useFixture(fixtures.TempDir()).path,
+            group='agent',
+        )
+        self.placement_mock.get.return_value.json.return_value = {
+            'resource_providers': [{'uuid': 'test-uuid'}]
+        }
+        am = self._create_manager_with_mocks()
+        bitstream = b'bitstream'
+        am.image_api.get.return_value = {
+            'checksum': hashlib.md5(bitstream).hexdigest()
+        }
+
+        def download(context, image_id, dest_path, **kwargs):
+            with open(dest_path, 'wb') as f:
+                f.write(bitstream)
+
+        am.image_api.download.side_effect = download
+        driver = am.fpga_driver.create.return_value
+
+        def program(controlpath_id, path):
+            with open(path, 'rb') as f:
+                return f.read() == bitstream
+
+        driver.program.side_effect = program
+        for _ in range(2):
+            self.assertTrue(
+                am.fpga_program(
+                    self.context, 'cpid', uuids.bitstream, 'intel_fpga_driver'
+                )
+            )
+        am.image_api.download.assert_called_once()
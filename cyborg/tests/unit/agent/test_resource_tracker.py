@@ -15,13 +15,18 @@
 
 """Cyborg agent resource_tracker test cases."""
 
+import threading
+
 from unittest import mock
 
+from cyborg.accelerator.common import pci_snapshot
+from cyborg.accelerator.common import utils
 from cyborg.agent.resource_tracker import ResourceTracker
 from cyborg.common import exception
 from cyborg.conductor import rpcapi as cond_api
 from cyborg.conf import CONF
 from cyborg.tests import base
+from cyborg.tests.unit import fake_driver_device
 
 
 class TestResourceTracker(base.TestCase):
@@ -66,3 +71,166 @@ class TestResourceTracker(base.TestCase):
         mock_log.error.assert_called_once_with(
             'Unable to report usage: %s', m.side_effect
         )
+
+    def _mock_discover(self):
+        acc_driver = mock.Mock()
+        acc_driver.discover.side_effect = lambda: (
+            fake_driver_device.get_fake_driver_devices_objs()
+        )
+        self.rt.acc_drivers = [acc_driver]
+
+    @mock.patch.object(pci_snapshot, 'lspci_privileged')
+    def test_update_usage_shares_pci_snapshot(self, m_lspci):
+        m_lspci.return_value = ('', '')
+        drivers = [mock.Mock(), mock.Mock()]
+        for acc_driver in drivers:
+            acc_driver.discover.side_effect = lambda: (
+                pci_snapshot.lspci(mock.Mock()) and []
+            )
+        self.rt.acc_drivers = drivers
+        with mock.patch.object(self.rt.conductor_api, 'report_data'):
+            self.rt.update_usage(None)
+        m_lspci.assert_called_once_with(pci_snapshot.LSPCI_FLAGS)
+        self.assertIsNone(pci_snapshot.current())
+
+    def test_update_usage_reports_delta(self):
+        self._mock_discover()
+        with (
+            mock.patch.object(self.rt.conductor_api, 'report_data') as m_full,
+            mock.patch.object(
+                self.rt.conductor_api, 'report_data_delta', return_value=True
+            ) as m_delta,
+        ):
+            self.rt.update_usage(None)
+            m_full.assert_called_once_with(None, 'fake-mini', mock.ANY)
+            m_delta.assert_not_called()
+
+            self.rt.update_usage(None)
+            m_full.assert_called_once()
+            m_delta.assert_called_once_with(None, 'fake-mini', mock.ANY, [])
+            self.assertEqual(2, len(m_delta.call_args[0][2]))
+
+    def test_update_usage_delta_rejected(self):
+        self._mock_discover()
+        with (
+            mock.patch.object(self.rt.conductor_api, 'report_data') as m_full,
+            mock.patch.object(
+                self.rt.conductor_api, 'report_data_delta', return_value=False
+            ) as m_delta,
+        ):
+            self.rt.update_usage(None)
+            self.rt.update_usage(None)
+            m_delta.assert_called_once()
+            self.assertEqual(2, m_full.call_count)
+
+    def test_update_usage_full_report_after_failure(self):
+        self._mock_discover()
+        with (
+            mock.patch.object(self.rt.conductor_api, 'report_data') as m_full,
+            mock.patch.object(
+                self.rt.conductor_api, 'report_data_delta'
+            ) as m_delta,
+        ):
+            m_full.side_effect = [Exception('boom'), None]
+            self.assertRaises(Exception, self.rt.update_usage, None)
+            self.rt.update_usage(None)
+            m_delta.assert_not_called()
+            self.assertEqual(2, m_full.call_count)
+
+    def _blocking_driver(self, event):
+        acc_driver = mock.Mock()
+        devices = fake_driver_device.get_fake_driver_devices_objs()
+        calls = []
+
+        def _discover():
+            calls.append(None)
+            if len(calls) > 1:
+                event.wait(10)
+            return devices
+
+        acc_driver.discover.side_effect = _discover
+        return acc_driver, devices
+
+    def test_discover_concurrently(self):
+        barrier = threading.Barrier(2, timeout=10)
+        drivers = [mock.Mock(), mock.Mock()]
+        for acc_driver in drivers:
+            acc_driver.discover.side_effect = lambda: (barrier.wait(), [])[1]
+        self.rt.acc_drivers = drivers
+        self.assertEqual([], self.rt._discover())
+        self.assertFalse(barrier.broken)
+
+    def test_discover_timeout_reports_last_devices(self):
+        self.flags(discovery_timeout=1, group='agent')
+        event = threading.Event()
+        self.addCleanup(event.set)
+        acc_driver, devices = self._blocking_driver(event)
+        self.rt.acc_drivers = [acc_driver]
+        self.rt._driver_names = {acc_driver: 'slow_driver'}
+        self.assertEqual(devices, self.rt._discover())
+        self.assertFalse(self.rt.discovery_metrics['slow_driver']['stale'])
+        self.assertIn('latency', self.rt.discovery_metrics['slow_driver'])
+
+        self.assertEqual(devices, self.rt._discover())
+        self.assertTrue(self.rt.discovery_metrics['slow_driver']['stale'])
+        # The discovery still running is waited for, not run again.
+        self.assertEqual(devices, self.rt._discover())
+        self.assertEqual(2, acc_driver.discover.call_count)
+        self.assertEqual(
+            2, self.rt.discovery_metrics['slow_driver']['timeouts']
+        )
+
+    def test_discover_timeout_without_devices(self):
+        self.flags(discovery_timeout=1, group='agent')
+        event = threading.Event()
+        self.addCleanup(event.set)
+        acc_driver = mock.Mock()
+        acc_driver.discover.side_effect = lambda: (event.wait(10), [])[1]
+        self.rt.acc_drivers = [acc_driver]
+        with (
+            mock.patch.object(self.rt.conductor_api, 'report_data') as m_full,
+            mock.patch.object(
+                self.rt.conductor_api, 'report_data_delta'
+            ) as m_delta,
+        ):
+            self.rt.update_usage(None)
+        m_full.assert_not_called()
+        m_delta.assert_not_called()
+
+    def test_discover_error(self):
+        acc_driver = mock.Mock()
+        acc_driver.discover.side_effect = Exception('boom')
+        self.rt.acc_drivers = [acc_driver]
+        self.assertRaises(Exception, self.rt._discover)
+        self.assertEqual(1, self.rt.discovery_metrics['Mock']['errors'])
+
+    def test_update_usage_changed_devices(self):
+        drivers = [mock.Mock(), mock.Mock()]
+        devices = fake_driver_device.get_fake_driver_devices_objs()
+        devices[1].controlpath_id.cpid_info = utils.pci_str_to_json(
+            '0000:db:00.0'
+        )
+        drivers[0].discover.return_value = devices[:1]
+        drivers[1].discover.return_value = devices[1:]
+        self.rt.acc_drivers = drivers
+        with (
+            mock.patch.object(self.rt.conductor_api, 'report_data') as m_full,
+            mock.patch.object(
+                self.rt.conductor_api, 'report_data_delta', return_value=True
+            ) as m_delta,
+        ):
+            self.rt.update_usage(None)
+            self.rt.update_usage(None, {'0000:db:00.0'})
+            m_full.assert_called_once()
+            m_delta.assert_called_once()
+            self.assertEqual(2, len(m_delta.call_args[0][2]))
+        drivers[0].discover.assert_called_once_with()
+        self.assertEqual(2, drivers[1].discover.call_count)
+
+    def test_drivers_of_unknown_address(self):
+        drivers = [mock.Mock(), mock.Mock()]
+        for acc_driver in drivers:
+            acc_driver.discover.return_value = []
+        self.rt.acc_drivers = drivers
+        self.rt._discover()
+        self.assertEqual(drivers, self.rt._drivers_of({'0000:af:00.0'}))
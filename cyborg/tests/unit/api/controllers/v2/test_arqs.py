@@ -22,6 +22,7 @@ from oslo_utils.fixture import uuidsentinel as uuids
 from cyborg import context as cyborg_context
 from cyborg.api.controllers import base
 from cyborg.api.controllers.v2 import arqs
+from cyborg.common import constants
 from cyborg.common import exception
 from cyborg.tests.unit import fake_device_profile
 from cyborg.tests.unit import fake_extarq
@@ -88,11 +89,14 @@ class TestARQsController(v2_test.APITestV2):
     @mock.patch('cyborg.objects.ExtARQ.list')
     def test_get_all_with_instance(self, mock_extarqs):
         # test get_all with instance
-        mock_extarqs.return_value = self.fake_bind_extarqs
+        mock_extarqs.return_value = self.fake_bind_extarqs[:3]
         instance_uuid = self.fake_bind_extarqs[0].arq.instance_uuid
         url = '%s?instance=%s' % (self.ARQ_URL, instance_uuid)
         data = self.get_json(url, headers=self.headers)
         out_arqs = data['arqs']
+        mock_extarqs.assert_called_once_with(
+            mock.ANY, instance_uuid=instance_uuid
+        )
 
         result = isinstance(out_arqs, list)
         self.assertTrue(result)
@@ -103,10 +107,14 @@ class TestARQsController(v2_test.APITestV2):
     @mock.patch('cyborg.objects.ExtARQ.list')
     def test_get_all_with_bind_state(self, mock_extarqs):
         # test get_all with valid bind_state(resolved)
-        mock_extarqs.return_value = self.fake_resolved_extarqs
+        mock_extarqs.return_value = self.fake_resolved_extarqs[1:]
         url = '%s?bind_state=resolved' % self.ARQ_URL
         data = self.get_json(url, headers=self.headers)
         out_arqs = data['arqs']
+        mock_extarqs.assert_called_once_with(
+            mock.ANY,
+            state=list(constants.ARQ_BIND_STATES_STATUS_MAP),
+        )
 
         result = isinstance(out_arqs, list)
         self.assertTrue(result)
@@ -119,7 +127,7 @@ class TestARQsController(v2_test.APITestV2):
     @mock.patch('cyborg.objects.ExtARQ.list')
     def test_get_all_with_instance_and_bind_state(self, mock_extarqs):
         # test get_all with instance and valid bind_state(resolved)
-        mock_extarqs.return_value = self.fake_bind_extarqs[:3]
+        mock_extarqs.return_value = self.fake_bind_extarqs[:2]
         instance_uuid = self.fake_bind_extarqs[0].arq.instance_uuid
         url = '%s?instance=%s&bind_state=resolved' % (
             self.ARQ_URL,
@@ -199,18 +207,135 @@ class TestARQsController(v2_test.APITestV2):
         response = self.get_json(url, headers=self.headers, expect_errors=True)
         self.assertEqual(HTTPStatus.LOCKED, response.status_int)
 
+    @mock.patch('cyborg.objects.ExtARQ.list')
+    def test_get_all_with_limit(self, mock_extarqs):
+        mock_extarqs.return_value = self.fake_extarqs[:2]
+        marker = self.fake_extarqs[0].arq.uuid
+        headers = self.gen_headers(self.context)
+        headers[base.Version.current_api_version] = 'accelerator 2.4'
+        url = '%s?limit=2&marker=%s' % (self.ARQ_URL, marker)
+        data = self.get_json(url, headers=headers)
+        mock_extarqs.assert_called_once_with(mock.ANY, limit=2, marker=marker)
+        self.assertEqual(2, len(data['arqs']))
+        self.assertIn('limit=2', data['next'])
+        self.assertIn(
+            'marker=%s' % self.fake_extarqs[1].arq.uuid, data['next']
+        )
+
+    @mock.patch('cyborg.objects.ExtARQ.list')
+    def test_get_all_with_limit_locked_off_page(self, mock_extarqs):
+        # An unresolved ARQ of the instance is not on the page asked.
+        extarqs = self.fake_bind_extarqs[:2]
+        instance_uuid = extarqs[0].arq.instance_uuid
+        for extarq in extarqs:
+            extarq.arq.instance_uuid = instance_uuid
+        extarqs[1].arq.state = 'BindStarted'
+        mock_extarqs.side_effect = lambda context, **kw: extarqs[
+            : kw.get('limit')
+        ]
+        headers = self.gen_headers(self.context)
+        headers[base.Version.current_api_version] = 'accelerator 2.4'
+        url = '%s?instance=%s&bind_state=resolved&limit=1' % (
+            self.ARQ_URL,
+            instance_uuid,
+        )
+        response = self.get_json(url, headers=headers, expect_errors=True)
+        self.assertEqual(HTTPStatus.LOCKED, response.status_int)
+        mock_extarqs.assert_called_once_with(
+            mock.ANY, instance_uuid=instance_uuid
+        )
+
+    @mock.patch('cyborg.objects.ExtARQ.list')
+    def test_get_all_with_instance_bind_state_and_limit(self, mock_extarqs):
+        extarqs = self.fake_bind_extarqs[:2]
+        instance_uuid = extarqs[0].arq.instance_uuid
+        for extarq in extarqs:
+            extarq.arq.instance_uuid = instance_uuid
+            extarq.arq.state = 'Bound'
+        mock_extarqs.side_effect = lambda context, **kw: extarqs[
+            : kw.get('limit')
+        ]
+        headers = self.gen_headers(self.context)
+        headers[base.Version.current_api_version] = 'accelerator 2.4'
+        url = '%s?instance=%s&bind_state=resolved&limit=1' % (
+            self.ARQ_URL,
+            instance_uuid,
+        )
+        data = self.get_json(url, headers=headers)
+        self.assertEqual(1, len(data['arqs']))
+        self.assertEqual(extarqs[0].arq.uuid, data['arqs'][0]['uuid'])
+        mock_extarqs.assert_called_with(
+            mock.ANY, instance_uuid=instance_uuid, limit=1, marker=None
+        )
+
+    @mock.patch('cyborg.objects.ExtARQ.list')
+    def test_get_all_with_instance_and_limit(self, mock_extarqs):
+        # Without bind_state, only the page asked is listed.
+        mock_extarqs.return_value = self.fake_extarqs[:1]
+        instance_uuid = self.fake_extarqs[0].arq.instance_uuid
+        headers = self.gen_headers(self.context)
+        headers[base.Version.current_api_version] = 'accelerator 2.4'
+        url = '%s?instance=%s&limit=1' % (self.ARQ_URL, instance_uuid)
+        data = self.get_json(url, headers=headers)
+        self.assertEqual(1, len(data['arqs']))
+        mock_extarqs.assert_called_once_with(
+            mock.ANY, instance_uuid=instance_uuid, limit=1, marker=None
+        )
+
+    @mock.patch('cyborg.objects.ExtARQ.list')
+    def test_get_all_last_page_has_no_next(self, mock_extarqs):
+        mock_extarqs.return_value = self.fake_extarqs[:1]
+        headers = self.gen_headers(self.context)
+        headers[base.Version.current_api_version] = 'accelerator 2.4'
+        data = self.get_json(self.ARQ_URL + '?limit=2', headers=headers)
+        self.assertEqual(1, len(data['arqs']))
+        self.assertNotIn('next', data)
+
+    @mock.patch('cyborg.objects.ExtARQ.list')
+    def test_get_all_limit_capped_by_max_limit(self, mock_extarqs):
+        self.flags(max_limit=1, group='api')
+        mock_extarqs.return_value = self.fake_extarqs[:1]
+        headers = self.gen_headers(self.context)
+        headers[base.Version.current_api_version] = 'accelerator 2.4'
+        data = self.get_json(self.ARQ_URL + '?limit=5', headers=headers)
+        mock_extarqs.assert_called_once_with(mock.ANY, limit=1, marker=None)
+        self.assertIn('limit=1', data['next'])
+
+    def test_get_all_invalid_limit(self):
+        headers = self.gen_headers(self.context)
+        headers[base.Version.current_api_version] = 'accelerator 2.4'
+        response = self.get_json(
+            self.ARQ_URL + '?limit=0', headers=headers, expect_errors=True
+        )
+        self.assertEqual(HTTPStatus.BAD_REQUEST, response.status_int)
+
+    def test_get_all_limit_not_acceptable(self):
+        response = self.get_json(
+            self.ARQ_URL + '?limit=2', headers=self.headers, expect_errors=True
+        )
+        self.assertEqual(HTTPStatus.NOT_ACCEPTABLE, response.status_int)
+
     @mock.patch('cyborg.objects.DeviceProfile.get_by_name')
-    @mock.patch('cyborg.conductor.rpcapi.ConductorAPI.arq_create')
+    @mock.patch('cyborg.conductor.rpcapi.ConductorAPI.arq_create_bulk')
     def test_create(self, mock_obj_extarq, mock_obj_dp):
         dp_list = fake_device_profile.get_obj_devprofs()
         mock_obj_dp.return_value = dp = dp_list[0]
-        mock_obj_extarq.side_effect = self.fake_extarqs
+        mock_obj_extarq.return_value = self.fake_extarqs[:3]
         params = {'device_profile_name': dp['name']}
         response = self.post_json(self.ARQ_URL, params, headers=self.headers)
         data = jsonutils.loads(response.__dict__['controller_output'])
         out_arqs = data['arqs']
 
         self.assertEqual(HTTPStatus.CREATED, response.status_int)
+        # All the ARQs of the device profile are created in one call.
+        mock_obj_extarq.assert_called_once_with(mock.ANY, mock.ANY, dp.id)
+        self.assertEqual(
+            [0, 1, 1],
+            [
+                obj_extarq.arq.device_profile_group_id
+                for obj_extarq in mock_obj_extarq.call_args[0][1]
+            ],
+        )
         self.assertEqual(len(out_arqs), 3)
         for in_extarq, out_arq in zip(self.fake_extarqs, out_arqs):
             self._validate_arq(in_extarq.arq, out_arq)
@@ -219,12 +344,12 @@ class TestARQsController(v2_test.APITestV2):
             self.assertEqual(dp_group_id, out_arq['device_profile_group_id'])
 
     @mock.patch('cyborg.objects.DeviceProfile.get_by_name')
-    @mock.patch('cyborg.conductor.rpcapi.ConductorAPI.arq_create')
+    @mock.patch('cyborg.conductor.rpcapi.ConductorAPI.arq_create_bulk')
     def test_create_with_xilinx_fpga(self, mock_obj_extarq, mock_obj_dp):
         xilinx_fpga_dp = fake_device_profile.get_xilinx_fpga_devprof()
         mock_obj_dp.return_value = dp = xilinx_fpga_dp
         fake_xilinx_fpga_objs = fake_extarq.get_fake_xilinx_fpga_extarq_objs()
-        mock_obj_extarq.side_effect = fake_xilinx_fpga_objs
+        mock_obj_extarq.return_value = fake_xilinx_fpga_objs
         params = {'device_profile_name': dp['name']}
         response = self.post_json(self.ARQ_URL, params, headers=self.headers)
         data = jsonutils.loads(response.__dict__['controller_output'])
@@ -379,7 +504,7 @@ class TestARQsController(v2_test.APITestV2):
     def test_check_if_bound(self, mock_extarq_list):
         """Test the happy path."""
         extarqs = fake_extarq.get_fake_extarq_objs()
-        mock_extarq_list.return_value = extarqs
+        mock_extarq_list.return_value = []
 
         # Not the instance UUID in extarqs above
         instance_uuid = 'ffbb66f6-99f6-4a85-a90c-fd8e8fb35f16'
@@ -395,7 +520,9 @@ class TestARQsController(v2_test.APITestV2):
         self.arqs_controller._check_if_already_bound(
             self.context, valid_fields
         )
-        mock_extarq_list.assert_called_once_with(self.context)
+        mock_extarq_list.assert_called_once_with(
+            self.context, instance_uuid=instance_uuid, limit=1
+        )
 
     @mock.patch('cyborg.objects.ExtARQ.list')
     def test_check_if_bound_exception(self, mock_extarq_list):
@@ -475,13 +602,13 @@ class TestARQProjectIdOnCreate(v2_test.APITestV2):
         return patch
 
     @mock.patch('cyborg.objects.DeviceProfile.get_by_name')
-    @mock.patch('cyborg.conductor.rpcapi.ConductorAPI.arq_create')
+    @mock.patch('cyborg.conductor.rpcapi.ConductorAPI.arq_create_bulk')
     def test_post_sets_project_id_from_context(
         self, mock_arq_create, mock_get_dp
     ):
         dp_list = fake_device_profile.get_obj_devprofs()
         mock_get_dp.return_value = dp_list[0]
-        mock_arq_create.side_effect = self.fake_extarqs
+        mock_arq_create.return_value = self.fake_extarqs
 
         member_ctx = self._make_member_context()
         headers = self.gen_headers(member_ctx)
@@ -489,8 +616,8 @@ class TestARQProjectIdOnCreate(v2_test.APITestV2):
         params = {'device_profile_name': dp_list[0]['name']}
         self.post_json(self.ARQ_URL, params, headers=headers)
 
-        for call_args in mock_arq_create.call_args_list:
-            obj_extarq = call_args[0][1]
+        mock_arq_create.assert_called_once()
+        for obj_extarq in mock_arq_create.call_args[0][1]:
             self.assertEqual(member_ctx.project_id, obj_extarq.arq.project_id)
 
     @mock.patch('cyborg.api.controllers.v2.utils.allow_project_id')
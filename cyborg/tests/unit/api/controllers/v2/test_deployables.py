@@ -15,6 +15,7 @@
 
 from unittest import mock
 
+from cyborg.api.controllers import base
 from cyborg.tests.unit import fake_deployable
 from cyborg.tests.unit.api.controllers.v2 import base as v2_test
 
@@ -84,6 +85,17 @@ class TestDeployablesController(v2_test.APITestV2):
         )
         self._validate_deployable(self.fake_deployable, out_deployable[0])
 
+    @mock.patch('cyborg.objects.Deployable.list')
+    def test_get_with_limit(self, mock_deployables):
+        mock_deployables.return_value = [self.fake_deployable]
+        headers = self.gen_headers(self.context)
+        headers[base.Version.current_api_version] = 'accelerator 2.4'
+        data = self.get_json(self.DEPLOYABLE_URL + "?limit=1", headers=headers)
+        mock_deployables.assert_called_once_with(
+            mock.ANY, filters={"limit": 1}
+        )
+        self.assertIn('marker=%s' % self.fake_deployable['uuid'], data['next'])
+
     @mock.patch('cyborg.objects.Deployable.list')
     def test_get_with_filters_not_match(self, mock_deployables):
         # This will return null list because the fake deployable's name
@@ -118,6 +118,24 @@ class TestDeviceProfileController(v2_test.APITestV2):
         for in_dp, out_dp in zip(expected_dps, out_dps):
             self._validate_dp(in_dp, out_dp)
 
+    @mock.patch('cyborg.objects.DeviceProfile.get_by_uuid')
+    @mock.patch('cyborg.objects.DeviceProfile.list')
+    def test_get_all_with_limit_and_marker(self, mock_dp, mock_dp_get):
+        mock_dp.return_value = self.fake_dp_objs[1:2]
+        mock_dp_get.return_value = marker = self.fake_dp_objs[0]
+        headers = self.gen_headers(self.context)
+        headers[base.Version.current_api_version] = 'accelerator 2.4'
+        data = self.get_json(
+            self.DP_URL + '?limit=1&marker=%s' % marker['uuid'],
+            headers=headers,
+        )
+        mock_dp.assert_called_once_with(
+            mock.ANY, {'limit': 1, 'marker_obj': marker}
+        )
+        self.assertEqual(1, len(data['device_profiles']))
+        self._validate_dp(self.fake_dp_objs[1], data['device_profiles'][0])
+        self.assertIn('marker=%s' % self.fake_dp_objs[1]['uuid'], data['next'])
+
     @mock.patch('cyborg.conductor.rpcapi.ConductorAPI.device_profile_create')
     def test_create(self, mock_cond_dp):
         dp = [self.fake_dps[0]]
@@ -15,6 +15,7 @@
 
 from unittest import mock
 
+from cyborg.api.controllers import base
 from cyborg.tests.unit import fake_device
 from cyborg.tests.unit.api.controllers.v2 import base as v2_test
 
@@ -80,6 +81,27 @@ class TestDevicesController(v2_test.APITestV2):
         for in_device, out_device in zip(self.fake_devices, out_devices):
             self._validate_device(in_device, out_device)
 
+    @mock.patch('cyborg.objects.Device.get')
+    @mock.patch('cyborg.objects.Device.list')
+    def test_get_with_limit_and_marker(self, mock_devices, mock_device):
+        in_devices = self.fake_devices
+        mock_devices.return_value = in_devices[1:2]
+        mock_device.return_value = in_devices[0]
+        headers = self.gen_headers(self.context)
+        headers[base.Version.current_api_version] = 'accelerator 2.4'
+        data = self.get_json(
+            self.DEVICE_URL
+            + "?type=FPGA&limit=1&marker=%s" % in_devices[0]['uuid'],
+            headers=headers,
+        )
+        mock_devices.assert_called_once_with(
+            mock.ANY,
+            filters={"type": "FPGA", "limit": 1, "marker_obj": in_devices[0]},
+        )
+        self.assertEqual(1, len(data['devices']))
+        self.assertIn('type=FPGA', data['next'])
+        self.assertIn('marker=%s' % in_devices[1]['uuid'], data['next'])
+
     @mock.patch('cyborg.objects.Device.list')
     def test_get_by_type(self, mock_devices):
         in_devices = self.fake_devices
@@ -327,7 +327,7 @@ class TestHealArqProjectIds(base.TestCase):
 class TestNovaAdapterForHeal(base.TestCase):
     """Nova adapter used for ARQ project_id backfill."""
 
-    @mock.patch('cyborg.common.data_migrations.utils.get_sdk_adapter')
+    @mock.patch('cyborg.common.data_migrations.utils.get_shared_sdk_adapter')
     def test_get_nova_adapter_returns_compute_sdk_adapter(self, mock_get):
         mock_adapter = mock.MagicMock()
         mock_get.return_value = mock_adapter
@@ -0,0 +1,70 @@
+# Copyright 2026 The Cyborg Authors.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+from cyborg.common import hash_ring
+from cyborg.tests import base
+
+
+HOSTS = ['compute-%04d' % i for i in range(1000)]
+
+
+class HashRingTest(base.TestCase):
+    def _owners(self, ring):
+        return {host: ring.get_node(host) for host in HOSTS}
+
+    def test_get_node(self):
+        ring = hash_ring.HashRing(['c1', 'c2', 'c3'])
+        owners = self._owners(ring)
+        self.assertEqual(
+            owners, self._owners(hash_ring.HashRing(['c3', 'c2', 'c1']))
+        )
+        counts = {
+            node: list(owners.values()).count(node) for node in ring.nodes
+        }
+        # Each conductor gets a fair share of the hosts.
+        for count in counts.values():
+            self.assertGreater(count, len(HOSTS) / 3 * 0.6)
+
+    def test_empty(self):
+        self.assertIsNone(hash_ring.HashRing([]).get_node('compute'))
+
+    def test_join_and_leave_move_few_hosts(self):
+        before = self._owners(hash_ring.HashRing(['c1', 'c2', 'c3']))
+        after = self._owners(hash_ring.HashRing(['c1', 'c2', 'c3', 'c4']))
+        moved = [host for host in HOSTS if before[host] != after[host]]
+        # Only the hosts of the new conductor move.
+        self.assertEqual({'c4'}, {after[host] for host in moved})
+        self.assertLess(len(moved), len(HOSTS) / 4 * 1.5)
+
+        after = self._owners(hash_ring.HashRing(['c1', 'c2']))
+        moved = [host for host in HOSTS if before[host] != after[host]]
+        self.assertEqual({'c3'}, {before[host] for host in moved})
+
+
+class HashRingManagerTest(base.TestCase):
+    @mock.patch('cyborg.db.api.get_instance')
+    def test_ring(self, mock_dbapi):
+        list_alive = mock_dbapi.return_value.conductor_list_alive
+        list_alive.return_value = ['c1', 'c2']
+        manager = hash_ring.HashRingManager()
+        self.assertEqual({'c1', 'c2'}, manager.ring.nodes)
+        self.assertEqual({'c1', 'c2'}, manager.ring.nodes)
+        list_alive.assert_called_once_with(mock.ANY, 180)
+
+        list_alive.return_value = ['c1']
+        manager.reset()
+        self.assertEqual({'c1'}, manager.ring.nodes)
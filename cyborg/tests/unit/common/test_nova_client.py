@@ -136,3 +136,94 @@ class NovaAPITest(base.TestCase):
         self.assertRaises(
             exception.InvalidAPIResponse, nova._send_events, self.events
         )
+
+    def test_notify_binding_without_window(self):
+        self.flags(event_batch_window=0, group='nova')
+        self.mock_sdk.post.return_value = mock.Mock(status_code=200)
+        nova = nova_client.NovaAPI()
+        nova.notify_binding(
+            self.instance_uuid,
+            [(event['tag'], event['status']) for event in self.events],
+        )
+        self.mock_sdk.post.assert_called_once_with(
+            '/os-server-external-events',
+            json={'events': mock.ANY},
+            microversion=self.wsgi_api_version,
+        )
+
+
+class EventNotifierTest(base.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.mock_sdk = self.useFixture(
+            fixtures.MockPatch('cyborg.common.utils.get_sdk_adapter')
+        ).mock.return_value
+        self.mock_sdk.post.return_value = mock.Mock(status_code=200)
+        self.useFixture(
+            fixtures.MockPatch('cyborg.common.nova_client._backoff')
+        )
+        self.flags(event_batch_window=0.5, group='nova')
+        self.notifier = nova_client.EventNotifier()
+
+    def _events(self, num):
+        return [
+            [{'name': 'accelerator-request-bound', 'server_uuid': str(i)}]
+            for i in range(num)
+        ]
+
+    def _sent(self):
+        return [
+            c.kwargs['json']['events']
+            for c in self.mock_sdk.post.call_args_list
+        ]
+
+    def test_coalesce(self):
+        events = self._events(3)
+        for instance_events in events:
+            self.notifier.put(instance_events)
+        self.assertTrue(self.notifier.flush(5))
+        self.assertEqual([events[0] + events[1] + events[2]], self._sent())
+
+    def test_batch_size(self):
+        self.flags(event_batch_size=2, group='nova')
+        events = self._events(3)
+        for instance_events in events:
+            self.notifier.put(instance_events)
+        self.assertTrue(self.notifier.flush(5))
+        self.assertEqual([events[0] + events[1], events[2]], self._sent())
+
+    def test_retry_server_error(self):
+        self.mock_sdk.post.side_effect = [
+            mock.Mock(status_code=503),
+            mock.Mock(status_code=200),
+        ]
+        events = self._events(1)
+        self.notifier.put(events[0])
+        self.assertTrue(self.notifier.flush(5))
+        self.assertEqual([events[0], events[0]], self._sent())
+
+    def test_retries_exhausted(self):
+        self.flags(event_retries=1, group='nova')
+        self.mock_sdk.post.return_value = mock.Mock(status_code=500)
+        self.notifier.put(self._events(1)[0])
+        self.assertTrue(self.notifier.flush(5))
+        self.assertEqual(2, self.mock_sdk.post.call_count)
+
+    @mock.patch('cyborg.common.nova_client.LOG.error')
+    def test_partial_failure(self, mock_log_error):
+        events = self._events(3)
+        resp_events = [dict(e[0], code=200) for e in events]
+        resp_events[1]['code'] = 404
+        resp_events[2]['code'] = 422
+        self.mock_sdk.post.return_value = mock.Mock(status_code=207)
+        self.mock_sdk.post.return_value.json.return_value = {
+            'events': resp_events
+        }
+        for instance_events in events:
+            self.notifier.put(instance_events)
+        self.assertTrue(self.notifier.flush(5))
+        # Only the event nova failed for is reported, none is retried.
+        mock_log_error.assert_called_once_with(
+            mock.ANY, {'code': 404, 'event': resp_events[1]}
+        )
+        self.assertEqual(1, self.mock_sdk.post.call_count)
@@ -16,6 +16,8 @@ from unittest import mock
 
 import fixtures
 
+from oslo_utils.fixture import uuidsentinel as uuids
+
 from cyborg.common import exception
 from cyborg.common import placement_client
 from cyborg.tests import base
@@ -25,6 +27,8 @@ class PlacementAPITest(base.TestCase):
     def setUp(self):
         super().setUp()
         self.instance_uuid = '00000000-0000-0000-0000-000000000001'
+        placement_client.PROVIDER_TREE.clear()
+        self.addCleanup(placement_client.PROVIDER_TREE.clear)
 
         self.mock_sdk = self.useFixture(
             fixtures.MockPatch('cyborg.common.utils.get_sdk_adapter')
@@ -35,6 +39,9 @@ class PlacementAPITest(base.TestCase):
         self.mock_log_debug = self.useFixture(
             fixtures.MockPatch('cyborg.common.placement_client.LOG.debug')
         ).mock
+        self.mock_backoff = self.useFixture(
+            fixtures.MockPatch('cyborg.common.placement_client._backoff')
+        ).mock
 
     def test_get(self):
         self.mock_sdk.get.return_value = mock.Mock(status_code=200)
@@ -51,6 +58,25 @@ class PlacementAPITest(base.TestCase):
             exception.PlacementServerError, placement.get, mock.Mock()
         )
 
+    def test_get_retries_server_error(self):
+        self.mock_sdk.get.side_effect = [
+            mock.Mock(status_code=503),
+            mock.Mock(status_code=200),
+        ]
+        placement = placement_client.PlacementClient()
+        self.assertEqual(200, placement.get(mock.Mock()).status_code)
+        self.assertEqual(2, self.mock_sdk.get.call_count)
+        self.mock_backoff.assert_called_once_with(0)
+
+    def test_get_retries_exhausted(self):
+        self.flags(request_retries=1, group='placement')
+        self.mock_sdk.get.return_value = mock.Mock(status_code=500)
+        placement = placement_client.PlacementClient()
+        self.assertRaises(
+            exception.PlacementServerError, placement.get, mock.Mock()
+        )
+        self.assertEqual(2, self.mock_sdk.get.call_count)
+
     def test_post(self):
         self.mock_sdk.post.return_value = mock.Mock(status_code=200)
         placement = placement_client.PlacementClient()
@@ -69,6 +95,27 @@ class PlacementAPITest(base.TestCase):
             mock.ANY,
         )
 
+    def test_post_not_retried(self):
+        self.mock_sdk.post.return_value = mock.Mock(status_code=503)
+        placement = placement_client.PlacementClient()
+        self.assertRaises(
+            exception.PlacementServerError,
+            placement.post,
+            mock.Mock(),
+            mock.ANY,
+        )
+        self.mock_sdk.post.assert_called_once()
+        self.mock_backoff.assert_not_called()
+
+    def test_put_retries_server_error(self):
+        self.mock_sdk.put.side_effect = [
+            mock.Mock(status_code=502),
+            mock.Mock(status_code=204),
+        ]
+        placement = placement_client.PlacementClient()
+        self.assertEqual(204, placement.put(mock.Mock(), {}).status_code)
+        self.assertEqual(2, self.mock_sdk.put.call_count)
+
     def test_put(self):
         self.mock_sdk.put.return_value = mock.Mock(status_code=200)
         placement = placement_client.PlacementClient()
@@ -106,49 +153,86 @@ class PlacementAPITest(base.TestCase):
         )
 
     def test_get_rp_traits(self):
-        self.mock_sdk.get.return_value = mock.Mock(status_code=200)
+        self.mock_sdk.get.return_value = mock.Mock(
+            status_code=200,
+            **{
+                'json.return_value': {
+                    'traits': ['CUSTOM_FAKE'],
+                    'resource_provider_generation': 1,
+                }
+            },
+        )
         placement = placement_client.PlacementClient()
-        placement._get_rp_traits(mock.ANY)
+        placement._get_rp_traits(uuids.rp)
         msg = 'Successfully got resources from placement: %s'
         self.mock_log_debug.assert_called_once_with(msg, mock.ANY)
 
+    def test_get_rp_traits_cached(self):
+        self.mock_sdk.get.return_value = mock.Mock(
+            status_code=200,
+            **{
+                'json.return_value': {
+                    'traits': ['CUSTOM_FAKE'],
+                    'resource_provider_generation': 1,
+                }
+            },
+        )
+        placement = placement_client.PlacementClient()
+        placement._get_rp_traits(uuids.rp)
+        traits_json = placement_client.PlacementClient()._get_rp_traits(
+            uuids.rp
+        )
+        self.assertEqual(
+            {'traits': ['CUSTOM_FAKE'], 'resource_provider_generation': 1},
+            traits_json,
+        )
+        self.mock_sdk.get.assert_called_once()
+
     def test_get_rp_traits_exception(self):
         placement = placement_client.PlacementClient()
         mock_ret = mock.Mock(status_code=500)
         self.mock_sdk.get.return_value = mock_ret
         self.assertRaises(
-            exception.PlacementServerError, placement._get_rp_traits, mock.ANY
+            exception.PlacementServerError, placement._get_rp_traits, uuids.rp
         )
 
     def test_ensure_traits(self):
         self.mock_sdk.put.return_value = mock.Mock(status_code=201)
         placement = placement_client.PlacementClient()
-        self.mock_sdk.get.return_value = None
-        placement._ensure_traits([mock.ANY])
-        self.assertEqual(2, self.mock_log_debug.call_count)
+        placement._ensure_traits(['CUSTOM_FAKE'])
+        self.mock_sdk.get.assert_not_called()
         msg = 'Successfully updated resources from placement: %s'
-        # first call/arg
-        self.assertIn(msg, self.mock_log_debug.call_args_list[1][0][0])
+        self.mock_log_debug.assert_called_once_with(msg, mock.ANY)
+        # The trait is known to exist now.
+        placement._ensure_traits(['CUSTOM_FAKE'])
+        self.mock_sdk.put.assert_called_once()
 
     def test_ensure_traits_exception(self):
         placement = placement_client.PlacementClient()
         mock_ret = mock.Mock(status_code=500)
-        self.mock_sdk.get.return_value = None
         self.mock_sdk.put.return_value = mock_ret
         self.assertRaises(
             exception.PlacementServerError,
             placement._ensure_traits,
-            [mock.ANY],
+            ['CUSTOM_FAKE'],
         )
 
     @mock.patch(
         'cyborg.common.placement_client.PlacementClient.get_resource_provider'
     )
     def test_put_rp_traits(self, rp):
-        self.mock_sdk.put.return_value = mock.Mock(status_code=200)
+        self.mock_sdk.put.return_value = mock.Mock(
+            status_code=200,
+            **{
+                'json.return_value': {
+                    'traits': ['fake_trait'],
+                    'resource_provider_generation': 1,
+                }
+            },
+        )
         placement = placement_client.PlacementClient()
         rp.return_value = {'status_code': 200, 'generation': 0}
-        placement._put_rp_traits(mock.ANY, {'traits': 'fake_trait'})
+        placement._put_rp_traits(uuids.rp, {'traits': ['fake_trait']})
         msg = 'Successfully updated resources from placement: %s'
         self.mock_log_debug.assert_called_once_with(msg, mock.ANY)
 
@@ -163,6 +247,264 @@ class PlacementAPITest(base.TestCase):
         self.assertRaises(
             exception.PlacementServerError,
             placement._put_rp_traits,
-            mock.ANY,
-            {'traits': 'fake_trait'},
+            uuids.rp,
+            {'traits': ['fake_trait']},
+        )
+
+    def _mock_response(self, status_code, body=None):
+        return mock.Mock(
+            status_code=status_code, **{'json.return_value': body}
+        )
+
+    def _conflict(self):
+        return self._mock_response(
+            409, {'errors': [{'code': 'placement.concurrent_update'}]}
+        )
+
+    def test_add_traits_to_rp(self):
+        self.mock_sdk.get.return_value = self._mock_response(
+            200, {'traits': ['CUSTOM_A'], 'resource_provider_generation': 1}
+        )
+        self.mock_sdk.put.side_effect = [
+            # PUT /traits/CUSTOM_B
+            self._mock_response(201),
+            self._mock_response(
+                200,
+                {
+                    'traits': ['CUSTOM_A', 'CUSTOM_B'],
+                    'resource_provider_generation': 2,
+                },
+            ),
+        ]
+        placement = placement_client.PlacementClient()
+        placement.add_traits_to_rp(uuids.rp, ['CUSTOM_B'])
+        self.assertEqual(
+            1,
+            self.mock_sdk.put.call_args.kwargs['json'][
+                'resource_provider_generation'
+            ],
+        )
+        # Everything is cached, adding the trait again is a no-op.
+        placement.add_traits_to_rp(uuids.rp, ['CUSTOM_B'])
+        self.mock_sdk.get.assert_called_once()
+        self.assertEqual(2, self.mock_sdk.put.call_count)
+
+    def test_add_traits_to_rp_generation_conflict(self):
+        self.mock_sdk.get.side_effect = [
+            self._mock_response(
+                200, {'traits': [], 'resource_provider_generation': 1}
+            ),
+            self._mock_response(
+                200, {'traits': [], 'resource_provider_generation': 5}
+            ),
+        ]
+        self.mock_sdk.put.side_effect = [
+            self._mock_response(204),
+            self._conflict(),
+            self._mock_response(
+                200,
+                {'traits': ['CUSTOM_A'], 'resource_provider_generation': 6},
+            ),
+        ]
+        placement = placement_client.PlacementClient()
+        placement.add_traits_to_rp(uuids.rp, ['CUSTOM_A'])
+        self.assertEqual(
+            5,
+            self.mock_sdk.put.call_args.kwargs['json'][
+                'resource_provider_generation'
+            ],
+        )
+        self.assertEqual(
+            6, placement_client.PROVIDER_TREE.generation(uuids.rp)
+        )
+
+    def test_update_inventory(self):
+        self.mock_sdk.get.return_value = self._mock_response(
+            200, {'uuid': uuids.rp, 'generation': 3}
+        )
+        self.mock_sdk.put.return_value = self._mock_response(
+            200, {'inventories': {}, 'resource_provider_generation': 4}
+        )
+        inventories = {'CUSTOM_FAKE': {'total': 2}}
+        placement = placement_client.PlacementClient()
+        placement.update_inventory(uuids.rp, inventories)
+        self.assertEqual(
+            3,
+            self.mock_sdk.put.call_args.kwargs['json'][
+                'resource_provider_generation'
+            ],
+        )
+        # The same inventories are not written again.
+        placement.update_inventory(uuids.rp, inventories)
+        self.mock_sdk.put.assert_called_once()
+        # Other inventories are written with the cached generation.
+        placement.update_inventory(uuids.rp, {'CUSTOM_FAKE': {'total': 1}})
+        self.mock_sdk.get.assert_called_once()
+        self.assertEqual(
+            4,
+            self.mock_sdk.put.call_args.kwargs['json'][
+                'resource_provider_generation'
+            ],
+        )
+
+    @mock.patch('time.monotonic')
+    def test_update_inventory_cache_expired(self, mock_monotonic):
+        self.flags(provider_cache_ttl=10, group='placement')
+        mock_monotonic.return_value = 100
+        self.mock_sdk.get.side_effect = [
+            self._mock_response(200, {'uuid': uuids.rp, 'generation': 3}),
+            self._mock_response(200, {'uuid': uuids.rp, 'generation': 9}),
+        ]
+        self.mock_sdk.put.side_effect = [
+            self._mock_response(
+                200, {'inventories': {}, 'resource_provider_generation': 4}
+            ),
+            self._mock_response(
+                200, {'inventories': {}, 'resource_provider_generation': 10}
+            ),
+        ]
+        inventories = {'CUSTOM_FAKE': {'total': 2}}
+        placement = placement_client.PlacementClient()
+        placement.update_inventory(uuids.rp, inventories)
+        # Someone else may have changed the inventories since, they are
+        # written again once the cache expired.
+        mock_monotonic.return_value = 110
+        placement.update_inventory(uuids.rp, inventories)
+        self.assertEqual(2, self.mock_sdk.put.call_count)
+        self.assertEqual(
+            9,
+            self.mock_sdk.put.call_args.kwargs['json'][
+                'resource_provider_generation'
+            ],
+        )
+
+    def test_update_inventory_bad_request(self):
+        placement_client.PROVIDER_TREE.update(uuids.rp, 3)
+        placement_client.PROVIDER_TREE.add_resource_classes(['CUSTOM_FAKE'])
+        self.mock_sdk.put.return_value = self._mock_response(400, {})
+        placement = placement_client.PlacementClient()
+        placement.update_inventory(uuids.rp, {'CUSTOM_FAKE': {'total': 2}})
+        # The resource class may be gone from placement.
+        self.assertFalse(placement_client.PROVIDER_TREE.exists(uuids.rp))
+        self.assertEqual(
+            ['CUSTOM_FAKE'],
+            placement_client.PROVIDER_TREE.missing_resource_classes(
+                ['CUSTOM_FAKE']
+            ),
+        )
+
+    def test_add_traits_to_rp_bad_request(self):
+        placement_client.PROVIDER_TREE.update(uuids.rp, 1, traits=[])
+        placement_client.PROVIDER_TREE.add_traits(['CUSTOM_A'])
+        self.mock_sdk.put.return_value = self._mock_response(400)
+        placement = placement_client.PlacementClient()
+        self.assertRaises(
+            Exception, placement.add_traits_to_rp, uuids.rp, ['CUSTOM_A']
+        )
+        # The trait may be gone from placement.
+        self.assertFalse(placement_client.PROVIDER_TREE.exists(uuids.rp))
+        self.assertEqual(
+            ['CUSTOM_A'],
+            placement_client.PROVIDER_TREE.missing_traits(['CUSTOM_A']),
+        )
+
+    def test_update_inventory_generation_conflict(self):
+        self.mock_sdk.get.side_effect = [
+            self._mock_response(200, {'uuid': uuids.rp, 'generation': 3}),
+            self._mock_response(200, {'uuid': uuids.rp, 'generation': 7}),
+        ]
+        self.mock_sdk.put.side_effect = [
+            self._conflict(),
+            self._mock_response(
+                200, {'inventories': {}, 'resource_provider_generation': 8}
+            ),
+        ]
+        placement = placement_client.PlacementClient()
+        result = placement.update_inventory(
+            uuids.rp, {'CUSTOM_FAKE': {'total': 2}}
+        )
+        self.assertEqual(8, result['resource_provider_generation'])
+        self.assertEqual(2, self.mock_sdk.get.call_count)
+
+    def test_ensure_resource_provider_cached(self):
+        self.mock_sdk.get.return_value = self._mock_response(
+            200, {'uuid': uuids.rp, 'generation': 0}
+        )
+        placement = placement_client.PlacementClient()
+        placement.ensure_resource_provider(self.context, uuids.rp)
+        placement.ensure_resource_provider(self.context, uuids.rp)
+        self.mock_sdk.get.assert_called_once()
+
+    def test_delete_provider_invalidates_cache(self):
+        placement_client.PROVIDER_TREE.update(uuids.rp, 0)
+        self.mock_sdk.delete.return_value = mock.Mock(status_code=204, ok=True)
+        placement = placement_client.PlacementClient()
+        placement.delete_provider(uuids.rp)
+        self.assertFalse(placement_client.PROVIDER_TREE.exists(uuids.rp))
+
+    def test_sync_provider_new(self):
+        placement_client.PROVIDER_TREE.add_traits(['CUSTOM_A'])
+        self.mock_sdk.get.return_value = self._mock_response(404)
+        self.mock_sdk.post.return_value = self._mock_response(
+            200, {'uuid': uuids.rp, 'generation': 0}
+        )
+        self.mock_sdk.put.side_effect = [
+            # PUT /resource_classes/CUSTOM_FAKE
+            self._mock_response(201),
+            self._mock_response(
+                200, {'inventories': {}, 'resource_provider_generation': 1}
+            ),
+            self._mock_response(
+                200,
+                {'traits': ['CUSTOM_A'], 'resource_provider_generation': 2},
+            ),
+        ]
+        placement = placement_client.PlacementClient()
+        inventories = {'CUSTOM_FAKE': {'total': 2}}
+        self.assertEqual(
+            uuids.rp,
+            placement.sync_provider(
+                self.context,
+                uuids.rp,
+                inventories,
+                ['CUSTOM_A'],
+                name='fake',
+                parent_provider_uuid=uuids.parent,
+            ),
+        )
+        # The provider is only looked up before its creation.
+        self.mock_sdk.get.assert_called_once()
+        self.mock_sdk.post.assert_called_once()
+        self.assertEqual(
+            [
+                '/resource_classes/CUSTOM_FAKE',
+                f'/resource_providers/{uuids.rp}/inventories',
+                f'/resource_providers/{uuids.rp}/traits',
+            ],
+            [c.args[0] for c in self.mock_sdk.put.call_args_list],
+        )
+        self.assertEqual(
+            1,
+            self.mock_sdk.put.call_args.kwargs['json'][
+                'resource_provider_generation'
+            ],
+        )
+        # Nothing changed, nothing is written.
+        placement.sync_provider(
+            self.context, uuids.rp, inventories, ['CUSTOM_A']
+        )
+        self.assertEqual(3, self.mock_sdk.put.call_count)
+
+    def test_ensure_resource_classes_cached(self):
+        self.mock_sdk.put.return_value = self._mock_response(201)
+        placement = placement_client.PlacementClient()
+        placement.ensure_resource_classes(
+            self.context, ['VGPU', 'CUSTOM_FAKE']
+        )
+        placement.ensure_resource_classes(self.context, ['CUSTOM_FAKE'])
+        # Standard classes are skipped, but not the classes after them.
+        self.mock_sdk.put.assert_called_once_with(
+            '/resource_classes/CUSTOM_FAKE',
+            microversion='1.7',
+            global_request_id=mock.ANY,
         )
@@ -0,0 +1,114 @@
+# Copyright 2026 The Cyborg Authors.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+from oslo_utils.fixture import uuidsentinel as uuids
+
+from cyborg.common import provider_tree
+from cyborg.tests import base
+
+
+class ProviderTreeTest(base.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.tree = provider_tree.ProviderTree()
+
+    def test_update(self):
+        inventories = {'CUSTOM_FAKE': {'total': 1}}
+        self.tree.update(uuids.rp, 1, traits=['CUSTOM_A'])
+        self.tree.update(uuids.rp, 1, inventories=inventories)
+        self.assertTrue(self.tree.exists(uuids.rp))
+        self.assertEqual(1, self.tree.generation(uuids.rp))
+        self.assertEqual({'CUSTOM_A'}, self.tree.traits(uuids.rp))
+        self.assertEqual(inventories, self.tree.inventories(uuids.rp))
+
+    def test_update_new_generation_forgets_data(self):
+        self.tree.update(
+            uuids.rp,
+            1,
+            traits=['CUSTOM_A'],
+            inventories={'CUSTOM_FAKE': {'total': 1}},
+        )
+        self.tree.update(uuids.rp, 2, traits=['CUSTOM_B'])
+        self.assertEqual(2, self.tree.generation(uuids.rp))
+        self.assertEqual({'CUSTOM_B'}, self.tree.traits(uuids.rp))
+        self.assertIsNone(self.tree.inventories(uuids.rp))
+
+    def test_update_own_write_keeps_data(self):
+        self.tree.update(uuids.rp, 1, traits=['CUSTOM_A'])
+        self.tree.update(uuids.rp, 2, inventories={}, written=1)
+        self.assertEqual({'CUSTOM_A'}, self.tree.traits(uuids.rp))
+        # A write made with another generation raced with someone else's.
+        self.tree.update(uuids.rp, 4, inventories={}, written=1)
+        self.assertIsNone(self.tree.traits(uuids.rp))
+
+    def test_remove(self):
+        self.tree.update(uuids.rp, 1, traits=['CUSTOM_A'])
+        self.tree.remove(uuids.rp)
+        self.assertFalse(self.tree.exists(uuids.rp))
+        self.assertIsNone(self.tree.generation(uuids.rp))
+        self.assertIsNone(self.tree.traits(uuids.rp))
+        # Removing an unknown provider is fine.
+        self.tree.remove(uuids.rp)
+
+    def test_traits(self):
+        self.tree.add_traits(['CUSTOM_A', 'CUSTOM_B'])
+        self.tree.remove_trait('CUSTOM_A')
+        self.assertEqual(
+            ['CUSTOM_A', 'CUSTOM_C'],
+            self.tree.missing_traits(['CUSTOM_A', 'CUSTOM_B', 'CUSTOM_C']),
+        )
+
+    def test_resource_classes(self):
+        self.tree.add_resource_classes(['CUSTOM_A', 'CUSTOM_B'])
+        self.tree.remove_resource_class('CUSTOM_A')
+        self.assertEqual(
+            ['CUSTOM_A', 'CUSTOM_C'],
+            self.tree.missing_resource_classes(
+                ['CUSTOM_A', 'CUSTOM_B', 'CUSTOM_C']
+            ),
+        )
+        self.tree.clear()
+        self.assertEqual(
+            ['CUSTOM_B'], self.tree.missing_resource_classes(['CUSTOM_B'])
+        )
+
+    @mock.patch('time.monotonic')
+    def test_expired(self, mock_monotonic):
+        tree = provider_tree.ProviderTree(ttl=10)
+        mock_monotonic.return_value = 100
+        tree.update(uuids.rp, 1, traits=['CUSTOM_A'])
+        tree.add_traits(['CUSTOM_A'])
+        tree.add_resource_classes(['CUSTOM_FAKE'])
+        mock_monotonic.return_value = 109
+        # A write of ours does not extend the life of what was read.
+        tree.update(uuids.rp, 2, inventories={}, written=1)
+        self.assertEqual({'CUSTOM_A'}, tree.traits(uuids.rp))
+        self.assertEqual([], tree.missing_traits(['CUSTOM_A']))
+        mock_monotonic.return_value = 110
+        self.assertFalse(tree.exists(uuids.rp))
+        self.assertIsNone(tree.inventories(uuids.rp))
+        self.assertEqual(['CUSTOM_A'], tree.missing_traits(['CUSTOM_A']))
+        self.assertEqual(
+            ['CUSTOM_FAKE'], tree.missing_resource_classes(['CUSTOM_FAKE'])
+        )
+
+    def test_ttl_from_config(self):
+        self.flags(provider_cache_ttl=0, group='placement')
+        self.tree.update(uuids.rp, 1, traits=['CUSTOM_A'])
+        self.tree.add_traits(['CUSTOM_A'])
+        self.assertFalse(self.tree.exists(uuids.rp))
+        self.assertEqual(['CUSTOM_A'], self.tree.missing_traits(['CUSTOM_A']))
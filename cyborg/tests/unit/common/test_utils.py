@@ -0,0 +1,135 @@
+# Copyright 2026 The Cyborg Authors.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+
+from unittest import mock
+
+from cyborg.common import utils
+from cyborg.tests import base
+
+
+class LRUCacheTest(base.TestCase):
+    def test_get_put(self):
+        cache = utils.LRUCache(2)
+        cache.put('a', None)
+        self.assertIsNone(cache.get('a', 'default'))
+        self.assertEqual('default', cache.get('b', 'default'))
+        cache.pop('a')
+        self.assertEqual('default', cache.get('a', 'default'))
+
+    def test_evicts_least_recently_used(self):
+        cache = utils.LRUCache(2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        self.assertEqual(2, len(cache))
+        self.assertEqual(1, cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(3, cache.get('c'))
+
+    def test_disabled(self):
+        cache = utils.LRUCache(0)
+        cache.put('a', 1)
+        self.assertIsNone(cache.get('a'))
+
+    @mock.patch('time.monotonic')
+    def test_ttl(self, mock_monotonic):
+        cache = utils.LRUCache(2, ttl=10)
+        mock_monotonic.return_value = 100
+        cache.put('a', 1)
+        mock_monotonic.return_value = 109
+        self.assertEqual(1, cache.get('a'))
+        mock_monotonic.return_value = 110
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(0, len(cache))
+
+
+class KeyedThreadWorksTest(base.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.works = utils.KeyedThreadWorks(4)
+        self.addCleanup(self.works.executor.shutdown)
+
+    def test_same_key_in_order(self):
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def first():
+            started.set()
+            release.wait(5)
+            calls.append('first')
+            raise ValueError()
+
+        job1 = self.works.spawn('rp', first)
+        job2 = self.works.spawn('rp', calls.append, 'second')
+        started.wait(5)
+        self.assertFalse(job2.done())
+        release.set()
+        job2.result(5)
+        # The second job runs after the first one, even though it failed.
+        self.assertEqual(['first', 'second'], calls)
+        self.assertRaises(ValueError, job1.result)
+
+    def test_other_keys_concurrently(self):
+        barrier = threading.Barrier(3, timeout=5)
+        jobs = [self.works.spawn(key, barrier.wait) for key in 'abc']
+        self.assertEqual({0, 1, 2}, {job.result(5) for job in jobs})
+
+
+class SharedClientsTest(base.TestCase):
+    @mock.patch.object(utils, 'get_sdk_adapter')
+    def test_get_shared_sdk_adapter(self, mock_get):
+        self.flags(client_concurrency={'compute': 8})
+        adapter = utils.get_shared_sdk_adapter('compute')
+        self.assertIs(adapter, utils.get_shared_sdk_adapter('compute'))
+        mock_get.assert_called_once_with(
+            'compute', pool_maxsize=None, concurrency=8
+        )
+        self.assertIs(mock_get.return_value, adapter)
+
+        utils.get_shared_sdk_adapter('placement', pool_maxsize=16)
+        mock_get.assert_called_with(
+            'placement', pool_maxsize=16, concurrency=None
+        )
+
+    @mock.patch('openstack.connection.Connection')
+    def test_get_shared_connection(self, mock_conn):
+        conn = utils.get_shared_connection('devstack-admin')
+        self.assertIs(conn, utils.get_shared_connection('devstack-admin'))
+        mock_conn.assert_called_once_with(cloud='devstack-admin')
+        utils.clear_shared_clients()
+        utils.get_shared_connection('devstack-admin')
+        self.assertEqual(2, mock_conn.call_count)
+
+    @mock.patch('openstack.connection.Connection')
+    @mock.patch('openstack.config.cloud_region.from_conf')
+    @mock.patch.object(utils, '_get_auth_and_session')
+    def test_get_sdk_adapter_concurrency(
+        self, mock_session, mock_from_conf, mock_conn
+    ):
+        adapter = utils.get_sdk_adapter('compute', concurrency=4)
+        self.assertIs(mock_conn.return_value.compute, adapter)
+        config = mock_from_conf.call_args.kwargs['config']
+        self.assertEqual({'compute': 4}, config['concurrency'])
+        mock_conn.assert_called_once_with(
+            config=mock_from_conf.return_value, strict_proxies=False
+        )
+        # The pool keeps a connection for each concurrent request.
+        mounted = mock_session.return_value.session.mount.call_args_list
+        self.assertEqual(2, len(mounted))
+        self.assertEqual(4, mounted[0].args[1]._pool_maxsize)
@@ -9,9 +9,14 @@
 #    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 #    License for the specific language governing permissions and limitations
 #    under the License.
+import threading
+import time
+import uuid
+
 from unittest import mock
 
 import fixtures
+import oslo_messaging as messaging
 
 from oslo_utils.fixture import uuidsentinel as uuids
 
@@ -19,6 +24,7 @@ from cyborg.common import exception
 from cyborg.conductor import manager
 from cyborg.tests import base
 from cyborg.tests.unit import fake_driver_device
+from cyborg.tests.unit.db import base as db_base
 
 
 class ConductorManagerTest(base.TestCase):
@@ -29,6 +35,23 @@ class ConductorManagerTest(base.TestCase):
                 'cyborg.common.placement_client.PlacementClient'
             )
         ).mock.return_value
+        # No other conductor is alive.
+        self.hash_ring_mock = self.useFixture(
+            fixtures.MockPatch('cyborg.common.hash_ring.HashRingManager')
+        ).mock.return_value
+        self.hash_ring_mock.ring.get_node.return_value = mock.sentinel.host
+        self.dbapi_mock = self.useFixture(
+            fixtures.MockPatch('cyborg.conductor.manager.dbapi.get_instance')
+        ).mock.return_value
+        host_reports = {}
+        self.dbapi_mock.host_report_set.side_effect = (
+            lambda ctxt, hostname, report_id: host_reports.update(
+                {hostname: report_id}
+            )
+        )
+        self.dbapi_mock.host_report_get.side_effect = lambda ctxt, hostname: (
+            host_reports.get(hostname)
+        )
         self.cm = manager.ConductorManager(
             mock.sentinel.topic, mock.sentinel.host
         )
@@ -49,8 +72,7 @@ class ConductorManagerTest(base.TestCase):
         actual = manager._gen_resource_inventory('CUSTOM_FOO', 42)
         self.assertEqual(expected, actual)
 
-    @mock.patch('cyborg.conductor.manager.ConductorManager._get_sub_provider')
-    def test_provider_report(self, mock_get_sub):
+    def test_provider_report(self):
         rc = 'CUSTOM_ACCELERATOR'
         traits = [
             "CUSTOM_FPGA_INTEL",
@@ -67,28 +89,24 @@ class ConductorManagerTest(base.TestCase):
                 'max_unit': total,
             },
         }
-        self.placement_mock.ensure_resource_classes.return_value = None
+        sub_pr_uuid = str(uuid.uuid3(uuid.NAMESPACE_DNS, 'name'))
+        self.placement_mock.sync_provider.return_value = sub_pr_uuid
         actual = self.cm.provider_report(
             mock.sentinel.context,
-            mock.sentinel.name,
+            'name',
             rc,
             traits,
             total,
             mock.sentinel.parent,
         )
 
-        self.placement_mock.ensure_resource_classes.assert_called_once_with(
-            mock.sentinel.context, [rc]
-        )
-        mock_get_sub.assert_called_once_with(
-            mock.sentinel.context, mock.sentinel.parent, mock.sentinel.name
-        )
-        sub_pr_uuid = mock_get_sub.return_value
-        self.placement_mock.update_inventory.assert_called_once_with(
-            sub_pr_uuid, expected_inv
-        )
-        self.placement_mock.add_traits_to_rp.assert_called_once_with(
-            sub_pr_uuid, traits
+        self.placement_mock.sync_provider.assert_called_once_with(
+            mock.sentinel.context,
+            sub_pr_uuid,
+            expected_inv,
+            traits,
+            name='name',
+            parent_provider_uuid=mock.sentinel.parent,
         )
         self.assertEqual(sub_pr_uuid, actual)
 
@@ -162,6 +180,30 @@ class ConductorManagerTest(base.TestCase):
         mock_destroy_driver_device.assert_called_once()
         mock_placement_delete.assert_called_once()
 
+    @mock.patch(
+        'cyborg.conductor.manager.ConductorManager.'
+        'get_placement_needed_info_and_report'
+    )
+    @mock.patch(
+        'cyborg.objects.driver_objects.driver_device.DriverDevice.create'
+    )
+    def test_drv_device_make_diff_reports_concurrently(
+        self, mock_create_driver_device, mock_placement_report
+    ):
+        new_driver_devices = self.fake_driver_devices
+        # Every report waits for the others, so they must run at once.
+        barrier = threading.Barrier(len(new_driver_devices), timeout=5)
+        mock_placement_report.side_effect = lambda *args: barrier.wait()
+
+        failed = self.cm.drv_device_make_diff(
+            mock.sentinel.context, 'foo', [], new_driver_devices
+        )
+
+        self.assertEqual(set(), failed)
+        self.assertEqual(
+            len(new_driver_devices), mock_placement_report.call_count
+        )
+
     @mock.patch(
         'cyborg.conductor.manager.ConductorManager.'
         '_delete_provider_and_sub_providers'
@@ -207,6 +249,321 @@ class ConductorManagerTest(base.TestCase):
         mock_destroy_driver_deployable.assert_called_once()
         mock_placement_delete.assert_called_once()
 
+    @mock.patch('cyborg.conductor.manager.ConductorManager.drv_ah_make_diff')
+    @mock.patch('cyborg.conductor.manager.Attribute.get_by_dep_key')
+    @mock.patch('cyborg.conductor.manager.Deployable.get_list_by_device_id')
+    def test_drv_deployable_make_diff_provider_writes_in_order(
+        self, mock_dep_list, mock_get_attr, mock_ah_diff
+    ):
+        old_driver_dep = self.fake_driver_depolyables[0]
+        new_driver_dep = fake_driver_device.get_fake_driver_deployable_objs()[
+            0
+        ]
+        new_driver_dep.num_accelerators = 2
+        new_driver_dep.attribute_list[0].value = 'CUSTOM_GPU_NVIDIA_NEW'
+        dep_obj = mock.Mock(id=1, num_accelerators=1)
+        # name is an argument of Mock(), so it is set afterwards.
+        dep_obj.name = old_driver_dep.name
+        mock_dep_list.return_value = [dep_obj]
+        writes = []
+
+        def update_inventory(rp_uuid, inv_data):
+            writes.append('inventory')
+            # Long enough for an overlapping trait write to run meanwhile.
+            time.sleep(0.1)
+            writes.append('inventory done')
+
+        self.placement_mock.update_inventory.side_effect = update_inventory
+        self.placement_mock.delete_trait_by_name.side_effect = lambda *args: (
+            writes.append('delete trait')
+        )
+        self.placement_mock.add_traits_to_rp.side_effect = lambda *args: (
+            writes.append('add trait')
+        )
+
+        failed = self.cm.drv_deployable_make_diff(
+            mock.sentinel.context,
+            '1',
+            '2',
+            [old_driver_dep],
+            [new_driver_dep],
+            'foo',
+        )
+
+        self.assertEqual(set(), failed)
+        self.assertEqual(
+            ['inventory', 'inventory done', 'delete trait', 'add trait'],
+            writes,
+        )
+
+    @mock.patch(
+        'cyborg.conductor.manager.ConductorManager.drv_deployable_make_diff'
+    )
+    @mock.patch('cyborg.conductor.manager.ControlpathID.list')
+    @mock.patch('cyborg.conductor.manager.Device.get_list_by_hostname')
+    def test_drv_device_make_diff_same_loads_host_once(
+        self, mock_dev_list, mock_cpid_list, mock_dep_diff
+    ):
+        self.placement_mock.get.return_value.json.return_value = {
+            'resource_providers': [{'uuid': mock.sentinel.uuid}],
+        }
+        old_devices = fake_driver_device.get_fake_driver_devices_objs()
+        new_devices = self.fake_driver_devices
+        dev_objs = [mock.Mock(id=i) for i in range(len(new_devices))]
+        for dev_obj in dev_objs:
+            dev_obj.obj_what_changed.return_value = set()
+        mock_dev_list.return_value = dev_objs
+        # The last device has no controlpath_id in the DB.
+        mock_cpid_list.return_value = [
+            mock.Mock(id=i, device_id=i, cpid_info=d.controlpath_id.cpid_info)
+            for i, d in enumerate(new_devices[:-1])
+        ]
+        mock_dep_diff.return_value = set()
+
+        failed = self.cm.drv_device_make_diff(
+            self.context, 'foo', old_devices, new_devices
+        )
+
+        self.assertEqual({new_devices[-1].controlpath_id.cpid_info}, failed)
+        mock_dev_list.assert_called_once_with(self.context, 'foo')
+        mock_cpid_list.assert_called_once_with(
+            self.context, {'device_id': list(range(len(dev_objs)))}
+        )
+        self.assertEqual(len(new_devices) - 1, mock_dep_diff.call_count)
+        for dev_obj in dev_objs:
+            dev_obj.save.assert_not_called()
+
+    @mock.patch(
+        'cyborg.conductor.manager.AttachHandle.get_ah_list_by_deployable_id'
+    )
+    def test_drv_ah_make_diff_saves_changed_only(self, mock_ah_list):
+        old_ahs = fake_driver_device.get_fake_driver_devices_objs()[0]
+        old_ahs = old_ahs.deployable_list[0].attach_handle_list
+        new_ahs = self.fake_driver_devices[0]
+        new_ahs = new_ahs.deployable_list[0].attach_handle_list
+
+        self.cm.drv_ah_make_diff(
+            self.context, mock.sentinel.dep_id, 1, old_ahs, new_ahs
+        )
+        mock_ah_list.assert_not_called()
+
+        new_ahs[0].attach_type = 'TEST_PCI'
+        ah_obj = mock.Mock(attach_info=new_ahs[0].attach_info)
+        mock_ah_list.return_value = [ah_obj]
+        self.cm.drv_ah_make_diff(
+            self.context, mock.sentinel.dep_id, 1, old_ahs, new_ahs
+        )
+
+        mock_ah_list.assert_called_once_with(
+            self.context, mock.sentinel.dep_id
+        )
+        self.assertEqual('TEST_PCI', ah_obj.attach_type)
+        ah_obj.save.assert_called_once_with(self.context)
+
+    def test_fingerprint_ignores_list_order(self):
+        dev = self.fake_driver_devices[0]
+        fp = dev.fingerprint()
+        dep = dev.deployable_list[0]
+        dep.attribute_list = list(reversed(dep.attribute_list))
+        self.assertEqual(fp, dev.fingerprint())
+        dep.num_accelerators = 2
+        self.assertNotEqual(fp, dev.fingerprint())
+
+    @mock.patch(
+        'cyborg.conductor.manager.ConductorManager.drv_device_make_diff'
+    )
+    @mock.patch(
+        'cyborg.objects.driver_objects.driver_device.DriverDevice.list'
+    )
+    def test_report_data_delta_unchanged(self, mock_list, mock_diff):
+        mock_list.return_value = []
+        mock_diff.return_value = set()
+        self.cm.report_data(self.context, 'foo', self.fake_driver_devices)
+        fingerprints = {
+            d.controlpath_id.cpid_info: d.fingerprint()
+            for d in self.fake_driver_devices
+        }
+
+        ret = self.cm.report_data_delta(self.context, 'foo', fingerprints, [])
+
+        self.assertTrue(ret)
+        mock_list.assert_called_once_with(self.context, 'foo')
+        mock_diff.assert_called_once()
+
+    @mock.patch('cyborg.conductor.manager.ConductorManager._apply_report_data')
+    def test_queue_report_data(self, mock_report_data):
+        self.cm.queue_report_data(
+            self.context, 'foo', self.fake_driver_devices
+        )
+        self.cm._report_queue.wait('foo', timeout=5)
+        mock_report_data.assert_called_once_with(
+            self.context, 'foo', self.fake_driver_devices
+        )
+
+    @mock.patch(
+        'cyborg.conductor.manager.ConductorManager.drv_device_make_diff'
+    )
+    @mock.patch(
+        'cyborg.objects.driver_objects.driver_device.DriverDevice.list'
+    )
+    def test_report_data_delta_after_queued_report(self, mock_list, mock_diff):
+        mock_list.return_value = []
+        mock_diff.return_value = set()
+        fingerprints = {
+            d.controlpath_id.cpid_info: d.fingerprint()
+            for d in self.fake_driver_devices
+        }
+        release = threading.Event()
+        self.cm._report_queue.put('foo', release.wait, 5)
+        self.cm.queue_report_data(
+            self.context, 'foo', self.fake_driver_devices
+        )
+        threading.Timer(0.1, release.set).start()
+
+        # The delta waits for the full report it is relative to.
+        ret = self.cm.report_data_delta(self.context, 'foo', fingerprints, [])
+
+        self.assertTrue(ret)
+
+    @mock.patch('cyborg.conductor.manager.ConductorManager._apply_report_data')
+    def test_queue_report_data_forwarded(self, mock_report_data):
+        self.hash_ring_mock.ring.get_node.return_value = 'other'
+        self.cm._conductor_api = mock.Mock()
+        self.cm.queue_report_data(
+            self.context, 'foo', self.fake_driver_devices
+        )
+        self.cm._conductor_api.forward_report_data.assert_called_once_with(
+            self.context, 'other', 'foo', self.fake_driver_devices
+        )
+        self.cm._report_queue.wait('foo', timeout=5)
+        mock_report_data.assert_not_called()
+
+    @mock.patch('cyborg.conductor.manager.ConductorManager._apply_report_data')
+    def test_queue_report_data_not_forwarded_capped(self, mock_report_data):
+        # The conductors are upgraded from a version not forwarding reports.
+        self.flags(conductor='1.3', group='upgrade_levels')
+        self.hash_ring_mock.ring.get_node.return_value = 'other'
+        self.cm.queue_report_data(
+            self.context, 'foo', self.fake_driver_devices
+        )
+        self.cm._report_queue.wait('foo', timeout=5)
+        mock_report_data.assert_called_once_with(
+            self.context, 'foo', self.fake_driver_devices
+        )
+
+    def test_report_data_delta_owner_timeout(self):
+        self.hash_ring_mock.ring.get_node.return_value = 'other'
+        self.cm._conductor_api = mock.Mock()
+        forward = self.cm._conductor_api.forward_report_data_delta
+        forward.side_effect = messaging.MessagingTimeout()
+        ret = self.cm.report_data_delta(self.context, 'foo', {}, [])
+        self.assertFalse(ret)
+        forward.assert_called_once_with(self.context, 'other', 'foo', {}, [])
+        self.hash_ring_mock.reset.assert_called_once_with()
+
+    def test_periodic_tasks_rebalance(self):
+        self.cm._host_fingerprints = {'foo': {}, 'bar': {}}
+        self.hash_ring_mock.ring.get_node.side_effect = {
+            'foo': mock.sentinel.host,
+            'bar': 'other',
+        }.get
+        self.cm.periodic_tasks(self.context)
+        self.dbapi_mock.conductor_register.assert_called_once_with(
+            self.context, mock.sentinel.host
+        )
+        self.hash_ring_mock.reset.assert_called_once_with()
+        self.assertEqual({'foo': {}}, self.cm._host_fingerprints)
+
+    def test_report_data_delta_without_baseline(self):
+        ret = self.cm.report_data_delta(self.context, 'foo', {}, [])
+        self.assertFalse(ret)
+
+    @mock.patch(
+        'cyborg.conductor.manager.ConductorManager.drv_device_make_diff'
+    )
+    @mock.patch(
+        'cyborg.objects.driver_objects.driver_device.DriverDevice.list'
+    )
+    def test_report_data_delta_changed(self, mock_list, mock_diff):
+        old_devices = fake_driver_device.get_fake_driver_devices_objs()
+        mock_list.return_value = old_devices
+        mock_diff.return_value = set()
+        self.cm.report_data(self.context, 'foo', self.fake_driver_devices)
+        changed_dev = self.fake_driver_devices[1]
+        changed_dev.vendor = '0xFFFF'
+        cpid_info = changed_dev.controlpath_id.cpid_info
+        fingerprints = {
+            d.controlpath_id.cpid_info: d.fingerprint()
+            for d in self.fake_driver_devices
+        }
+
+        ret = self.cm.report_data_delta(
+            self.context, 'foo', fingerprints, [changed_dev]
+        )
+
+        self.assertTrue(ret)
+        mock_diff.assert_called_with(
+            self.context,
+            'foo',
+            [old_devices[1]],
+            [changed_dev],
+            unchanged_deployables={
+                cpid_info: {changed_dev.deployable_list[0].name}
+            },
+        )
+        self.assertEqual(
+            fingerprints[cpid_info],
+            self.cm._host_fingerprints['foo'][cpid_info]['device'],
+        )
+
+    @mock.patch(
+        'cyborg.conductor.manager.ConductorManager.drv_device_make_diff'
+    )
+    @mock.patch(
+        'cyborg.objects.driver_objects.driver_device.DriverDevice.list'
+    )
+    def test_report_data_delta_missing_changed_device(
+        self, mock_list, mock_diff
+    ):
+        mock_list.return_value = []
+        mock_diff.return_value = set()
+        self.cm.report_data(self.context, 'foo', self.fake_driver_devices)
+        fingerprints = {
+            d.controlpath_id.cpid_info: 'stale'
+            for d in self.fake_driver_devices
+        }
+
+        ret = self.cm.report_data_delta(self.context, 'foo', fingerprints, [])
+
+        self.assertFalse(ret)
+        mock_diff.assert_called_once()
+
+    @mock.patch(
+        'cyborg.conductor.manager.ConductorManager.drv_device_make_diff'
+    )
+    @mock.patch(
+        'cyborg.objects.driver_objects.driver_device.DriverDevice.list'
+    )
+    def test_report_data_failed_device_not_cached(self, mock_list, mock_diff):
+        mock_list.return_value = []
+        failed_cpid = self.fake_driver_devices[0].controlpath_id.cpid_info
+        mock_diff.return_value = {failed_cpid}
+
+        self.cm.report_data(self.context, 'foo', self.fake_driver_devices)
+
+        self.assertNotIn(failed_cpid, self.cm._host_fingerprints['foo'])
+        self.assertEqual(1, len(self.cm._host_fingerprints['foo']))
+
+    @mock.patch('cyborg.conductor.manager.ExtARQ.create_many')
+    def test_arq_create_bulk(self, mock_create_many):
+        obj_extarqs = [mock.sentinel.extarq1, mock.sentinel.extarq2]
+        mock_create_many.return_value = obj_extarqs
+        ret = self.cm.arq_create_bulk(mock.sentinel.ctx, obj_extarqs, 1)
+        mock_create_many.assert_called_once_with(
+            mock.sentinel.ctx, obj_extarqs, 1
+        )
+        self.assertEqual(obj_extarqs, ret)
+
     @mock.patch(
         'cyborg.common.data_migrations.heal_arq_project_ids', autospec=True
     )
@@ -214,6 +571,9 @@ class ConductorManagerTest(base.TestCase):
         mock_heal.return_value = 3
         self.cm.init_host()
         mock_heal.assert_called_once()
+        self.dbapi_mock.conductor_register.assert_called_once_with(
+            mock.ANY, mock.sentinel.host
+        )
 
     @mock.patch(
         'cyborg.common.data_migrations.heal_arq_project_ids', autospec=True
@@ -222,3 +582,151 @@ class ConductorManagerTest(base.TestCase):
         mock_heal.side_effect = Exception('Nova unavailable')
         self.cm.init_host()
         mock_heal.assert_called_once()
+
+
+class ConductorShardingTest(db_base.DbTestCase):
+    """Conductors sharing the hosts, with their heartbeats in the DB."""
+
+    CONDUCTORS = ('conductor-1', 'conductor-2', 'conductor-3')
+    HOSTS = ['compute-%d' % i for i in range(30)]
+
+    def setUp(self):
+        super().setUp()
+        self.useFixture(
+            fixtures.MockPatch(
+                'cyborg.common.placement_client.PlacementClient'
+            )
+        )
+        self.useFixture(
+            fixtures.MockPatch(
+                'cyborg.common.data_migrations.heal_arq_project_ids'
+            )
+        )
+        self.useFixture(
+            fixtures.MockPatch(
+                'cyborg.conductor.manager.ConductorManager.'
+                'drv_device_make_diff',
+                return_value=set(),
+            )
+        )
+        self.useFixture(
+            fixtures.MockPatch(
+                'cyborg.objects.driver_objects.driver_device.'
+                'DriverDevice.list',
+                return_value=[],
+            )
+        )
+        self.managers = {}
+        for name in self.CONDUCTORS:
+            cm = manager.ConductorManager(mock.sentinel.topic, name)
+            cm._conductor_api = self._conductor_api()
+            cm.init_host()
+            self.managers[name] = cm
+
+    def _conductor_api(self):
+        """An RPC API calling the other managers directly."""
+        api = mock.Mock()
+        api.forward_report_data.side_effect = (
+            lambda ctxt, server, hostname, devices: self.managers[
+                server
+            ].queue_report_data(ctxt, hostname, devices, forwarded=True)
+        )
+        api.forward_report_data_delta.side_effect = (
+            lambda ctxt, server, hostname, fps, devices: self.managers[
+                server
+            ].report_data_delta(ctxt, hostname, fps, devices, forwarded=True)
+        )
+        return api
+
+    def _report_all(self):
+        # Any conductor may receive the report of a host.
+        conductors = list(self.managers.values())
+        for i, hostname in enumerate(self.HOSTS):
+            conductors[i % len(conductors)].queue_report_data(
+                self.context, hostname, []
+            )
+        for cm in self.managers.values():
+            for hostname in self.HOSTS:
+                cm._report_queue.wait(hostname, timeout=5)
+
+    def _owners(self):
+        owners = {}
+        for name, cm in self.managers.items():
+            for hostname in cm._host_fingerprints:
+                self.assertNotIn(hostname, owners)
+                owners[hostname] = name
+        return owners
+
+    def test_hosts_partitioned(self):
+        self._report_all()
+        owners = self._owners()
+        self.assertEqual(set(self.HOSTS), set(owners))
+        self.assertEqual(set(self.CONDUCTORS), set(owners.values()))
+        # A delta sent to any conductor is applied by the owner.
+        for cm in self.managers.values():
+            self.assertTrue(
+                cm.report_data_delta(self.context, 'compute-0', {}, [])
+            )
+
+    def test_conductor_leaves(self):
+        self._report_all()
+        before = self._owners()
+        gone = self.managers.pop('conductor-3')
+        gone.del_host()
+        for cm in self.managers.values():
+            cm.periodic_tasks(self.context)
+        # Only the hosts of the conductor gone need a full report again.
+        kept = self._owners()
+        self.assertEqual(
+            {h for h, owner in before.items() if owner != 'conductor-3'},
+            set(kept),
+        )
+        for hostname, owner in kept.items():
+            self.assertEqual(before[hostname], owner)
+        self._report_all()
+        self.assertEqual(set(self.HOSTS), set(self._owners()))
+
+    def test_rings_disagree(self):
+        # conductor-1 thinks conductor-2 owns the host and the other way
+        # round, until their rings are reset.
+        for name, other in (
+            ('conductor-1', 'conductor-2'),
+            ('conductor-2', 'conductor-1'),
+        ):
+            ring_manager = mock.Mock()
+            ring_manager.ring.get_node.return_value = other
+            self.managers[name]._hash_ring = ring_manager
+        cm = self.managers['conductor-1']
+
+        cm.queue_report_data(self.context, 'compute-0', [])
+        for other in self.managers.values():
+            other._report_queue.wait('compute-0', timeout=5)
+
+        # The report is forwarded once and applied by its receiver.
+        cm._conductor_api.forward_report_data.assert_called_once_with(
+            self.context, 'conductor-2', 'compute-0', []
+        )
+        self.managers[
+            'conductor-2'
+        ]._conductor_api.forward_report_data.assert_not_called()
+        self.assertEqual({'compute-0': 'conductor-2'}, self._owners())
+
+    def test_delta_after_full_report_to_other_conductor(self):
+        cm1 = self.managers['conductor-1']
+        cm2 = self.managers['conductor-2']
+        # The rings disagree, both conductors get a full report of the host.
+        cm1._apply_report_data(self.context, 'compute-0', [])
+        cm2._apply_report_data(self.context, 'compute-0', [])
+        # The fingerprints of conductor-1 are older than the last full
+        # report, a delta relative to the latter needs a full report.
+        self.assertFalse(
+            cm1.report_data_delta(
+                self.context, 'compute-0', {}, [], forwarded=True
+            )
+        )
+        self.assertNotIn('compute-0', cm1._host_fingerprints)
+        self.assertTrue(
+            cm2.report_data_delta(
+                self.context, 'compute-0', {}, [], forwarded=True
+            )
+        )
@@ -0,0 +1,66 @@
+# Copyright 2026 The Cyborg Authors.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+
+from cyborg.conductor import report_queue
+from cyborg.tests import base
+
+
+class ReportQueueTest(base.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.queue = report_queue.ReportQueue(2)
+
+    def test_latest_report_of_host_only(self):
+        started = threading.Event()
+        release = threading.Event()
+        applied = []
+
+        def apply(report):
+            if report == 1:
+                started.set()
+                release.wait(5)
+            applied.append(report)
+
+        self.queue.put('host', apply, 1)
+        started.wait(5)
+        # The reports queued while the first one is applied supersede each
+        # other.
+        for report in (2, 3, 4):
+            self.queue.put('host', apply, report)
+        release.set()
+        self.assertTrue(self.queue.wait('host', timeout=5))
+        self.assertEqual([1, 4], applied)
+
+    def test_hosts_concurrently(self):
+        barrier = threading.Barrier(2, timeout=5)
+        results = []
+        for host in ('host1', 'host2'):
+            self.queue.put(host, lambda: results.append(barrier.wait()))
+        for host in ('host1', 'host2'):
+            self.assertTrue(self.queue.wait(host, timeout=5))
+        self.assertEqual([0, 1], sorted(results))
+
+    def test_failed_report(self):
+        def fail():
+            raise ValueError()
+
+        applied = threading.Event()
+        self.queue.put('host', fail)
+        self.assertTrue(self.queue.wait('host', timeout=5))
+        # The host is not stuck by a failure.
+        self.queue.put('host', applied.set)
+        self.assertTrue(applied.wait(5))
@@ -0,0 +1,119 @@
+# Copyright 2026 The Cyborg Authors.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+import fixtures
+
+from cyborg.conductor import rpcapi
+from cyborg.tests import base
+
+
+class TestConductorAPI(base.TestCase):
+    """Test conductor rpcapi"""
+
+    def setUp(self):
+        super().setUp()
+        self.cast = self.useFixture(
+            fixtures.MockPatch(
+                'oslo_messaging.rpc.client._BaseCallContext.cast',
+                autospec=True,
+            )
+        ).mock
+        self.call = self.useFixture(
+            fixtures.MockPatch(
+                'oslo_messaging.rpc.client._BaseCallContext.call',
+                autospec=True,
+            )
+        ).mock
+
+    def _get_api(self, version_cap=None):
+        self.flags(conductor=version_cap, group='upgrade_levels')
+        return rpcapi.ConductorAPI()
+
+    def test_version_cap(self):
+        api = self._get_api()
+        self.assertTrue(api.client.can_send_version(api.RPC_API_VERSION))
+        api = self._get_api('1.2')
+        self.assertTrue(api.client.can_send_version('1.2'))
+        self.assertFalse(api.client.can_send_version('1.3'))
+
+    def test_report_data(self):
+        api = self._get_api()
+        api.report_data(self.context, 'foo', [])
+        cctxt = self.cast.call_args[0][0]
+        self.assertEqual('1.3', cctxt.target.version)
+        self.cast.assert_called_once_with(
+            cctxt,
+            self.context,
+            'queue_report_data',
+            hostname='foo',
+            driver_device_list=[],
+        )
+        self.call.assert_not_called()
+
+    def test_report_data_capped(self):
+        api = self._get_api('1.2')
+        api.report_data(self.context, 'foo', [])
+        self.cast.assert_not_called()
+        cctxt = self.call.call_args[0][0]
+        self.call.assert_called_once_with(
+            cctxt,
+            self.context,
+            'report_data',
+            hostname='foo',
+            driver_device_list=[],
+        )
+
+    def test_arq_create_bulk(self):
+        api = self._get_api()
+        self.call.return_value = mock.sentinel.extarqs
+        ret = api.arq_create_bulk(
+            self.context, mock.sentinel.extarq_list, mock.sentinel.devprof_id
+        )
+        self.assertEqual(mock.sentinel.extarqs, ret)
+        cctxt = self.call.call_args[0][0]
+        self.assertEqual('1.2', cctxt.target.version)
+        self.call.assert_called_once_with(
+            cctxt,
+            self.context,
+            'arq_create_bulk',
+            obj_extarqs=mock.sentinel.extarq_list,
+            devprof_id=mock.sentinel.devprof_id,
+        )
+
+    def test_arq_create_bulk_capped(self):
+        api = self._get_api('1.1')
+        self.call.side_effect = lambda cctxt, ctxt, method, **kw: kw[
+            'obj_extarq'
+        ]
+        extarqs = [mock.sentinel.extarq1, mock.sentinel.extarq2]
+        ret = api.arq_create_bulk(
+            self.context, extarqs, mock.sentinel.devprof_id
+        )
+        self.assertEqual(extarqs, ret)
+        self.assertEqual(
+            [
+                mock.call(
+                    mock.ANY,
+                    self.context,
+                    'arq_create',
+                    obj_extarq=extarq,
+                    devprof_id=mock.sentinel.devprof_id,
+                )
+                for extarq in extarqs
+            ],
+            self.call.call_args_list,
+        )
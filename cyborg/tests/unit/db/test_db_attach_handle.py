@@ -15,9 +15,12 @@
 
 """Tests for manipulating AttachHandle via the DB API"""
 
+from unittest import mock
+
 from oslo_utils import uuidutils
 
 from cyborg.common import exception
+from cyborg.db.sqlalchemy import api as sqlalchemy_api
 from cyborg.tests.unit.db import base
 from cyborg.tests.unit.db import utils
 
@@ -93,6 +96,32 @@ class TestDbAttachHandle(base.DbTestCase):
         self.assertEqual(1, len(res))
         self.assertEqual(ah1['uuid'], res[0]['uuid'])
 
+    def test_get_by_filters_attach_info(self):
+        utils.create_test_attach_handle(
+            self.context,
+            id=1,
+            uuid=uuidutils.generate_uuid(),
+            deployable_id=1,
+            attach_info='{"bus": "00"}',
+        )
+        ah2 = utils.create_test_attach_handle(
+            self.context,
+            id=2,
+            uuid=uuidutils.generate_uuid(),
+            deployable_id=1,
+            attach_info='{"bus": "01"}',
+            in_use=True,
+        )
+        res = self.dbapi.attach_handle_get_by_filters(
+            self.context,
+            filters={"deployable_id": 1, "attach_info": '{"bus": "01"}'},
+        )
+        self.assertEqual([ah2['uuid']], [ah['uuid'] for ah in res])
+        res = self.dbapi.attach_handle_get_by_filters(
+            self.context, filters={"deployable_id": 1, "in_use": True}
+        )
+        self.assertEqual([ah2['uuid']], [ah['uuid'] for ah in res])
+
     def test_allocate(self):
         utils.create_test_attach_handle(
             self.context, id=1, uuid=uuidutils.generate_uuid(), deployable_id=1
@@ -102,6 +131,63 @@ class TestDbAttachHandle(base.DbTestCase):
         )
         self.assertTrue(allocate_ah['in_use'])
 
+    def test_allocate_many(self):
+        for i in range(1, 5):
+            utils.create_test_attach_handle(
+                self.context,
+                id=i,
+                uuid=uuidutils.generate_uuid(),
+                deployable_id=1,
+                in_use=i == 2,
+            )
+        allocated = self.dbapi.attach_handle_allocate_many(
+            self.context, deployable_id=1, count=2
+        )
+        self.assertEqual([1, 3], [ah['id'] for ah in allocated])
+        self.assertEqual(
+            [1, 2, 3],
+            sorted(
+                ah['id']
+                for ah in self.dbapi.attach_handle_list(self.context)
+                if ah['in_use']
+            ),
+        )
+
+    def test_allocate_many_not_enough(self):
+        utils.create_test_attach_handle(
+            self.context, id=1, uuid=uuidutils.generate_uuid(), deployable_id=1
+        )
+        self.assertRaises(
+            exception.ResourceNotFound,
+            self.dbapi.attach_handle_allocate_many,
+            self.context,
+            1,
+            2,
+        )
+        # Nothing is allocated.
+        ah = self.dbapi.attach_handle_get_by_id(self.context, 1)
+        self.assertFalse(ah['in_use'])
+
+    def test_supports_skip_locked(self):
+        cases = [
+            ('postgresql', False, (9, 4), False),
+            ('postgresql', False, (13, 2), True),
+            ('mysql', False, (5, 7, 40), False),
+            ('mysql', False, (8, 0, 36), True),
+            ('mysql', True, (10, 5, 9), False),
+            ('mysql', True, (10, 11, 6), True),
+            ('sqlite', False, (3, 40, 1), False),
+        ]
+        for name, is_mariadb, version, expected in cases:
+            session = mock.Mock()
+            dialect = session.get_bind.return_value.dialect
+            dialect.name = name
+            dialect.is_mariadb = is_mariadb
+            dialect.server_version_info = version
+            self.assertEqual(
+                expected, sqlalchemy_api._supports_skip_locked(session)
+            )
+
     def test_delete(self):
         created_ah = utils.create_test_attach_handle(self.context)
         return_value = self.dbapi.attach_handle_delete(
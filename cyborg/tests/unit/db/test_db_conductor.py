@@ -0,0 +1,68 @@
+# Copyright 2026 The Cyborg Authors.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Tests for the conductor heartbeats via the DB API"""
+
+import datetime
+
+from oslo_utils import timeutils
+
+from cyborg.tests.unit.db import base
+
+
+class TestDbConductor(base.DbTestCase):
+    def setUp(self):
+        super().setUp()
+        self.now = datetime.datetime(2026, 10, 18, 12, 0, 0)
+        timeutils.set_time_override(self.now)
+        self.addCleanup(timeutils.clear_time_override)
+
+    def test_register(self):
+        self.dbapi.conductor_register(self.context, 'c1')
+        self.dbapi.conductor_register(self.context, 'c2')
+        # Registering again is a heartbeat.
+        self.dbapi.conductor_register(self.context, 'c1')
+        self.assertEqual(
+            ['c1', 'c2'], self.dbapi.conductor_list_alive(self.context, 60)
+        )
+
+    def test_unregister(self):
+        self.dbapi.conductor_register(self.context, 'c1')
+        self.dbapi.conductor_register(self.context, 'c2')
+        self.dbapi.conductor_unregister(self.context, 'c2')
+        self.assertEqual(
+            ['c1'], self.dbapi.conductor_list_alive(self.context, 60)
+        )
+        self.dbapi.conductor_register(self.context, 'c2')
+        self.assertEqual(
+            ['c1', 'c2'], self.dbapi.conductor_list_alive(self.context, 60)
+        )
+
+    def test_list_alive_timeout(self):
+        self.dbapi.conductor_register(self.context, 'c1')
+        timeutils.advance_time_seconds(30)
+        self.dbapi.conductor_register(self.context, 'c2')
+        timeutils.advance_time_seconds(40)
+        self.assertEqual(
+            ['c2'], self.dbapi.conductor_list_alive(self.context, 60)
+        )
+
+    def test_host_report(self):
+        self.assertIsNone(self.dbapi.host_report_get(self.context, 'h1'))
+        self.dbapi.host_report_set(self.context, 'h1', 'r1')
+        self.dbapi.host_report_set(self.context, 'h2', 'r2')
+        self.dbapi.host_report_set(self.context, 'h1', 'r3')
+        self.assertEqual('r3', self.dbapi.host_report_get(self.context, 'h1'))
+        self.assertEqual('r2', self.dbapi.host_report_get(self.context, 'h2'))
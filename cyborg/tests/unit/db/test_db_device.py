@@ -125,3 +125,46 @@ class TestDbDevice(base.DbTestCase):
             self.context,
             random_uuid,
         )
+
+    def test_device_tree_get_by_hostname(self):
+        dev = utils.create_test_device(
+            self.context, id=1, uuid=uuidutils.generate_uuid()
+        )
+        utils.create_test_device(
+            self.context,
+            id=2,
+            uuid=uuidutils.generate_uuid(),
+            hostname='myhost2',
+        )
+        cpid = self.dbapi.control_path_create(
+            self.context, utils.get_test_control_path(device_id=dev['id'])
+        )
+        dep = utils.create_test_deployable(self.context, device_id=dev['id'])
+        utils.create_test_deployable(
+            self.context,
+            id=2,
+            uuid=uuidutils.generate_uuid(),
+            device_id=2,
+        )
+        attr = self.dbapi.attribute_create(
+            self.context,
+            {'deployable_id': dep['id'], 'key': 'rc', 'value': 'FPGA'},
+        )
+        ah = utils.create_test_attach_handle(
+            self.context, deployable_id=dep['id'], cpid_id=cpid['id']
+        )
+
+        res = self.dbapi.device_tree_get_by_hostname(self.context, 'localhost')
+
+        self.assertEqual([dev['id']], [r['id'] for r in res['devices']])
+        self.assertEqual(
+            [cpid['id']], [r['id'] for r in res['controlpath_ids']]
+        )
+        self.assertEqual([dep['id']], [r['id'] for r in res['deployables']])
+        self.assertEqual([attr['id']], [r['id'] for r in res['attributes']])
+        self.assertEqual([ah['id']], [r['id'] for r in res['attach_handles']])
+
+    def test_device_tree_get_by_hostname_not_exist(self):
+        res = self.dbapi.device_tree_get_by_hostname(self.context, 'nohost')
+        self.assertEqual([], res['devices'])
+        self.assertEqual([], res['attach_handles'])
@@ -15,10 +15,13 @@
 
 """Tests for manipulating ExtArq via the DB API"""
 
+from unittest import mock
+
 from oslo_utils import uuidutils
 from oslo_utils.fixture import uuidsentinel
 
 from cyborg.common import exception
+from cyborg.db.sqlalchemy import api as sqlalchemy_api
 from cyborg.tests.unit.db import base
 from cyborg.tests.unit.db import utils
 
@@ -30,6 +33,123 @@ class TestDbExtArq(base.DbTestCase):
         created_extarq = utils.create_test_extarq(self.context, **kw)
         self.assertEqual(random_uuid, created_extarq['uuid'])
 
+    def test_create_many(self):
+        devprof = utils.create_test_device_profile(self.context)
+        values_list = [
+            {
+                'device_profile_name': devprof['name'],
+                'device_profile_group_id': i,
+                'state': 'Initial',
+            }
+            for i in range(3)
+        ]
+        conn = sqlalchemy_api.Connection()
+        with mock.patch.object(
+            conn, 'device_profile_get', wraps=conn.device_profile_get
+        ) as mock_devprof_get:
+            created = conn.extarq_create_many(self.context, values_list)
+        mock_devprof_get.assert_called_once_with(self.context, devprof['name'])
+        self.assertEqual(
+            [0, 1, 2], [x.device_profile_group_id for x in created]
+        )
+        extarqs = self.dbapi.extarq_list(self.context)
+        self.assertEqual(
+            sorted(x.uuid for x in created), sorted(x.uuid for x in extarqs)
+        )
+        for extarq in extarqs:
+            self.assertEqual(devprof['id'], extarq.device_profile_id)
+
+    def test_create_many_duplicate_uuid(self):
+        random_uuid = uuidutils.generate_uuid()
+        values_list = [
+            {'uuid': random_uuid, 'device_profile_id': 1, 'state': 'Initial'},
+            {'uuid': random_uuid, 'device_profile_id': 1, 'state': 'Initial'},
+        ]
+        self.assertRaises(
+            exception.ExtArqAlreadyExists,
+            self.dbapi.extarq_create_many,
+            self.context,
+            values_list,
+        )
+        self.assertEqual([], self.dbapi.extarq_list(self.context))
+
+    def test_update_many(self):
+        values_by_uuid = {}
+        for i in range(1, 4):
+            extarq = utils.create_test_extarq(
+                self.context, id=i, uuid=uuidutils.generate_uuid()
+            )
+            values_by_uuid[extarq['uuid']] = {
+                'hostname': 'myhost',
+                'device_rp_uuid': uuidutils.generate_uuid(),
+                'state': 'BindStarted',
+            }
+        count = self.dbapi.extarq_update_many(
+            self.context, values_by_uuid, ['Initial', 'Bound']
+        )
+        self.assertEqual(3, count)
+        for arq_uuid, values in values_by_uuid.items():
+            extarq = self.dbapi.extarq_get(self.context, arq_uuid)
+            self.assertEqual('myhost', extarq['hostname'])
+            self.assertEqual(
+                values['device_rp_uuid'], extarq['device_rp_uuid']
+            )
+            self.assertEqual('BindStarted', extarq['state'])
+
+    def test_update_many_bad_state(self):
+        values_by_uuid = {}
+        for i, state in enumerate(['Initial', 'Bound']):
+            extarq = utils.create_test_extarq(
+                self.context,
+                id=i + 1,
+                uuid=uuidutils.generate_uuid(),
+                state=state,
+            )
+            values_by_uuid[extarq['uuid']] = {'state': 'BindStarted'}
+        self.assertRaises(
+            exception.ARQBadState,
+            self.dbapi.extarq_update_many,
+            self.context,
+            values_by_uuid,
+            ['Initial'],
+        )
+        # None of the extarqs is updated.
+        states = sorted(
+            extarq['state'] for extarq in self.dbapi.extarq_list(self.context)
+        )
+        self.assertEqual(['Bound', 'Initial'], states)
+
+    def test_update_state(self):
+        created_extarq = utils.create_test_extarq(self.context)
+        count, state = self.dbapi.extarq_update_state(
+            self.context,
+            created_extarq['uuid'],
+            {'state': 'BindStarted', 'hostname': 'myhost'},
+            ['Initial', 'Bound'],
+        )
+        self.assertEqual((1, 'BindStarted'), (count, state))
+        extarq = self.dbapi.extarq_get(self.context, created_extarq['uuid'])
+        self.assertEqual('BindStarted', extarq['state'])
+        self.assertEqual('myhost', extarq['hostname'])
+
+    def test_update_state_bad_state(self):
+        created_extarq = utils.create_test_extarq(self.context, state='Bound')
+        count, state = self.dbapi.extarq_update_state(
+            self.context,
+            created_extarq['uuid'],
+            {'state': 'BindStarted'},
+            ['Initial'],
+        )
+        self.assertEqual((0, 'Bound'), (count, state))
+        extarq = self.dbapi.extarq_get(self.context, created_extarq['uuid'])
+        self.assertEqual('Bound', extarq['state'])
+
+    def test_update_state_not_found(self):
+        count, state = self.dbapi.extarq_update_state(
+            self.context, uuidsentinel.extarq, {'state': 'BindStarted'}
+        )
+        self.assertEqual((0, None), (count, state))
+
     def test_get_by_uuid(self):
         created_extarq = utils.create_test_extarq(self.context)
         queried_extarq = self.dbapi.extarq_get(
@@ -55,6 +175,23 @@ class TestDbExtArq(base.DbTestCase):
         extarq_uuids = [item.uuid for item in extarqs]
         self.assertEqual(sorted(uuids), sorted(extarq_uuids))
 
+    def test_list_with_state_filter(self):
+        for i, state in enumerate(['Initial', 'Bound', 'BindFailed']):
+            utils.create_test_extarq(
+                self.context,
+                id=i + 1,
+                uuid=uuidutils.generate_uuid(),
+                state=state,
+            )
+        extarqs = self.dbapi.extarq_list(self.context, state='Bound')
+        self.assertEqual(['Bound'], [item.state for item in extarqs])
+        extarqs = self.dbapi.extarq_list(
+            self.context, state=['Bound', 'BindFailed']
+        )
+        self.assertEqual(
+            ['BindFailed', 'Bound'], sorted(item.state for item in extarqs)
+        )
+
     def test_delete(self):
         created_extarq = utils.create_test_extarq(self.context)
         return_value = self.dbapi.extarq_delete(
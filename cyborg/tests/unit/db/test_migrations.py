@@ -121,6 +121,50 @@ class CyborgMigrationsCheckers:
         self.assertIn('type', col_names)
         self.assertIsInstance(devices.c.type.type, sqlalchemy.types.Enum)
 
+    def _check_3c0e9b3b2a6f(self, engine, data):
+        indexes = sqlalchemy.inspect(engine).get_indexes(
+            'extended_accelerator_requests'
+        )
+        self.assertIn(
+            'extArqs_state_idx', [index['name'] for index in indexes]
+        )
+
+    def _check_8f3b2c6d1e4a(self, engine, data):
+        inspector = sqlalchemy.inspect(engine)
+        expected = {
+            'devices': ['devices_hostname_idx'],
+            'deployables': [
+                'deployables_name_device_id_idx',
+                'deployables_rp_uuid_idx',
+            ],
+            'controlpath_ids': ['controlpath_ids_device_id_cpid_info_idx'],
+            'attach_handles': [
+                'attach_handles_deployable_id_in_use_idx',
+                'attach_handles_deployable_id_attach_info_idx',
+            ],
+        }
+        for table, names in expected.items():
+            indexes = [index['name'] for index in inspector.get_indexes(table)]
+            for name in names:
+                self.assertIn(name, indexes)
+
+    def _check_b5e1d4a7c2f9(self, engine, data):
+        inspector = sqlalchemy.inspect(engine)
+        self.assertIn('conductors', inspector.get_table_names())
+        columns = {c['name'] for c in inspector.get_columns('conductors')}
+        self.assertEqual(
+            {'id', 'hostname', 'online', 'created_at', 'updated_at'}, columns
+        )
+
+    def _check_e7c4a2f19d3b(self, engine, data):
+        inspector = sqlalchemy.inspect(engine)
+        self.assertIn('host_reports', inspector.get_table_names())
+        columns = {c['name'] for c in inspector.get_columns('host_reports')}
+        self.assertEqual(
+            {'id', 'hostname', 'report_id', 'created_at', 'updated_at'},
+            columns,
+        )
+
     def test_upgrade_and_version(self):
         with patch_with_engine(self.engine):
             self.migration_api.upgrade('head')
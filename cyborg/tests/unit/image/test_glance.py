@@ -0,0 +1,192 @@
+# Copyright 2026 The Cyborg Authors.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import hashlib
+import io
+import os
+
+from unittest import mock
+
+import fixtures
+
+from oslo_utils import units
+
+from cyborg.common import exception
+from cyborg.image import glance
+from cyborg.tests import base
+
+
+class FakeImageChunks(list):
+    """The chunks of the data of an image, as glanceclient returns them."""
+
+    wrapped = True
+
+
+class TestGlanceImageServiceV2Download(base.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.data = os.urandom(10 * 1024)
+        self.chunks = [
+            self.data[i : i + 1000] for i in range(0, len(self.data), 1000)
+        ]
+        self.image_meta = {
+            'id': 'image-1',
+            'os_hash_algo': 'sha512',
+            'os_hash_value': hashlib.sha512(self.data).hexdigest(),
+        }
+        self.client = mock.Mock()
+        self.client.call.side_effect = self._call
+        self.service = glance.GlanceImageServiceV2(client=self.client)
+        self.path = os.path.join(
+            self.useFixture(fixtures.TempDir()).path, 'image'
+        )
+        self.flags(download_chunk_size=4096, group='glance')
+
+    def _call(self, context, version, method, image_id):
+        if method == 'get':
+            return self.image_meta
+        return FakeImageChunks(self.chunks)
+
+    def _read(self):
+        with open(self.path, 'rb') as f:
+            return f.read()
+
+    def test_download_to_path(self):
+        self.service.download(self.context, 'image-1', dst_path=self.path)
+        self.assertEqual(self.data, self._read())
+        self.assertEqual(
+            [
+                mock.call(self.context, 2, 'get', 'image-1'),
+                mock.call(self.context, 2, 'data', 'image-1'),
+            ],
+            self.client.call.call_args_list,
+        )
+
+    def test_download_chunk_size(self):
+        data = mock.Mock()
+        self.service.download(self.context, 'image-1', data=data)
+        writes = [c.args[0] for c in data.write.call_args_list]
+        self.assertEqual(self.data, b''.join(writes))
+        # The chunks of 1000 bytes are written 5 at a time.
+        self.assertEqual([5000, 5000, 240], [len(w) for w in writes])
+
+    def test_download_without_prefetch(self):
+        self.flags(download_prefetch_chunks=0, group='glance')
+        self.service.download(self.context, 'image-1', dst_path=self.path)
+        self.assertEqual(self.data, self._read())
+
+    def test_download_md5_checksum(self):
+        self.image_meta = {'checksum': hashlib.md5(self.data).hexdigest()}
+        self.service.download(self.context, 'image-1', dst_path=self.path)
+        self.assertEqual(self.data, self._read())
+
+    def test_download_checksum_mismatch(self):
+        self.image_meta['os_hash_value'] = 'bad'
+        self.assertRaises(
+            exception.ImageUnacceptable,
+            self.service.download,
+            self.context,
+            'image-1',
+            dst_path=self.path,
+        )
+
+    def test_download_image_meta_given(self):
+        self.image_meta = None
+        self.service.download(
+            self.context,
+            'image-1',
+            dst_path=self.path,
+            image_meta={'checksum': hashlib.md5(self.data).hexdigest()},
+        )
+        self.client.call.assert_called_once_with(
+            self.context, 2, 'data', 'image-1'
+        )
+
+    def test_download_not_verified(self):
+        self.flags(verify_download=False, group='glance')
+        self.image_meta['os_hash_value'] = 'bad'
+        self.service.download(self.context, 'image-1', dst_path=self.path)
+        self.assertEqual(self.data, self._read())
+        self.client.call.assert_called_once_with(
+            self.context, 2, 'data', 'image-1'
+        )
+
+    def test_download_iterator(self):
+        chunks = self.service.download(self.context, 'image-1')
+        self.assertEqual(self.chunks, chunks)
+
+    def test_download_read_error(self):
+        def chunks():
+            yield self.chunks[0]
+            raise OSError('connection reset')
+
+        self.client.call.side_effect = None
+        self.client.call.return_value = mock.MagicMock(
+            wrapped=True, __iter__=lambda _: chunks()
+        )
+        self.assertRaises(
+            OSError,
+            self.service.download,
+            self.context,
+            'image-1',
+            dst_path=self.path,
+            verify=False,
+        )
+
+    @mock.patch('os.posix_fadvise')
+    @mock.patch('os.fdatasync')
+    def test_download_sync_batches(self, mock_fdatasync, mock_fadvise):
+        self.flags(
+            download_sync_size=1, download_drop_cache=True, group='glance'
+        )
+        self.data = os.urandom(int(2.5 * units.Mi))
+        self.chunks = [
+            self.data[i : i + units.Mi // 4]
+            for i in range(0, len(self.data), units.Mi // 4)
+        ]
+        self.image_meta['os_hash_value'] = hashlib.sha512(
+            self.data
+        ).hexdigest()
+        self.service.download(self.context, 'image-1', dst_path=self.path)
+        self.assertEqual(self.data, self._read())
+        self.assertEqual(2, mock_fdatasync.call_count)
+        self.assertEqual(
+            [
+                mock.call(mock.ANY, 0, units.Mi, os.POSIX_FADV_DONTNEED),
+                mock.call(
+                    mock.ANY, units.Mi, units.Mi, os.POSIX_FADV_DONTNEED
+                ),
+                mock.call(mock.ANY, 2 * units.Mi, 0, os.POSIX_FADV_DONTNEED),
+            ],
+            mock_fadvise.call_args_list,
+        )
+
+    @mock.patch('os.posix_fadvise')
+    @mock.patch('os.fdatasync')
+    def test_download_drop_cache_unsynced(self, mock_fdatasync, mock_fadvise):
+        self.flags(
+            download_sync_size=0, download_drop_cache=True, group='glance'
+        )
+        self.service.download(self.context, 'image-1', dst_path=self.path)
+        self.assertEqual(self.data, self._read())
+        mock_fdatasync.assert_not_called()
+        mock_fadvise.assert_called_once_with(
+            mock.ANY, 0, 0, os.POSIX_FADV_DONTNEED
+        )
+
+    def test_download_to_file_object(self):
+        data = io.BytesIO()
+        self.service.download(self.context, 'image-1', data=data)
+        self.assertEqual(self.data, data.getvalue())
@@ -14,7 +14,11 @@
 
 from unittest import mock
 
+from oslo_utils.fixture import uuidsentinel as uuids
+
 from cyborg import objects
+from cyborg.common import exception
+from cyborg.objects import device_profile
 from cyborg.tests.unit import fake_device_profile
 from cyborg.tests.unit.db import base
 from cyborg.tests.unit.db import utils
@@ -123,6 +127,120 @@ class TestDeviceProfileObject(base.DbTestCase):
                 mock_dp_get.assert_called_once_with(self.context, uuid)
                 mock_dp_update.assert_called_once()
 
+    def test_get_cached(self):
+        with mock.patch.object(
+            self.dbapi, 'device_profile_get', autospec=True
+        ) as mock_db_devprof_get:
+            mock_db_devprof_get.return_value = self.fake_device_profile
+            obj_devprof = objects.DeviceProfile.get_by_name(
+                self.context, self.fake_device_profile['name']
+            )
+            # The profile is now cached by its id and uuid too.
+            with mock.patch.object(
+                self.dbapi, 'device_profile_get_by_id'
+            ) as mock_db_get_by_id:
+                by_id = objects.DeviceProfile.get_by_id(
+                    self.context, self.fake_device_profile['id']
+                )
+                by_name = objects.DeviceProfile.get_by_name(
+                    self.context, self.fake_device_profile['name']
+                )
+        mock_db_devprof_get.assert_called_once()
+        mock_db_get_by_id.assert_not_called()
+        for devprof in (by_id, by_name):
+            self.assertEqual(obj_devprof.uuid, devprof.uuid)
+            self.assertEqual(obj_devprof.groups, devprof.groups)
+            self.assertEqual(self.context, devprof._context)
+            self.assertEqual(set(), devprof.obj_what_changed())
+        # Each object has its own groups.
+        by_id.groups[0]['resources:FPGA'] = '2'
+        self.assertNotEqual(by_id.groups, by_name.groups)
+
+    def test_get_cache_disabled(self):
+        self.config(device_profile_cache_size=0)
+        device_profile.clear_cache()
+        with mock.patch.object(
+            self.dbapi, 'device_profile_get_by_id', autospec=True
+        ) as mock_db_get_by_id:
+            mock_db_get_by_id.return_value = self.fake_device_profile
+            for _ in range(2):
+                objects.DeviceProfile.get_by_id(
+                    self.context, self.fake_device_profile['id']
+                )
+        self.assertEqual(2, mock_db_get_by_id.call_count)
+
+    @mock.patch('time.monotonic')
+    def test_get_cache_expired(self, mock_monotonic):
+        self.config(device_profile_cache_ttl=60)
+        device_profile.clear_cache()
+        mock_monotonic.return_value = 1000
+        with mock.patch.object(
+            self.dbapi, 'device_profile_get_by_id', autospec=True
+        ) as mock_db_get_by_id:
+            mock_db_get_by_id.return_value = self.fake_device_profile
+            objects.DeviceProfile.get_by_id(
+                self.context, self.fake_device_profile['id']
+            )
+            mock_monotonic.return_value = 1059
+            objects.DeviceProfile.get_by_id(
+                self.context, self.fake_device_profile['id']
+            )
+            self.assertEqual(1, mock_db_get_by_id.call_count)
+            mock_monotonic.return_value = 1061
+            objects.DeviceProfile.get_by_id(
+                self.context, self.fake_device_profile['id']
+            )
+            self.assertEqual(2, mock_db_get_by_id.call_count)
+
+    def test_destroy_uncaches(self):
+        devprof = utils.create_test_device_profile(self.context)
+        obj_devprof = objects.DeviceProfile.get_by_name(
+            self.context, devprof['name']
+        )
+        obj_devprof.destroy(self.context)
+        self.assertRaises(
+            exception.ResourceNotFound,
+            objects.DeviceProfile.get_by_uuid,
+            self.context,
+            devprof['uuid'],
+        )
+
+    def test_save_uncaches(self):
+        devprof = utils.create_test_device_profile(self.context)
+        obj_devprof = objects.DeviceProfile.get_by_name(
+            self.context, devprof['name']
+        )
+        obj_devprof.groups = [{'resources:FPGA': '2'}]
+        obj_devprof.save(self.context)
+        by_id = objects.DeviceProfile.get_by_id(self.context, devprof['id'])
+        self.assertEqual([{'resources:FPGA': '2'}], by_id.groups)
+
+    def test_get_by_ids(self):
+        devprofs = [
+            utils.create_test_device_profile(
+                self.context,
+                id=i,
+                name='dp%d' % i,
+                uuid=getattr(uuids, 'dp%d' % i),
+            )
+            for i in range(1, 4)
+        ]
+        objects.DeviceProfile.get_by_id(self.context, 1)
+        with mock.patch.object(
+            self.dbapi,
+            'device_profile_list_by_filters',
+            wraps=self.dbapi.device_profile_list_by_filters,
+        ) as mock_list:
+            obj_devprofs = objects.DeviceProfile.get_by_ids(
+                self.context, [1, 2, 3]
+            )
+        # Only the profiles not cached are read.
+        mock_list.assert_called_once_with(self.context, {'id': [2, 3]})
+        self.assertEqual(
+            {devprof['id']: devprof['name'] for devprof in devprofs},
+            {id: devprof.name for id, devprof in obj_devprofs.items()},
+        )
+
     def test_obj_make_compatible(self):
         dp_obj = objects.DeviceProfile(description="fake description")
         primitive = dp_obj.obj_to_primitive()
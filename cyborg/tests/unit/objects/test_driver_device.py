@@ -0,0 +1,67 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+from cyborg.objects.device import Device
+from cyborg.objects.driver_objects.driver_controlpath_id import (
+    DriverControlPathID,
+)
+from cyborg.objects.driver_objects.driver_deployable import DriverDeployable
+from cyborg.objects.driver_objects.driver_device import DriverDevice
+from cyborg.tests.unit import fake_driver_device
+from cyborg.tests.unit.db import base
+
+
+class TestDriverDeviceObject(base.DbTestCase):
+    def setUp(self):
+        super().setUp()
+        self.fake_driver_devices = (
+            fake_driver_device.get_fake_driver_devices_objs()
+        )
+
+    def test_list(self):
+        for driver_dev in self.fake_driver_devices:
+            driver_dev.create(self.context, 'host1')
+
+        with mock.patch.object(
+            self.dbapi,
+            'device_tree_get_by_hostname',
+            wraps=self.dbapi.device_tree_get_by_hostname,
+        ) as mock_tree:
+            driver_devs = DriverDevice.list(self.context, 'host1')
+            mock_tree.assert_called_once_with(self.context, 'host1')
+
+        # Same tree as the one built by the per-object loaders.
+        expected = []
+        for dev_obj in Device.get_list_by_hostname(self.context, 'host1'):
+            expected.append(
+                DriverDevice(
+                    vendor=dev_obj.vendor,
+                    model=dev_obj.model,
+                    type=dev_obj.type,
+                    std_board_info=dev_obj.std_board_info,
+                    vendor_board_info=dev_obj.vendor_board_info,
+                    controlpath_id=DriverControlPathID.get(
+                        self.context, dev_obj.id
+                    ),
+                    deployable_list=DriverDeployable.list(
+                        self.context, dev_obj.id
+                    ),
+                )
+            )
+        self.assertEqual(2, len(driver_devs))
+        self.assertEqual(
+            [d.fingerprint() for d in expected],
+            [d.fingerprint() for d in driver_devs],
+        )
+        self.assertEqual([], DriverDevice.list(self.context, 'host2'))
@@ -156,6 +156,178 @@ class TestExtARQJobMixin(base.DbTestCase):
         )
         mock_job.assert_called_once_with(self.context, fake_dep)
 
+    @mock.patch('cyborg.objects.ExtARQ.list')
+    def test_get_suitable_ext_arqs(self, mock_list):
+        expect_type = [objects.ExtARQ] + [objects.FPGAExtARQ] * 4
+        mock_list.return_value = list(self.class_objects.values())
+        uuids = [obj.arq.uuid for obj in self.class_objects.values()]
+        extarqs = objects.ExtARQ.get_suitable_ext_arqs(self.context, uuids)
+        mock_list.assert_called_once_with(self.context, uuids)
+        self.assertEqual(uuids, [extarq.arq.uuid for extarq in extarqs])
+        for extarq, typ in zip(extarqs, expect_type):
+            self.assertIsInstance(extarq, typ)
+
+    @mock.patch('cyborg.objects.ExtARQ.list')
+    def test_get_suitable_ext_arqs_not_found(self, mock_list):
+        mock_list.return_value = []
+        self.assertRaises(
+            exception.ResourceNotFound,
+            objects.ExtARQ.get_suitable_ext_arqs,
+            self.context,
+            [uuidutils.generate_uuid()],
+        )
+
+    def _get_instant_binds(self, num_deps):
+        extarqs = [self.class_objects["gpu"], self.class_objects["no_program"]]
+        deps = []
+        valid_fields = {}
+        for i, extarq in enumerate(extarqs):
+            extarq.arq.state = constants.ARQ_INITIAL
+            dep = fake_deployable.fake_deployable_obj(
+                self.context,
+                id=i % num_deps + 1,
+                uuid=uuidutils.generate_uuid(),
+                rp_uuid=uuidutils.generate_uuid(),
+            )
+            deps.append(dep)
+            valid_fields[extarq.arq.uuid] = {
+                'hostname': 'myhost',
+                'device_rp_uuid': dep.rp_uuid,
+                'instance_uuid': extarqs[0].arq.instance_uuid,
+            }
+        return extarqs, deps, valid_fields
+
+    @mock.patch('cyborg.common.utils.ThreadWorks.spawn')
+    @mock.patch('cyborg.objects.AttachHandle.allocate_many')
+    @mock.patch('cyborg.objects.ExtARQ.bind')
+    @mock.patch('cyborg.objects.Deployable.list')
+    @mock.patch('cyborg.objects.ExtARQ.update_check_states')
+    def test_start_bind_jobs_same_deployable(
+        self,
+        mock_states,
+        mock_dep_list,
+        mock_bind,
+        mock_allocate_many,
+        mock_spawn,
+    ):
+        extarqs, deps, valid_fields = self._get_instant_binds(num_deps=1)
+        mock_dep_list.return_value = deps
+        handles = [mock.Mock(), mock.Mock()]
+        mock_allocate_many.return_value = handles
+
+        arq_binds = objects.ExtARQ.start_bind_jobs(
+            self.context, extarqs, valid_fields
+        )
+
+        mock_states.assert_called_once_with(
+            self.context, extarqs, constants.ARQ_BIND_STARTED
+        )
+        self.assertEqual(dict.fromkeys(extarqs), arq_binds)
+        # The binds of one deployable run in order, in this thread, with
+        # their attach handles allocated at once.
+        mock_spawn.assert_not_called()
+        mock_allocate_many.assert_called_once_with(self.context, 1, 2)
+        self.assertEqual(
+            [
+                mock.call(self.context, dep, ah)
+                for dep, ah in zip(deps, handles)
+            ],
+            mock_bind.call_args_list,
+        )
+        for extarq, dep in zip(extarqs, deps):
+            self.assertEqual('myhost', extarq.arq.hostname)
+            self.assertEqual(dep.rp_uuid, extarq.arq.device_rp_uuid)
+
+    @mock.patch('cyborg.objects.AttachHandle.allocate_many')
+    @mock.patch('cyborg.objects.ExtARQ.bind')
+    @mock.patch('cyborg.objects.Deployable.list')
+    @mock.patch('cyborg.objects.ExtARQ.update_check_states')
+    def test_start_bind_jobs_same_deployable_bind_fails(
+        self, mock_states, mock_dep_list, mock_bind, mock_allocate_many
+    ):
+        extarqs, deps, valid_fields = self._get_instant_binds(num_deps=1)
+        mock_dep_list.return_value = deps
+        handles = [mock.Mock(), mock.Mock()]
+        mock_allocate_many.return_value = handles
+        mock_bind.side_effect = exception.ResourceNotFound(
+            resource='Attribute', msg=''
+        )
+
+        self.assertRaises(
+            exception.ResourceNotFound,
+            objects.ExtARQ.start_bind_jobs,
+            self.context,
+            extarqs,
+            valid_fields,
+        )
+        mock_bind.assert_called_once_with(self.context, deps[0], handles[0])
+        # The handle of the ARQ that was not bound is released.
+        handles[0].deallocate.assert_not_called()
+        handles[1].deallocate.assert_called_once_with(self.context)
+
+    @mock.patch('cyborg.objects.AttachHandle.allocate_many')
+    @mock.patch('cyborg.objects.ExtARQ.bind')
+    @mock.patch('cyborg.objects.Deployable.list')
+    @mock.patch('cyborg.objects.ExtARQ.update_check_states')
+    def test_start_bind_jobs_same_deployable_few_handles(
+        self, mock_states, mock_dep_list, mock_bind, mock_allocate_many
+    ):
+        extarqs, deps, valid_fields = self._get_instant_binds(num_deps=1)
+        mock_dep_list.return_value = deps
+        mock_allocate_many.side_effect = exception.ResourceNotFound(
+            resource='AttachHandle', msg=''
+        )
+
+        objects.ExtARQ.start_bind_jobs(self.context, extarqs, valid_fields)
+        # Each ARQ allocates its own handle.
+        self.assertEqual(
+            [mock.call(self.context, dep) for dep in deps],
+            mock_bind.call_args_list,
+        )
+
+    @mock.patch('cyborg.objects.ExtARQ.bind')
+    @mock.patch('cyborg.objects.Deployable.list')
+    @mock.patch('cyborg.objects.ExtARQ.update_check_states')
+    def test_start_bind_jobs_concurrent_deployables(
+        self, mock_states, mock_dep_list, mock_bind
+    ):
+        extarqs, deps, valid_fields = self._get_instant_binds(num_deps=2)
+        mock_dep_list.return_value = deps
+        mock_bind.side_effect = [
+            exception.ResourceNotFound(resource='AttachHandle', msg=''),
+            None,
+        ]
+
+        with mock.patch.object(
+            utils.ThreadWorks, 'spawn', wraps=utils.ThreadWorks().spawn
+        ) as mock_spawn:
+            self.assertRaises(
+                exception.ResourceNotFound,
+                objects.ExtARQ.start_bind_jobs,
+                self.context,
+                extarqs,
+                valid_fields,
+            )
+        # Both binds ran, each in a worker, before the failure is raised.
+        self.assertEqual(2, mock_spawn.call_count)
+        self.assertEqual(2, mock_bind.call_count)
+
+    @mock.patch('cyborg.objects.Deployable.list')
+    @mock.patch('cyborg.objects.ExtARQ.update_check_states')
+    def test_start_bind_jobs_deployable_not_found(
+        self, mock_states, mock_dep_list
+    ):
+        extarqs, deps, valid_fields = self._get_instant_binds(num_deps=1)
+        mock_dep_list.return_value = deps[:1]
+        self.assertRaises(
+            exception.ResourceNotFound,
+            objects.ExtARQ.start_bind_jobs,
+            self.context,
+            extarqs,
+            valid_fields,
+        )
+        mock_states.assert_not_called()
+
     @mock.patch('cyborg.objects.FPGAExtARQ.bind')
     def test_gpu_arq_start_bind_job(self, mock_aysnc_bind):
         # Test GPU ARQ does not need async bind
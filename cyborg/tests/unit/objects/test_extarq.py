@@ -27,6 +27,7 @@ from cyborg.tests.unit import fake_deployable
 from cyborg.tests.unit import fake_device_profile
 from cyborg.tests.unit import fake_extarq
 from cyborg.tests.unit.db import base
+from cyborg.tests.unit.db import utils as db_utils
 
 
 class TestExtARQObject(base.DbTestCase):
@@ -66,6 +67,116 @@ class TestExtARQObject(base.DbTestCase):
             for obj_extarq in obj_extarqs:
                 self.assertEqual(obj_extarqs[0].arq.uuid, db_extarq['uuid'])
 
+    def test_update_check_states_db(self):
+        devprof = db_utils.create_test_device_profile(self.context)
+        for i in range(2):
+            db_utils.create_test_extarq(
+                self.context,
+                uuid=getattr(uuids, 'arq%d' % i),
+                id=devprof['id'],
+                state=constants.ARQ_INITIAL,
+            )
+        obj_extarqs = objects.ExtARQ.list(self.context)
+        for obj_extarq in obj_extarqs:
+            obj_extarq.arq.hostname = 'newtestnode1'
+
+        objects.ExtARQ.update_check_states(
+            self.context, obj_extarqs, constants.ARQ_BIND_STARTED
+        )
+
+        for obj_extarq in obj_extarqs:
+            self.assertEqual(constants.ARQ_BIND_STARTED, obj_extarq.arq.state)
+            self.assertEqual({}, obj_extarq.obj_get_changes())
+            db_extarq = self.dbapi.extarq_get(
+                self.context, obj_extarq.arq.uuid
+            )
+            self.assertEqual(constants.ARQ_BIND_STARTED, db_extarq['state'])
+            self.assertEqual('newtestnode1', db_extarq['hostname'])
+
+    def test_list_loads_related_objects_once(self):
+        devprof = db_utils.create_test_device_profile(self.context)
+        dep = db_utils.create_test_deployable(self.context)
+        db_utils.create_test_attach_handle(
+            self.context,
+            deployable_id=dep['id'],
+            attach_info='{"bus": "5e", "device": "00"}',
+        )
+        for i in range(3):
+            db_extarq = db_utils.create_test_extarq(
+                self.context,
+                uuid=getattr(uuids, 'arq%d' % i),
+                id=devprof['id'],
+            )
+            self.dbapi.extarq_update(
+                self.context, db_extarq['uuid'], {'deployable_id': dep['id']}
+            )
+
+        with (
+            mock.patch.object(
+                objects.DeviceProfile, 'get_by_id'
+            ) as mock_devprof,
+            mock.patch.object(
+                self.dbapi, 'attach_handle_get_by_id'
+            ) as mock_ah,
+            mock.patch.object(objects.Deployable, 'get_by_id') as mock_dep,
+        ):
+            obj_extarqs = objects.ExtARQ.list(self.context)
+
+        mock_devprof.assert_not_called()
+        mock_ah.assert_not_called()
+        mock_dep.assert_not_called()
+        self.assertThat(obj_extarqs, HasLength(3))
+        for obj_extarq in obj_extarqs:
+            self.assertEqual(
+                devprof['name'], obj_extarq.arq.device_profile_name
+            )
+            self.assertEqual(
+                {'bus': '5e', 'device': '00'},
+                obj_extarq.arq.attach_handle_info,
+            )
+            self.assertEqual(dep['uuid'], obj_extarq.deployable_uuid)
+
+    def test_list_with_limit_and_marker(self):
+        devprof = db_utils.create_test_device_profile(self.context)
+        dep = db_utils.create_test_deployable(self.context)
+        db_utils.create_test_attach_handle(
+            self.context,
+            deployable_id=dep['id'],
+            attach_info='{"bus": "5e", "device": "00"}',
+        )
+        arq_uuids = [getattr(uuids, 'arq%d' % i) for i in range(3)]
+        for arq_uuid in arq_uuids:
+            db_utils.create_test_extarq(
+                self.context, uuid=arq_uuid, id=devprof['id']
+            )
+
+        first_page = objects.ExtARQ.list(self.context, limit=2)
+        self.assertEqual(
+            arq_uuids[:2], [extarq.arq.uuid for extarq in first_page]
+        )
+        next_page = objects.ExtARQ.list(
+            self.context, limit=2, marker=first_page[-1].arq.uuid
+        )
+        self.assertEqual(
+            arq_uuids[2:], [extarq.arq.uuid for extarq in next_page]
+        )
+
+    @mock.patch('cyborg.objects.ExtARQ.destroy')
+    @mock.patch('cyborg.objects.ExtARQ.unbind')
+    @mock.patch('cyborg.objects.ExtARQ.list')
+    def test_delete_by_instance(self, mock_list, mock_unbind, mock_destroy):
+        obj_extarq = self.fake_obj_extarqs[0]
+        instance_uuid = obj_extarq.arq.instance_uuid
+        mock_list.return_value = [obj_extarq]
+
+        objects.ExtARQ.delete_by_instance(self.context, instance_uuid)
+
+        mock_list.assert_called_once_with(
+            self.context, instance_uuid=instance_uuid
+        )
+        mock_unbind.assert_called_once_with(self.context)
+        mock_destroy.assert_called_once_with(self.context)
+
     @mock.patch('cyborg.objects.ExtARQ._from_db_object')
     def test_create(self, mock_from_db_obj):
         db_extarq = self.fake_db_extarqs[0]
@@ -79,17 +190,45 @@ class TestExtARQObject(base.DbTestCase):
             extarq.create(self.context)
             mock_extarq_create.assert_called_once()
 
+    def test_create_many(self):
+        devprof = db_utils.create_test_device_profile(self.context)
+        extarqs = [
+            objects.ExtARQ(
+                self.context,
+                arq=objects.ARQ(
+                    self.context,
+                    device_profile_name=devprof['name'],
+                    device_profile_group_id=0,
+                ),
+            )
+            for _ in range(2)
+        ]
+        with mock.patch.object(
+            self.dbapi, 'extarq_create', autospec=True
+        ) as mock_extarq_create:
+            created = objects.ExtARQ.create_many(
+                self.context, extarqs, devprof['id']
+            )
+        mock_extarq_create.assert_not_called()
+        self.assertEqual(extarqs, created)
+        for extarq in created:
+            self.assertEqual(constants.ARQ_INITIAL, extarq.arq.state)
+            self.assertEqual(devprof['name'], extarq.arq.device_profile_name)
+            self.assertIsNotNone(extarq.arq.uuid)
+        self.assertThat(objects.ExtARQ.list(self.context), HasLength(2))
+
     @mock.patch('openstack.connection.Connection')
     @mock.patch('cyborg.common.nova_client.NovaAPI.notify_binding')
     @mock.patch('cyborg.objects.ExtARQ.bind')
-    @mock.patch('cyborg.objects.ExtARQ.get')
+    @mock.patch('cyborg.objects.ExtARQ.list')
     def test_apply_patch_to_bad_arq_state(
-        self, mock_get, mock_bind, mock_notify_bind, mock_conn
+        self, mock_list, mock_bind, mock_notify_bind, mock_conn
     ):
         good_states = constants.ARQ_STATES_TRANSFORM_MATRIX[
             constants.ARQ_BIND_STARTED
         ]
-        mock_get.return_value = obj_extarq = self.fake_obj_extarqs[0]
+        obj_extarq = self.fake_obj_extarqs[0]
+        mock_list.return_value = [obj_extarq]
         uuid = obj_extarq.arq.uuid
         instance_uuid = obj_extarq.arq.instance_uuid
         valid_fields = {
@@ -121,7 +260,6 @@ class TestExtARQObject(base.DbTestCase):
 
         for state in set(constants.ARQ_STATES) - set(good_states):
             obj_extarq.arq.state = state
-            mock_get.return_value = obj_extarq
             self.assertRaises(
                 exception.ARQBadState,
                 objects.ExtARQ.apply_patch,
@@ -143,10 +281,12 @@ class TestExtARQObject(base.DbTestCase):
     @mock.patch('cyborg.objects.ExtARQ.get')
     @mock.patch('cyborg.objects.ExtARQ.list')
     @mock.patch('cyborg.objects.ExtARQ.update_check_state')
-    @mock.patch('cyborg.objects.deployable.Deployable.get_by_device_rp_uuid')
+    @mock.patch('cyborg.objects.ExtARQ.update_check_states')
+    @mock.patch('cyborg.objects.Deployable.list')
     def test_apply_patch_for_common_extarq(
         self,
-        mock_get_dep,
+        mock_dep_list,
+        mock_check_states,
         mock_check_state,
         mock_list,
         mock_get,
@@ -175,16 +315,15 @@ class TestExtARQObject(base.DbTestCase):
         # bound_extarq.arq.state = constants.ARQ_BOUND
         # mock_get.side_effect = [obj_extarq, bound_extarq]
 
-        mock_get.side_effect = [obj_extarq] * 2
         mock_list.return_value = [obj_extarq]
         uuid = obj_extarq.arq.uuid
         instance_uuid = obj_extarq.arq.instance_uuid
 
         dep_uuid = self.deployable_uuids[0]
         fake_dep = fake_deployable.fake_deployable_obj(
-            self.context, uuid=dep_uuid
+            self.context, uuid=dep_uuid, rp_uuid=obj_extarq.arq.device_rp_uuid
         )
-        mock_get_dep.return_value = fake_dep
+        mock_dep_list.return_value = [fake_dep]
         valid_fields = {
             uuid: {
                 'hostname': obj_extarq.arq.hostname,
@@ -223,6 +362,13 @@ class TestExtARQObject(base.DbTestCase):
 
         self.assertEqual(obj_extarq.deployable_id, fake_dep.id)
         mock_save.assert_called_once()
+        mock_get.assert_not_called()
+        mock_dep_list.assert_called_once_with(
+            self.context, {'rp_uuid': [obj_extarq.arq.device_rp_uuid]}
+        )
+        mock_check_states.assert_called_once_with(
+            self.context, [obj_extarq], constants.ARQ_BIND_STARTED
+        )
 
     @mock.patch(
         'cyborg.objects.extarq.ext_arq_job.ExtARQJobMixin.'
@@ -234,12 +380,14 @@ class TestExtARQObject(base.DbTestCase):
     @mock.patch('cyborg.objects.ExtARQ.get')
     @mock.patch('cyborg.objects.ExtARQ.list')
     @mock.patch('cyborg.objects.ExtARQ.update_check_state')
-    @mock.patch('cyborg.objects.deployable.Deployable.get_by_device_rp_uuid')
+    @mock.patch('cyborg.objects.ExtARQ.update_check_states')
+    @mock.patch('cyborg.objects.Deployable.list')
     @mock.patch('cyborg.common.utils.ThreadWorks.spawn')
     def test_apply_patch_start_fpga_arq_job(
         self,
         mock_spawn,
-        mock_get_dep,
+        mock_dep_list,
+        mock_check_states,
         mock_check_state,
         mock_list,
         mock_get,
@@ -262,19 +410,18 @@ class TestExtARQObject(base.DbTestCase):
         # bound_extarq = copy.deepcopy(obj_extarq)
         # bound_extarq.arq.state = constants.ARQ_BOUND
         # mock_get.side_effect = [obj_extarq, bound_extarq]
-        mock_get.side_effect = [obj_extarq, obj_fpga_extarq]
         mock_list.return_value = [obj_extarq]
         uuid = obj_extarq.arq.uuid
         instance_uuid = obj_extarq.arq.instance_uuid
         # mock_job_get_ext_arq.side_effect = obj_extarq
         dep_uuid = self.deployable_uuids[0]
         fake_dep = fake_deployable.fake_deployable_obj(
-            self.context, uuid=dep_uuid
+            self.context, uuid=dep_uuid, rp_uuid=obj_extarq.arq.device_rp_uuid
         )
         mock_get_bind_st.return_value = [
             (obj_extarq.arq.uuid, constants.ARQ_BIND_STATUS_FINISH)
         ]
-        mock_get_dep.return_value = fake_dep
+        mock_dep_list.return_value = [fake_dep]
         mock_spawn.return_value = None
         valid_fields = {
             uuid: {
@@ -312,9 +459,10 @@ class TestExtARQObject(base.DbTestCase):
             [(obj_extarq.arq.uuid, constants.ARQ_BIND_STATUS_FINISH)],
         )
         # NOTE(Shaohe) check it spawn to start a job.
-        mock_spawn.assert_called_once_with(
-            obj_fpga_extarq.bind, self.context, fake_dep
-        )
+        mock_spawn.assert_called_once_with(mock.ANY, self.context, fake_dep)
+        bound_extarq = mock_spawn.call_args[0][0].__self__
+        self.assertIsInstance(bound_extarq, type(obj_fpga_extarq))
+        self.assertEqual(obj_extarq.arq.uuid, bound_extarq.arq.uuid)
 
     @mock.patch('openstack.connection.Connection')
     @mock.patch('cyborg.common.nova_client.NovaAPI.notify_binding')
@@ -322,12 +470,14 @@ class TestExtARQObject(base.DbTestCase):
     @mock.patch('cyborg.objects.ExtARQ.get')
     @mock.patch('cyborg.objects.ExtARQ.list')
     @mock.patch('cyborg.objects.ExtARQ.update_check_state')
-    @mock.patch('cyborg.objects.deployable.Deployable.get_by_device_rp_uuid')
+    @mock.patch('cyborg.objects.ExtARQ.update_check_states')
+    @mock.patch('cyborg.objects.Deployable.list')
     @mock.patch('cyborg.common.utils.ThreadWorks.spawn_master')
     def test_apply_patch_fpga_arq_monitor_job(
         self,
         mock_master,
-        mock_get_dep,
+        mock_dep_list,
+        mock_check_states,
         mock_check_state,
         mock_list,
         mock_get,
@@ -349,15 +499,14 @@ class TestExtARQObject(base.DbTestCase):
         # bound_extarq = copy.deepcopy(obj_extarq)
         # bound_extarq.arq.state = constants.ARQ_BOUND
         # mock_get.side_effect = [obj_extarq, bound_extarq]
-        mock_get.side_effect = [obj_extarq, obj_fpga_extarq]
         mock_list.return_value = [obj_extarq]
         uuid = obj_extarq.arq.uuid
         instance_uuid = obj_extarq.arq.instance_uuid
         dep_uuid = self.deployable_uuids[0]
         fake_dep = fake_deployable.fake_deployable_obj(
-            self.context, uuid=dep_uuid
+            self.context, uuid=dep_uuid, rp_uuid=obj_extarq.arq.device_rp_uuid
         )
-        mock_get_dep.return_value = fake_dep
+        mock_dep_list.return_value = [fake_dep]
         valid_fields = {
             uuid: {
                 'hostname': obj_extarq.arq.hostname,
@@ -513,6 +662,88 @@ class TestExtARQObject(base.DbTestCase):
             obj_extarq.save(self.context)
             mock_extarq_update.assert_called_once()
 
+    @mock.patch('cyborg.objects.ExtARQ.get')
+    def test_update_check_state(self, mock_get):
+        obj_extarq = self.fake_obj_extarqs[0]
+        obj_extarq.arq.state = constants.ARQ_BIND_STARTED
+        obj_extarq.obj_reset_changes()
+        obj_extarq.arq.obj_reset_changes()
+        with mock.patch.object(
+            self.dbapi, 'extarq_update_state', autospec=True
+        ) as mock_update_state:
+            mock_update_state.return_value = (1, constants.ARQ_BOUND)
+            self.assertTrue(
+                obj_extarq.update_check_state(
+                    self.context, constants.ARQ_BOUND
+                )
+            )
+        mock_update_state.assert_called_once_with(
+            self.context,
+            obj_extarq.arq.uuid,
+            {'state': constants.ARQ_BOUND},
+            [constants.ARQ_BIND_STARTED],
+        )
+        # The new state is known from the swap, no need to read it back.
+        mock_get.assert_not_called()
+        self.assertEqual(constants.ARQ_BOUND, obj_extarq.arq.state)
+        self.assertEqual({}, obj_extarq.obj_get_changes())
+
+    def test_update_check_states(self):
+        obj_extarqs = self.fake_obj_extarqs[:2]
+        for obj_extarq in obj_extarqs:
+            obj_extarq.arq.state = constants.ARQ_INITIAL
+            obj_extarq.obj_reset_changes()
+            obj_extarq.arq.obj_reset_changes()
+            obj_extarq.arq.hostname = 'newtestnode1'
+        with mock.patch.object(
+            self.dbapi, 'extarq_update_many', autospec=True
+        ) as mock_update_many:
+            objects.ExtARQ.update_check_states(
+                self.context, obj_extarqs, constants.ARQ_BIND_STARTED
+            )
+        mock_update_many.assert_called_once_with(
+            self.context,
+            {
+                obj_extarq.arq.uuid: {
+                    'hostname': 'newtestnode1',
+                    'state': constants.ARQ_BIND_STARTED,
+                }
+                for obj_extarq in obj_extarqs
+            },
+            [constants.ARQ_INITIAL, constants.ARQ_UNBOUND],
+        )
+        for obj_extarq in obj_extarqs:
+            self.assertEqual(constants.ARQ_BIND_STARTED, obj_extarq.arq.state)
+            self.assertEqual({}, obj_extarq.obj_get_changes())
+
+    def test_update_check_state_bad_state(self):
+        obj_extarq = self.fake_obj_extarqs[0]
+        obj_extarq.arq.state = constants.ARQ_BIND_STARTED
+        with mock.patch.object(
+            self.dbapi, 'extarq_update_state', autospec=True
+        ) as mock_update_state:
+            mock_update_state.return_value = (0, constants.ARQ_UNBOUND)
+            self.assertRaises(
+                exception.ARQBadState,
+                obj_extarq.update_check_state,
+                self.context,
+                constants.ARQ_BOUND,
+            )
+
+    def test_update_check_state_not_found(self):
+        obj_extarq = self.fake_obj_extarqs[0]
+        obj_extarq.arq.state = constants.ARQ_BIND_STARTED
+        with mock.patch.object(
+            self.dbapi, 'extarq_update_state', autospec=True
+        ) as mock_update_state:
+            mock_update_state.return_value = (0, None)
+            self.assertRaises(
+                exception.ResourceNotFound,
+                obj_extarq.update_check_state,
+                self.context,
+                constants.ARQ_BOUND,
+            )
+
     def test_get_arq_bind_statuses(self):
         # ARQ state is 'Bound'  by default in the fake extarqs
         arq_list = [extarq.arq for extarq in self.fake_obj_extarqs]
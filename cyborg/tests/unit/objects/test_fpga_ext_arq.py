@@ -456,18 +456,121 @@ class TestFPGAExtARQObject(base.DbTestCase):
         self.assertFalse(mock_program.called)
         self.assertFalse(mock_placement_init.called)
         self.assertFalse(mock_dp_update.called)
-        mock_bind.assert_called_once_with(self.context, fake_dep)
+        mock_bind.assert_called_once_with(self.context, fake_dep, None)
 
         self.cpid["cpid_info"] = json.dumps(self.bdf).encode('utf-8')
         # function_id is require
         obj_extarq = self.class_fgpa_objects["function_program"]
         obj_extarq.bind(self.context, fake_dep)
-        mock_bind.assert_called_with(self.context, fake_dep)
+        mock_bind.assert_called_with(self.context, fake_dep, None)
         self.assertEqual(mock_bind.call_count, 2)
 
         self.cpid["cpid_info"] = json.dumps(self.bdf).encode('utf-8')
         # bitstream_id is require
         obj_extarq = self.class_fgpa_objects["bitstream_program"]
         obj_extarq.bind(self.context, fake_dep)
-        mock_bind.assert_called_with(self.context, fake_dep)
+        mock_bind.assert_called_with(self.context, fake_dep, None)
         self.assertEqual(mock_bind.call_count, 3)
+
+    def _mock_images(self, mock_conn):
+        get = mock.Mock(side_effect=self.images_get)
+        mock_conn.return_value = type(
+            "Connection",
+            (object,),
+            {"image": type("image", (object,), {"get": get})},
+        )
+        return get
+
+    @mock.patch('openstack.connection.Connection')
+    def test_get_bitstream_md_from_function_id_cached(self, mock_conn):
+        mock_get = self._mock_images(mock_conn)
+        obj_extarq = self.class_fgpa_objects["function_program"]
+        for _ in range(2):
+            md = obj_extarq._get_bitstream_md_from_function_id(
+                self.function_id
+            )
+            self.assertDictEqual(self.images_md["/images"][0], md)
+        # The image is cached under its bitstream id too.
+        md = obj_extarq._get_bitstream_md_from_bitstream_id(self.bitstream_id)
+        self.assertDictEqual(self.images_md["/images"][0], md)
+        self.assertEqual(1, mock_get.call_count)
+
+    @mock.patch('openstack.connection.Connection')
+    def test_get_bitstream_md_from_bitstream_id_cached(self, mock_conn):
+        mock_get = self._mock_images(mock_conn)
+        obj_extarq = self.class_fgpa_objects["bitstream_program"]
+        for _ in range(2):
+            md = obj_extarq._get_bitstream_md_from_bitstream_id(
+                self.bitstream_id
+            )
+            self.assertDictEqual(self.images_md["/images"][0], md)
+        mock_get.assert_called_once_with('/images/' + self.bitstream_id)
+
+    @mock.patch('time.monotonic')
+    @mock.patch('openstack.connection.Connection')
+    def test_get_bitstream_md_from_function_id_miss(
+        self, mock_conn, mock_monotonic
+    ):
+        self.flags(bitstream_md_cache_miss_ttl=10)
+        mock_get = self._mock_images(mock_conn)
+        mock_monotonic.return_value = 100
+        images = self.images_md["/images"]
+        self.images_md["/images"] = []
+        obj_extarq = self.class_fgpa_objects["function_program"]
+        for _ in range(2):
+            self.assertRaises(
+                exception.ExpectedOneObject,
+                obj_extarq._get_bitstream_md_from_function_id,
+                self.function_id,
+            )
+        self.assertEqual(1, mock_get.call_count)
+
+        # The image uploaded is found once the miss expired.
+        self.images_md["/images"] = images
+        mock_monotonic.return_value = 110
+        md = obj_extarq._get_bitstream_md_from_function_id(self.function_id)
+        self.assertEqual(self.bitstream_id, md['id'])
+        self.assertEqual(2, mock_get.call_count)
+
+    @mock.patch('openstack.connection.Connection')
+    def test_get_bitstream_md_glance_failure_not_cached(self, mock_conn):
+        mock_get = self._mock_images(mock_conn)
+        mock_get.side_effect = [
+            self.response(status_code=503),
+            self.response(content={"images": self.images_md["/images"]}),
+        ]
+        obj_extarq = self.class_fgpa_objects["function_program"]
+        self.assertIsNone(
+            obj_extarq._get_bitstream_md_from_function_id(self.function_id)
+        )
+        md = obj_extarq._get_bitstream_md_from_function_id(self.function_id)
+        self.assertEqual(self.bitstream_id, md['id'])
+
+    @mock.patch('cyborg.agent.rpcapi.AgentAPI.fpga_program')
+    @mock.patch('openstack.connection.Connection')
+    @mock.patch('cyborg.objects.ExtARQ.update_check_state')
+    @mock.patch('cyborg.objects.Deployable.get_cpid_list')
+    def test_do_programming_failed_invalidates_cache(
+        self, mock_cpid_list, mock_check_state, mock_conn, mock_program
+    ):
+        mock_get = self._mock_images(mock_conn)
+        mock_cpid_list.return_value = [self.cpid]
+        mock_program.side_effect = exception.ImageUnacceptable(
+            image_id=self.bitstream_id, reason='not found'
+        )
+        fake_dep = fake_deployable.fake_deployable_obj(
+            self.context, uuid=self.deployable_uuids[0]
+        )
+        fake_dep.driver_name = "intel_fpga"
+        obj_extarq = self.class_fgpa_objects["function_program"]
+        obj_extarq.arq.hostname = 'newtestnode1'
+        obj_extarq._get_bitstream_md_from_function_id(self.function_id)
+        self.assertRaises(
+            exception.ImageUnacceptable,
+            obj_extarq._do_programming,
+            self.context,
+            fake_dep,
+            self.bitstream_id,
+        )
+        obj_extarq._get_bitstream_md_from_function_id(self.function_id)
+        self.assertEqual(2, mock_get.call_count)
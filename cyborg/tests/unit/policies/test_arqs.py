@@ -280,12 +280,12 @@ class ARQPolicyTest(base.BasePolicyTest):
         mock_apply.assert_not_called()
 
     @mock.patch(
-        'cyborg.conductor.rpcapi.ConductorAPI.arq_create', autospec=True
+        'cyborg.conductor.rpcapi.ConductorAPI.arq_create_bulk', autospec=True
     )
     @mock.patch('cyborg.objects.DeviceProfile.get_by_name', autospec=True)
     def test_create_arq_success(self, mock_dp, mock_arq):
         mock_dp.return_value = self.fake_dp_obj
-        mock_arq.return_value = self.fake_extarq_obj
+        mock_arq.return_value = [self.fake_extarq_obj]
         req_body = {'device_profile_name': self.fake_dp_obj.name}
         for context in self.write_authorized_contexts:
             with self.subTest(context=context):
@@ -304,7 +304,7 @@ class ARQPolicyTest(base.BasePolicyTest):
                     self.post_json(ARQ_URL, req_body, headers=headers)
 
     @mock.patch(
-        'cyborg.conductor.rpcapi.ConductorAPI.arq_create', autospec=True
+        'cyborg.conductor.rpcapi.ConductorAPI.arq_create_bulk', autospec=True
     )
     @mock.patch('cyborg.objects.DeviceProfile.get_by_name', autospec=True)
     def test_create_arq_system_scope_forbidden(self, mock_dp, mock_arq):
@@ -601,12 +601,12 @@ class ARQPolicyNewDefaultsTest(base.BasePolicyTest):
         mock_apply.assert_not_called()
 
     @mock.patch(
-        'cyborg.conductor.rpcapi.ConductorAPI.arq_create', autospec=True
+        'cyborg.conductor.rpcapi.ConductorAPI.arq_create_bulk', autospec=True
     )
     @mock.patch('cyborg.objects.DeviceProfile.get_by_name', autospec=True)
     def test_create_arq_new_defaults_success(self, mock_dp, mock_arq):
         mock_dp.return_value = self.fake_dp_obj
-        mock_arq.return_value = self.fake_extarq_obj
+        mock_arq.return_value = [self.fake_extarq_obj]
         req_body = {'device_profile_name': self.fake_dp_obj.name}
         for context in self.write_authorized_contexts:
             with self.subTest(context=context):
@@ -0,0 +1,187 @@
+# Copyright 2026 The Cyborg Authors.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Microbenchmark of the bind path of an ARQ PATCH.
+
+Every DB round trip and every bind is replaced by a sleep of a fixed
+latency, so the numbers show how many round trips a PATCH makes and how
+many of them overlap. The per-ARQ path that apply_patch used to take is
+timed against the batched one for PATCHes of 1, 8 and 32 ARQs, each ARQ
+on its own deployable.
+
+Usage::
+
+    python tools/benchmarks/arq_bind.py [--db-latency MS] [--bind-latency MS]
+"""
+
+import argparse
+import time
+
+from unittest import mock
+
+from oslo_utils import uuidutils
+
+from cyborg import context
+from cyborg import objects
+from cyborg.common import constants
+
+
+SIZES = (1, 8, 32)
+INSTANCE_UUID = uuidutils.generate_uuid()
+
+
+def _make_extarqs(num):
+    extarqs = []
+    for _ in range(num):
+        arq = objects.ARQ(
+            uuid=uuidutils.generate_uuid(),
+            state=constants.ARQ_INITIAL,
+            device_profile_name='dp1',
+            device_profile_group_id=0,
+            device_rp_uuid=uuidutils.generate_uuid(),
+            hostname=None,
+            instance_uuid=None,
+            project_id=None,
+            attach_handle_type='',
+            attach_handle_info={},
+        )
+        extarqs.append(
+            objects.ExtARQ(
+                arq=arq,
+                device_profile_group={'resources:GPU': '1'},
+                deployable_uuid=None,
+            )
+        )
+    return extarqs
+
+
+def _make_deployable(rp_uuid, dep_id):
+    return objects.Deployable(id=dep_id, rp_uuid=rp_uuid, driver_name='fake')
+
+
+def _patch(extarqs, db_latency, bind_latency):
+    """Replace the DB and bind calls of the bind path with sleeps."""
+    by_uuid = {extarq.arq.uuid: extarq for extarq in extarqs}
+    deps = {
+        extarq.arq.device_rp_uuid: _make_deployable(
+            extarq.arq.device_rp_uuid, i
+        )
+        for i, extarq in enumerate(extarqs)
+    }
+
+    def db_call(result=None, round_trips=1):
+        def _call(*args, **kwargs):
+            time.sleep(db_latency * round_trips)
+            return result(*args, **kwargs) if result else None
+
+        return _call
+
+    def bind(self, context, deployable):
+        time.sleep(bind_latency)
+        self.arq.state = constants.ARQ_BOUND
+
+    ext_arq = objects.ExtARQ
+    patches = [
+        mock.patch.object(
+            ext_arq, 'get', db_call(lambda ctx, uuid, **kw: by_uuid[uuid])
+        ),
+        mock.patch.object(
+            ext_arq, 'list', db_call(lambda ctx, uuids: list(by_uuid.values()))
+        ),
+        # Update the state, then read the ARQ back.
+        mock.patch.object(
+            ext_arq, 'update_check_state', db_call(round_trips=2)
+        ),
+        mock.patch.object(ext_arq, 'update_check_states', db_call()),
+        mock.patch.object(ext_arq, 'bind', bind),
+        mock.patch.object(ext_arq, 'master'),
+        mock.patch.object(
+            objects.Deployable,
+            'get_by_device_rp_uuid',
+            db_call(lambda ctx, rp_uuid: deps[rp_uuid]),
+        ),
+        mock.patch.object(
+            objects.Deployable,
+            'list',
+            db_call(lambda ctx, filters: list(deps.values())),
+        ),
+    ]
+    for patch in patches:
+        patch.start()
+    return patches
+
+
+def _per_arq_apply_patch(ctxt, patch_list, valid_fields):
+    """The bind path of apply_patch before ARQs were bound in batches."""
+    arq_binds = {}
+    for arq_uuid in patch_list:
+        extarq = objects.ExtARQ.get_suitable_ext_arq(ctxt, arq_uuid)
+        arq_binds[extarq] = extarq.start_bind_job(ctxt, valid_fields)
+    objects.ExtARQ.master(ctxt, arq_binds)
+
+
+def _run(apply_patch, num, db_latency, bind_latency):
+    extarqs = _make_extarqs(num)
+    patch_list = {}
+    valid_fields = {}
+    for extarq in extarqs:
+        patch_list[extarq.arq.uuid] = [{'op': 'add'}]
+        valid_fields[extarq.arq.uuid] = {
+            'hostname': 'myhost',
+            'device_rp_uuid': extarq.arq.device_rp_uuid,
+            'instance_uuid': INSTANCE_UUID,
+            'project_id': None,
+        }
+    patches = _patch(extarqs, db_latency, bind_latency)
+    try:
+        start = time.monotonic()
+        apply_patch(context.get_admin_context(), patch_list, valid_fields)
+        return time.monotonic() - start
+    finally:
+        for patch in patches:
+            patch.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--db-latency',
+        type=float,
+        default=2.0,
+        help='Latency of a DB round trip, in milliseconds.',
+    )
+    parser.add_argument(
+        '--bind-latency',
+        type=float,
+        default=10.0,
+        help='Latency of the bind of an ARQ, in milliseconds.',
+    )
+    args = parser.parse_args()
+    db_latency = args.db_latency / 1000
+    bind_latency = args.bind_latency / 1000
+
+    objects.register_all()
+    # The ARQs never reach an agent, so there is no need for a transport.
+    mock.patch('cyborg.objects.ext_arq.AgentAPI').start()
+    print('%6s %12s %12s' % ('ARQs', 'per-ARQ ms', 'batched ms'))
+    for num in SIZES:
+        per_arq = _run(_per_arq_apply_patch, num, db_latency, bind_latency)
+        batched = _run(
+            objects.ExtARQ.apply_patch, num, db_latency, bind_latency
+        )
+        print('%6d %12.1f %12.1f' % (num, per_arq * 1000, batched * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,330 @@
+# Copyright 2026 The Cyborg Authors.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Query plans and timings of the hot dbapi lookups.
+
+A synthetic inventory of ``--hosts`` compute nodes is loaded, each with
+``--devices`` devices of one deployable, one control path and
+``--handles`` attach handles, and one bound ARQ per device. Each lookup
+done on an agent report or a bind is then run ``--repeat`` times; its
+mean time and the plan of the SELECT it issued are printed.
+
+``--drop-indexes`` drops the lookup indexes first, to compare the plans
+with the table scans they replace::
+
+    python tools/benchmarks/db_lookups.py
+    python tools/benchmarks/db_lookups.py --drop-indexes
+
+The database is wiped. Without ``--connection`` a temporary SQLite file is
+used; plans are read with EXPLAIN QUERY PLAN on SQLite and EXPLAIN
+elsewhere.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import sqlalchemy
+
+from oslo_config import cfg
+from oslo_db import options
+from oslo_utils import uuidutils
+
+from cyborg import context
+from cyborg.common import constants
+from cyborg.db import api as dbapi
+from cyborg.db.sqlalchemy import api as sqlalchemy_api
+from cyborg.db.sqlalchemy import models
+
+
+CONF = cfg.CONF
+LOOKUP_INDEXES = (
+    ('devices', 'devices_hostname_idx'),
+    ('deployables', 'deployables_name_device_id_idx'),
+    ('deployables', 'deployables_rp_uuid_idx'),
+    ('controlpath_ids', 'controlpath_ids_device_id_cpid_info_idx'),
+    ('attach_handles', 'attach_handles_deployable_id_in_use_idx'),
+    ('attach_handles', 'attach_handles_deployable_id_attach_info_idx'),
+    ('extended_accelerator_requests', 'extArqs_state_idx'),
+)
+
+
+def _insert(engine, model, rows):
+    if rows:
+        with engine.begin() as conn:
+            conn.execute(model.__table__.insert(), rows)
+
+
+def _load(engine, hosts, devices, handles):
+    """Bulk load the inventory, returning a sample of one host."""
+    models.Base.metadata.drop_all(engine)
+    models.Base.metadata.create_all(engine)
+    dp_uuid = uuidutils.generate_uuid()
+    _insert(
+        engine,
+        models.DeviceProfile,
+        [
+            {
+                'id': 1,
+                'uuid': dp_uuid,
+                'name': 'bench',
+                'profile_json': '{"groups": [{"resources:FPGA": "1"}]}',
+            }
+        ],
+    )
+    dev_rows, dep_rows, cpid_rows, ah_rows, arq_rows = [], [], [], [], []
+    sample = None
+    for host in range(hosts):
+        hostname = 'compute-%04d' % host
+        for dev in range(devices):
+            dev_id = len(dev_rows) + 1
+            cpid_info = (
+                '{"bus": "%02x", "device": "00", "function": "0"}' % dev
+            )
+            rp_uuid = uuidutils.generate_uuid()
+            dev_rows.append(
+                {
+                    'id': dev_id,
+                    'uuid': uuidutils.generate_uuid(),
+                    'type': 'FPGA',
+                    'vendor': '8086',
+                    'model': 'bench',
+                    'hostname': hostname,
+                    'status': 'enabled',
+                }
+            )
+            dep_rows.append(
+                {
+                    'id': dev_id,
+                    'uuid': uuidutils.generate_uuid(),
+                    'name': '%s_%s' % (hostname, cpid_info),
+                    'num_accelerators': handles,
+                    'device_id': dev_id,
+                    'rp_uuid': rp_uuid,
+                    'driver_name': 'bench',
+                }
+            )
+            cpid_rows.append(
+                {
+                    'id': dev_id,
+                    'uuid': uuidutils.generate_uuid(),
+                    'device_id': dev_id,
+                    'cpid_type': 'PCI',
+                    'cpid_info': cpid_info,
+                }
+            )
+            for ah in range(handles):
+                ah_rows.append(
+                    {
+                        'id': len(ah_rows) + 1,
+                        'uuid': uuidutils.generate_uuid(),
+                        'deployable_id': dev_id,
+                        'cpid_id': dev_id,
+                        # The first handle is the one bound below.
+                        'in_use': ah == 0,
+                        'attach_type': 'PCI',
+                        'attach_info': '{"bus": "%02x", "function": "%d"}'
+                        % (dev, ah),
+                    }
+                )
+            arq_rows.append(
+                {
+                    'id': dev_id,
+                    'uuid': uuidutils.generate_uuid(),
+                    'state': constants.ARQ_BOUND,
+                    'device_profile_id': 1,
+                    'device_profile_group_id': 0,
+                    'hostname': hostname,
+                    'device_rp_uuid': rp_uuid,
+                    'instance_uuid': uuidutils.generate_uuid(),
+                    'attach_handle_id': len(ah_rows) - handles + 1,
+                    'deployable_id': dev_id,
+                }
+            )
+            sample = {
+                'hostname': hostname,
+                'name': dep_rows[-1]['name'],
+                'device_id': dev_id,
+                'rp_uuid': rp_uuid,
+                'cpid_info': cpid_info,
+                'attach_info': ah_rows[-1]['attach_info'],
+            }
+    for model, rows in (
+        (models.Device, dev_rows),
+        (models.Deployable, dep_rows),
+        (models.ControlpathID, cpid_rows),
+        (models.AttachHandle, ah_rows),
+        (models.ExtArq, arq_rows),
+    ):
+        _insert(engine, model, rows)
+    return sample
+
+
+def _drop_indexes(engine):
+    with engine.begin() as conn:
+        for table, name in LOOKUP_INDEXES:
+            for index in models.Base.metadata.tables[table].indexes:
+                if index.name == name:
+                    index.drop(conn)
+
+
+def _lookups(dbapi_conn, sample):
+    return (
+        (
+            'device_list_by_filters(hostname)',
+            lambda ctxt: dbapi_conn.device_list_by_filters(
+                ctxt, {'hostname': sample['hostname']}
+            ),
+        ),
+        (
+            'deployable_get_by_filters(name)',
+            lambda ctxt: dbapi_conn.deployable_get_by_filters(
+                ctxt, {'name': sample['name']}
+            ),
+        ),
+        (
+            'deployable_get_by_filters(name, device_id)',
+            lambda ctxt: dbapi_conn.deployable_get_by_filters(
+                ctxt,
+                {'name': sample['name'], 'device_id': sample['device_id']},
+            ),
+        ),
+        (
+            'deployable_get_by_rp_uuid',
+            lambda ctxt: dbapi_conn.deployable_get_by_rp_uuid(
+                ctxt, sample['rp_uuid']
+            ),
+        ),
+        (
+            'control_path_get_by_filters(device_id, cpid_info)',
+            lambda ctxt: dbapi_conn.control_path_get_by_filters(
+                ctxt,
+                {
+                    'device_id': sample['device_id'],
+                    'cpid_info': sample['cpid_info'],
+                },
+            ),
+        ),
+        (
+            'attach_handle_get_by_filters(deployable_id, in_use)',
+            lambda ctxt: dbapi_conn.attach_handle_get_by_filters(
+                ctxt, {'deployable_id': sample['device_id'], 'in_use': False}
+            ),
+        ),
+        (
+            'attach_handle_get_by_filters(deployable_id, attach_info)',
+            lambda ctxt: dbapi_conn.attach_handle_get_by_filters(
+                ctxt,
+                {
+                    'deployable_id': sample['device_id'],
+                    'attach_info': sample['attach_info'],
+                },
+            ),
+        ),
+        (
+            'extarq_list(state)',
+            lambda ctxt: dbapi_conn.extarq_list(
+                ctxt, state=constants.ARQ_BIND_STARTED
+            ),
+        ),
+    )
+
+
+def _explain(engine, statement, parameters):
+    if engine.dialect.name == 'sqlite':
+        prefix, detail = 'EXPLAIN QUERY PLAN ', -1
+    else:
+        prefix, detail = 'EXPLAIN ', None
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(prefix + statement, parameters).fetchall()
+    if detail is not None:
+        return [str(row[detail]) for row in rows]
+    return [
+        ' '.join('%s=%s' % (k, v) for k, v in row._mapping.items() if v)
+        for row in rows
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--connection', help='SQLAlchemy URL of a database to wipe.'
+    )
+    parser.add_argument('--hosts', type=int, default=500)
+    parser.add_argument('--devices', type=int, default=4)
+    parser.add_argument('--handles', type=int, default=8)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument(
+        '--drop-indexes',
+        action='store_true',
+        help='Drop the lookup indexes before timing.',
+    )
+    args = parser.parse_args()
+
+    connection = args.connection
+    if not connection:
+        fd, path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        connection = 'sqlite:///%s' % path
+    options.set_defaults(CONF, connection=connection)
+    CONF([], project='cyborg')
+    dbapi_conn = dbapi.get_instance()
+    engine = sqlalchemy_api.main_context_manager.writer.get_engine()
+
+    sample = _load(engine, args.hosts, args.devices, args.handles)
+    if args.drop_indexes:
+        _drop_indexes(engine)
+    with engine.begin() as conn:
+        if engine.dialect.name == 'sqlite':
+            conn.exec_driver_sql('ANALYZE')
+        else:
+            for table in {table for table, _ in LOOKUP_INDEXES}:
+                conn.exec_driver_sql('ANALYZE TABLE %s' % table)
+
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, ctx, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            statements.append((statement, parameters))
+
+    ctxt = context.get_admin_context()
+    print(
+        '%d hosts, %d devices, %d attach handles, indexes %s'
+        % (
+            args.hosts,
+            args.hosts * args.devices,
+            args.hosts * args.devices * args.handles,
+            'dropped' if args.drop_indexes else 'present',
+        )
+    )
+    for name, lookup in _lookups(dbapi_conn, sample):
+        del statements[:]
+        sqlalchemy.event.listen(engine, 'before_cursor_execute', _record)
+        try:
+            lookup(ctxt)
+        finally:
+            sqlalchemy.event.remove(engine, 'before_cursor_execute', _record)
+        start = time.monotonic()
+        for _ in range(args.repeat):
+            lookup(ctxt)
+        elapsed = (time.monotonic() - start) / args.repeat
+        print('\n%s: %.3f ms' % (name, elapsed * 1000))
+        for statement, parameters in statements[-1:]:
+            for line in _explain(engine, statement, parameters):
+                print('    %s' % line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+# Copyright 2026 The Cyborg Authors.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Microbenchmark of the download of an image from Glance to a file.
+
+Glance is replaced by an iterator of 64 KiB chunks, each one delayed to
+simulate a network of a given bandwidth. The loop download used to run,
+writing each chunk as received and syncing once at the end, is timed
+against the download pipeline with and without prefetching, all of them
+verifying the data against its sha512. The throughput and the CPU time
+of the process are reported.
+
+Usage::
+
+    python tools/benchmarks/glance_download.py [--size MIB]
+        [--bandwidth MIBPS] [--dir DIR]
+"""
+
+import argparse
+import hashlib
+import os
+import tempfile
+import time
+
+from oslo_utils import units
+
+from cyborg.conf import CONF
+from cyborg.image import glance
+
+
+CHUNK = 64 * units.Ki
+
+
+class FakeImageChunks:
+    """The chunks of an image received at a given bandwidth."""
+
+    wrapped = True
+
+    def __init__(self, data, bandwidth):
+        self._data = data
+        self._delay = CHUNK / bandwidth if bandwidth else 0
+
+    def __iter__(self):
+        view = memoryview(self._data)
+        for i in range(0, len(view), CHUNK):
+            if self._delay:
+                time.sleep(self._delay)
+            yield bytes(view[i : i + CHUNK])
+
+
+class FakeClient:
+    def __init__(self, data, bandwidth):
+        self._data = data
+        self._bandwidth = bandwidth
+        self.image_meta = {
+            'os_hash_algo': 'sha512',
+            'os_hash_value': hashlib.sha512(data).hexdigest(),
+        }
+
+    def call(self, context, version, method, image_id):
+        if method == 'get':
+            return self.image_meta
+        return FakeImageChunks(self._data, self._bandwidth)
+
+
+def _loop_download(client, path):
+    """The download loop of GlanceImageServiceV2 before the pipeline."""
+    hasher = hashlib.sha512()
+    with open(path, 'wb') as data:
+        for chunk in client.call(None, 2, 'data', 'image'):
+            hasher.update(chunk)
+            data.write(chunk)
+        data.flush()
+        os.fsync(data.fileno())
+    assert hasher.hexdigest() == client.image_meta['os_hash_value']
+
+
+def _pipeline_download(client, path):
+    glance.GlanceImageServiceV2(client=client).download(
+        None, 'image', dst_path=path
+    )
+
+
+def _run(func, client, path):
+    wall = time.monotonic()
+    cpu = time.process_time()
+    func(client, path)
+    return time.monotonic() - wall, time.process_time() - cpu
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--size', type=int, default=256, help='Size of the image, in MiB.'
+    )
+    parser.add_argument(
+        '--bandwidth',
+        type=float,
+        default=400.0,
+        help='Bandwidth of the network, in MiB/s. 0 for no limit.',
+    )
+    parser.add_argument(
+        '--dir', default=None, help='Directory to download the image to.'
+    )
+    args = parser.parse_args()
+
+    CONF([], project='cyborg', default_config_files=[])
+    data = os.urandom(args.size * units.Mi)
+    client = FakeClient(data, args.bandwidth * units.Mi)
+    runs = [
+        ('loop', _loop_download, {}),
+        ('pipeline', _pipeline_download, {'download_prefetch_chunks': 0}),
+        ('pipeline+prefetch', _pipeline_download, {}),
+        (
+            'pipeline+prefetch+drop',
+            _pipeline_download,
+            {'download_drop_cache': True},
+        ),
+    ]
+    print('%24s %10s %10s' % ('', 'MiB/s', 'CPU s'))
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        path = os.path.join(tmp, 'image')
+        for name, func, flags in runs:
+            for flag, value in flags.items():
+                CONF.set_override(flag, value, group='glance')
+            try:
+                wall, cpu = _run(func, client, path)
+            finally:
+                for flag in flags:
+                    CONF.clear_override(flag, group='glance')
+            os.remove(path)
+            print('%24s %10.1f %10.2f' % (name, args.size / wall, cpu))
+
+
+if __name__ == '__main__':
+    main()